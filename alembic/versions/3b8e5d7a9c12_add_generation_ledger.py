@@ -0,0 +1,46 @@
+"""add_generation_ledger
+
+Revision ID: 3b8e5d7a9c12
+Revises: 7c1f4b9d2a31
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e5d7a9c12'
+down_revision: Union[str, None] = '7c1f4b9d2a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duration, tokens and estimated cost per generation, graph node run and LLM call
+    op.create_table('generation_ledger',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('profile_id', sa.UUID(), nullable=False),
+    sa.Column('thread_id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.Text(), nullable=False),
+    sa.Column('node', sa.Text(), nullable=True),
+    sa.Column('model', sa.Text(), nullable=True),
+    sa.Column('duration_ms', sa.REAL(), nullable=False),
+    sa.Column('prompt_tokens', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('cached_tokens', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('completion_tokens', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('cost_usd', sa.Float(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint("kind IN ('generation', 'node', 'llm')", name='generation_ledger_kind_check'),
+    sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_generation_ledger_profile_kind', 'generation_ledger', ['profile_id', 'kind', 'created_at'], unique=False)
+    op.create_index('idx_generation_ledger_thread_id', 'generation_ledger', ['thread_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_generation_ledger_thread_id', table_name='generation_ledger')
+    op.drop_index('idx_generation_ledger_profile_kind', table_name='generation_ledger')
+    op.drop_table('generation_ledger')
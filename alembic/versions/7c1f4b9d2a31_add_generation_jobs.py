@@ -0,0 +1,50 @@
+"""add_generation_jobs
+
+Revision ID: 7c1f4b9d2a31
+Revises: e2746ef4e845
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f4b9d2a31'
+down_revision: Union[str, None] = 'e2746ef4e845'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Queue for background content generation, claimed by workers with FOR UPDATE SKIP LOCKED
+    op.create_table('generation_jobs',
+    sa.Column('job_id', sa.UUID(), nullable=False),
+    sa.Column('profile_id', sa.UUID(), nullable=False),
+    sa.Column('thread_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.Text(), server_default=sa.text("'queued'::text"), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('user_context', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), server_default=sa.text('3'), nullable=False),
+    sa.Column('worker_id', sa.Text(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint("status IN ('queued', 'running', 'succeeded', 'failed')", name='generation_jobs_status_check'),
+    sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('idx_generation_jobs_claim', 'generation_jobs', ['status', 'created_at'], unique=False)
+    op.create_index('idx_generation_jobs_profile_id', 'generation_jobs', ['profile_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_generation_jobs_profile_id', table_name='generation_jobs')
+    op.drop_index('idx_generation_jobs_claim', table_name='generation_jobs')
+    op.drop_table('generation_jobs')
@@ -1,24 +1,30 @@
 import ast
+import asyncio
+import contextvars
+import dataclasses
 import json
 import logging
 import os
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 
 from fastapi import HTTPException
-from langgraph.checkpoint.postgres import PostgresSaver
-from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langchain_core.runnables import RunnableConfig
 from langgraph.constants import Send
 from langgraph.graph import START, END, StateGraph
+from langgraph.types import StreamWriter
 # from langchain_core.messages import HumanMessage, SystemMessage
-from psycopg import Connection
 
 # from src.agents import configuration
 from src.backend.agents.prompts import (
     default_blog_structure,
     blog_planner_instructions,
     main_body_section_writer_instructions,
+    main_body_section_request,
     intro_conclusion_instructions,
+    intro_conclusion_request,
     linkedin_post_instructions,
     twitter_post_instructions,
     tags_generator,
@@ -28,19 +34,34 @@ from src.backend.agents.prompts import (
     relevant_search_prompt,
     relevant_reddit_prompt,
     twitter_query_creator,
-    blog_reviewer_instructions
+    blog_reviewer_instructions,
+    feedback_section_mapper,
+    section_feedback_instructions,
+    source_chunk_summary_instructions,
+    source_brief_instructions
 
 )
+from src.backend.agents.budget import ContentBudgeter
+from src.backend.agents.keyphrases import KeyphraseExtractor
+from src.backend.agents.memo import get_stage_cache
+from src.backend.agents.ranking import RelevanceRanker
+from src.backend.agents.research import ResearchPool
+from src.backend.agents.tiers import ModelTiers
 from src.backend.agents.tools import ImageSearch, RedditSearch, WebSearch
-from src.backend.clients.llm import LLMClient, HumanMessage, SystemMessage
-from src.backend.agents.state import BlogState, BlogStateInput, BlogStateOutput, SectionState, StreamUpdate
+from src.backend.clients.llm import LLMClient, HumanMessage, SystemMessage, track_usage
+from src.backend.config import ConfigLoader
+from src.backend.agents.state import BlogState, BlogStateInput, BlogStateOutput, SectionState, StreamToken, StreamUpdate
 from src.backend.agents.utils import *
 from src.backend.extraction.factory import ConverterRegistry, ExtracterRegistry
-import atexit
+from src.backend.utils.ledger import GenerationLedger, in_node_span, node_span
 from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
 from src.backend.utils.general import safe_json_loads, shorten_link
+from src.backend.settings import get_settings
 from src.backend.db.repositories import URLReferencesRepository, MediaRepository, SourceMetadataRepository
 from src.backend.db.repositories import *
+from src.backend.db.checkpoint import aget_checkpoint_pool, get_checkpoint_pool
+from src.backend.db.checkpoint_serde import CompactAsyncPostgresSaver, CompactPostgresSaver
 
 # Setup logger
 logger = setup_logger(__name__)
@@ -59,41 +80,43 @@ class AgentWorkflow:
         'length': 'medium'
     }
 
-    def __init__(self):
+    def __init__(self, checkpointer=None):
+        """
+        Args:
+            checkpointer: Optional LangGraph checkpointer supporting both sync and async
+                access (e.g. InMemorySaver for tests and benchmarks). Defaults to Postgres.
+        """
         logger.info("Initializing AgentWorkflow")
         self.llm = LLMClient()
+        # Per-node llm config, output cap and temperature (cheaper models for simple calls)
+        self.tiers = ModelTiers.from_config(ConfigLoader().get_config("llm_tiers.default"))
+        budget_config = ConfigLoader().get_config("content_budget.default")
+        self.budgeter = ContentBudgeter.from_config(budget_config, self.llm.model_name)
+        self.condense_params = budget_config.class_params.get("condense", {})
         self.websearcher = WebSearch(provider='google', num_results=15)
         self.imagesearch=ImageSearch()
         self.reddit_searcher=RedditSearch()
+        self.research = ResearchPool.from_config(ConfigLoader().get_config("research.default"))
+        self.relevance = RelevanceRanker.from_config(ConfigLoader().get_config("relevance.default"))
         # Initialize repositories
-        self.builder = StateGraph(
-            BlogState,
-            input=BlogStateInput,
-            output=BlogStateOutput
-            # config_schema=configuration.Configuration,
-        )
-        dsn = os.getenv("DATABASE_URL")
-        connection_kwargs = {
-            "autocommit": True,
-            "keepalives": 1,
-            "keepalives_idle": 60,
-            "keepalives_interval": 10,
-            "keepalives_count": 5,
-        }
-        self.conn = Connection.connect(dsn, **connection_kwargs)
-        self.checkpointer = PostgresSaver(
-            self.conn, 
-            serde=JsonPlusSerializer(pickle_fallback=True)
-        )
+        self.async_graph = None
+        self._async_setup_lock = asyncio.Lock()
+        self.stage_cache = get_stage_cache()
+        if checkpointer is not None:
+            self.checkpointer = checkpointer
+        else:
+            # Checkpoint reads/writes check out connections from the process-wide pool
+            self.checkpointer = CompactPostgresSaver(get_checkpoint_pool())
 
         # NOTE: Checkpoint tables are created by Alembic migration
         # cf32c51cc0a1_add_checkpoint_tables_and_seed_data
         # Uncomment only if you need to create tables manually
         # self.checkpointer.setup()
 
-        # Add finalizer to close connection when object is destroyed
-        atexit.register(self._cleanup)
         self.graph = self.setup_workflow()
+        if checkpointer is not None:
+            # Injected checkpointers serve both the sync and async entry points
+            self.async_graph = self._compile_graph(self.checkpointer, asynchronous=True)
         self.generic_converter=ConverterRegistry.get_converter("generic")
         self.html_converter=ConverterRegistry.get_converter("html")
         self.arxiv_extracter=ExtracterRegistry.get_extractor("arxiv")
@@ -114,39 +137,263 @@ class AgentWorkflow:
         self.url_references_repo = URLReferencesRepository()
         self.media_repo = MediaRepository()
         self.source_metadata_repo = SourceMetadataRepository()
+        self.ledger_repo = LedgerRepository()
+        # Tags are extracted locally (converging on tags in use) or generated by the LLM
+        self.tagger = KeyphraseExtractor.from_config(
+            ConfigLoader().get_config("tags.default"), vocabulary=self._known_tag_names
+        )
 
 
-    def _cleanup(self):
-        """Close database connection on exit"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+    async def asetup(self):
+        """
+        Compile the graph against an async Postgres checkpointer.
+        Called from the app lifespan; async entry points also call it lazily.
+        """
+        async with self._async_setup_lock:
+            if self.async_graph is not None:
+                return self.async_graph
+            async_checkpointer = CompactAsyncPostgresSaver(await aget_checkpoint_pool())
+            self.async_graph = self._compile_graph(async_checkpointer, asynchronous=True)
+            return self.async_graph
 
     def _get_template_params(self, state):
         """Get template parameters with defaults as fallback"""
         template_params = state.template.get('parameters', {}) if state.template else {}
         return {**self.DEFAULT_TEMPLATE_PARAMS, **template_params}
 
-    def generate_blog_plan(self, state: BlogState):
-        """Generate the report plan"""
-        reference_link = state.input_url
-        media_markdown = state.media_markdown
-        user_instructions = state.input_content
-        blog_structure = default_blog_structure
+    def _length(self, state):
+        """Template length ("short", "medium", "long"), which caps the section writers' output"""
+        return self._get_template_params(state)['length']
+
+    # Each LLM node has a sync implementation (used by self.graph) and an async one
+    # prefixed with "a" (used by self.async_graph). Both share the prompt building
+    # and response parsing helpers below.
 
+    @staticmethod
+    def _stream_tokens(config: RunnableConfig):
+        """Whether the caller asked for LLM tokens on the graph's "custom" stream"""
+        return bool(config and config.get("configurable", {}).get("stream_tokens"))
+
+    # Stages whose output only depends on their prompt; served from the stage cache
+    MEMOIZED_STAGES = {
+        "generate_blog_plan", "write_section", "write_final_sections",
+        "write_twitter_post", "write_linkedin_post", "summarize_source_chunk", "reduce_source_brief",
+    }
+
+    @staticmethod
+    def _use_cache(config: RunnableConfig):
+        """Whether the run may be served from caches; requests opt out with use_cache=False,
+        which is carried in the run config"""
+        return not (config and config.get("configurable", {}).get("use_cache") is False)
+
+    def _llm_for(self, node, length=None):
+        """Client and call parameters (max_tokens, temperature) of a node's tier"""
+        config_path = self.tiers.llm(node)
+        llm = self.llm.variant(config_path) if config_path else self.llm
+        return llm, self.tiers.params(node, length)
+
+    def _invoke(self, node, messages, config: RunnableConfig = None, length=None):
+        """Call the LLM of a node's tier; the run config decides whether the response cache is used"""
+        llm, params = self._llm_for(node, length)
+        return llm.invoke(messages, cache=self._use_cache(config), **params)
+
+    async def _ainvoke(self, node, messages, config: RunnableConfig = None, length=None):
+        """Async counterpart of _invoke"""
+        llm, params = self._llm_for(node, length)
+        return await llm.ainvoke(messages, cache=self._use_cache(config), **params)
+
+    def _memo_lookup(self, node, messages, config: RunnableConfig, length=None):
+        """Return (cache key, cached output) for a memoized stage; the key is None when not cached."""
+        if self.stage_cache is None or node not in self.MEMOIZED_STAGES:
+            return None, None
+        if not self._use_cache(config):
+            return None, None
+        llm, params = self._llm_for(node, length)
+        key = self.stage_cache.key(node, messages, {**llm.cache_key_params, **params})
+        return key, self.stage_cache.get(node, key)
+
+    def _memo_store(self, key, output):
+        if key is not None and output:
+            self.stage_cache.set(key, output)
+
+    def _generate(self, messages, config: RunnableConfig, writer: StreamWriter, node, section=None,
+                  length=None):
+        """Call the LLM, forwarding tokens to the stream writer when token streaming is on.
+
+        Internal stages pass writer=None so their output is never streamed to the client.
+        Section writers pass the template's length, which sets their output cap.
+        """
+        streaming = writer is not None and self._stream_tokens(config)
+        key, cached = self._memo_lookup(node, messages, config, length)
+        if cached is not None:
+            if streaming:
+                writer({"node": node, "section": section, "token": cached})
+            return cached
+        use_cache = self._use_cache(config)
+        llm, params = self._llm_for(node, length)
+        if not streaming:
+            output = llm.invoke(messages, cache=use_cache, **params)
+        else:
+            parts = []
+            for token in llm.stream(messages, cache=use_cache, **params):
+                parts.append(token)
+                writer({"node": node, "section": section, "token": token})
+            output = "".join(parts)
+        self._memo_store(key, output)
+        return output
+
+    async def _agenerate(self, messages, config: RunnableConfig, writer: StreamWriter, node, section=None,
+                   length=None):
+        """Async counterpart of _generate"""
+        streaming = writer is not None and self._stream_tokens(config)
+        key, cached = self._memo_lookup(node, messages, config, length)
+        if cached is not None:
+            if streaming:
+                writer({"node": node, "section": section, "token": cached})
+            return cached
+        use_cache = self._use_cache(config)
+        llm, params = self._llm_for(node, length)
+        if not streaming:
+            output = await llm.ainvoke(messages, cache=use_cache, **params)
+        else:
+            parts = []
+            async for token in llm.astream(messages, cache=use_cache, **params):
+                parts.append(token)
+                writer({"node": node, "section": section, "token": token})
+            output = "".join(parts)
+        self._memo_store(key, output)
+        return output
+
+    def _fit_reference(self, node, content, focus=None):
+        """Fit the reference content to the node's token budget; returns (content, content_budget update)"""
+        fitted, decision = self.budgeter.fit(node, content, focus)
+        if decision is None:
+            return content, []
+        if decision["strategy"] != "fit":
+            logger.info(
+                f"Reference content for {node} cut from {decision['input_tokens']} to "
+                f"{decision['kept_tokens']} tokens ({decision['strategy']})"
+            )
+        return fitted, [decision]
+
+    # Oversized reference content is condensed before planning: the source is split into
+    # chunks that are summarized concurrently (map) and merged into one brief (reduce).
+    # Section writers then work from the brief instead of the raw source.
+
+    def _condense_chunks(self, content):
+        """Map units for the reference content, or an empty list when it is small enough to use as is"""
+        min_tokens = self.condense_params.get("min_tokens")
+        if not content or not min_tokens:
+            return []
+        chunks = self.budgeter.group(content, self.condense_params.get("chunk_tokens", 4000))
+        if sum(chunk.tokens for chunk in chunks) <= min_tokens:
+            return []
+        return chunks
+
+    def route_input(self, state: BlogState):
+        """Condense oversized reference content before planning"""
+        return "condense_reference" if self._condense_chunks(state.input_content) else "generate_blog_plan"
+
+    @staticmethod
+    def _chunk_source(chunk):
+        """' (Source N: url)' for chunks of multi-source content"""
+        return f" ({chunk.header.lstrip('# ')})" if chunk.header else ""
+
+    def _chunk_summary_messages(self, state: BlogState, chunk, parts):
+        """Build the prompt summarizing one chunk of the reference content"""
         params = self._get_template_params(state)
-        system_instructions_sections = blog_planner_instructions.format(
-            user_instructions=user_instructions, blog_structure=blog_structure, **params
+        system_instructions = source_chunk_summary_instructions.format(
+            content_type=params["content_type"],
+            topic=state.input_topic or state.input_url or "the source",
+            part=chunk.position + 1,
+            parts=parts,
+            source=self._chunk_source(chunk),
+            chunk=chunk.text,
+            summary_words=self.condense_params.get("summary_words", 250),
         )
+        return [
+            SystemMessage(content=system_instructions),
+            HumanMessage(content="Summarize this part of the source."),
+        ]
 
-        report_sections = self.llm.invoke(
-            [
-                SystemMessage(content=system_instructions_sections),
-                HumanMessage(
-                    content="Generate the sections of the blog. Your response must include a 'sections' field containing a list of sections. Each section must have: name, description, and content fields."
-                ),
-            ]
+    def _brief_messages(self, state: BlogState, chunks, summaries):
+        """Build the prompt reducing the chunk summaries into one brief"""
+        params = self._get_template_params(state)
+        system_instructions = source_brief_instructions.format(
+            content_type=params["content_type"],
+            topic=state.input_topic or state.input_url or "the source",
+            summaries="\n\n".join(
+                f"## Part {chunk.position + 1}{self._chunk_source(chunk)}\n{summary}"
+                for chunk, summary in zip(chunks, summaries)
+            ),
+            brief_words=self.condense_params.get("brief_words", 1500),
+        )
+        return [
+            SystemMessage(content=system_instructions),
+            HumanMessage(content="Write the brief."),
+        ]
+
+    def _condensed(self, chunks, brief):
+        """State update with the brief and the condensing decision"""
+        decision = {
+            "node": "condense_reference", "strategy": "condense",
+            "input_tokens": sum(chunk.tokens for chunk in chunks),
+            "chunks_total": len(chunks), "kept_tokens": self.budgeter.count(brief),
+        }
+        logger.info(
+            f"Condensed {decision['input_tokens']} tokens of reference content in {len(chunks)} chunks "
+            f"into a {decision['kept_tokens']} token brief"
+        )
+        return {"reference_brief": brief, "content_budget": [decision]}
+
+    def condense_reference(self, state: BlogState, config: RunnableConfig = None):
+        """Summarize the reference content chunk by chunk in parallel and reduce it into a brief"""
+        chunks = self._condense_chunks(state.input_content)
+
+        def summarize(chunk):
+            return self._generate(
+                self._chunk_summary_messages(state, chunk, len(chunks)), config, None, "summarize_source_chunk"
+            )
+
+        with ThreadPoolExecutor(max_workers=self.condense_params.get("max_concurrency", 4)) as pool:
+            # Each task runs in a copy of this context so LLM usage is tracked for the generation
+            futures = [pool.submit(contextvars.copy_context().run, summarize, chunk) for chunk in chunks]
+            summaries = [future.result() for future in futures]
+        brief = self._generate(self._brief_messages(state, chunks, summaries), config, None, "reduce_source_brief")
+        return self._condensed(chunks, brief)
+
+    async def acondense_reference(self, state: BlogState, config: RunnableConfig = None):
+        """Summarize the reference content chunk by chunk in parallel and reduce it into a brief (async)"""
+        chunks = self._condense_chunks(state.input_content)
+        semaphore = asyncio.Semaphore(self.condense_params.get("max_concurrency", 4))
+
+        async def summarize(chunk):
+            async with semaphore:
+                return await self._agenerate(
+                    self._chunk_summary_messages(state, chunk, len(chunks)), config, None, "summarize_source_chunk"
+                )
+
+        summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+        brief = await self._agenerate(
+            self._brief_messages(state, chunks, summaries), config, None, "reduce_source_brief"
         )
+        return self._condensed(chunks, brief)
 
+    def _blog_plan_messages(self, state: BlogState, reference_content):
+        """Build the planner prompt"""
+        params = self._get_template_params(state)
+        system_instructions_sections = blog_planner_instructions.format(
+            user_instructions=reference_content, blog_structure=default_blog_structure, **params
+        )
+        return [
+            SystemMessage(content=system_instructions_sections),
+            HumanMessage(
+                content="Generate the sections of the blog. Your response must include a 'sections' field containing a list of sections. Each section must have: name, description, and content fields."
+            ),
+        ]
+
+    def _parse_blog_plan(self, report_sections):
+        """Parse the planner response into Section objects"""
         pattern = r"```json\n([\s\S]*?)\n```"
         match = re.search(pattern, report_sections)
 
@@ -156,59 +403,122 @@ class AgentWorkflow:
             parsed = {"sections": []}
 
         # Convert dict items into actual Section objects
-        sections = [Section(**sec) for sec in parsed.get("sections", [])]
+        sections = [Section(**sec) for sec in (parsed or {}).get("sections", [])]
 
         return {"sections": sections}
 
-    def write_section(self, state: SectionState):
-        """Write a section of the report"""
+    def generate_blog_plan(self, state: BlogState, config: RunnableConfig = None):
+        """Generate the report plan"""
+        reference_content, budget = self._fit_reference("generate_blog_plan", state.input_content)
+        messages = self._blog_plan_messages(state, reference_content)
+        key, report_sections = self._memo_lookup("generate_blog_plan", messages, config)
+        if report_sections is not None:
+            return {**self._parse_blog_plan(report_sections), "content_budget": budget}
+        report_sections = self._invoke("generate_blog_plan", messages, config)
+        return {**self._memoize_plan(key, report_sections), "content_budget": budget}
+
+    async def agenerate_blog_plan(self, state: BlogState, config: RunnableConfig = None):
+        """Generate the report plan (async)"""
+        reference_content, budget = self._fit_reference("generate_blog_plan", state.input_content)
+        messages = self._blog_plan_messages(state, reference_content)
+        key, report_sections = self._memo_lookup("generate_blog_plan", messages, config)
+        if report_sections is not None:
+            return {**self._parse_blog_plan(report_sections), "content_budget": budget}
+        report_sections = await self._ainvoke("generate_blog_plan", messages, config)
+        return {**self._memoize_plan(key, report_sections), "content_budget": budget}
+
+    def _memoize_plan(self, key, report_sections):
+        """Parse a fresh plan, caching the response only if it produced sections"""
+        plan = self._parse_blog_plan(report_sections)
+        if plan["sections"]:
+            self._memo_store(key, report_sections)
+        return plan
+
+    def _section_messages(self, state: SectionState, reference_content):
+        """Build the main body section writer prompt"""
         section = state.section
-        reference_link = state.input_url
-        user_instructions = state.input_content
-        media_markdown = state.media_markdown
-        url_source_str = reference_link
-
         params = self._get_template_params(state)
         system_instructions = main_body_section_writer_instructions.format(
-            section_name=section.name,
-            section_topic=section.description,
-            user_instructions=user_instructions,
-            source_urls=url_source_str,
-            media_markdown=media_markdown,
+            user_instructions=reference_content,
+            source_urls=state.input_url,
+            media_markdown=state.media_markdown,
             **params
         )
+        return [
+            SystemMessage(content=system_instructions, cache=True),
+            HumanMessage(
+                content=main_body_section_request.format(section_name=section.name, section_topic=section.description)
+            ),
+        ]
 
-        section_content = self.llm.invoke(
-            [
-                SystemMessage(content=system_instructions),
-                HumanMessage(
-                    content="Generate a blog section based on the provided information."
-                ),
-            ]
+    def write_section(self, state: SectionState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write a section of the report"""
+        section = state.section
+        reference_content, budget = self._section_reference(state)
+        section.content = self._generate(
+            self._section_messages(state, reference_content), config, writer, "write_section", section.name,
+            length=self._length(state),
         )
+        return {"completed_sections": [section], "content_budget": budget}
 
-        section.content = section_content
-        return {"completed_sections": [section]}
-
-    def write_final_sections(self, state: SectionState):
-        """Write final sections of the report, which do not require web search and use the completed sections as context"""
+    async def awrite_section(self, state: SectionState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write a section of the report (async)"""
         section = state.section
+        reference_content, budget = self._section_reference(state)
+        section.content = await self._agenerate(
+            self._section_messages(state, reference_content), config, writer, "write_section", section.name,
+            length=self._length(state),
+        )
+        return {"completed_sections": [section], "content_budget": budget}
 
+    def _section_reference(self, state: SectionState):
+        """Reference content for one section.
+
+        With prompt caching every section gets the same content so the prompt prefix is
+        shared; otherwise over-budget content is prioritized for the section.
+        """
+        focus = None
+        if self._llm_for("write_section")[0].prompt_caching == "off":
+            focus = f"{state.section.name}: {state.section.description}"
+        reference_content, budget = self._fit_reference(
+            "write_section", state.reference_brief or state.input_content, focus=focus
+        )
+        for decision in budget:
+            decision["section"] = state.section.name
+        return reference_content, budget
+
+    def _final_section_messages(self, state: SectionState):
+        """Build the introduction/conclusion writer prompt"""
+        section = state.section
         params = self._get_template_params(state)
         system_instructions = intro_conclusion_instructions.format(
-            section_name=section.name,
-            section_topic=section.description,
             main_body_sections=state.blog_main_body_sections,
             source_urls=state.urls,
             **params
         )
+        return [
+            SystemMessage(content=system_instructions, cache=True),
+            HumanMessage(
+                content=intro_conclusion_request.format(section_name=section.name, section_topic=section.description)
+            ),
+        ]
 
-        section_content = self.llm.invoke([
-            SystemMessage(content=system_instructions),
-            HumanMessage(content="Generate an intro/conclusion section based on the provided main body sections.")
-        ])
-        section.content = section_content
+    def write_final_sections(self, state: SectionState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write final sections of the report, which do not require web search and use the completed sections as context"""
+        section = state.section
+        section.content = self._generate(
+            self._final_section_messages(state), config, writer, "write_final_sections", section.name,
+            length=self._length(state),
+        )
+        return {"completed_sections": [section]}
 
+    async def awrite_final_sections(self, state: SectionState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write final sections of the report (async)"""
+        section = state.section
+        section.content = await self._agenerate(
+            self._final_section_messages(state), config, writer, "write_final_sections", section.name,
+            length=self._length(state),
+        )
         return {"completed_sections": [section]}
 
     def initiate_section_writing(self, state: BlogState):
@@ -220,6 +530,7 @@ class AgentWorkflow:
                     section=s,
                     input_url=state.input_url,
                     input_content=state.input_content,
+                    reference_brief=state.reference_brief,
                     media_markdown=state.media_markdown,
                     urls=[state.input_url],
                     completed_sections=[],  # Initialize with empty list
@@ -255,68 +566,118 @@ class AgentWorkflow:
             if not s.main_body
         ]
 
+    def _latest_sections(self, state: BlogState):
+        """Planned sections with their most recently written content.
+
+        completed_sections is append-only, so a section revised after feedback
+        appears again later in the list and its newest content wins.
+        """
+        latest = {s.name: s.content for s in state.completed_sections}
+        return [dataclasses.replace(s, content=latest.get(s.name, s.content)) for s in state.sections]
+
     def compile_final_blog(self, state: BlogState):
         """Compile the final blog"""
-        sections = state.sections
-        completed_sections = {s.name: s.content for s in sections}
-
-        for section in sections:
-            section.content = completed_sections[section.name]
+        sections = self._latest_sections(state)
 
         all_sections = "\n\n".join([s.content for s in sections])
         #ToDO: Add title to the final blog
         blog_title_matches = re.findall(r"^#{1,3}\s+(.*)$", all_sections, re.MULTILINE)
         blog_title = blog_title_matches[0] if blog_title_matches else ""
-        return {"final_blog": all_sections, "blog_title": blog_title}
+        result = {"final_blog": all_sections, "blog_title": blog_title}
+        if state.feedback_sections:
+            # Recompiled after section-scoped feedback
+            result.update({"feedback": None, "feedback_sections": None, "feedback_applied": True})
+        return result
     
-    def review_blog(self, state: BlogState):
-        """Review the final blog"""
-        final_blog = state.final_blog
+    def _review_messages(self, state: BlogState):
+        """Build the blog reviewer prompt"""
         params = self._get_template_params(state)
-        review_prompt = blog_reviewer_instructions.format(blog_input=final_blog,**params)
-
-        review = self.llm.invoke([
-            HumanMessage(content=review_prompt)
-        ])
+        review_prompt = blog_reviewer_instructions.format(blog_input=state.final_blog, **params)
+        return [HumanMessage(content=review_prompt)]
 
-        # filter using re inside <final_review> </final_review>
+    def _parse_review(self, review):
+        """Extract the reviewed blog from <final_review> tags"""
         pattern = r"<final_review>(.*?)</final_review>"
         match = re.search(pattern, review, re.DOTALL)
         if match:
             review = match.group(1).strip()
         else:
             review = review.strip()
-        
+
         return {"reviewed_blog": review}
 
-    def write_twitter_post(self, state: BlogState):
-        """Write the Twitter post"""
-        final_blog = state.final_blog
-        twitter_post = self.llm.invoke([
-            SystemMessage(content=twitter_post_instructions.format(final_blog=final_blog)),
+    def review_blog(self, state: BlogState, config: RunnableConfig = None):
+        """Review the final blog"""
+        return self._parse_review(self._invoke("review_blog", self._review_messages(state), config))
+
+    async def areview_blog(self, state: BlogState, config: RunnableConfig = None):
+        """Review the final blog (async)"""
+        return self._parse_review(await self._ainvoke("review_blog", self._review_messages(state), config))
+
+    def _twitter_post_messages(self, state: BlogState):
+        """Build the Twitter post prompt"""
+        return [
+            SystemMessage(content=twitter_post_instructions.format(final_blog=state.final_blog)),
             HumanMessage(content="Generate a Twitter post based on the provided article")
-        ])
-        return {"twitter_post": twitter_post}
+        ]
 
-    def write_linkedin_post(self, state: BlogState):
-        """Write the LinkedIn post"""
-        final_blog = state.final_blog
-        linkedin_post = self.llm.invoke([
-            SystemMessage(content=linkedin_post_instructions.format(final_blog=final_blog)),
+    def write_twitter_post(self, state: BlogState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write the Twitter post"""
+        return {"twitter_post": self._generate(
+            self._twitter_post_messages(state), config, writer, "write_twitter_post"
+        )}
+
+    async def awrite_twitter_post(self, state: BlogState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write the Twitter post (async)"""
+        return {"twitter_post": await self._agenerate(
+            self._twitter_post_messages(state), config, writer, "write_twitter_post"
+        )}
+
+    def _linkedin_post_messages(self, state: BlogState):
+        """Build the LinkedIn post prompt"""
+        return [
+            SystemMessage(content=linkedin_post_instructions.format(final_blog=state.final_blog)),
             HumanMessage(content="Generate a LinkedIn post based on the provided article")
-        ])
-        return {"linkedin_post": linkedin_post}
-
-    def generate_tags(self, state: BlogState):
-        """Generate tags for the blog"""
-        linkedin_post = state.final_blog
+        ]
 
-        # Cleaner version
-        result = self.llm.invoke([
-            SystemMessage(content=tags_generator.format(linkedin_post=linkedin_post)),
+    def write_linkedin_post(self, state: BlogState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write the LinkedIn post"""
+        return {"linkedin_post": self._generate(
+            self._linkedin_post_messages(state), config, writer, "write_linkedin_post"
+        )}
+
+    async def awrite_linkedin_post(self, state: BlogState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Write the LinkedIn post (async)"""
+        return {"linkedin_post": await self._agenerate(
+            self._linkedin_post_messages(state), config, writer, "write_linkedin_post"
+        )}
+
+    def _tags_messages(self, state: BlogState):
+        """Build the tag generation prompt"""
+        return [
+            SystemMessage(content=tags_generator.format(linkedin_post=state.final_blog)),
             HumanMessage(content="Generate tags for the blog.")
-        ])
+        ]
 
+    def generate_tags(self, state: BlogState, config: RunnableConfig = None):
+        """Generate tags for the blog"""
+        if self.tagger.method == "keyphrase":
+            return {"tags": self.tagger.extract(state.final_blog)}
+        return self._parse_tags(self._invoke("generate_tags", self._tags_messages(state), config))
+
+    async def agenerate_tags(self, state: BlogState, config: RunnableConfig = None):
+        """Generate tags for the blog (async)"""
+        if self.tagger.method == "keyphrase":
+            # The list of tags in use is refreshed from the database now and then
+            return {"tags": await asyncio.to_thread(self.tagger.extract, state.final_blog)}
+        return self._parse_tags(await self._ainvoke("generate_tags", self._tags_messages(state), config))
+
+    def _known_tag_names(self, limit):
+        """Names of the most used tags, which extracted tags converge on"""
+        return [tag.name for tag, _ in self.tag_repo.get_popular_tags(limit=limit)]
+
+    def _parse_tags(self, result):
+        """Parse the list inside <tags> from the LLM response"""
         tags_match = re.findall(r"<tags>(.*?)</tags>", result, re.DOTALL)
         if tags_match:
             tags_string = tags_match[0].strip()
@@ -330,20 +691,18 @@ class AgentWorkflow:
             tags = []
         return {"tags": tags}
 
-    def handle_feedback(self, state: BlogState):
-        """Process feedback and regenerate content"""
-        if not state.feedback:
-            return state
-
-        # Determine which content to modify based on post_types
+    def _feedback_target(self, state: BlogState):
+        """Return the content the feedback applies to, based on post_types"""
         if "blog" in state.post_types:
-            content = state.final_blog
+            return state.final_blog
         elif "twitter" in state.post_types:
-            content = state.twitter_post
+            return state.twitter_post
         elif "linkedin" in state.post_types:
-            content = state.linkedin_post
-        else:
-            return state
+            return state.linkedin_post
+        return None
+
+    def _feedback_messages(self, state: BlogState, content):
+        """Build the feedback rewrite prompt"""
 
         # System prompt for modifying content based on feedback
         system_prompt = f"""You are an AI assistant helping to modify content based on user feedback.
@@ -358,15 +717,101 @@ class AgentWorkflow:
         Stricly return only the modified content in markdown format and do not include any additional text including introductory phrases like conversation starters e.g. Do not include 'Here's is the modified content etc.'.
         """
 
-        # Invoke the LLM to modify the content
-        modified_content = self.llm.invoke(
-            [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content="Modify the content based on the feedback"),
-            ]
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content="Modify the content based on the feedback"),
+        ]
+
+    def _feedback_candidate_sections(self, state: BlogState):
+        """Sections that section-scoped feedback can revise, or None to rewrite the whole content.
+
+        Only applies to blogs whose final_blog is still exactly the compiled sections
+        (a previous full rewrite leaves them out of sync).
+        """
+        if state.feedback_scope == "full" or "blog" not in state.post_types:
+            return None
+        sections = self._latest_sections(state)
+        if len(sections) < 2 or any(s.content is None for s in sections):
+            return None
+        if "\n\n".join(s.content for s in sections) != state.final_blog:
+            return None
+        return sections
+
+    def _feedback_mapper_messages(self, state: BlogState, sections):
+        """Build the prompt mapping feedback to section numbers"""
+        params = self._get_template_params(state)
+        outline = "\n".join(
+            f"{idx}. {s.name}: {s.description}\n   Begins: {s.content[:200].strip()}"
+            for idx, s in enumerate(sections, 1)
         )
+        return [
+            SystemMessage(content=feedback_section_mapper.format(
+                sections=outline, feedback=state.feedback, **params
+            )),
+            HumanMessage(content="Identify the sections the feedback applies to"),
+        ]
+
+    def _parse_feedback_sections(self, result, sections):
+        """Return the names of the targeted sections, or None when the whole post should change"""
+        match = re.search(r"<sections>(.*?)</sections>", result, re.DOTALL)
+        if not match or "all" in match.group(1).lower():
+            return None
+        names = []
+        for number in re.findall(r"\d+", match.group(1)):
+            idx = int(number) - 1
+            if 0 <= idx < len(sections) and sections[idx].name not in names:
+                names.append(sections[idx].name)
+        # A rewrite touching every section is cheaper as one full-length call
+        if not names or len(names) == len(sections):
+            return None
+        return names
+
+    def handle_feedback(self, state: BlogState, config: RunnableConfig = None):
+        """Process feedback and regenerate content.
+
+        Blog feedback is first mapped to the sections it concerns; those are revised in
+        parallel by revise_section. Otherwise the whole content is rewritten at once.
+        """
+        if not state.feedback:
+            return state
 
-        # Update the state with the modified content
+        sections = self._feedback_candidate_sections(state)
+        if sections:
+            targets = self._parse_feedback_sections(
+                self._invoke("feedback_mapper", self._feedback_mapper_messages(state, sections), config), sections
+            )
+            if targets:
+                return {"feedback_sections": targets}
+
+        content = self._feedback_target(state)
+        if content is None:
+            return state
+
+        modified_content = self._invoke("handle_feedback", self._feedback_messages(state, content), config)
+        return self._apply_feedback(state, modified_content)
+
+    async def ahandle_feedback(self, state: BlogState, config: RunnableConfig = None):
+        """Process feedback and regenerate content (async)"""
+        if not state.feedback:
+            return state
+
+        sections = self._feedback_candidate_sections(state)
+        if sections:
+            targets = self._parse_feedback_sections(
+                await self._ainvoke("feedback_mapper", self._feedback_mapper_messages(state, sections), config), sections
+            )
+            if targets:
+                return {"feedback_sections": targets}
+
+        content = self._feedback_target(state)
+        if content is None:
+            return state
+
+        modified_content = await self._ainvoke("handle_feedback", self._feedback_messages(state, content), config)
+        return self._apply_feedback(state, modified_content)
+
+    def _apply_feedback(self, state: BlogState, modified_content):
+        """Write the modified content back to the field matching post_types"""
         if "blog" in state.post_types:
             return {
                 "final_blog": modified_content,
@@ -388,6 +833,52 @@ class AgentWorkflow:
         else:
             return state
 
+    def route_feedback(self, state: BlogState):
+        """Fan out to revise_section for section-scoped feedback, otherwise continue as after any node"""
+        if not state.feedback_sections:
+            return self.route_derivatives(state)
+        return [
+            Send(
+                "revise_section",
+                SectionState(section=s, feedback=state.feedback, template=state.template),
+            )
+            for s in self._latest_sections(state)
+            if s.name in state.feedback_sections
+        ]
+
+    def _revise_section_messages(self, state: SectionState):
+        """Build the section revision prompt"""
+        section = state.section
+        params = self._get_template_params(state)
+        system_instructions = section_feedback_instructions.format(
+            section_name=section.name,
+            section_content=section.content,
+            feedback=state.feedback,
+            **params
+        )
+        return [
+            SystemMessage(content=system_instructions),
+            HumanMessage(content="Revise the section based on the feedback"),
+        ]
+
+    def revise_section(self, state: SectionState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Rewrite a single section to address feedback"""
+        section = state.section
+        section.content = self._generate(
+            self._revise_section_messages(state), config, writer, "revise_section", section.name,
+            length=self._length(state),
+        )
+        return {"completed_sections": [section]}
+
+    async def arevise_section(self, state: SectionState, config: RunnableConfig = None, writer: StreamWriter = None):
+        """Rewrite a single section to address feedback (async)"""
+        section = state.section
+        section.content = await self._agenerate(
+            self._revise_section_messages(state), config, writer, "revise_section", section.name,
+            length=self._length(state),
+        )
+        return {"completed_sections": [section]}
+
 #-------------Agent helpers----------------
 
     def fetch_urls_and_media(self, tweet_id):
@@ -446,7 +937,8 @@ class AgentWorkflow:
 
         research_prompt = summary_instructions.format(source_urls="\n".join(urls), topic=search_query)
         
-        llm_response= self.llm.invoke(
+        llm_response= self._invoke(
+            "summarize_websearch_results",
             [
                 HumanMessage(content=research_prompt)
             ]
@@ -454,6 +946,17 @@ class AgentWorkflow:
         
         return llm_response    
     
+    def _select_search_results(self, search, query):
+        """URLs of the search results worth converting: ranked locally (relevance.method bm25),
+        or selected by the LLM when configured or when no result matches the query's terms"""
+        if self.relevance.method == "bm25":
+            urls = self.relevance.rank(query, search.get_results())
+            if urls:
+                metrics.increment("relevance.ranked")
+                return urls
+            metrics.increment("relevance.llm_fallback")
+        return self._relevant_search_selection(search.get_all_urls(), query)
+
     def _relevant_search_selection(self, urls,query):
         """Select relevant search results"""
 
@@ -466,7 +969,8 @@ class AgentWorkflow:
 
         relevance_prompt = relevant_search_prompt.format(search_results="\n".join(urls),user_query=query)
         
-        llm_response= self.llm.invoke(
+        llm_response= self._invoke(
+            "relevant_search_selection",
             [
                 HumanMessage(content=relevance_prompt)
             ]
@@ -508,7 +1012,8 @@ class AgentWorkflow:
 
         relevance_prompt = relevant_reddit_prompt.format(reddit_content=pre_relevance_prompt,topic=topic)
         
-        llm_response= self.llm.invoke(
+        llm_response= self._invoke(
+            "relevant_reddit_post_selection",
             [
                 HumanMessage(content=relevance_prompt)
             ]
@@ -568,27 +1073,23 @@ class AgentWorkflow:
     
     def _handle_topic_workflow(self, payload, thread_id, user):
         """Handle workflow for URL-based content"""
-        reference_content = ''
         query=self._query_rewriter(payload['topic'],type='topic')
-        urls=self.websearcher.search(query).get_all_urls()
-        urls=self._relevant_search_selection(urls,query)
+        # Image search only needs the query, so it runs while the web results are selected and converted
+        images = self.research.start(self.imagesearch.search, query)
+        urls=self._select_search_results(self.websearcher.search(query), query)
 
         source_id,url_meta = self._setup_topic_source(payload,urls ,thread_id, user)
-        image_urls=self.imagesearch.search(query)
-        media_meta=[{"type":"image","original_url":url['imageUrl']} for url in image_urls.results]
-        
+        contents = self.research.map(self._process_url_content, url_meta, label=lambda meta: meta['original_url'])
+        sources = []
+        for meta, content in zip(url_meta, contents):
+            if content is not None:
+                sources.append(format_reference_source(len(sources) + 1, meta['original_url'], content))
+        reference_content = ''.join(sources)
+
+        image_urls = self.research.result(images, f"Image search for {query!r}")
+        media_meta=[{"type":"image","original_url":url['imageUrl']} for url in image_urls.results] if image_urls else []
         self._handle_media_storage(source_id, media_meta)
 
-        # reference_content=self._summarize_websearch_results(urls, query)
-        for meta in url_meta:
-            try:
-                # url_meta = get_url_metadata(url)
-                content = self._process_url_content(meta)
-                reference_content += f"# Source 1: \n **Source URL:* {meta['original_url']} \n **Raw Content**:\n {content} \n\n"
-            except Exception as e:
-                logger.warning(f"Failed to process URL {meta['original_url']}: {str(e)}")
-                continue
-        
         # Format URLs as a numbered list for better readability
         formatted_urls = "\n".join(f"{i+1}. {url}" for i, url in enumerate(urls))
         
@@ -603,17 +1104,15 @@ class AgentWorkflow:
     
     def _handle_reddit_workflow(self, payload, thread_id, user):
         """Handle workflow for reddit-based content"""
-        reference_content = ''
         query=self._query_rewriter(payload['reddit_query'],type='reddit')
-        urls=self.websearcher.search(query).get_all_urls()
-        urls=self._relevant_search_selection(urls,query)
+        images = self.research.start(self.imagesearch.search, query)
+        urls=self._select_search_results(self.websearcher.search(query), query)
 
         # if payload.get("subreddit"):
         #     reddit_obj=self.reddit_searcher.search(payload['reddit_query'],subreddit=payload.get("subreddit"))
         # else:
-        reddit_obj=[]
-        for url in urls:
-            reddit_obj.append(self.reddit_searcher.search(url)[0])
+        posts = self.research.map(lambda url: self.reddit_searcher.search(url)[0], urls)
+        reddit_obj = [post for post in posts if post is not None]
 
         # urls=self._relevant_reddit_post_selection(reddit_obj,payload['reddit_query'])
 
@@ -625,8 +1124,8 @@ class AgentWorkflow:
 
         source_id = self._setup_reddit_source(payload ,thread_id, user)
 
-        image_urls=self.imagesearch.search(query)
-        media_meta=[{"type":"image","original_url":url['imageUrl']} for url in image_urls.results['images']]
+        image_urls = self.research.result(images, f"Image search for {query!r}")
+        media_meta=[{"type":"image","original_url":url['imageUrl']} for url in image_urls.results['images']] if image_urls else []
         self._handle_media_storage(source_id, media_meta)
         
         return BlogStateInput(
@@ -649,7 +1148,8 @@ class AgentWorkflow:
         else:
             rewriter_instructions = query_creator.format(user_query_short=query)
         
-        llm_response= self.llm.invoke(
+        llm_response= self._invoke(
+            "query_rewriter",
             [
                 HumanMessage(content=rewriter_instructions)
             ]
@@ -664,27 +1164,25 @@ class AgentWorkflow:
     def _handle_tweet_workflow(self, payload, thread_id, user):
         """Handle workflow for tweet-based content"""
         source_id, url_meta, media_meta,tweet_text = self._setup_tweet_source(payload, thread_id, user)
-        reference_content, reference_link = get_tweet_reference_content(url_meta)
+        reference_content, reference_link = get_tweet_reference_content(
+            url_meta, map_urls=lambda fn, urls: self.research.map(fn, urls, label=lambda url: url["url"])
+        )
         media_markdown = get_tweet_media(media_meta)
 
         if not url_meta:
-            reference_content = ''            
             query=self._query_rewriter(tweet_text,type='tweet')
             # first call llm to rewrite teweet text for searchable queries
             # second call the tool to research content based on the rewritten tweet text
-            urls=self.websearcher.search(query).get_all_urls()
-            urls=self._relevant_search_selection(urls,query)
+            urls=self._select_search_results(self.websearcher.search(query), query)
 
-            for url in urls:
-                try:
-                    url_meta = get_url_metadata(url)
-                    content = self._process_url_content(url_meta)
-                    reference_content += f"For Source URL: {url}, below is the content \n {content} \n\n"
-                except Exception as e:
-                    logger.warning(f"Failed to process URL {url}: {str(e)}")
-                    continue
+            contents = self.research.map(lambda url: self._process_url_content(get_url_metadata(url)), urls)
+            sources = []
+            for url, content in zip(urls, contents):
+                if content is not None:
+                    sources.append(format_reference_source(len(sources) + 1, url, content))
             # select appropriate urls from the research results
             # reference_content=''.join([f"URL: {url} \n {self.generic_converter.convert(url)} \n\n" for url in urls ])
+            reference_content = ''.join(sources)
             # use markdownit to convert the urls to markdown
 
             return BlogStateInput(
@@ -706,13 +1204,143 @@ class AgentWorkflow:
             template=self.get_template_details(payload)
         ), source_id
 
+    def _prepare_input(self, payload, thread_id, user):
+        """Collect source content for a new generation and build the graph input.
+
+        The assembled reference content is capped at the "input" token budget so it
+        always fits the model's context window (and the checkpoint stays bounded).
+        """
+        with node_span("prepare_input"):
+            test_input, source_id = self._collect_input(payload, thread_id, user)
+            test_input.input_content, test_input.content_budget = self._fit_reference(
+                "input", test_input.input_content
+            )
+        return test_input, source_id
+
+    def _collect_input(self, payload, thread_id, user):
+        """Dispatch to the source-specific input handler"""
+        if payload.get("url"):
+            logger.debug(f"Processing URL: {payload['url']}")
+            return self._handle_url_workflow(payload, thread_id, user)
+        elif payload.get("tweet_id"):
+            logger.debug(f"Processing tweet: {payload['tweet_id']}")
+            return self._handle_tweet_workflow(payload, thread_id, user)
+        elif payload.get("topic"):
+            logger.debug(f"Processing topic: {payload['topic']}")
+            return self._handle_topic_workflow(payload, thread_id, user)
+        elif payload.get("reddit_query"):
+            logger.debug(f"Processing reddit query: {payload['reddit_query']}")
+            return self._handle_reddit_workflow(payload, thread_id, user)
+        else:
+            logger.error("Invalid payload - missing required fields")
+            raise ValueError("Invalid payload - must contain url, tweet_id or feedback")
+
+    @staticmethod
+    def _run_config(thread_id, payload, **configurable):
+        """Graph config for a run of this thread; payload use_cache=False bypasses the stage cache"""
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "use_cache": payload.get("use_cache", True) is not False,
+                **configurable,
+            }
+        }
+
+    @staticmethod
+    def _report_usage(thread_id, usage):
+        """Log the generation's input tokens and how many were served from the prompt cache"""
+        logger.info(
+            f"Generation {thread_id}: {usage.calls} LLM calls, {usage.prompt_tokens} input tokens, "
+            f"{usage.cached_tokens} from the prompt cache ({usage.cached_ratio:.0%}), "
+            f"{usage.completion_tokens} output tokens"
+        )
+
+    @staticmethod
+    def _ledger_operation(payload):
+        """What a run does, as recorded in the ledger"""
+        if payload.get("thread_id"):
+            return "feedback" if payload.get("feedback") else "social_posts"
+        return "generate"
+
+    @contextmanager
+    def _ledger(self, thread_id, payload, user):
+        """Record the run's node durations and LLM calls, and store them when it ends"""
+        ledger = GenerationLedger(thread_id, getattr(user, "profile_id", None), self._ledger_operation(payload))
+        try:
+            with ledger.recording():
+                yield ledger
+        finally:
+            self._store_ledger(ledger)
+
+    @asynccontextmanager
+    async def _aledger(self, thread_id, payload, user):
+        """Async counterpart of _ledger"""
+        ledger = GenerationLedger(thread_id, getattr(user, "profile_id", None), self._ledger_operation(payload))
+        try:
+            with ledger.recording():
+                yield ledger
+        finally:
+            await asyncio.to_thread(self._store_ledger, ledger)
+
+    def _store_ledger(self, ledger):
+        """Store a run's ledger; runs without a profile (scripts, benchmarks) are not stored.
+        A failure is logged and never fails the generation."""
+        if ledger.profile_id is None or not get_settings().ledger_enabled:
+            return
+        try:
+            self.ledger_repo.record(ledger)
+        except Exception as e:
+            logger.warning(f"Failed to store the ledger of thread {ledger.thread_id}: {e}")
+
     def _generate_new_content(self, test_input, thread_id, source_id, payload, user):
         """Generate new content using graph workflow"""
-        config = {"configurable": {"thread_id": thread_id}}
-        result = self.graph.invoke(test_input, config=config)
+        config = self._run_config(thread_id, payload)
+        with track_usage() as usage:
+            result = self.graph.invoke(test_input, config=config)
+        self._report_usage(thread_id, usage)
         self._store_new_content(result, thread_id, source_id, payload, user)
         return result   
 
+    async def _agenerate_new_content(self, test_input, thread_id, source_id, payload, user):
+        """Generate new content using the async graph"""
+        graph = await self._get_async_graph()
+        config = self._run_config(thread_id, payload)
+        with track_usage() as usage:
+            result = await graph.ainvoke(test_input, config=config)
+        self._report_usage(thread_id, usage)
+        await asyncio.to_thread(self._store_new_content, result, thread_id, source_id, payload, user)
+        return result
+
+    # A generation job that stored its content but stopped before completing (e.g. its
+    # worker died) is retried on the same thread. Its source already has content, so
+    # generating again would fail; the stored generation is returned instead.
+
+    @staticmethod
+    def _output_values(values):
+        """BlogStateOutput fields of the thread's checkpointed state"""
+        return {f.name: values[f.name] for f in dataclasses.fields(BlogStateOutput) if f.name in values}
+
+    def _stored_generation(self, thread_id):
+        """Output of this thread's generation if its content is already stored, else None"""
+        if not self.content_repo.exists("thread_id", thread_id):
+            return None
+        logger.info(f"Content of thread {thread_id} is already stored; returning it")
+        return self._output_values(self.graph.get_state(self._run_config(thread_id, {})).values)
+
+    async def _astored_generation(self, thread_id):
+        """Async counterpart of _stored_generation"""
+        if not await asyncio.to_thread(self.content_repo.exists, "thread_id", thread_id):
+            return None
+        logger.info(f"Content of thread {thread_id} is already stored; returning it")
+        graph = await self._get_async_graph()
+        return self._output_values((await graph.aget_state(self._run_config(thread_id, {}))).values)
+
+    async def _get_async_graph(self):
+        """Return the graph compiled for async execution, setting it up on first use"""
+        if self.async_graph is None:
+            await self.asetup()
+        return self.async_graph
+
     def run_generic_workflow(self, payload, thread_id,user):
         """Universal handler for all workflow types with database integration"""
         logger.info(f"Starting generic workflow with payload type: {type(payload).__name__}")
@@ -720,38 +1348,57 @@ class AgentWorkflow:
             thread_id, source_id, url_meta, media_meta = self._initialize_workflow(payload,thread_id)
             logger.debug(f"Initialized workflow: thread_id={thread_id}, source_id={source_id}")
 
-            # Handle existing thread with no feedback
-            if payload.get("thread_id") and not payload.get("feedback"):
-                logger.info("Handling existing thread without feedback")
-                return BlogStateOutput(**self._handle_social_post_generation(thread_id, payload, user))
-            
-            # Handle feedback
-            elif payload.get("feedback") and payload.get("thread_id"):
-                logger.info(f"Handling feedback for thread {thread_id}")
-                return BlogStateOutput(**self._handle_feedback(thread_id, payload,user))
-            
-            # Handle new content generation
-            else:
-                logger.info("Handling new content generation")
-                if payload.get("url"):
-                    logger.debug(f"Processing URL: {payload['url']}")
-                    test_input, source_id = self._handle_url_workflow(payload, thread_id, user)
-                elif payload.get("tweet_id"):
-                    logger.debug(f"Processing tweet: {payload['tweet_id']}")
-                    test_input, source_id = self._handle_tweet_workflow(payload, thread_id, user)
-                elif payload.get("topic"):
-                    logger.debug(f"Processing topic: {payload['topic']}")
-                    test_input, source_id = self._handle_topic_workflow(payload, thread_id, user)
-                elif payload.get("reddit_query"):
-                    logger.debug(f"Processing reddit query: {payload['reddit_query']}")
-                    test_input, source_id = self._handle_reddit_workflow(payload, thread_id, user)
+            with self._ledger(thread_id, payload, user):
+                # Handle existing thread with no feedback
+                if payload.get("thread_id") and not payload.get("feedback"):
+                    logger.info("Handling existing thread without feedback")
+                    return BlogStateOutput(**self._handle_social_post_generation(thread_id, payload, user))
+
+                # Handle feedback
+                elif payload.get("feedback") and payload.get("thread_id"):
+                    logger.info(f"Handling feedback for thread {thread_id}")
+                    return BlogStateOutput(**self._handle_feedback(thread_id, payload,user))
+
+                # Handle new content generation
                 else:
-                    logger.error("Invalid payload - missing required fields")
-                    raise ValueError("Invalid payload - must contain url, tweet_id or feedback")
+                    stored = self._stored_generation(thread_id)
+                    if stored is not None:
+                        return BlogStateOutput(**stored)
+                    logger.info("Handling new content generation")
+                    test_input, source_id = self._prepare_input(payload, thread_id, user)
+                    result = self._generate_new_content(test_input, thread_id, source_id, payload, user)
+                    logger.info("Content generation completed successfully")
+                    return BlogStateOutput(**result)
 
-                result = self._generate_new_content(test_input, thread_id, source_id, payload, user)
-                logger.info("Content generation completed successfully")
-                return BlogStateOutput(**result)
+        except Exception as e:
+            logger.error(f"Error in workflow: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def arun_generic_workflow(self, payload, thread_id, user):
+        """Async counterpart of run_generic_workflow; LLM calls are awaited and blocking
+        source collection and database work run in worker threads"""
+        logger.info(f"Starting async generic workflow with payload type: {type(payload).__name__}")
+        try:
+            thread_id, source_id, url_meta, media_meta = self._initialize_workflow(payload, thread_id)
+
+            async with self._aledger(thread_id, payload, user):
+                if payload.get("thread_id") and not payload.get("feedback"):
+                    logger.info("Handling existing thread without feedback")
+                    return BlogStateOutput(**await self._ahandle_social_post_generation(thread_id, payload, user))
+
+                elif payload.get("feedback") and payload.get("thread_id"):
+                    logger.info(f"Handling feedback for thread {thread_id}")
+                    return BlogStateOutput(**await self._ahandle_feedback(thread_id, payload, user))
+
+                else:
+                    stored = await self._astored_generation(thread_id)
+                    if stored is not None:
+                        return BlogStateOutput(**stored)
+                    logger.info("Handling new content generation")
+                    test_input, source_id = await asyncio.to_thread(self._prepare_input, payload, thread_id, user)
+                    result = await self._agenerate_new_content(test_input, thread_id, source_id, payload, user)
+                    logger.info("Content generation completed successfully")
+                    return BlogStateOutput(**result)
 
         except Exception as e:
             logger.error(f"Error in workflow: {str(e)}", exc_info=True)
@@ -878,7 +1525,7 @@ class AgentWorkflow:
         if not content:
             raise ValueError("No content found for thread_id")
 
-        config = {"configurable": {"thread_id": thread_id}}
+        config = self._run_config(thread_id, payload)
         self.graph.update_state(
             config,
             values={"post_types": payload.get("post_types", ["twitter", "linkedin"])},
@@ -888,6 +1535,33 @@ class AgentWorkflow:
         self._store_social_content(thread_id, payload, result, user)
         return result
 
+    async def _ahandle_social_post_generation(self, thread_id, payload, user):
+        """Handle generation of social media posts (async)"""
+
+        content = await asyncio.to_thread(self.content_repo.exists, "thread_id", thread_id)
+        if not content:
+            raise ValueError("No content found for thread_id")
+
+        graph = await self._get_async_graph()
+        config = self._run_config(thread_id, payload)
+        await graph.aupdate_state(
+            config,
+            values={"post_types": payload.get("post_types", ["twitter", "linkedin"])},
+        )
+        result = await graph.ainvoke(None, config=config)
+
+        await asyncio.to_thread(self._store_social_content, thread_id, payload, result, user)
+        return result
+
+    def _feedback_values(self, payload):
+        """State update that starts a feedback round"""
+        return {
+            "feedback": payload.get("feedback"),
+            "feedback_scope": payload.get("feedback_scope") or "sections",
+            "post_types": payload.get("post_types", ["blog"]),
+            "feedback_applied": False,
+        }
+
     def _handle_feedback(self, thread_id, payload,user):
         """Handle feedback processing"""
         # Check if content exists for thread_id
@@ -897,14 +1571,10 @@ class AgentWorkflow:
         if not existing_content.data:
             raise ValueError(f"No content found for thread_id: {thread_id}")
 
-        config = {"configurable": {"thread_id": thread_id}}
+        config = self._run_config(thread_id, payload)
         self.graph.update_state(
             config,
-            values={
-                "feedback": payload["feedback"],
-                "post_types": payload.get("post_types", ["blog"]),
-                "feedback_applied": False,
-            },
+            values=self._feedback_values(payload),
         )
         result = self.graph.invoke(None, config)
         self.graph.update_state(config, values={"feedback": None})
@@ -912,6 +1582,25 @@ class AgentWorkflow:
         self._update_content_with_feedback(thread_id, payload, result, user)
         return result
 
+    async def _ahandle_feedback(self, thread_id, payload, user):
+        """Handle feedback processing (async)"""
+        existing_content = await asyncio.to_thread(self.content_repo.find_by_field, "thread_id", thread_id)
+
+        if not existing_content.data:
+            raise ValueError(f"No content found for thread_id: {thread_id}")
+
+        graph = await self._get_async_graph()
+        config = self._run_config(thread_id, payload)
+        await graph.aupdate_state(
+            config,
+            values=self._feedback_values(payload),
+        )
+        result = await graph.ainvoke(None, config)
+        await graph.aupdate_state(config, values={"feedback": None})
+
+        await asyncio.to_thread(self._update_content_with_feedback, thread_id, payload, result, user)
+        return result
+
     def _store_social_content(self, thread_id, payload, result, user):
         """Store generated social media content"""
         for post_type in payload.get("post_types", ["twitter", "linkedin"]):
@@ -947,70 +1636,31 @@ class AgentWorkflow:
                 self.content_repo.update_by_thread(thread_id, user.profile_id, content_data)
 
     def _store_new_content(self, result, thread_id, source_id, payload, user):
-        """Store newly generated content"""
-        try:
-            for post_type in payload.get("post_types", ["blog"]):
-                # Validate post type exists
-
-                content_type_result = self.content_type_repo.find_by_field("name",post_type)
-                
-                if not content_type_result:
-                    logging.error(f"Content type {post_type} not found")
-                    continue
-
-                # Clean and validate content
-                blog_title = result.get("blog_title", "").strip() if post_type == "blog" else None
-                blog_body = result.get("final_blog" if post_type == "blog" else f"{post_type}_post", "")
-                
-                if isinstance(blog_body, str):
-                    blog_body = blog_body.strip()
-
-                content_data = {
-                    "profile_id": user.profile_id,
-                    "content_type_id": content_type_result.content_type_id,
-                    "title": blog_title,
-                    "body": blog_body.strip(),
-                    "status": "Draft",
-                    "thread_id": thread_id,
-                }
-
-                # Insert content with error handling
-                try:
-                    content = self.content_repo.create(content_data)
-                    content_id = content.content_id
-
-                    # Store source reference if provided
-                    if source_id:
-                        self.content_repo.add_content_source(content_id,source_id)
-                        # content_sources repository handles this
-
-                    # Store tags
-                    if result:
-                        self._store_tags(result, content_id)
-
-                except Exception as e:
-                    logging.error(f"Error storing content: {str(e)}")
-                    raise Exception(f"Failed to store content: {str(e)}")
+        """Store newly generated content, its source and tags in a single transaction"""
+        rows = []
+        for post_type in payload.get("post_types", ["blog"]):
+            blog_title = result.get("blog_title", "").strip() if post_type == "blog" else None
+            blog_body = result.get("final_blog" if post_type == "blog" else f"{post_type}_post", "")
+
+            if isinstance(blog_body, str):
+                blog_body = blog_body.strip()
+
+            rows.append({
+                "content_type": post_type,
+                "profile_id": user.profile_id,
+                "title": blog_title,
+                "body": blog_body.strip(),
+                "status": "Draft",
+                "thread_id": thread_id,
+            })
 
+        try:
+            self.content_repo.create_with_associations(
+                rows, source_id=source_id, tag_names=result.get("tags") if result else None
+            )
         except Exception as e:
             logging.error(f"Error in _store_new_content: {str(e)}")
-            raise
-
-    def _store_tags(self, result, content_id):
-        """Store tags for content"""
-        if result.get("tags"):
-            for tag_name in result["tags"]:
-                # Use tag repository to find or create tag
-                tag = self.tag_repo.find_by_field("name", tag_name)
-                if not tag:
-                    tag = self.tag_repo.create({"name": tag_name})
-                
-                # Store content-tag relationship using content_tags repository
-                # content_tag_data = {
-                #     "content_id": content_id,
-                #     "tag_id": tag.tag_id,
-                # }
-                self.content_repo.add_content_tag(content_id,tag.tag_id)
+            raise Exception(f"Failed to store content: {str(e)}")
 
     def _process_url_content(self, url_meta):
         """Helper to process URL content based on type"""
@@ -1042,206 +1692,231 @@ class AgentWorkflow:
         # Generate Twitter post
         return {"tweet_post_generated": True}
 
-    def setup_workflow(self):
+    def route_derivatives(self, state: BlogState):
+        """Fan out to every derivative of the final blog that is still missing.
+
+        LinkedIn, Twitter and tags only depend on final_blog, so the requested ones run
+        as parallel branches and are joined in merge_derivatives.
+        """
+        if state.feedback:
+            return "handle_feedback"
+        branches = []
+        if "linkedin" in state.post_types and not state.linkedin_post:
+            branches.append("write_linkedin_post")
+        if "twitter" in state.post_types and not state.twitter_post:
+            branches.append("write_twitter_post")
+        if state.tags is None:
+            branches.append("generate_tags")
+        return branches or END
+
+    def merge_derivatives(self, state: BlogState):
+        """Join the derivative branches and record which social posts exist"""
+        return {
+            "linkedin_post_generated": bool(state.linkedin_post),
+            "twitter_post_generated": bool(state.twitter_post),
+        }
+
+    def _build_graph(self, asynchronous=False):
+        """Graph builder whose LLM nodes are the sync methods, or their async twins.
+
+        The node functions are registered as they are, so LangGraph injects their
+        `config` and `writer` parameters on either path.
+        """
+        prefix = "a" if asynchronous else ""
+
+        def llm_node(name):
+            return in_node_span(name, getattr(self, f"{prefix}{name}"))
+
+        builder = StateGraph(
+            BlogState,
+            input=BlogStateInput,
+            output=BlogStateOutput
+            # config_schema=configuration.Configuration,
+        )
+
         # Add nodes
-        self.builder.add_node("generate_blog_plan", self.generate_blog_plan)
-        self.builder.add_node("write_section", self.write_section)
-        self.builder.add_node("compile_final_blog", self.compile_final_blog)
-        self.builder.add_node(
-            "gather_completed_sections", self.gather_completed_sections
+        builder.add_node("condense_reference", llm_node("condense_reference"))
+        builder.add_node("generate_blog_plan", llm_node("generate_blog_plan"))
+        builder.add_node("write_section", llm_node("write_section"))
+        builder.add_node("compile_final_blog", in_node_span("compile_final_blog", self.compile_final_blog))
+        builder.add_node(
+            "gather_completed_sections", in_node_span("gather_completed_sections", self.gather_completed_sections)
         )
-        self.builder.add_node("write_final_sections", self.write_final_sections)
-        self.builder.add_node("write_twitter_post", self.write_twitter_post)
-        self.builder.add_node("write_linkedin_post", self.write_linkedin_post)
-        # self.builder.add_node("review_blog", self.review_blog)
-        self.builder.add_node("generate_tags", self.generate_tags)
-        self.builder.add_node("handle_feedback", self.handle_feedback)
+        builder.add_node("write_final_sections", llm_node("write_final_sections"))
+        builder.add_node("write_twitter_post", llm_node("write_twitter_post"))
+        builder.add_node("write_linkedin_post", llm_node("write_linkedin_post"))
+        # builder.add_node("review_blog", llm_node("review_blog"))
+        builder.add_node("generate_tags", llm_node("generate_tags"))
+        builder.add_node("merge_derivatives", in_node_span("merge_derivatives", self.merge_derivatives))
+        builder.add_node("handle_feedback", llm_node("handle_feedback"))
+        builder.add_node("revise_section", llm_node("revise_section"))
 
         # Add basic flow edges
-        self.builder.add_edge(START, "generate_blog_plan")
-        self.builder.add_conditional_edges(
+        builder.add_conditional_edges(
+            START, self.route_input, ["condense_reference", "generate_blog_plan"]
+        )
+        builder.add_edge("condense_reference", "generate_blog_plan")
+        builder.add_conditional_edges(
             "generate_blog_plan", self.initiate_section_writing, ["write_section"]
         )
-        self.builder.add_edge("write_section", "gather_completed_sections")
-        self.builder.add_conditional_edges(
+        builder.add_edge("write_section", "gather_completed_sections")
+        builder.add_conditional_edges(
             "gather_completed_sections",
             self.initiate_final_section_writing,
             ["write_final_sections"],
         )
-        self.builder.add_edge("write_final_sections", "compile_final_blog")
-        # self.builder.add_edge("compile_final_blog", "generate_tags")
-
-        # Post-tags routing logic
-        def route_after_generation(state: BlogState):
-            if state.feedback:
-                return "handle_feedback"
-            if "linkedin" in state.post_types and not state.linkedin_post:
-                return "write_linkedin_post"
-            if "twitter" in state.post_types and not state.twitter_post:
-                return "write_twitter_post"
-            return END
-
-        # Post-LinkedIn routing logic
-        def route_after_linkedin(state: BlogState):
-            if state.feedback:
-                return "handle_feedback"
-            if "twitter" in state.post_types and not state.twitter_post:
-                return "write_twitter_post"
-            return END
-
-        # Post-Twitter routing logic
-        def route_after_twitter(state: BlogState):
-            if state.feedback:
-                return "handle_feedback"
-            if "linkedin" in state.post_types and not state.linkedin_post:
-                return "write_linkedin_post"
-            return END
-
-        # Add routing edges
-        self.builder.add_conditional_edges(
-            "compile_final_blog",
-            route_after_generation,
-            ["write_linkedin_post", "write_twitter_post", "handle_feedback", END],
-        )
+        builder.add_edge("write_final_sections", "compile_final_blog")
 
-        self.builder.add_conditional_edges(
-            "write_linkedin_post",
-            route_after_linkedin,
-            ["write_twitter_post", "handle_feedback", END],
+        # Derivatives of the final blog run in parallel and are joined before finishing.
+        # The same routing applies after the join and after feedback, so a later
+        # update_state (new post_types or feedback) resumes from whichever ran last.
+        derivative_targets = [
+            "write_linkedin_post", "write_twitter_post", "generate_tags", "handle_feedback", END
+        ]
+        for node in ("compile_final_blog", "merge_derivatives"):
+            builder.add_conditional_edges(node, self.route_derivatives, derivative_targets)
+        for node in ("write_linkedin_post", "write_twitter_post", "generate_tags"):
+            builder.add_edge(node, "merge_derivatives")
+
+        # Section-scoped feedback revises the affected sections, then recompiles the blog
+        builder.add_conditional_edges(
+            "handle_feedback", self.route_feedback, derivative_targets + ["revise_section"]
         )
+        builder.add_edge("revise_section", "compile_final_blog")
 
-        self.builder.add_conditional_edges(
-            "write_twitter_post",
-            route_after_twitter,
-            ["write_linkedin_post", "handle_feedback", END],
-        )
+        return builder
 
-        # Feedback handling edge - routes back to appropriate node based on post type
-        def route_after_feedback(state: BlogState):
-            if state.feedback:
-                return "handle_feedback"
-            if "linkedin" in state.post_types and not state.linkedin_post:
-                return "write_linkedin_post"
-            if "twitter" in state.post_types and not state.twitter_post:
-                return "write_twitter_post"
-            return END
-
-        self.builder.add_conditional_edges(
-            "handle_feedback",
-            route_after_feedback,
-            ["handle_feedback", "write_linkedin_post", "write_twitter_post", END],
-        )
+    def setup_workflow(self):
+        return self._compile_graph(self.checkpointer)
 
-        # Compile graph with interrupts after key steps
-        graph = self.builder.compile(
-            checkpointer=self.checkpointer,
-            interrupt_after=[
-                "compile_final_blog",
-                # "review_blog",
-                "write_linkedin_post",
-                "write_twitter_post",
-            ],
-        )
-        return graph
+    def _compile_graph(self, checkpointer, asynchronous=False):
+        """Compile the sync or async graph against the given checkpointer"""
+        return self._build_graph(asynchronous).compile(checkpointer=checkpointer)
     
     async def stream_generic_workflow(self, payload, thread_id, user):
-        """Stream workflow execution with real-time updates"""
+        """Stream workflow execution with real-time updates.
+
+        Yields newline-delimited JSON: a progress event when a node finishes, and token
+        events (tagged with node and section) while sections and posts are being written.
+
+        The graph runs on the event loop through its async nodes; blocking source
+        collection and database work are pushed to worker threads so a long
+        generation never stalls other requests on the same worker.
+        """
         logger.info(f"Starting streaming workflow with payload type: {type(payload).__name__}")
         try:
             thread_id, source_id, url_meta, media_meta = self._initialize_workflow(payload, thread_id)
             logger.debug(f"Initialized workflow: thread_id={thread_id}, source_id={source_id}")
 
-            # check thread_id is not existent
-            existing_content = self.content_repo.exists("thread_id",thread_id)
-            final_state=None
-            if existing_content and not payload.get("feedback"):
-                logger.info("Handling existing thread without feedback")
-                config = {"configurable": {"thread_id": thread_id}}
-                
-                self.graph.update_state(
-                    config,
-                    values={"post_types": payload.get("post_types", ["twitter", "linkedin"])},
-                )
+            graph = await self._get_async_graph()
+            config = self._run_config(thread_id, payload, stream_tokens=True)
 
-                for event in self.graph.stream(None, config=config):
-                    if 'write_linkedin_post' in str(event):
-                        final_state = event.get('write_linkedin_post')
-                    elif 'write_twitter_post' in str(event):
-                        final_state = event.get('write_twitter_post')
-
-                    yield self._format_event(event)
-
-                if final_state:
-                    self._store_social_content(thread_id, payload, final_state, user)
-                
-                return
+            # check thread_id is not existent
+            existing_content = await asyncio.to_thread(self.content_repo.exists, "thread_id", thread_id)
+            final_state = {}
+            async with self._aledger(thread_id, payload, user) as ledger:
+                if existing_content and not payload.get("feedback"):
+                    logger.info("Handling existing thread without feedback")
+                    ledger.operation = "social_posts"
+                    await graph.aupdate_state(
+                        config,
+                        values={"post_types": payload.get("post_types", ["twitter", "linkedin"])},
+                    )
+
+                    async for line in self._astream_lines(graph, None, config, final_state):
+                        yield line
+
+                    if final_state:
+                        await asyncio.to_thread(self._store_social_content, thread_id, payload, final_state, user)
+                    return
                             
-            # Handle feedback
-            if existing_content and payload.get("thread_id"):
-                config = {"configurable": {"thread_id": thread_id}}
-                self.graph.update_state(
-                    config,
-                    values={
-                        "feedback": payload.get("feedback"),
-                        "post_types": payload.get("post_types", ["blog"]),
-                        "feedback_applied": False,
-                    }, 
-                )
-                for event in self.graph.stream(None, config):
-                    if 'handle_feedback' in str(event):
-                        final_state = event.get('handle_feedback')
-
-                    yield self._format_event(event)
-
-                self.graph.update_state(config, values={"feedback": None})
-
-                if final_state:
-                    self._update_content_with_feedback(thread_id, payload, final_state,user)   
-                return   
-            
-
-            # Handle new content generation
-            logger.info("Handling new content generation")
-            if payload.get("url"):
-                test_input, source_id = self._handle_url_workflow(payload, thread_id, user)
-            elif payload.get("tweet_id"):
-                test_input, source_id = self._handle_tweet_workflow(payload, thread_id, user)
-            elif payload.get("topic"):
-                test_input, source_id = self._handle_topic_workflow(payload, thread_id, user)
-            elif payload.get("reddit_query"):
-                test_input, source_id = self._handle_reddit_workflow(payload, thread_id, user)
-            else:
-                raise ValueError("Invalid payload - missing required fields")
-
-            config = {"configurable": {"thread_id": thread_id}}
-            import dataclasses
-            import json
-            for event in self.graph.stream(dataclasses.asdict(test_input), config=config):
-                # Pass through the event as a JSON string
-                yield json.dumps(self._format_event(event))
-                
-                if ('compile_final_blog' or 'write_linkedin_post' or 'write_twitter_post') in str(event):
-                    final_state = event
-                # Alternatively, LangGraph might emit an event with specific markers for end state
-                if '__end__' in str(event) or '__interrupt__' in str(event):
-                    logger.info("End of workflow detected")
-                
-            # Store the final state after the workflow completes
-            if final_state:
-                self._store_new_content(final_state['compile_final_blog'], thread_id, source_id, payload, user)
+                # Handle feedback
+                if existing_content and payload.get("thread_id"):
+                    ledger.operation = "feedback"
+                    await graph.aupdate_state(
+                        config,
+                        values=self._feedback_values(payload),
+                    )
+                    async for line in self._astream_lines(graph, None, config, final_state):
+                        yield line
+
+                    await graph.aupdate_state(config, values={"feedback": None})
+
+                    if final_state:
+                        await asyncio.to_thread(self._update_content_with_feedback, thread_id, payload, final_state, user)
+                    return   
+
+                # Handle new content generation
+                logger.info("Handling new content generation")
+                ledger.operation = "generate"
+                test_input, source_id = await asyncio.to_thread(self._prepare_input, payload, thread_id, user)
+
+                with track_usage() as usage:
+                    async for line in self._astream_lines(graph, dataclasses.asdict(test_input), config, final_state):
+                        yield line
+                self._report_usage(thread_id, usage)
+
+                # Store the final state after the workflow completes
+                if final_state.get("final_blog"):
+                    await asyncio.to_thread(
+                        self._store_new_content, final_state, thread_id, source_id, payload, user
+                    )
                 
         except Exception as e:
             logger.error(f"Error in streaming workflow: {str(e)}", exc_info=True)
             import json
-            yield json.dumps({"error": str(e)})
+            yield json.dumps({"error": str(e)}) + "\n"
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _astream_lines(self, graph, graph_input, config, final_state):
+        """Run the graph with node updates and LLM tokens interleaved, one JSON line per event"""
+        async for mode, chunk in graph.astream(graph_input, config=config, stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                yield self._format_token(chunk) + "\n"
+            else:
+                self._accumulate_update(final_state, chunk)
+                yield self._format_event(chunk) + "\n"
+
+    @staticmethod
+    def _accumulate_update(final_state, event):
+        """Merge the per-node updates of a stream event into final_state.
+
+        Parallel branches (e.g. LinkedIn, Twitter and tags) emit separate events, so
+        the stored result is built from all of them rather than the last one seen.
+        """
+        for update in event.values():
+            if isinstance(update, dict):
+                final_state.update(update)
+
+    # Approximate overall progress once each node has finished
+    NODE_PROGRESS = {
+        "condense_reference": 5,
+        "generate_blog_plan": 10,
+        "write_section": 40,
+        "gather_completed_sections": 55,
+        "write_final_sections": 70,
+        "compile_final_blog": 80,
+        "write_twitter_post": 90,
+        "write_linkedin_post": 90,
+        "generate_tags": 90,
+        "handle_feedback": 90,
+        "revise_section": 90,
+        "merge_derivatives": 100,
+    }
+
+    def _format_token(self, chunk):
+        """Format an LLM token written by a node to the custom stream"""
+        import json
+        token = StreamToken(node=chunk["node"], section=chunk.get("section"), content=chunk["token"])
+        return json.dumps(token.__dict__)
+
     def _format_event(self, event):
         """Format LangGraph event for streaming"""
         import json
         
         # Define custom messages for each node
         node_messages = {
+            "condense_reference": "Condensing long source material...",
             "generate_blog_plan": "Planning blog structure and outline...",
             "write_section": "Writing blog section content...",
             "gather_completed_sections": "Compiling blog sections together...",
@@ -1250,13 +1925,14 @@ class AgentWorkflow:
             "review_blog": "Reviewing blog for quality and coherence...",
             "write_twitter_post": "Creating concise Twitter post from blog content...",
             "write_linkedin_post": "Crafting professional LinkedIn post...",
-            "generate_tags": "Generating relevant tags for better discoverability..."
+            "generate_tags": "Generating relevant tags for better discoverability...",
+            "merge_derivatives": "Collecting generated posts and tags...",
+            "handle_feedback": "Applying your feedback...",
+            "revise_section": "Revising sections based on your feedback..."
         }
         
-        # Extract node name
-        if hasattr(event, 'node'):
-            node_name = event.node
-        elif isinstance(event, dict):
+        # Extract node name ("updates" events are {node_name: update})
+        if isinstance(event, dict):
             node_name = next(iter(event))
         else:
             node_name = str(event)
@@ -1264,31 +1940,12 @@ class AgentWorkflow:
         # Get custom message or use default
         custom_message = node_messages.get(node_name, f"Processing {node_name}")
         
-        # Determine status and progress based on event type
-        if hasattr(event, 'type'):
-            if event.type == 'start':
-                status = "started"
-                progress = 10
-                message = f"Starting: {custom_message}"
-            elif event.type == 'end':
-                status = "completed"
-                progress = 100
-                message = f"Completed: {custom_message}"
-            else:
-                status = "processing"
-                progress = 50
-                message = custom_message
-        else:
-            status = "processing"
-            progress = 50
-            message = custom_message
-        
-        # Create update object
+        # Updates are emitted when a node finishes
         update = StreamUpdate(
             node=node_name,
-            progress=progress,
-            status=status,
-            message=message
+            progress=self.NODE_PROGRESS.get(node_name, 50),
+            status="completed",
+            message=custom_message
         )
         
         # Convert the StreamUpdate object to a JSON string
@@ -0,0 +1,202 @@
+"""
+Token budgets for the reference material sent to the LLM.
+
+``input_content`` can hold up to 15 converted web pages or a whole PDF, and it is
+inserted into the planner prompt and into every ``write_section`` prompt.
+``ContentBudgeter`` splits the material into paragraph-aligned chunks (counted once
+with the configured model's tokenizer) and fits it to a per-node token budget:
+
+* ``fit``         - the content is within budget and passed through unchanged
+* ``trim``        - leading chunks of every source are kept round-robin, so each
+                    source stays represented (planner, input assembly)
+* ``prioritize``  - chunks sharing the most terms with the section being written
+                    are kept first (``write_section``)
+
+Every decision is returned as a dict so nodes can record it in ``BlogState.content_budget``.
+``group`` merges chunks into larger units for map-reduce condensing of oversized sources.
+"""
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import litellm
+from cachetools import LRUCache
+
+from src.backend.config import Config
+
+SOURCE_HEADER = re.compile(r"^# Source \d+:.*$", re.MULTILINE)
+GAP_MARKER = "\n[...]\n"
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "how", "what",
+    "why", "its", "into", "your", "you", "our", "about", "section", "introduction", "conclusion",
+}
+
+
+@dataclass
+class Chunk:
+    source: int
+    header: str
+    text: str
+    tokens: int
+    position: int
+
+
+def _terms(text: str) -> set:
+    return {t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 2 and t not in _STOPWORDS}
+
+
+class ContentBudgeter:
+    """Fits reference content to per-node token budgets"""
+
+    def __init__(self, model: str, budgets: Dict[str, int], chunk_tokens: int = 400,
+                 counter: Optional[Callable[[str], int]] = None):
+        self.model = model
+        self.budgets = budgets
+        self.chunk_tokens = chunk_tokens
+        self._counter = counter
+        self._chunk_cache = LRUCache(maxsize=32)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config, model: str) -> "ContentBudgeter":
+        params = config.class_params
+        budgets = dict(params.get("nodes", {}))
+        if params.get("max_input_tokens"):
+            budgets["input"] = params["max_input_tokens"]
+        return cls(model, budgets, chunk_tokens=params.get("chunk_tokens", 400))
+
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text`` for the configured model"""
+        if self._counter is not None:
+            return self._counter(text)
+        return litellm.token_counter(model=self.model, text=text)
+
+    def fit(self, node: str, content: Optional[str], focus: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict]]:
+        """Return the content to use for ``node`` and the budgeting decision (None when unbudgeted)"""
+        budget = self.budgets.get(node)
+        if not content or not budget:
+            return content, None
+
+        chunks = self._chunks(content)
+        total = sum(c.tokens for c in chunks)
+        decision = {"node": node, "budget": budget, "input_tokens": total,
+                    "chunks_total": len(chunks), "sources_total": len({c.source for c in chunks})}
+        if total <= budget:
+            return content, {**decision, "strategy": "fit", "kept_tokens": total,
+                             "chunks_kept": len(chunks), "sources_kept": decision["sources_total"]}
+
+        if focus:
+            strategy, ordered = "prioritize", self._by_relevance(chunks, focus)
+        else:
+            strategy, ordered = "trim", self._round_robin(chunks)
+
+        kept, used = [], 0
+        for chunk in ordered:
+            if used + chunk.tokens <= budget:
+                kept.append(chunk)
+                used += chunk.tokens
+        kept.sort(key=lambda c: c.position)
+        return self._assemble(kept), {
+            **decision, "strategy": strategy, "kept_tokens": used,
+            "chunks_kept": len(kept), "sources_kept": len({c.source for c in kept}),
+        }
+
+    def group(self, content: str, max_tokens: int) -> List[Chunk]:
+        """Merge consecutive chunks of the same source into groups of at most ``max_tokens``"""
+        groups: List[Chunk] = []
+        for chunk in self._chunks(content):
+            last = groups[-1] if groups else None
+            if last and last.source == chunk.source and last.tokens + chunk.tokens <= max_tokens:
+                groups[-1] = Chunk(last.source, last.header, f"{last.text}\n\n{chunk.text}",
+                                   last.tokens + chunk.tokens, last.position)
+            else:
+                groups.append(Chunk(chunk.source, chunk.header, chunk.text, chunk.tokens, len(groups)))
+        return groups
+
+    def _chunks(self, content: str) -> List[Chunk]:
+        """Split content into per-source, paragraph-aligned chunks, counting each once"""
+        digest = hashlib.sha1(content.encode()).hexdigest()
+        with self._lock:
+            cached = self._chunk_cache.get(digest)
+            if cached is None:
+                cached = self._chunk_cache[digest] = self._split(content)
+        return cached
+
+    def _split(self, content: str) -> List[Chunk]:
+        headers = list(SOURCE_HEADER.finditer(content))
+        if headers:
+            bounds = [(m.group(0), m.end(), headers[i + 1].start() if i + 1 < len(headers) else len(content))
+                      for i, m in enumerate(headers)]
+            preamble = content[:headers[0].start()]
+            if preamble.strip():
+                bounds.insert(0, ("", 0, headers[0].start()))
+        else:
+            bounds = [("", 0, len(content))]
+
+        chunks: List[Chunk] = []
+        for source, (header, start, end) in enumerate(bounds):
+            buffer, buffer_tokens = [], 0
+            for paragraph in re.split(r"\n\s*\n", content[start:end]):
+                if not paragraph.strip():
+                    continue
+                for piece, tokens in self._pieces(paragraph):
+                    if buffer and buffer_tokens + tokens > self.chunk_tokens:
+                        chunks.append(Chunk(source, header, "\n\n".join(buffer), buffer_tokens, len(chunks)))
+                        buffer, buffer_tokens = [], 0
+                    buffer.append(piece)
+                    buffer_tokens += tokens
+            if buffer:
+                chunks.append(Chunk(source, header, "\n\n".join(buffer), buffer_tokens, len(chunks)))
+        return chunks
+
+    def _pieces(self, paragraph: str) -> List[Tuple[str, int]]:
+        """Split a paragraph larger than a chunk into word runs (~4 characters per token)"""
+        tokens = self.count(paragraph)
+        if tokens <= self.chunk_tokens:
+            return [(paragraph, tokens)]
+        max_chars = self.chunk_tokens * 4
+        words, pieces, current = paragraph.split(), [], []
+        size = 0
+        for word in words:
+            if current and size + len(word) + 1 > max_chars:
+                pieces.append(" ".join(current))
+                current, size = [], 0
+            current.append(word)
+            size += len(word) + 1
+        if current:
+            pieces.append(" ".join(current))
+        return [(piece, self.count(piece)) for piece in pieces]
+
+    @staticmethod
+    def _round_robin(chunks: List[Chunk]) -> List[Chunk]:
+        """Leading chunks of every source first, then the next chunk of each, and so on"""
+        rank: Dict[int, int] = {}
+        keyed = []
+        for chunk in chunks:
+            depth = rank.get(chunk.source, 0)
+            rank[chunk.source] = depth + 1
+            keyed.append((depth, chunk.source, chunk.position, chunk))
+        return [k[-1] for k in sorted(keyed, key=lambda k: k[:3])]
+
+    @staticmethod
+    def _by_relevance(chunks: List[Chunk], focus: str) -> List[Chunk]:
+        """Chunks sharing the most terms with ``focus`` first, earlier chunks breaking ties"""
+        focus_terms = _terms(focus)
+        return sorted(chunks, key=lambda c: (-len(focus_terms & _terms(c.text)), c.position))
+
+    @staticmethod
+    def _assemble(kept: List[Chunk]) -> str:
+        """Rebuild the content from kept chunks, marking where material was left out"""
+        parts, previous = [], None
+        for chunk in kept:
+            if previous is None or chunk.source != previous.source:
+                parts.append(f"{chunk.header}\n{chunk.text}" if chunk.header else chunk.text)
+            elif chunk.position != previous.position + 1:
+                parts.append(GAP_MARKER + chunk.text)
+            else:
+                parts.append(chunk.text)
+            previous = chunk
+        return "\n\n".join(parts)
@@ -0,0 +1,189 @@
+"""
+Local keyphrase extraction for blog tags.
+
+``generate_tags`` can ask the LLM for up to five tags, or extract them from the
+compiled blog on CPU in a few milliseconds (``method: keyphrase`` under ``tags`` in
+config.yaml). ``KeyphraseExtractor`` works RAKE-style:
+
+* the markdown is reduced to prose (code, URLs and markup dropped); headings count double
+* candidate phrases are runs of up to ``max_words`` words between stopwords and punctuation
+* plurals are folded ("databases" counts as "database"); a phrase scores its frequency
+  times its length and the square root of its words' mean frequency, so recurring
+  multi-word terms ("vector database") beat the single words they contain
+* names of tags already in use (``vocabulary``) that appear in the text are boosted by
+  ``known_boost`` and keep their stored spelling, so tags converge instead of proliferating
+
+Phrases overlapping a better one ("vector" under "vector databases") are skipped.
+"""
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional
+
+from src.backend.config import Config
+from src.backend.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each either else even ever every few for from
+further get gets getting had has have having he her here hers him his how however i if in into is it its
+itself just let lets like made make makes making many may me might more most much must my need needs new
+no nor not now of off often on once one only or other our out over own per rather really same see she
+should since so some such than that the their them then there these they thing things this those though
+through to too two under until up upon us use used uses using very via want was way ways we well were what
+when where whether which while who whom whose why will with within without would yet you your yours
+able across already always among another anyone anything around back become becomes best better big
+come comes different does done easy enough first good great help helps keep know last less lot lots
+next number part point possible quite real right several simple still sure take takes today try turn
+vs versus etc eg ie
+""".split())
+
+_CODE_BLOCK = re.compile(r"```.*?```", re.DOTALL)
+_INLINE_CODE = re.compile(r"`[^`]*`")
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_URL = re.compile(r"https?://\S+")
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+# Words keep inner symbols of technical terms (C++, Node.js, GPT-4, C#)
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:[.+#\-][A-Za-z0-9+#]+)*\+*#?")
+_BREAK = re.compile(r"[^\w\s.+#\-']|(?<=\w)[.!?;:](?=\s|$)|\s-\s|\n")
+
+
+def _fold(word: str) -> str:
+    """Lowercase singular form of a word, for counting"""
+    word = word.lower()
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-3] + "y" if word.endswith("ies") else word[:-1]
+    return word
+
+
+class KeyphraseExtractor:
+    """Extracts tags from a post, preferring the names of tags already in use"""
+
+    def __init__(self, method: str = "keyphrase", max_tags: int = 5, max_words: int = 3,
+                 known_boost: float = 2.0, vocabulary_size: int = 500, vocabulary_ttl: float = 600,
+                 vocabulary: Optional[Callable[[int], List[str]]] = None):
+        """
+        Args:
+            method: "keyphrase" (local extraction) or "llm"
+            vocabulary: Returns up to ``n`` names of tags in use (e.g. from TagRepository);
+                fetched at most once per ``vocabulary_ttl`` seconds
+        """
+        if method not in ("keyphrase", "llm"):
+            raise ValueError(f"Unsupported tags method: {method} (use keyphrase or llm)")
+        self.method = method
+        self.max_tags = max_tags
+        self.max_words = max_words
+        self.known_boost = known_boost
+        self.vocabulary = vocabulary
+        self.vocabulary_size = vocabulary_size
+        self.vocabulary_ttl = vocabulary_ttl
+        self._known: Dict[str, str] = {}
+        self._known_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config, vocabulary: Optional[Callable[[int], List[str]]] = None) -> "KeyphraseExtractor":
+        return cls(vocabulary=vocabulary, **config.class_params)
+
+    def known_tags(self) -> Dict[str, str]:
+        """Tags in use by lowercase name; the last fetch is kept for vocabulary_ttl seconds"""
+        if self.vocabulary is None:
+            return {}
+        with self._lock:
+            if self._known_at is None or time.monotonic() - self._known_at > self.vocabulary_ttl:
+                try:
+                    names = self.vocabulary(self.vocabulary_size)
+                    self._known = {" ".join(map(_fold, _WORD.findall(name))): name for name in names if name}
+                except Exception as e:
+                    # Tags are still extracted, without converging on existing names
+                    logger.warning(f"Could not load existing tags: {e}")
+                self._known_at = time.monotonic()
+            return self._known
+
+    @staticmethod
+    def _prose(text: str) -> str:
+        text = _CODE_BLOCK.sub("\n", text)
+        text = _IMAGE.sub("\n", text)
+        text = _LINK.sub(r"\1", text)
+        text = _URL.sub("\n", _INLINE_CODE.sub("\n", text))
+        # Headings name the topics of a post: counted twice
+        headings = "\n".join(_HEADING.findall(text))
+        text = re.sub(r"['’]\w*", "", f"{text}\n{headings}")  # contractions and possessives
+        return text.replace("*", "").replace("_", " ")
+
+    def _candidates(self, text: str):
+        """Yield each candidate phrase occurrence as a list of words (original case)"""
+        for fragment in _BREAK.split(text):
+            run = []
+            for word in _WORD.findall(fragment) + [None]:
+                if word is None or word.lower() in _STOPWORDS or word.isdigit():
+                    for size in range(1, self.max_words + 1):
+                        for start in range(len(run) - size + 1):
+                            yield run[start:start + size]
+                    run = []
+                else:
+                    run.append(word)
+
+    def extract(self, text: Optional[str]) -> List[str]:
+        """Up to max_tags tags for ``text``, best first"""
+        if not text or not text.strip():
+            return []
+        prose = self._prose(text)
+        phrase_counts, word_counts = Counter(), Counter()
+        surface = defaultdict(Counter)
+        for words in self._candidates(prose):
+            key = " ".join(map(_fold, words))
+            phrase_counts[key] += 1
+            surface[key][" ".join(words)] += 1
+            if len(words) == 1:
+                word_counts[key] += 1
+
+        known = self.known_tags()
+        lowered = " ".join(map(_fold, _WORD.findall(prose)))
+        for key in known:
+            if key and key not in phrase_counts:
+                # Known tags spanning stopwords ("retrieval augmented generation" is fine,
+                # "state of the art" is not a run) are counted in the whole text
+                count = len(re.findall(rf"(?<!\S){re.escape(key)}(?!\S)", lowered))
+                if count:
+                    phrase_counts[key] = count
+
+        scores = {}
+        for key, count in phrase_counts.items():
+            words = key.split()
+            # Phrases seen once and very short words are noise, unless they are known tags
+            if key not in known and (count < 2 or len(key) < 3):
+                continue
+            mean_frequency = sum(word_counts.get(w, 1) for w in words) / len(words)
+            score = count * len(words) * mean_frequency ** 0.5
+            if key in known:
+                score *= self.known_boost
+            scores[key] = score
+
+        tags, taken = [], []
+        for key in sorted(scores, key=lambda k: (-scores[k], k)):
+            words = set(key.split())
+            if any(words <= other or other <= words for other in taken):
+                continue
+            tags.append(known.get(key) or self._display(surface[key]))
+            taken.append(words)
+            if len(tags) >= self.max_tags:
+                break
+        return tags
+
+    @staticmethod
+    def _display(forms: Counter) -> str:
+        """Most frequent spelling of a phrase; phrases without inner capitals (acronyms,
+        product names) are title-cased so the same tag is always spelled the same"""
+        if not forms:
+            return ""
+        spellings = Counter()
+        for form, count in forms.items():
+            spellings[form.lower()] += count
+        spelling = max(spellings, key=lambda s: (spellings[s], s))
+        form = max((f for f in forms if f.lower() == spelling), key=lambda f: (forms[f], f))
+        return form if any(c.isupper() for c in form[1:]) else form.title()
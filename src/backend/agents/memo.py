@@ -0,0 +1,99 @@
+"""
+Content-addressed memoization of generation stages.
+
+Regenerating the same URL or topic with the same template (client retries, team
+members picking the same source, re-creating a deleted draft) repeats the same
+planner, section and social post prompts. ``StageCache`` keeps the raw LLM output
+of those stages keyed by a hash of the fully rendered prompt, which covers the
+normalized input content and the template parameters, plus the model settings
+and ``STAGE_CACHE_VERSION``.
+
+The cache is in-process (per worker), bounded (LRU) and entries expire after a TTL.
+"""
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+
+from src.backend.settings import get_settings
+from src.backend.utils.metrics import metrics
+
+# Bump when stage outputs are post-processed differently, to invalidate cached outputs
+STAGE_CACHE_VERSION = 1
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so formatting-only differences in the input share an entry"""
+    return " ".join(text.split())
+
+
+class StageCache:
+    """TTL + LRU cache of stage outputs with per-stage hit/miss accounting"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def key(stage: str, messages: List[Any], model_params: Dict[str, Any]) -> str:
+        """Hash of everything that determines a stage's output"""
+        payload = {
+            "version": STAGE_CACHE_VERSION,
+            "stage": stage,
+            "model": model_params,
+            "messages": [
+                [type(m).__name__, _normalize(getattr(m, "content", str(m)))] for m in messages
+            ],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        """Return the cached output for ``key`` and record a hit or miss for ``stage``"""
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self._misses[stage] += 1
+            else:
+                self._hits[stage] += 1
+        metrics.increment(f"stage_cache.{'miss' if value is None else 'hit'}.{stage}")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit rate per stage"""
+        with self._lock:
+            stages = set(self._hits) | set(self._misses)
+            hit_rate = {
+                stage: round(self._hits[stage] / (self._hits[stage] + self._misses[stage]), 3)
+                for stage in sorted(stages)
+            }
+            return {"size": len(self._cache), "maxsize": self._cache.maxsize, "hit_rate": hit_rate}
+
+
+_stage_cache: Optional[StageCache] = None
+_stage_cache_lock = threading.Lock()
+
+
+def get_stage_cache() -> Optional[StageCache]:
+    """Return the process-wide stage cache, or None when it is disabled in settings"""
+    global _stage_cache
+    settings = get_settings()
+    if not settings.stage_cache_enabled:
+        return None
+    with _stage_cache_lock:
+        if _stage_cache is None:
+            _stage_cache = StageCache(maxsize=settings.stage_cache_size, ttl=settings.stage_cache_ttl)
+            metrics.register_gauge("stage_cache", _stage_cache.stats)
+        return _stage_cache
@@ -78,6 +78,9 @@ Final check:
 
 
 ##----------------- Section Writer Instructions -----------------##
+# The instructions only depend on the generation's inputs, so every section call shares
+# them as a byte-identical prompt prefix (cached by the provider); the section itself is
+# given in main_body_section_request.
 main_body_section_writer_instructions = """You are an expert {persona} crafting a section of a {content_type}, you can think step by step to create natural and concise content for {age_group}.  
 
 Here are the inputs provided for the overall blog post generation, so that you have context for the overall content:
@@ -85,16 +88,6 @@ Here are the inputs provided for the overall blog post generation, so that you h
 **Input**
 {user_instructions}  
 
-Here is the Section Name you are going to write:
-
-**Section Name**:
-{section_name}  
-
-Here is the Section Description you are going to write:  
-
-**Section Description**:
-{section_topic}  
-
 Here are the reference urls that you can use for references wherever needed in the content:
 
 **Reference urls**:
@@ -153,15 +146,22 @@ QUALITY CHECKLIST:
 [ ] Uses proper text formatting without duplication
 [ ] Uses naturally flowing language and writing style"""
 
+main_body_section_request = """Here is the Section Name you are going to write:
 
-##----------------- Introduction/Conclusion Writer Instructions -----------------##
-intro_conclusion_instructions = """You are an expert {persona}, you can think step by step for crafting the section of {content_type}.
+**Section Name**:
+{section_name}  
 
-Here is the Section Name you are going to write: 
-{section_name}
+Here is the Section Description you are going to write:  
+
+**Section Description**:
+{section_topic}  
+
+Generate a blog section based on the provided information."""
 
-Here is the Section Description you are going to write: 
-{section_topic}
+
+##----------------- Introduction/Conclusion Writer Instructions -----------------##
+# Shared by the introduction and conclusion calls; the section is given in intro_conclusion_request
+intro_conclusion_instructions = """You are an expert {persona}, you can think step by step for crafting the section of {content_type}.
 
 Here are the main body sections that you are going to reference: 
 {main_body_sections}
@@ -206,6 +206,14 @@ FOR CONCLUSION (if writing Conclusion):
 - Use ## Conclusion (should always start with '##' and should be a crisp concluding statement)
 """
 
+intro_conclusion_request = """Here is the Section Name you are going to write: 
+{section_name}
+
+Here is the Section Description you are going to write: 
+{section_topic}
+
+Generate an intro/conclusion section based on the provided main body sections."""
+
 
 ##----------------- Twitter Post Instructions -----------------##
 twitter_post_instructions = """You are a social media expert tasked with crafting tweets that drive engagement on Twitter. 
@@ -443,4 +451,57 @@ Your output must follow this exact format:
 [Summary of adjustments and reasoning, if any]
 </review_summary>
 
-Do not add any additional commentary or explanations outside of the specified output format."""
\ No newline at end of file
+Do not add any additional commentary or explanations outside of the specified output format."""
+
+##----------------- Feedback Instructions -----------------##
+feedback_section_mapper = """You are an editor deciding which sections of a {content_type} a piece of reader feedback applies to.
+
+Sections:
+{sections}
+
+Feedback:
+{feedback}
+
+Identify the sections that need to change to address the feedback. Choose as few sections as possible.
+
+Respond in the following format:
+<sections>[section numbers, e.g. 2, 3]</sections>
+
+If the feedback applies to the whole post (e.g. overall tone, length or style), respond with <sections>all</sections>.
+Do not add any extra explanation or information outside the specified format."""
+
+section_feedback_instructions = """You are an expert {persona} revising one section of a {content_type} based on reader feedback.
+
+Section: {section_name}
+Current content:
+{section_content}
+
+Feedback on the post:
+{feedback}
+
+Revise this section to address the parts of the feedback that concern it. Keep its heading, markdown formatting, links and media unchanged unless the feedback asks otherwise. Other sections are revised separately, so do not add content that belongs to them.
+
+Strictly return only the revised section in markdown format and do not include any additional text including introductory phrases like 'Here is the revised section'."""
+
+##----------------- Source Condensing Instructions -----------------##
+source_chunk_summary_instructions = """You are a research assistant condensing a long source so that a {content_type} about "{topic}" can be written from it.
+
+Below is part {part} of {parts} of the source material{source}.
+
+<source_part>
+{chunk}
+</source_part>
+
+Summarize this part of the source in at most {summary_words} words. Keep the key claims, methods, numbers, results, names and definitions, and any links or media references exactly as written. Leave out boilerplate such as navigation, references lists and acknowledgements.
+
+Strictly return only the summary in markdown format, without introductory phrases."""
+
+source_brief_instructions = """You are a research assistant preparing a brief for writers of a {content_type} about "{topic}".
+
+Below are summaries of consecutive parts of the source material, in order:
+
+{summaries}
+
+Combine the chunk summaries into a single, well-organized brief of at most {brief_words} words. Group related points under short headings, remove repetition, and keep the specific facts, numbers, names, links and media references the writers will need.
+
+Strictly return only the brief in markdown format, without introductory phrases."""
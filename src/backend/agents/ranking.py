@@ -0,0 +1,120 @@
+"""
+Local relevance ranking of web search results.
+
+Topic, tweet and Reddit generations search the web with the rewritten query and keep
+the results worth converting. ``RelevanceRanker`` scores each result's title, snippet
+and URL path against the query with BM25 (on CPU, no LLM round trip) and weighs the
+score by:
+
+* ``domain_priors`` - multiplier per domain (and its subdomains), e.g. < 1 for pages
+                      that convert poorly (video, social) and > 1 for reference sites
+* ``position_decay`` - the search engine's own order: result i is weighted 1 / (1 + decay * i)
+
+Results scoring below ``min_score_ratio`` of the best one are dropped, at most
+``max_per_domain`` are kept per domain and ``max_results`` overall. An empty ranking
+(no result shares a term with the query) lets the caller fall back to LLM selection.
+"""
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.backend.config import Config
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "how", "what", "why",
+    "its", "into", "your", "you", "our", "about", "www", "com", "org", "net", "html", "htm",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _domain(url: str) -> str:
+    host = urlparse(url).netloc.lower().split("@")[-1].split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+class RelevanceRanker:
+    """Ranks search results against a query with BM25 and domain priors"""
+
+    def __init__(self, method: str = "bm25", max_results: int = 8, min_results: int = 3,
+                 min_score_ratio: float = 0.3, max_per_domain: int = 2, position_decay: float = 0.05,
+                 title_weight: int = 2, domain_priors: Optional[Dict[str, float]] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        if method not in ("bm25", "llm"):
+            raise ValueError(f"Unsupported relevance method: {method} (use bm25 or llm)")
+        self.method = method
+        self.max_results = max_results
+        self.min_results = min_results
+        self.min_score_ratio = min_score_ratio
+        self.max_per_domain = max_per_domain
+        self.position_decay = position_decay
+        self.title_weight = title_weight
+        self.domain_priors = {d.lower(): float(w) for d, w in (domain_priors or {}).items()}
+        self.k1 = k1
+        self.b = b
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RelevanceRanker":
+        return cls(**config.class_params)
+
+    def prior(self, url: str) -> float:
+        """Weight of a URL's domain: the most specific matching entry of domain_priors, else 1"""
+        domain = _domain(url)
+        parts = domain.split(".")
+        for i in range(len(parts)):
+            weight = self.domain_priors.get(".".join(parts[i:]))
+            if weight is not None:
+                return weight
+        return 1.0
+
+    def _document(self, result: Dict[str, Any]) -> List[str]:
+        url = result.get("link") or ""
+        return (_tokens(result.get("title")) * self.title_weight
+                + _tokens(result.get("snippet"))
+                + _tokens(urlparse(url).path))
+
+    def scores(self, query: str, results: List[Dict[str, Any]]) -> List[float]:
+        """BM25 score of each result against ``query``, weighted by domain and position"""
+        terms = set(_tokens(query))
+        documents = [self._document(result) for result in results]
+        if not terms or not documents:
+            return [0.0] * len(results)
+        average_length = sum(len(d) for d in documents) / len(documents) or 1.0
+        document_frequency = Counter(t for d in documents for t in set(d) & terms)
+        scores = []
+        for position, (result, document) in enumerate(zip(results, documents)):
+            frequencies = Counter(document)
+            norm = self.k1 * (1 - self.b + self.b * len(document) / average_length)
+            score = 0.0
+            for term in terms & frequencies.keys():
+                df = document_frequency[term]
+                idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+                score += idf * frequencies[term] * (self.k1 + 1) / (frequencies[term] + norm)
+            weight = self.prior(result.get("link") or "") / (1 + self.position_decay * position)
+            scores.append(score * weight)
+        return scores
+
+    def rank(self, query: str, results: List[Dict[str, Any]]) -> List[str]:
+        """URLs of the results worth converting, best first; empty when none matches the query"""
+        results = [r for r in results if r.get("link")]
+        ranked = sorted(zip(self.scores(query, results), range(len(results))), key=lambda s: (-s[0], s[1]))
+        if not ranked or ranked[0][0] <= 0:
+            return []
+        threshold = ranked[0][0] * self.min_score_ratio
+        selected, per_domain = [], Counter()
+        for score, index in ranked:
+            url = results[index]["link"]
+            if score <= 0 or (score < threshold and len(selected) >= self.min_results):
+                break
+            domain = _domain(url)
+            if url in selected or per_domain[domain] >= self.max_per_domain:
+                continue
+            selected.append(url)
+            per_domain[domain] += 1
+            if len(selected) >= self.max_results:
+                break
+        return selected
@@ -0,0 +1,140 @@
+"""
+Concurrent research calls for building the reference content.
+
+The topic, tweet and Reddit workflows spend most of their time waiting on the
+network: a web search, an image search and one conversion or extraction per
+selected URL. ``ResearchPool`` overlaps them:
+
+* ``start`` runs an independent call (image search) in the background while the
+  workflow continues with web search and relevance selection, and ``result``
+  collects it later
+* ``map`` converts or extracts every selected URL on a bounded pool of threads
+
+A URL call times out ``url_timeout`` seconds after it starts running, and a background
+call ``search_timeout`` seconds after it is collected. A call that fails or times out
+is logged and yields ``None``, so one slow or broken URL costs at most the timeout and
+never fails the generation. Timed-out calls cannot be interrupted; they
+finish in the background and their result is discarded.
+
+``max_concurrency: 1`` runs everything inline, one call after another.
+"""
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.backend.config import Config
+from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+
+class ResearchPool:
+    """Runs independent research calls concurrently with per-call timeouts"""
+
+    def __init__(self, max_concurrency: int = 8, url_timeout: float = 45.0, search_timeout: float = 30.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.url_timeout = url_timeout
+        self.search_timeout = search_timeout
+
+    @classmethod
+    def from_config(cls, config: Config) -> "ResearchPool":
+        params = config.class_params
+        return cls(max_concurrency=params.get("max_concurrency", 8),
+                   url_timeout=params.get("url_timeout", 45.0),
+                   search_timeout=params.get("search_timeout", 30.0))
+
+    @property
+    def concurrent(self) -> bool:
+        return self.max_concurrency > 1
+
+    def start(self, fn: Callable, *args) -> Future:
+        """Run ``fn(*args)`` in the background; collect it with ``result``"""
+        if not self.concurrent:
+            future: Future = Future()
+            self._run_inline(future, fn, *args)
+            return future
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="research")
+        # Runs in a copy of this context so LLM usage is tracked for the generation
+        future = executor.submit(contextvars.copy_context().run, fn, *args)
+        executor.shutdown(wait=False)
+        return future
+
+    def result(self, future: Future, label: str, timeout: Optional[float] = None) -> Any:
+        """Result of a ``start``ed call, or None when it failed or timed out"""
+        timeout = self.search_timeout if timeout is None else timeout
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            metrics.increment("research.timeouts")
+            logger.warning(f"{label} timed out after {timeout:.0f}s")
+        except Exception as e:
+            logger.warning(f"{label} failed: {e}")
+        return None
+
+    def map(self, fn: Callable, items: Sequence, label: Callable[[Any], str] = str) -> List[Any]:
+        """Apply ``fn`` to every item, at most ``max_concurrency`` at a time.
+
+        Results keep the order of ``items``; failed or timed-out items are None.
+        """
+        if not items:
+            return []
+        if not self.concurrent:
+            return [self._call(fn, item, label) for item in items]
+
+        started: Dict[int, float] = {}
+
+        def run(index, item):
+            started[index] = time.monotonic()
+            return fn(item)
+
+        results: List[Any] = [None] * len(items)
+        executor = ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items)),
+                                      thread_name_prefix="research")
+        try:
+            futures = {
+                executor.submit(contextvars.copy_context().run, run, index, item): index
+                for index, item in enumerate(items)
+            }
+            pending = set(futures)
+            while pending:
+                now = time.monotonic()
+                deadlines = [started[futures[f]] + self.url_timeout for f in pending if futures[f] in started]
+                timeout = max(0.0, min(deadlines) - now) if deadlines else self.url_timeout
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to process {label(items[index])}: {e}")
+                    metrics.observe("research.call_ms", (time.monotonic() - started[index]) * 1000)
+                now = time.monotonic()
+                expired = {f for f in pending
+                           if futures[f] in started and now - started[futures[f]] >= self.url_timeout}
+                for future in expired:
+                    metrics.increment("research.timeouts")
+                    logger.warning(f"Timed out after {self.url_timeout:.0f}s processing {label(items[futures[future]])}")
+                pending -= expired
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def _run_inline(future: Future, fn: Callable, *args) -> None:
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    @staticmethod
+    def _call(fn: Callable, item: Any, label: Callable[[Any], str]) -> Any:
+        start = time.monotonic()
+        try:
+            return fn(item)
+        except Exception as e:
+            logger.warning(f"Failed to process {label(item)}: {e}")
+            return None
+        finally:
+            metrics.observe("research.call_ms", (time.monotonic() - start) * 1000)
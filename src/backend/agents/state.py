@@ -18,6 +18,8 @@ class Sections:
 class BlogState:
     sections: List[Section] = field(default_factory=list)
     completed_sections: Annotated[List[Section], add] = field(default_factory=list)
+    # Token budgeting decisions for the reference content, one entry per budgeted prompt
+    content_budget: Annotated[List[Dict], add] = field(default_factory=list)
     blog_main_body_sections: Optional[str] = field(default=None)
     final_blog: Optional[str] = field(default=None)
     reviewed_blog: Optional[str] = field(default=None)
@@ -25,10 +27,15 @@ class BlogState:
     linkedin_post: Optional[str] = field(default=None)
     tags: Optional[List[str]] = field(default=None)
     feedback: Optional[str] = field(default=None)
+    # "sections" revises only the sections the feedback is about, "full" rewrites the whole post
+    feedback_scope: Optional[str] = field(default="sections")
+    feedback_sections: Optional[List[str]] = field(default=None)
     input_reddit: Optional[str] = field(default=None)
     input_topic: Optional[str] = field(default=None)
     input_url: Optional[str] = field(default=None)
     input_content: Optional[str] = field(default=None)
+    # Map-reduce summary of oversized reference content, used by the section writers
+    reference_brief: Optional[str] = field(default=None)
     urls: Optional[List[str]] = field(default_factory=list)
     post_types: List[str] = field(default_factory=list)
     thread_id: Optional[str] = field(default=None)
@@ -49,6 +56,7 @@ class BlogStateInput:
     thread_id: Optional[str] = field(default=None)
     media_markdown: Optional[str] = field(default=None)
     template: Optional[Dict] = field(default=None)
+    content_budget: List[Dict] = field(default_factory=list)
     # media_meta: Optional[List[Dict]] = field(default_factory=list)
 
 @dataclass
@@ -68,16 +76,26 @@ class SectionState:
     section: Section
     input_url: Optional[str] = field(default=None)
     input_content: Optional[str] = field(default=None)
+    reference_brief: Optional[str] = field(default=None)
     urls: Optional[List[str]] = field(default_factory=list)
     completed_sections: List[Section] = field(default_factory=list)
     blog_main_body_sections: Optional[str] = field(default=None)
     # media_meta: Optional[List[Dict]] = field(default_factory=list)
     media_markdown: Optional[str] = field(default=None)
     template: Optional[Dict] = field(default=None)
+    feedback: Optional[str] = field(default=None)
 
 @dataclass
 class StreamUpdate:
     node: str
     progress: int
     status: str = "processing"
-    message: Optional[str] = field(default=None)
\ No newline at end of file
+    message: Optional[str] = field(default=None)
+    type: str = "progress"
+
+@dataclass
+class StreamToken:
+    node: str
+    content: str
+    section: Optional[str] = field(default=None)
+    type: str = "token"
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Per-node model tiers: the llm config, output cap and temperature of each LLM call.
+
+Every graph node and helper of ``AgentWorkflow`` calls the LLM under a node name
+(``write_section``, ``generate_tags``, ``query_rewriter``...). ``llm_tiers`` in
+config.yaml maps those names to:
+
+* ``llm``          - llm config serving the call (e.g. ``gemini-lite`` for classification
+                     and rewriting); unset, the agent's main client (LLM_CONFIG) is used
+* ``max_tokens``   - output cap, or ``length`` to derive it from the template's ``length``
+                     parameter through ``length_tokens``
+* ``temperature``  - overrides the llm config's temperature
+
+Nodes that are not listed use the main client with its own settings.
+"""
+from typing import Any, Dict, Optional
+
+from src.backend.config import Config
+
+# max_tokens value that takes the cap from the template's length parameter
+LENGTH = "length"
+
+
+class ModelTiers:
+    """Maps LLM call sites to the llm config and call parameters they use"""
+
+    def __init__(self, nodes: Optional[Dict[str, Dict[str, Any]]] = None,
+                 length_tokens: Optional[Dict[str, int]] = None, default_length: str = "medium"):
+        self.nodes = nodes or {}
+        self.length_tokens = length_tokens or {}
+        self.default_length = default_length
+
+    @classmethod
+    def from_config(cls, config: Config) -> "ModelTiers":
+        params = config.class_params
+        return cls(
+            {node: dict(tier or {}) for node, tier in (params.get("nodes") or {}).items()},
+            dict(params.get("length_tokens") or {}),
+            params.get("default_length", "medium"),
+        )
+
+    def llm(self, node: str) -> Optional[str]:
+        """llm config path of ``node`` (e.g. "llm.gemini-lite"), or None for the main client"""
+        name = self.nodes.get(node, {}).get("llm")
+        return f"llm.{name}" if name else None
+
+    def params(self, node: str, length: Optional[str] = None) -> Dict[str, Any]:
+        """Call parameters (max_tokens, temperature) of ``node`` for a template ``length``"""
+        tier = self.nodes.get(node, {})
+        params = {}
+        if tier.get("temperature") is not None:
+            params["temperature"] = tier["temperature"]
+        max_tokens = tier.get("max_tokens")
+        if max_tokens == LENGTH:
+            # Unknown lengths (templates accept free text) get the default length's cap
+            max_tokens = self.length_tokens.get(str(length or "").strip().lower()) \
+                or self.length_tokens.get(self.default_length)
+        if max_tokens:
+            params["max_tokens"] = int(max_tokens)
+        return params
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import copy
 import os
 import time
 from urllib.error import HTTPError
@@ -9,13 +10,33 @@ import json
 
 import requests
 
+from src.backend.clients.http import get_http
 from src.backend.extraction.factory import ExtracterRegistry
+from src.backend.utils.singleflight import flight_key, get_flight
 
 class Search(ABC):
     @abstractmethod
     def search(self, query, max_retries=3):
         pass
 
+    def _with_results(self, results):
+        """
+        Store results and return a snapshot of the searcher holding them.
+        Searchers are shared by concurrent requests, so callers chaining on the
+        return value (``search(q).get_all_urls()``) must not read ``self.results``,
+        which another request may overwrite in the meantime.
+        """
+        self.results = results
+        snapshot = copy.copy(self)
+        snapshot.results = results
+        return snapshot
+
+    def _coalesced(self, search, *args):
+        """Run ``search(*args)``, sharing the result with identical searches already in flight"""
+        key = flight_key(type(self).__name__, getattr(self, "provider", None),
+                         getattr(self, "num_results", None), *args)
+        return get_flight("search").do(key, search, *args)
+
 class WebSearch(Search):
     PROVIDERS = {
         'google': lambda: GoogleSerperAPIWrapper(k=15),
@@ -45,6 +66,9 @@ class WebSearch(Search):
         :param max_retries: Maximum number of retries on rate limit
         :return: self for method chaining
         """
+        return self._coalesced(self._search, query, max_retries)
+
+    def _search(self, query, max_retries):
         for attempt in range(max_retries):
             try:
 
@@ -55,11 +79,11 @@ class WebSearch(Search):
                 
                 # Parse results based on provider
                 if self.provider in ['google', 'serpapi']:
-                    self.results = search_results['organic']
+                    results = search_results['organic']
                 else:  # duckduckgo
-                    self.results = search_results
-                    
-                return self
+                    results = search_results
+
+                return self._with_results(results)
             except Exception as e:
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)  # Exponential backoff
@@ -100,13 +124,16 @@ class RedditSearch(Search):
 
     def search(self, query, max_retries=3, subreddit=None, limit=10):
         """Search Reddit posts and extract content"""
+        return self._coalesced(self._search, query, max_retries, subreddit, limit)
+
+    def _search(self, query, max_retries, subreddit, limit):
         for attempt in range(max_retries):
             try:
                 if query.startswith(('https://www.reddit.com/', 'https://reddit.com/')):
                     # Handle Reddit URL
                     submission = self.reddit.submission(url=query)
                     extracted_content = self.extractor.extract(query,skip_llm=True)
-                    self.results = [{
+                    results = [{
                         'title': submission.title,
                         'url': submission.url,
                         'subreddit': submission.subreddit.display_name,
@@ -123,10 +150,10 @@ class RedditSearch(Search):
                     else:
                         submissions = self.reddit.subreddit('all').search(query, limit=limit)
 
-                    self.results = []
+                    results = []
                     for submission in submissions:
                         extracted_content = self.extractor.extract(f"https://reddit.com{submission.permalink}",skip_llm=True)
-                        self.results.append({
+                        results.append({
                             'title': submission.title,
                             'url': submission.url,
                             'subreddit': submission.subreddit.display_name,
@@ -136,8 +163,9 @@ class RedditSearch(Search):
                             # 'summary': extracted_content.get('summary', ''),
                             'top_comments': extracted_content.get('top_comments', [])
                         })
-                    
-                return self.results
+
+                self.results = results
+                return results
 
             except Exception as e:
                 if attempt == max_retries - 1:
@@ -179,6 +207,9 @@ class ImageSearch(Search):
         :param max_retries: Maximum number of retries on error/rate limits
         :return: self for method chaining
         """
+        return self._coalesced(self._search, query, max_retries)
+
+    def _search(self, query, max_retries):
         for attempt in range(max_retries):
             try:
                 # For DuckDuckGo (and Brave if it follows similar pattern), we use invoke
@@ -189,8 +220,7 @@ class ImageSearch(Search):
 
                 # Here we assume the provider returns a list of image results.
                 # If the format differs (for example, nested under a key), you may need to adjust.
-                self.results = search_results["images"][:self.num_results]
-                return self
+                return self._with_results(search_results["images"][:self.num_results])
             except Exception as e:
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
@@ -251,19 +281,18 @@ class PixabayImageSearch(Search):
         }
         for attempt in range(max_retries):
             try:
-                response = requests.get(base_url, params=params)
+                response = get_http().get(base_url, params=params)
                 response.raise_for_status()
                 data = response.json()
                 hits = data.get("hits", [])
                 # Extract only the top num_results images
-                self.results = [
+                return self._with_results([
                     {
                         "title": hit.get("tags", "No Title"),
                         "link": hit.get("largeImageURL", hit.get("webformatURL", ""))
                     }
                     for hit in hits
-                ][:self.num_results]
-                return self
+                ][:self.num_results])
             except requests.HTTPError as e:
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)  # Exponential backoff before retrying
@@ -2,6 +2,7 @@ import time
 from typing import Dict, List, Tuple, Union
 import urllib
 from src.backend.agents.state import Section
+from src.backend.clients.http import get_http
 from src.backend.extraction.docintelligence import DocumentExtractor
 import requests
 import re
@@ -36,24 +37,35 @@ def process_url_content(url_meta):
     else:
         return url_meta["content"]
 
-def get_tweet_reference_content(tweet_urls):
-        
+def fetch_tweet_url_content(url):
+    """Download and extract the content behind a link in a tweet"""
+    if url["type"] == "html":
+        try:
+            response = get_http().get(url['url'])
+            url['content'] = response.text if response.status_code == 200 else ""
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not fetch {url['url']}: {e}")
+            url['content'] = ""
+    else:
+        url['content'] = ""
+    return process_url_content(url)
+
+def get_tweet_reference_content(tweet_urls, map_urls=None):
+    """Reference content and link list for the links in a tweet.
+
+    ``map_urls(fn, urls)`` fetches the links (e.g. ``ResearchPool.map`` to fetch them
+    concurrently); by default they are fetched one after another.
+    """
     reference_content=""
     reference_link=""
-    media_markdown = ""
     # Process URLs
     if tweet_urls:
-        for url in tweet_urls:
-            if url["type"]=="html":
-                response = requests.get(url['url'])
-                if response.status_code == 200:
-                    url['content'] = response.text
-                else:
-                    url['content'] = "" 
-            else:    
-                url['content'] = ""
-                
-            reference_content += process_url_content(url)
+        if map_urls is None:
+            contents = [fetch_tweet_url_content(url) for url in tweet_urls]
+        else:
+            contents = map_urls(fetch_tweet_url_content, tweet_urls)
+        for index, (url, content) in enumerate(zip(tweet_urls, contents), 1):
+            reference_content += format_reference_source(index, url["url"], content or "")
             reference_link += "URL:" + url["url"] + "\n"
 
     return reference_content, reference_link
@@ -103,6 +115,10 @@ def format_sections(sections: list[Section]) -> str:
         """
     return formatted_str
 
+def format_reference_source(index: int, url: str, content: str) -> str:
+    """ Format one source of the reference content; the header lets the content budgeter split by source """
+    return f"# Source {index}: {url}\n**Raw Content**:\n{content}\n\n"
+
 def get_media_links(url):
     """
     Extracts clean media links (images, videos, audio) from a web URL.
@@ -112,7 +128,7 @@ def get_media_links(url):
     """
     try:
         # Fetch the web page content
-        response = requests.get(url)
+        response = get_http().get(url)
         response.raise_for_status()  # Raise an error for bad status codes
         soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -1,4 +1,6 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, Query, Security, Body, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -18,6 +20,7 @@ from cachetools import TTLCache
 
 from src.backend.api.routers import content, profiles, content_types, sources, templates, parameters, reddit, health
 from src.backend.api.middleware import register_exception_handlers, request_logging_middleware
+from src.backend.api.dependencies import get_workflow, aclose_workflow, start_job_workers, stop_job_workers
 
 # Setup logger
 logger = setup_logger(__name__)
@@ -39,10 +42,28 @@ auth_cache = TTLCache(maxsize=settings.auth_cache_size, ttl=settings.auth_cache_
 db_manager = DatabaseConnectionManager()
 security = HTTPBearer()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared resources once per worker and release them on shutdown"""
+    try:
+        await get_workflow().asetup()
+        logger.info("Shared AgentWorkflow initialized")
+    except Exception as e:
+        # Don't block startup (e.g. database briefly unavailable); the first
+        # generation request retries the initialization.
+        logger.error(f"Failed to initialize shared AgentWorkflow at startup: {e}")
+    start_job_workers()
+    yield
+    # Running jobs get a short grace period; the rest are retried by another worker
+    await asyncio.to_thread(stop_job_workers, 10)
+    await aclose_workflow()
+
+
 app = FastAPI(
     title="PostBot API",
     version="1.0.0",
-    description="AI-powered content generation and management platform"
+    description="AI-powered content generation and management platform",
+    lifespan=lifespan
 )
 
 # Register exception handlers for consistent error responses
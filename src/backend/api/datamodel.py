@@ -542,6 +542,8 @@ class GeneratePostRequestModel(BaseModel):
     url: Optional[str] = None
     topic: Optional[str] = None
     feedback: Optional[str] = None  # Add this field
+    feedback_scope: Optional[str] = "sections"  # "sections" or "full"
+    use_cache: bool = True  # Reuse memoized plan/section/post outputs and cached LLM responses for identical inputs
     reddit_query: Optional[str] = None
     subreddit: Optional[str] = None
     template_id: Optional[str] = None
@@ -573,4 +575,37 @@ class BlogResponse(BaseModel):
     tags: Optional[List[str]]
     feedback_applied: Optional[bool]
     linkedin_post_generated: Optional[bool]
-    twitter_post_generated: Optional[bool]
\ No newline at end of file
+    twitter_post_generated: Optional[bool]
+
+
+class GenerationJobResponse(BaseModel):
+    job_id: UUID
+    thread_id: UUID
+    status: str  # queued, running, succeeded or failed
+    attempts: int = 0
+    max_attempts: int
+    error: Optional[str] = None
+    result: Optional[BlogResponse] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class UsageStats(BaseModel):
+    """Duration and cost percentiles of a node (or an LLM model called from it) over a profile's generations"""
+    node: Optional[str] = None  # node name; the operation (generate, social_posts, feedback) for generations
+    model: Optional[str] = None  # set for LLM calls
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    prompt_tokens: int
+    cached_tokens: int
+    completion_tokens: int
+    total_cost_usd: float
+    p50_cost_usd: float
+    p95_cost_usd: float
+    p99_cost_usd: float
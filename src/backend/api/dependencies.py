@@ -1,12 +1,16 @@
+import threading
 from fastapi import HTTPException, Request, Security, Header
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from cachetools import TTLCache
 from uuid import UUID
 from src.backend.agents.blogs import AgentWorkflow
 from src.backend.api.datamodel import UserProfileResponse
+from src.backend.db.checkpoint import aclose_checkpoint_pools
 from src.backend.auth import get_auth_provider
 from src.backend.db.repositories.profile import ProfileRepository
 from src.backend.exceptions import AuthenticationException
+from src.backend.jobs import GenerationWorkerPool
+from src.backend.settings import get_settings
 from typing import Optional
 
 
@@ -18,9 +22,50 @@ auth_provider = get_auth_provider()
 profile_repository = ProfileRepository()
 
 # Agent Workflow Endpoint
+# A single AgentWorkflow is shared by every request in this worker process. Building one
+# compiles the LangGraph graph and creates the LLM router, search clients and repositories,
+# so it is done once (at startup via the app lifespan, or lazily on first use) instead of
+# per request. Checkpointer connections come from the pools in db/checkpoint.py.
+_workflow: Optional[AgentWorkflow] = None
+_workflow_lock = threading.Lock()
+
+
 def get_workflow() -> AgentWorkflow:
-    """Dependency to get a AgentWorkflow instance."""
-    return AgentWorkflow()
+    """Dependency to get the process-wide AgentWorkflow instance."""
+    global _workflow
+    if _workflow is None:
+        with _workflow_lock:
+            if _workflow is None:
+                _workflow = AgentWorkflow()
+    return _workflow
+
+
+async def aclose_workflow() -> None:
+    """Release the shared AgentWorkflow and both checkpointer pools (called on application shutdown)."""
+    global _workflow
+    _workflow = None
+    await aclose_checkpoint_pools()
+
+
+# Background generation workers for this process (see src/backend/jobs.py)
+_job_pool: Optional[GenerationWorkerPool] = None
+
+
+def start_job_workers() -> Optional[GenerationWorkerPool]:
+    """Start the generation worker pool sharing the process-wide workflow (none when JOB_WORKERS=0)."""
+    global _job_pool
+    if _job_pool is None and get_settings().job_workers > 0:
+        _job_pool = GenerationWorkerPool.from_settings(get_workflow)
+        _job_pool.start()
+    return _job_pool
+
+
+def stop_job_workers(timeout: Optional[float] = None) -> None:
+    """Stop the generation worker pool; unfinished jobs are retried once their lease expires."""
+    global _job_pool
+    if _job_pool is not None:
+        _job_pool.stop(timeout)
+        _job_pool = None
 
 
 async def verify_auth_token(
@@ -1,18 +1,19 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
-from src.backend.api.datamodel import BlogResponse, Content, ContentUpdate, ContentListResponse, ContentListItem, SaveContentRequest, ScheduleContentRequest, GeneratePostRequestModel
-from src.backend.db.repositories import ContentRepository, ProfileRepository, ContentTypeRepository, TemplateRepository
+from src.backend.api.datamodel import BlogResponse, Content, ContentUpdate, ContentListResponse, ContentListItem, SaveContentRequest, ScheduleContentRequest, GeneratePostRequestModel, GenerationJobResponse, UsageStats
+from src.backend.db.repositories import ContentRepository, ProfileRepository, ContentTypeRepository, TemplateRepository, JobRepository, LedgerRepository
 from src.backend.api.dependencies import get_current_user_profile, get_workflow
 from uuid import UUID
 import json
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional
 from fastapi import Query
 from src.backend.agents.blogs import AgentWorkflow
 from src.backend.utils.logger import setup_logger
 from src.backend.api.formatters import format_content_list_response, format_content_list_item
 from fastapi.responses import StreamingResponse
 from fastapi import BackgroundTasks
+from src.backend.settings import get_settings
 
 logger = setup_logger(__name__)
 
@@ -23,6 +24,8 @@ content_repository = ContentRepository()
 profile_repository = ProfileRepository()
 content_type_repository = ContentTypeRepository()
 template_repository = TemplateRepository()
+job_repository = JobRepository()
+ledger_repository = LedgerRepository()
 
 
 # Update content endpoints to use profile_id
@@ -64,7 +67,7 @@ async def generate_generic_blog(
 
         # Proceed with generation
         logger.debug("Starting workflow execution")
-        result = workflow.run_generic_workflow(payload_dict, thread_id, current_user)
+        result = await workflow.arun_generic_workflow(payload_dict, thread_id, current_user)
         logger.debug("Workflow execution completed")
 
         # Increment generation count
@@ -78,6 +81,49 @@ async def generate_generic_blog(
         logger.error(f"Unexpected error in generate_generic_blog: {str(e)}", exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/content/jobs", response_model=GenerationJobResponse, status_code=202)
+async def submit_generation_job(
+    payload: GeneratePostRequestModel,
+    current_user: dict = Depends(get_current_user_profile),
+):
+    """Queue a generation job and return its id without waiting for the workflow."""
+    try:
+        thread_id = payload.thread_id or str(uuid.uuid4())
+
+        # Queued and running jobs count against the limit until they finish
+        limit_response = await check_generation_limit(current_user.profile_id)
+        pending = job_repository.count_pending(UUID(current_user.profile_id))
+        if limit_response['generations_used'] + pending >= limit_response['max_generations']:
+            logger.warning(f"Generation limit reached for user {current_user.id}")
+            raise HTTPException(status_code=403, detail="Generation limit reached")
+
+        job = job_repository.enqueue(
+            profile_id=UUID(current_user.profile_id),
+            thread_id=UUID(thread_id),
+            payload=payload.model_dump(),
+            user_context=current_user.model_dump(),
+            max_attempts=get_settings().job_max_attempts,
+        )
+        logger.info(f"Queued generation job {job.job_id} for thread {thread_id}")
+        return job
+    except HTTPException as e:
+        logger.error(f"HTTP Exception in submit_generation_job: {str(e)}")
+        raise e
+    except Exception as e:
+        logger.error(f"Unexpected error in submit_generation_job: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/content/jobs/{job_id}", response_model=GenerationJobResponse)
+async def get_generation_job(
+    job_id: UUID,
+    current_user: dict = Depends(get_current_user_profile),
+):
+    """Get the status of a generation job, with the generated content once it succeeded."""
+    job = job_repository.get_for_profile(job_id, UUID(current_user.profile_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 async def check_generation_limit(profile_id: UUID) -> Dict:
     """Check the generation limit for a specific profile."""
     profile_data = profile_repository.get_with_generation_limits(profile_id)
@@ -138,6 +184,24 @@ async def stream_generic_blog(
         logger.error(f"Unexpected error in stream_generic_blog: {str(e)}", exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/content/usage", response_model=List[UsageStats])
+async def get_usage_stats(
+    kind: Literal["generation", "node", "llm"] = "node",
+    days: int = Query(30, ge=1, le=365),
+    current_user: dict = Depends(get_current_user_profile),
+):
+    """Latency, token and cost percentiles of the current profile's recent generations.
+
+    ``kind=generation`` covers whole runs per operation, ``node`` each graph node and
+    ``llm`` the LLM calls per node and model; the most time-consuming come first.
+    """
+    try:
+        return ledger_repository.percentiles(UUID(current_user.profile_id), kind, days)
+    except Exception as e:
+        logger.error(f"Error getting usage stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/content/filter", response_model=ContentListResponse)
 async def filter_content(
     skip: int = 0,
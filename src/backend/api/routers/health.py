@@ -1,10 +1,12 @@
 """Health check endpoints for monitoring and uptime checks."""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime
 from typing import Dict, Any
 import psycopg
 from src.backend.settings import get_settings
 from src.backend.auth import get_auth_provider
+from src.backend.api.dependencies import get_current_user_profile
+from src.backend.utils.metrics import metrics
 
 router = APIRouter(tags=["health"])
 
@@ -119,3 +121,19 @@ async def startup_check() -> Dict[str, Any]:
         "timestamp": datetime.utcnow().isoformat(),
         "service": "postbot-backend"
     }
+
+
+@router.get("/metrics", dependencies=[Depends(get_current_user_profile)])
+async def metrics_snapshot() -> Dict[str, Any]:
+    """
+    In-process metrics for this worker (counters, timings and gauges such as
+    checkpointer pool statistics and connection wait times).
+    Requires authentication, since it exposes pool, rate limit and cache internals.
+
+    Suitable for: debugging and scraping by an authenticated metrics agent
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "service": "postbot-backend",
+        **metrics.snapshot()
+    }
@@ -0,0 +1,325 @@
+"""
+Shared HTTP client for outbound fetches (web pages, PDFs, READMEs, media, image search).
+
+``get_http()`` returns one ``HttpSession`` per process, a ``requests.Session`` with:
+
+* keep-alive connection pools per host (``pool_connections`` hosts, ``pool_maxsize``
+  connections each), so repeated fetches from a host skip the TCP and TLS handshakes
+* default ``(connect, read)`` timeouts for calls that do not pass one
+* a cap on response bodies: responses that are not streamed are read in chunks and
+  abandoned with ``ResponseTooLarge`` past ``max_bytes``; streamed responses raise it
+  while their body is read (``iter_content``, and ``content``/``iter_lines`` built on
+  it), so headers alone can still be fetched; ``download`` streams a body to a file
+  under the same cap
+* retries of GET and HEAD requests on connection errors, timeouts, 429 and 5xx answers,
+  with exponential backoff and full jitter (Retry-After is honoured)
+* one User-Agent for every request
+
+Settings are under ``http`` in config.yaml. MarkItDown converters are given the session
+as well, so URL conversions share its pools, timeouts and User-Agent.
+
+``get_async_http()`` is the async counterpart on httpx, for native async extractors,
+with the same settings. An httpx client is bound to the event loop that opened its
+connections, so it keeps one client per running loop. It raises the ``requests``
+exception types (``ConnectionError``, ``Timeout``, ``HTTPError`` from
+``raise_for_status``), so callers handle both paths alike.
+"""
+import asyncio
+import functools
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.backend.config import Config, ConfigLoader
+from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+RETRY_METHODS = {"GET", "HEAD"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    """A response body exceeded the size cap"""
+
+
+def _too_large(url, max_bytes: int, response=None) -> ResponseTooLarge:
+    metrics.increment("http.too_large")
+    return ResponseTooLarge(f"Response from {url} exceeds {max_bytes} bytes", response=response)
+
+
+def _requests_error(error: httpx.HTTPError) -> requests.RequestException:
+    """The ``requests`` exception matching an httpx one"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return requests.HTTPError(str(error), response=error.response)
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.Timeout(str(error))
+    if isinstance(error, httpx.TooManyRedirects):
+        return requests.TooManyRedirects(str(error))
+    if isinstance(error, (httpx.UnsupportedProtocol, httpx.InvalidURL)):
+        return requests.exceptions.InvalidURL(str(error))
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(str(error))
+    return requests.RequestException(str(error))
+
+
+def _raise_for_status(response: httpx.Response) -> httpx.Response:
+    """``response.raise_for_status`` raising ``requests.HTTPError``"""
+    try:
+        return httpx.Response.raise_for_status(response)
+    except httpx.HTTPStatusError as e:
+        raise _requests_error(e) from e
+
+
+def _over_length(headers, max_bytes: int) -> bool:
+    """Whether the declared Content-Length exceeds ``max_bytes``"""
+    length = headers.get("Content-Length", "")
+    return bool(max_bytes) and length.isdigit() and int(length) > max_bytes
+
+
+def _retry_delay(attempt: int, backoff: float, max_backoff: float, headers=None) -> float:
+    """Retry-After if the server sent one, else full jitter over the exponential backoff"""
+    try:
+        return min(float((headers or {}).get("Retry-After", "")), max_backoff)
+    except ValueError:
+        return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+
+
+def _note_retry(reason: str, delay: float) -> None:
+    metrics.increment("http.retries")
+    logger.debug(f"{reason}; retrying in {delay:.2f}s")
+
+
+class HttpSession(requests.Session):
+    """requests.Session with pooling, default timeouts, size caps and jittered retries"""
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_bytes: int = 20 * 1024 * 1024, retries: int = 2, backoff: float = 0.5,
+                 max_backoff: float = 10.0, pool_connections: int = 32, pool_maxsize: int = 16,
+                 user_agent: str = "postbot/1.0"):
+        """
+        Args:
+            max_bytes: Largest response body read, in bytes (0 disables the cap)
+            retries: Retries of a GET or HEAD request after the first attempt
+            backoff: Base delay in seconds; attempt ``n`` waits up to ``backoff * 2**n``
+        """
+        super().__init__()
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    @classmethod
+    def from_config(cls, config: Config) -> "HttpSession":
+        return cls(**config.class_params)
+
+    def request(self, method: str, url: str, max_bytes: Optional[int] = None, **kwargs) -> requests.Response:
+        """Send a request; the body is read under ``max_bytes``, when it is iterated if ``stream=True``"""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        stream = kwargs.pop("stream", False)
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        retries = self.retries if method.upper() in RETRY_METHODS else 0
+        metrics.increment("http.requests")
+
+        for attempt in range(retries + 1):
+            try:
+                response = super().request(method, url, stream=True, **kwargs)
+                if response.status_code in RETRY_STATUSES and attempt < retries:
+                    response.close()
+                    self._wait(attempt, f"{method} {url} answered {response.status_code}", response.headers)
+                    continue
+                if stream:
+                    self._cap(response, max_bytes)
+                else:
+                    self._read(response, max_bytes)
+                return response
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                self._wait(attempt, f"{method} {url} failed: {e}")
+
+    def download(self, url: str, path: str, max_bytes: Optional[int] = None, **kwargs) -> requests.Response:
+        """Stream the body of a GET to ``path``; nothing is left behind if it exceeds ``max_bytes``"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        response = self.get(url, stream=True, max_bytes=max_bytes, **kwargs)
+        response.raise_for_status()
+        try:
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+        except BaseException:
+            response.close()
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return response
+
+    def _read(self, response: requests.Response, max_bytes: int) -> None:
+        """Load the body into ``response.content``, giving up past ``max_bytes``"""
+        body = bytearray()
+        if not _over_length(response.headers, max_bytes):
+            for chunk in response.iter_content(CHUNK_SIZE):
+                body += chunk
+                if max_bytes and len(body) > max_bytes:
+                    break
+            else:
+                response._content = bytes(body)
+                return
+        response.close()
+        raise _too_large(response.url, max_bytes, response)
+
+    @staticmethod
+    def _cap(response: requests.Response, max_bytes: int) -> None:
+        """Make reads of a streamed body raise ``ResponseTooLarge`` past ``max_bytes``"""
+        if not max_bytes:
+            return
+        iter_content = response.iter_content
+
+        def capped(chunk_size=1, decode_unicode=False):
+            if _over_length(response.headers, max_bytes):
+                response.close()
+                raise _too_large(response.url, max_bytes, response)
+            size = 0
+            for chunk in iter_content(chunk_size, decode_unicode):
+                size += len(chunk)
+                if size > max_bytes:
+                    response.close()
+                    raise _too_large(response.url, max_bytes, response)
+                yield chunk
+
+        response.iter_content = capped
+
+    def _wait(self, attempt: int, reason: str, headers=None) -> None:
+        delay = _retry_delay(attempt, self.backoff, self.max_backoff, headers)
+        _note_retry(reason, delay)
+        time.sleep(delay)
+
+
+class AsyncHttpSession:
+    """httpx counterpart of HttpSession: same timeouts, size cap, retries and User-Agent"""
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_bytes: int = 20 * 1024 * 1024, retries: int = 2, backoff: float = 0.5,
+                 max_backoff: float = 10.0, pool_connections: int = 32, pool_maxsize: int = 16,
+                 user_agent: str = "postbot/1.0", transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            transport: httpx transport of the clients (e.g. ``httpx.MockTransport`` in tests)
+        """
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=None,
+                                   max_keepalive_connections=pool_connections * pool_maxsize)
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = {"User-Agent": user_agent}
+        self.transport = transport
+        self._clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+
+    @classmethod
+    def from_config(cls, config: Config) -> "AsyncHttpSession":
+        return cls(**config.class_params)
+
+    def client(self) -> httpx.AsyncClient:
+        """The httpx client of the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(headers=self.headers, timeout=self.timeout, limits=self.limits,
+                                       follow_redirects=True, transport=self.transport)
+            self._clients[loop] = client
+        return client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def request(self, method: str, url: str, max_bytes: Optional[int] = None, **kwargs) -> httpx.Response:
+        """Send a request and read its body under ``max_bytes``
+
+        Raises:
+            requests.RequestException: on transport errors, after the retries
+        """
+        client = self.client()
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        retries = self.retries if method.upper() in RETRY_METHODS else 0
+        metrics.increment("http.requests")
+
+        for attempt in range(retries + 1):
+            try:
+                response = await client.send(client.build_request(method, url, **kwargs), stream=True)
+                if response.status_code in RETRY_STATUSES and attempt < retries:
+                    await response.aclose()
+                    await self._wait(attempt, f"{method} {url} answered {response.status_code}", response.headers)
+                    continue
+                await self._read(response, max_bytes)
+                response.raise_for_status = functools.partial(_raise_for_status, response)
+                return response
+            except (httpx.TransportError, httpx.TooManyRedirects) as e:
+                if attempt >= retries or not isinstance(e, httpx.TransportError):
+                    raise _requests_error(e) from e
+                await self._wait(attempt, f"{method} {url} failed: {e}")
+
+    async def _read(self, response: httpx.Response, max_bytes: int) -> None:
+        """Load the body into ``response.content``, giving up past ``max_bytes``"""
+        body = bytearray()
+        try:
+            if not _over_length(response.headers, max_bytes):
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    body += chunk
+                    if max_bytes and len(body) > max_bytes:
+                        break
+                else:
+                    response._content = bytes(body)
+                    return
+        finally:
+            await response.aclose()
+        raise _too_large(response.url, max_bytes)
+
+    async def _wait(self, attempt: int, reason: str, headers=None) -> None:
+        delay = _retry_delay(attempt, self.backoff, self.max_backoff, headers)
+        _note_retry(reason, delay)
+        await asyncio.sleep(delay)
+
+
+_session: Optional[HttpSession] = None
+_async_session: Optional[AsyncHttpSession] = None
+_session_lock = threading.Lock()
+
+
+def get_http() -> HttpSession:
+    """The process-wide HTTP session"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession.from_config(ConfigLoader().get_config("http.default"))
+        return _session
+
+
+def get_async_http() -> AsyncHttpSession:
+    """The process-wide async HTTP session"""
+    global _async_session
+    with _session_lock:
+        if _async_session is None:
+            _async_session = AsyncHttpSession.from_config(ConfigLoader().get_config("http.default"))
+        return _async_session
@@ -1,17 +1,130 @@
-from typing import Any, List, Optional, Dict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from litellm import Router
+from litellm.router_utils.cooldown_handlers import _get_cooldown_deployments
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from src.backend.config import Config, ConfigLoader
+from src.backend.clients.llm_cache import ResponseCache, get_response_cache
+from src.backend.clients.rate_limit import get_governor, is_rate_limit_error
+from src.backend.settings import get_settings
+from src.backend.utils.ledger import record_llm_call
+from src.backend.utils.metrics import metrics
+from src.backend.utils.singleflight import get_flight
+import asyncio
 import backoff
+import hashlib
+import json
 import logging
+import threading
+import time
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 # litellm.set_verbose=True
 
+def _is_not_rate_limit(e: Exception) -> bool:
+    """Only rate-limit errors are retried by the backoff decorator"""
+    return not is_rate_limit_error(e)
+
+
+def _log_backoff(details):
+    logger.warning(
+        f"Retry attempt {details['tries']} after {details['wait']:.1f}s due to: {str(details['exception'])[:100]}"
+    )
+
+
+class LLMUsage:
+    """Token usage accumulated over the LLM calls of one generation"""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.completion_tokens += completion_tokens
+
+    @property
+    def cached_ratio(self) -> float:
+        """Share of input tokens served from the provider's prompt cache"""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+_current_usage: ContextVar[Optional[LLMUsage]] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_usage():
+    """Collect the usage of every LLM call made in this context (including graph tasks it starts)"""
+    usage = LLMUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def record_usage(prompt_tokens: int, cached_tokens: int = 0, completion_tokens: int = 0,
+                 model: Optional[str] = None, duration_ms: float = 0.0) -> None:
+    """Add one call's usage to the metrics, the generation being tracked and its ledger, if any"""
+    metrics.increment("llm.calls")
+    metrics.increment("llm.prompt_tokens", prompt_tokens)
+    metrics.increment("llm.cached_prompt_tokens", cached_tokens)
+    metrics.increment("llm.completion_tokens", completion_tokens)
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add(prompt_tokens, cached_tokens, completion_tokens)
+    record_llm_call(model, duration_ms, prompt_tokens, cached_tokens, completion_tokens)
+
+
+def _record_response_usage(usage, model: str, started: float) -> None:
+    """Record a litellm ``Usage`` (cached tokens are reported as prompt_tokens_details.cached_tokens)
+    for a call that started at ``started`` (``time.perf_counter()``)"""
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = (getattr(details, "cached_tokens", None) if details else None) \
+        or getattr(usage, "cache_read_input_tokens", None) or 0
+    record_usage(usage.prompt_tokens or 0, cached, usage.completion_tokens or 0,
+                 model=model, duration_ms=(time.perf_counter() - started) * 1000)
+
+
+_routers: Dict[str, Router] = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(**router_params) -> Router:
+    """Router for these settings, shared by the clients of this process.
+
+    Every litellm Router adds its callbacks to litellm's process-wide callback lists,
+    which are capped (MAX_CALLBACKS); past the cap new routers silently lose latency
+    tracking. Clients of the same llm config therefore share one Router.
+    """
+    key = json.dumps(router_params, sort_keys=True, default=str)
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None:
+            router = _routers[key] = Router(**router_params)
+        return router
+
 class Message:
-    def __init__(self, content: str):
+    def __init__(self, content: str, cache: bool = False):
+        """
+        Args:
+            content: Message text
+            cache: Marks the message as part of a prompt prefix shared by several calls,
+                to be cached by the provider when the client uses explicit prompt caching
+        """
         self.content = content
+        self.cache = cache
 
     def __call__(self):
         return self.to_dict()
@@ -28,40 +141,172 @@ class SystemMessage(Message):
         return {"role": "system", "content": self.content}
 
 class LLMClient:
-    def __init__(self, config_path: str = "llm.default"):
+    # Keys of an llm config that configure the client and its router rather than a deployment
+    ROUTING_PARAMS = ("prompt_caching", "prompt_cache_ttl", "prompt_cache_warmup", "deployments", "fallbacks",
+                      "routing_strategy", "timeout", "allowed_fails", "cooldown_time", "rate_limit")
+
+    def __init__(self, config_path: Optional[str] = None):
         """
         Initialize LLM client with a specific configuration
         Args:
-            config_path: Configuration path (e.g., "llm.chat", "llm.completion")
+            config_path: Configuration path (e.g., "llm.chat", "llm.completion");
+                defaults to the LLM_CONFIG setting ("llm.default")
         """
+        config_path = config_path or get_settings().llm_config
         self.loader = ConfigLoader()
-        try:
-            self.config = self.loader.get_config(config_path)
-        except ValueError as e:
-            available_configs = self.loader.list_configs("llm")
-            raise ValueError(f"Invalid configuration: {config_path}. Available configs: {available_configs}")
+        self.config = self._load_config(config_path)
+        params = self.config.class_params
         
         # Get retry configuration from config
-        self.num_retries = self.config.class_params.get('num_retries', 3)
-        
-        # Build model_list for Router from config
-        model = self.config.class_params.get('model', 'gpt-3.5-turbo')
-        max_parallel_requests = self.config.class_params.get('max_parallel_requests', 10)  # Default to 10 if not set
+        self.num_retries = params.get('num_retries', 3)
+        max_parallel_requests = params.get('max_parallel_requests', 10)  # Default to 10 if not set
         
-        litellm_params = self.config.class_params.copy()
+        # "implicit": prompts keep shared content as a stable prefix (providers cache it
+        # automatically); "explicit": cacheable messages are also marked with cache_control
+        # (e.g. Gemini cachedContents via litellm); "off": per-call prompts
+        self.prompt_caching = params.get('prompt_caching', 'implicit') or 'off'
+        self.prompt_cache_ttl = params.get('prompt_cache_ttl', 600)
+        # Longest wait, in seconds, of calls sharing a prefix for the first call to create its cache
+        self.prompt_cache_warmup = params.get('prompt_cache_warmup', 2.0)
+        # Prefixes whose provider cache was created by an earlier call
+        self._warm_prefixes = TTLCache(maxsize=256, ttl=self.prompt_cache_ttl)
+        # Prefixes being warmed: set when the leading call has created the cache or given up
+        self._warming_events: Dict[str, threading.Event] = {}
+        self._awarming_events: Dict[str, asyncio.Event] = {}
+        self._warming_lock = threading.Lock()
+        # Clients of other llm configs used alongside this one (see variant)
+        self._variants: Dict[str, 'LLMClient'] = {}
+        self._variants_lock = threading.Lock()
         
-        model_list = [{
-            "model_name": model,  # Use actual model as alias
-            "litellm_params": litellm_params
-        }]
+        deployments = params.get('deployments')
+        fallbacks = params.get('fallbacks') or []
+        if deployments:
+            # A group of llm configs served as one model: the router picks a deployment per
+            # call (routing_strategy) and moves to the fallback group on timeouts, 429s and errors
+            self.model_name = quota_name = self.config.name
+            fallback_group = f"{self.model_name}-fallback"
+            model_list = [self._deployment(self.model_name, name, name) for name in deployments]
+            model_list += [self._deployment(fallback_group, name, f"fallback/{name}") for name in fallbacks]
+            router_fallbacks = [{self.model_name: [fallback_group]}] if fallbacks else []
+            # The router picks the deployment, so the group is governed by their combined quota
+            rate_limit, group_parallel = self._group_quota(deployments)
+            rate_limit = params.get('rate_limit') or rate_limit
+            max_parallel_requests = params.get('max_parallel_requests', group_parallel)
+        else:
+            model = params.get('model', 'gpt-3.5-turbo')
+            self.model_name = quota_name = model  # Use actual model as alias
+            model_list = [{
+                "model_name": model,
+                "litellm_params": self._litellm_params(params),
+                "model_info": {"id": self.config.name},
+            }]
+            router_fallbacks = []
+            rate_limit = params.get('rate_limit')
+            api_key = str(params.get('api_key') or '')
+            if api_key.startswith('os.environ/'):
+                # Quotas are per key: configs of the model on another key get buckets of their own
+                quota_name = f"{model}@{api_key[len('os.environ/'):]}"
+        self.deployments = {d["model_info"]["id"]: d for d in model_list}
+        self.routing_strategy = params.get('routing_strategy', 'simple-shuffle')
         
-        # Initialize Router with built-in concurrency control
-        self.router = Router(
+        # Router with built-in concurrency control, shared by the clients of this config
+        self.router = get_router(
             model_list=model_list,
-            num_retries=self.num_retries
+            num_retries=self.num_retries,
+            routing_strategy=self.routing_strategy,
+            fallbacks=router_fallbacks,
+            timeout=params.get('timeout'),
+            allowed_fails=params.get('allowed_fails'),
+            cooldown_time=params.get('cooldown_time'),
         )
-        self.model_name = model
-        logger.info(f"Initialized LLMClient with model={model}, max_parallel_requests={max_parallel_requests}, num_retries={self.num_retries}")
+        # Exact-match response cache shared by the clients of this process (None when disabled)
+        self.response_cache = get_response_cache()
+        # RPM/TPM buckets and adaptive concurrency for this model, shared by the clients of
+        # this process (configs of the same model share one) and, with LLM_RATE_LIMIT_URL,
+        # by all workers (None without rate_limit)
+        self.governor = get_governor(quota_name, rate_limit, max_parallel_requests)
+        if deployments:
+            metrics.register_gauge(f"llm_routing.{self.config.name}", self.routing_stats)
+        logger.info(f"Initialized LLMClient with model={self.model_name}, deployments={list(self.deployments)}, "
+                    f"routing_strategy={self.routing_strategy}, max_parallel_requests={max_parallel_requests}, "
+                    f"num_retries={self.num_retries}")
+
+    def _load_config(self, config_path: str) -> Config:
+        try:
+            return self.loader.get_config(config_path)
+        except ValueError as e:
+            available_configs = self.loader.list_configs("llm")
+            raise ValueError(f"Invalid configuration: {config_path}. Available configs: {available_configs}")
+
+    def _litellm_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        litellm_params = {k: v for k, v in params.items() if k not in self.ROUTING_PARAMS}
+        # The router weighs deployments of a group by their quota (usage-based routing)
+        litellm_params.update(params.get('rate_limit') or {})
+        return litellm_params
+
+    def _deployment(self, group: str, name: str, deployment_id: str) -> Dict[str, Any]:
+        """Router entry serving ``group`` with the settings of the llm config ``name``"""
+        config = self._load_config(f"llm.{name}")
+        return {
+            "model_name": group,
+            "litellm_params": self._litellm_params(config.class_params),
+            "model_info": {"id": deployment_id},
+        }
+
+    def _group_quota(self, deployments: List[str]) -> Tuple[Dict[str, float], int]:
+        """Combined rate_limit (limits set by every deployment) and max_parallel_requests of a group"""
+        configs = [self._load_config(f"llm.{name}").class_params for name in deployments]
+        limits = [config.get('rate_limit') or {} for config in configs]
+        rate_limit = {
+            limit: sum(deployment[limit] for deployment in limits)
+            for limit in ("rpm", "tpm") if all(deployment.get(limit) for deployment in limits)
+        }
+        return rate_limit, sum(config.get('max_parallel_requests', 10) for config in configs)
+
+    def _record_route(self, response, started: float) -> str:
+        """Record which deployment served a call and its latency; returns the deployment's model"""
+        hidden = getattr(response, "_hidden_params", None) or {}
+        deployment = hidden.get("model_id")
+        if deployment in self.deployments:
+            metrics.observe(f"llm.deployment.{deployment}", (time.perf_counter() - started) * 1000)
+            fallbacks = (hidden.get("additional_headers") or {}).get("x-litellm-attempted-fallbacks") or 0
+            if fallbacks:
+                metrics.increment("llm.fallbacks", fallbacks)
+        return hidden.get("litellm_model_name") or self.model_name
+
+    def routing_stats(self) -> Dict[str, Any]:
+        """Deployments of this client with their latency, call count and cooldown state"""
+        try:
+            cooling_down = set(_get_cooldown_deployments(self.router, None))
+        except Exception:
+            cooling_down = set()
+        return {
+            "strategy": self.routing_strategy,
+            "fallbacks": metrics.counter("llm.fallbacks"),
+            "deployments": {
+                deployment_id: {
+                    "group": d["model_name"],
+                    "model": d["litellm_params"].get("model"),
+                    "cooling_down": deployment_id in cooling_down,
+                    **metrics.timing(f"llm.deployment.{deployment_id}"),
+                }
+                for deployment_id, d in self.deployments.items()
+            },
+        }
+
+    def variant(self, config_path: str) -> 'LLMClient':
+        """Client of another llm config (e.g. "llm.gemini-lite"), created once per client.
+
+        Callers holding a client for their main model reach cheaper tiers through it, so
+        replacing the client (e.g. with a fake in tests) replaces its variants too.
+        """
+        if config_path == self.config.path:
+            return self
+        with self._variants_lock:
+            client = self._variants.get(config_path)
+            if client is None:
+                client = self._variants[config_path] = LLMClient(config_path)
+            return client
 
     @classmethod
     def from_config(cls, config: Config) -> 'LLMClient':
@@ -70,42 +315,362 @@ class LLMClient:
         instance.config = config
         return instance
 
+    # Settings that change what the model returns for the same prompt
+    OUTPUT_PARAMS = ("model", "temperature", "top_p", "top_k", "max_tokens", "seed")
+
+    @property
+    def cache_key_params(self) -> Dict[str, Any]:
+        """Model settings that identify this client's outputs in caches"""
+        params = self.config.class_params
+        key_params = {k: params[k] for k in self.OUTPUT_PARAMS if k in params}
+        if params.get("deployments"):
+            # Any deployment of a group may serve the call
+            key_params["deployments"] = sorted(
+                json.dumps({k: d["litellm_params"][k] for k in self.OUTPUT_PARAMS if k in d["litellm_params"]},
+                           sort_keys=True, default=str)
+                for d in getattr(self, "deployments", {}).values()
+            )
+        return key_params
+
+    # Response cache: a call is answered from the cache when the model settings, call
+    # parameters and messages match an earlier call. Identical calls already in flight
+    # share one provider call (single flight). Callers bypass both with cache=False.
+
+    def _request_key(self, messages: List[Any], kwargs: Dict[str, Any]) -> str:
+        plain = [m.to_dict() if isinstance(m, Message) else m for m in messages]
+        return ResponseCache.key(self.cache_key_params, plain, kwargs)
+
+    def _response_cache_lookup(self, key: Optional[str]) -> Optional[str]:
+        response_cache = getattr(self, "response_cache", None)
+        if response_cache is None or key is None:
+            return None
+        return response_cache.get(key)
+
+    async def _aresponse_cache_lookup(self, key: Optional[str]) -> Optional[str]:
+        """Async counterpart of _response_cache_lookup; persistent store reads run in a thread"""
+        response_cache = getattr(self, "response_cache", None)
+        if response_cache is not None and response_cache.store is not None:
+            return await asyncio.to_thread(self._response_cache_lookup, key)
+        return self._response_cache_lookup(key)
+
+    def _response_cache_store(self, key: Optional[str], response: str) -> None:
+        response_cache = getattr(self, "response_cache", None)
+        if response_cache is not None and key is not None:
+            response_cache.set(key, response, self.model_name)
+
+    async def _aresponse_cache_store(self, key: Optional[str], response: str) -> None:
+        response_cache = getattr(self, "response_cache", None)
+        if response_cache is not None and key is not None and response_cache.store is not None:
+            await asyncio.to_thread(self._response_cache_store, key, response)
+        else:
+            self._response_cache_store(key, response)
+
     def _convert_messages(self, messages: List[Any]) -> List[Dict[str, Any]]:
         converted = []
         for msg in messages:
             if isinstance(msg, Message):
-                converted.append(msg.to_dict())
+                message = msg.to_dict()
+                if msg.cache and self.prompt_caching == "explicit":
+                    message["content"] = [{
+                        "type": "text",
+                        "text": msg.content,
+                        "cache_control": {"type": "ephemeral", "ttl": f"{self.prompt_cache_ttl}s"},
+                    }]
+                converted.append(message)
             elif isinstance(msg, dict):
                 converted.append(msg)
             else:
                 raise ValueError(f"Unsupported message type: {type(msg)}")
         return converted
     
+    # With explicit caching, concurrent calls sharing a prefix (the section fan-out) would
+    # each create their own provider cache. The first call per prefix goes ahead; the
+    # others wait until its cache exists and then reuse it.
+    #
+    # A stream's cache exists once the stream opens, so followers of a streaming leader
+    # wait for that. A non-streaming call only reports back when its whole completion is
+    # done, which would serialize the fan-out behind one section; its followers therefore
+    # wait at most prompt_cache_warmup seconds (by then litellm has created the cache in
+    # its pre-request in the common case). The cost is up to prompt_cache_warmup seconds
+    # of added latency per follower on the first use of a prefix; a follower released
+    # before the cache exists creates a duplicate cache, as without warming.
+
+    def _cache_prefix_key(self, messages: List[Any]) -> Optional[str]:
+        if self.prompt_caching != "explicit":
+            return None
+        prefix = [m.content for m in messages if isinstance(m, Message) and m.cache]
+        if not prefix:
+            return None
+        return hashlib.sha1("\0".join([self.model_name, *prefix]).encode()).hexdigest()
+
+    def _warming_event(self, events: Dict[str, Any], key: str, factory):
+        """The event of a prefix being warmed, and whether this call leads (created it)"""
+        with self._warming_lock:
+            event = events.get(key)
+            if event is not None:
+                return event, False
+            event = events[key] = factory()
+            return event, True
+
+    def _warmed(self, events: Dict[str, Any], key: str, event, ok: bool) -> None:
+        """Release the followers of a leading call"""
+        with self._warming_lock:
+            if ok:
+                self._warm_prefixes[key] = True
+            events.pop(key, None)
+        event.set()
+
+    @contextmanager
+    def _warming(self, messages: List[Any]):
+        """Hold back calls on a cacheable prefix until its first call has created the cache"""
+        key = self._cache_prefix_key(messages)
+        if key is None or key in self._warm_prefixes:
+            yield
+            return
+        event, leader = self._warming_event(self._warming_events, key, threading.Event)
+        if not leader:
+            if not event.wait(self.prompt_cache_warmup):
+                metrics.increment("llm.prompt_cache_warmup_timeouts")
+            yield
+            return
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._warmed(self._warming_events, key, event, ok)
+
+    @asynccontextmanager
+    async def _awarming(self, messages: List[Any]):
+        """Async counterpart of _warming"""
+        key = self._cache_prefix_key(messages)
+        if key is None or key in self._warm_prefixes:
+            yield
+            return
+        event, leader = self._warming_event(self._awarming_events, key, asyncio.Event)
+        if not leader:
+            try:
+                await asyncio.wait_for(event.wait(), self.prompt_cache_warmup)
+            except asyncio.TimeoutError:
+                metrics.increment("llm.prompt_cache_warmup_timeouts")
+            yield
+            return
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._warmed(self._awarming_events, key, event, ok)
+
+    # Rate governor: every provider call holds a concurrency slot and its request/token
+    # budget while it runs. The slot is taken before waiting on a warming prefix, so a call
+    # waiting for the warming leader never holds up the leader.
+
+    @staticmethod
+    def _estimate_tokens(messages: List[Any]) -> int:
+        """Rough prompt size (4 characters per token) charged before the call"""
+        return sum(len(str(m.content if isinstance(m, Message) else m.get("content", ""))) for m in messages) // 4
+
+    @contextmanager
+    def _governed(self, messages: List[Any]):
+        governor = getattr(self, "governor", None)
+        if governor is None:
+            yield None
+            return
+        estimate = self._estimate_tokens(messages)
+        with governor.acquire(estimate):
+            yield estimate
+
+    @asynccontextmanager
+    async def _agoverned(self, messages: List[Any]):
+        governor = getattr(self, "governor", None)
+        if governor is None:
+            yield None
+            return
+        estimate = self._estimate_tokens(messages)
+        async with governor.aacquire(estimate):
+            yield estimate
+
+    def _settle(self, estimate: Optional[int], usage) -> None:
+        """Charge the governor for the tokens a call used beyond its estimate"""
+        if estimate is not None and usage is not None:
+            self.governor.settle(estimate, (usage.prompt_tokens or 0) + (usage.completion_tokens or 0))
+
     @backoff.on_exception(
         backoff.expo,
         Exception,
         max_tries=3,
-        giveup=lambda e: 'RateLimitError' not in type(e).__name__ and '429' not in str(e),
-        on_backoff=lambda details: logger.warning(
-            f"Retry attempt {details['tries']} after {details['wait']:.1f}s due to: {str(details['exception'])[:100]}"
-        )
+        giveup=_is_not_rate_limit,
+        on_backoff=_log_backoff
     )
-    def invoke(self, messages: List[Any], **kwargs) -> str:
+    def invoke(self, messages: List[Any], cache: bool = True, **kwargs) -> str:
         """Invoke LLM via Router with automatic concurrency control and retry."""
         if not messages:
             raise ValueError("Messages cannot be empty")
-        
+
+        key = self._request_key(messages, kwargs) if cache else None
+        cached = self._response_cache_lookup(key)
+        if cached is not None:
+            return cached
+        if key is None:
+            return self._complete(messages, kwargs)
+        return get_flight("llm").do(key, self._complete, messages, kwargs, key)
+
+    def _complete(self, messages: List[Any], kwargs: Dict[str, Any], key: Optional[str] = None) -> str:
+        """Send one call to the provider and cache its response under ``key``"""
         converted_messages = self._convert_messages(messages)
         
-        # Router handles concurrency via max_parallel_requests automatically
-        response = self.router.completion(
-            model=self.model_name,
-            messages=converted_messages,
-            **kwargs
-        )
-        return response.choices[0].message.content
+        with self._governed(messages) as estimate, self._warming(messages):
+            started = time.perf_counter()
+            response = self.router.completion(
+                model=self.model_name,
+                messages=converted_messages,
+                **kwargs
+            )
+        self._settle(estimate, getattr(response, "usage", None))
+        model = self._record_route(response, started)
+        _record_response_usage(getattr(response, "usage", None), model, started)
+        content = response.choices[0].message.content
+        self._response_cache_store(key, content)
+        return content
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=3,
+        giveup=_is_not_rate_limit,
+        on_backoff=_log_backoff
+    )
+    async def ainvoke(self, messages: List[Any], cache: bool = True, **kwargs) -> str:
+        """Async counterpart of invoke; awaits the Router without blocking the event loop."""
+        if not messages:
+            raise ValueError("Messages cannot be empty")
+
+        key = self._request_key(messages, kwargs) if cache else None
+        cached = await self._aresponse_cache_lookup(key)
+        if cached is not None:
+            return cached
+        if key is None:
+            return await self._acomplete(messages, kwargs)
+        return await get_flight("llm").ado(key, self._acomplete, messages, kwargs, key)
+
+    async def _acomplete(self, messages: List[Any], kwargs: Dict[str, Any], key: Optional[str] = None) -> str:
+        """Async counterpart of _complete"""
+        converted_messages = self._convert_messages(messages)
+
+        async with self._agoverned(messages) as estimate, self._awarming(messages):
+            started = time.perf_counter()
+            response = await self.router.acompletion(
+                model=self.model_name,
+                messages=converted_messages,
+                **kwargs
+            )
+        self._settle(estimate, getattr(response, "usage", None))
+        model = self._record_route(response, started)
+        _record_response_usage(getattr(response, "usage", None), model, started)
+        content = response.choices[0].message.content
+        await self._aresponse_cache_store(key, content)
+        return content
+
+    # Streaming: only opening the stream is retried; a failure mid-stream is raised
+    # to the caller since the partial output has already been consumed. Each attempt
+    # takes its own governor slot, so a 429 reaches the governor before the retry.
+    # A cached response is yielded as one chunk; a streamed one is cached once it completes.
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=3,
+        giveup=_is_not_rate_limit,
+        on_backoff=_log_backoff
+    )
+    def _open_stream(self, messages: List[Any], **kwargs):
+        """Take a governor slot and open the stream; returns the slot's scope, estimate, start time and stream"""
+        with ExitStack() as scope:
+            estimate = scope.enter_context(self._governed(messages))
+            started = time.perf_counter()
+            with self._warming(messages):
+                stream = self.router.completion(
+                    model=self.model_name,
+                    messages=self._convert_messages(messages),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **kwargs
+                )
+            return scope.pop_all(), estimate, started, stream
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=3,
+        giveup=_is_not_rate_limit,
+        on_backoff=_log_backoff
+    )
+    async def _aopen_stream(self, messages: List[Any], **kwargs):
+        """Async counterpart of _open_stream"""
+        async with AsyncExitStack() as scope:
+            estimate = await scope.enter_async_context(self._agoverned(messages))
+            started = time.perf_counter()
+            async with self._awarming(messages):
+                stream = await self.router.acompletion(
+                    model=self.model_name,
+                    messages=self._convert_messages(messages),
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **kwargs
+                )
+            return scope.pop_all(), estimate, started, stream
+
+    def stream(self, messages: List[Any], cache: bool = True, **kwargs) -> Iterator[str]:
+        """Invoke the LLM and yield the response text as it is generated."""
+        if not messages:
+            raise ValueError("Messages cannot be empty")
+
+        key = self._request_key(messages, kwargs) if cache else None
+        cached = self._response_cache_lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        scope, estimate, started, stream = self._open_stream(messages, **kwargs)
+        with scope:
+            model = self._record_route(stream, started)
+            for chunk in stream:
+                _record_response_usage(getattr(chunk, "usage", None), model, started)
+                self._settle(estimate, getattr(chunk, "usage", None))
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        self._response_cache_store(key, "".join(parts))
+
+    async def astream(self, messages: List[Any], cache: bool = True, **kwargs) -> AsyncIterator[str]:
+        """Async counterpart of stream."""
+        if not messages:
+            raise ValueError("Messages cannot be empty")
+
+        key = self._request_key(messages, kwargs) if cache else None
+        cached = await self._aresponse_cache_lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        scope, estimate, started, stream = await self._aopen_stream(messages, **kwargs)
+        async with scope:
+            model = self._record_route(stream, started)
+            async for chunk in stream:
+                _record_response_usage(getattr(chunk, "usage", None), model, started)
+                self._settle(estimate, getattr(chunk, "usage", None))
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        await self._aresponse_cache_store(key, "".join(parts))
     
 # Usage examples:
-# llm = LLMClient()  # uses llm.default with Router (reads max_parallel_requests from config)
+# llm = LLMClient()  # uses LLM_CONFIG (llm.default) with Router (reads max_parallel_requests from config)
+# routed_llm = LLMClient("llm.routed")  # balances gemini-2.5-flash over two keys, falls back to flash-lite
 # chat_llm = LLMClient("llm.chat")
 # completion_llm = LLMClient("llm.completion")
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Exact-match cache of LLM responses.
+
+Identical prompts sent to the same model with the same settings (query rewrites of a
+repeated topic, relevance selection over the same search results, trending title
+suggestions for unchanged Reddit data) are answered from the cache instead of the
+provider. The key is a hash of the model settings, the call parameters and the
+messages, so any change to the prompt is a miss.
+
+Two tiers:
+
+* memory: per worker process, bounded (LRU), entries expire after a TTL
+* store (optional): a SQL table shared by workers and restarts; any SQLAlchemy URL
+  (``sqlite:///llm_cache.db``, the application's Postgres, ...). The table is created
+  on first use.
+
+Store hits are copied into the memory tier. Store errors are logged and treated as
+misses, so the cache never fails a call; a store that cannot be opened (unreachable,
+misspelled or unsupported URL) leaves the cache memory-only.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import Column, Float, MetaData, Table, Text, create_engine, delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.backend.settings import get_settings
+from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+# Bump when responses are requested or post-processed differently, to invalidate cached ones
+LLM_CACHE_VERSION = 1
+
+_metadata = MetaData()
+
+llm_response_cache = Table(
+    "llm_response_cache",
+    _metadata,
+    Column("key", Text, primary_key=True),
+    Column("model", Text),
+    Column("response", Text, nullable=False),
+    Column("created_at", Float, nullable=False),  # epoch seconds
+    Column("expires_at", Float, nullable=False, index=True),
+)
+
+
+class SQLResponseStore:
+    """Persistent tier: one row per cached response in ``llm_response_cache``"""
+
+    # Expired rows are deleted after every this many writes
+    PURGE_EVERY = 100
+
+    def __init__(self, url: str):
+        self.engine = create_engine(url, pool_pre_ping=True)
+        # Checked before any DDL is sent
+        dialect = self.engine.dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"Unsupported LLM cache database: {dialect} (use postgresql or sqlite)")
+        llm_response_cache.create(self.engine, checkfirst=True)
+        self._insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        stmt = select(llm_response_cache.c.response).where(
+            llm_response_cache.c.key == key, llm_response_cache.c.expires_at > time.time()
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(stmt).scalar()
+
+    def set(self, key: str, value: str, ttl: float, model: Optional[str] = None) -> None:
+        now = time.time()
+        row = {"key": key, "model": model, "response": value, "created_at": now, "expires_at": now + ttl}
+        stmt = self._insert(llm_response_cache).values(**row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[llm_response_cache.c.key],
+            set_={name: stmt.excluded[name] for name in ("model", "response", "created_at", "expires_at")},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge()
+
+    def purge(self) -> int:
+        """Delete expired rows; returns how many were deleted"""
+        with self.engine.begin() as conn:
+            return conn.execute(delete(llm_response_cache).where(llm_response_cache.c.expires_at <= time.time())).rowcount
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(llm_response_cache))
+
+
+class ResponseCache:
+    """Memory tier in front of an optional persistent store, with hit/miss accounting"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400, store: Optional[SQLResponseStore] = None):
+        self.ttl = ttl
+        self.store = store
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._hits = {"memory": 0, "store": 0}
+        self._misses = 0
+
+    @staticmethod
+    def key(model_params: Dict[str, Any], messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        """Hash of everything that determines a response: model settings, call parameters and messages"""
+        payload = {"version": LLM_CACHE_VERSION, "model": model_params, "params": params, "messages": messages}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` from the first tier that has it"""
+        with self._lock:
+            value = self._memory.get(key)
+        if value is not None:
+            return self._record("memory", value)
+        if self.store is not None:
+            try:
+                value = self.store.get(key)
+            except Exception as e:
+                logger.warning(f"LLM cache store read failed; treating as a miss: {e}")
+                value = None
+            if value is not None:
+                with self._lock:
+                    self._memory[key] = value
+                return self._record("store", value)
+        return self._record(None, None)
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        """Cache a response in every tier"""
+        if not value:
+            return
+        with self._lock:
+            self._memory[key] = value
+        if self.store is not None:
+            try:
+                self.store.set(key, value, self.ttl, model)
+            except Exception as e:
+                logger.warning(f"LLM cache store write failed: {e}")
+
+    def _record(self, tier: Optional[str], value: Optional[str]) -> Optional[str]:
+        with self._lock:
+            if tier is None:
+                self._misses += 1
+            else:
+                self._hits[tier] += 1
+        metrics.increment(f"llm_cache.hit.{tier}" if tier else "llm_cache.miss")
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory tier size and hit rate per tier"""
+        with self._lock:
+            lookups = sum(self._hits.values()) + self._misses
+            return {
+                "size": len(self._memory),
+                "maxsize": self._memory.maxsize,
+                "persistent": self.store is not None,
+                "hits": dict(self._hits),
+                "misses": self._misses,
+                "hit_rate": round(sum(self._hits.values()) / lookups, 3) if lookups else 0.0,
+            }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide LLM response cache, or None when it is disabled in settings"""
+    global _response_cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            store = None
+            if settings.llm_cache_url:
+                try:
+                    store = SQLResponseStore(settings.llm_cache_url)
+                except Exception as e:
+                    # An unreachable or invalid store must not stop clients from being built
+                    logger.warning(f"LLM cache store unavailable, caching in memory only: {e}")
+            _response_cache = ResponseCache(maxsize=settings.llm_cache_size, ttl=settings.llm_cache_ttl, store=store)
+            metrics.register_gauge("llm_cache", _response_cache.stats)
+        return _response_cache
@@ -0,0 +1,337 @@
+"""
+Rate governor for LLM calls: requests/tokens per minute and adaptive concurrency.
+
+Provider limits apply per API key, so they are shared by every worker process. Each
+governed model has two token buckets, requests per minute and tokens per minute,
+kept in a ``BucketStore``:
+
+* ``MemoryBucketStore``: per process (single worker, tests)
+* ``SQLBucketStore``: a row per bucket in ``llm_rate_buckets`` on SQLite or Postgres,
+  shared by all workers. Taking from a bucket is one conditional UPDATE, so concurrent
+  workers never overdraw it.
+
+A call takes one request and its estimated prompt tokens before it is sent, waiting
+for the buckets to refill if needed, and settles the difference with the reported
+usage afterwards.
+
+Concurrency adapts AIMD-style per process: the number of calls in flight grows by one
+per window of successful calls and is halved when the provider answers 429, which
+also empties the shared request bucket so every worker pauses.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, Table, Text, case, create_engine, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.backend.settings import get_settings
+from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    return 'RateLimitError' in type(e).__name__ or '429' in str(e)
+
+
+class MemoryBucketStore:
+    """Token buckets of one process"""
+
+    def __init__(self):
+        self._buckets: Dict[str, list] = {}  # name -> [tokens, updated_at]
+        self._lock = threading.Lock()
+
+    def _level(self, name: str, capacity: float, rate: float, now: float) -> float:
+        tokens, updated_at = self._buckets.setdefault(name, [capacity, now])
+        return min(capacity, tokens + (now - updated_at) * rate)
+
+    def take(self, name: str, cost: float, capacity: float, rate: float) -> float:
+        """Take ``cost`` tokens if available; returns 0, or the seconds until they will be"""
+        with self._lock:
+            now = time.time()
+            level = self._level(name, capacity, rate, now)
+            if level >= cost:
+                self._buckets[name] = [level - cost, now]
+                return 0.0
+            return (cost - level) / rate
+
+    def debit(self, name: str, amount: float, capacity: float, rate: float) -> None:
+        """Take ``amount`` tokens without waiting (the bucket may go negative)"""
+        with self._lock:
+            now = time.time()
+            self._buckets[name] = [self._level(name, capacity, rate, now) - amount, now]
+
+    def drain(self, name: str) -> None:
+        with self._lock:
+            self._buckets[name] = [0.0, time.time()]
+
+
+_metadata = MetaData()
+
+llm_rate_buckets = Table(
+    "llm_rate_buckets",
+    _metadata,
+    Column("name", Text, primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("updated_at", Float, nullable=False),  # epoch seconds
+)
+
+
+class SQLBucketStore:
+    """Token buckets shared by every process using the same database"""
+
+    def __init__(self, url: str):
+        self.engine = create_engine(url, pool_pre_ping=True)
+        # Checked before any DDL is sent
+        dialect = self.engine.dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"Unsupported rate limit database: {dialect} (use postgresql or sqlite)")
+        llm_rate_buckets.create(self.engine, checkfirst=True)
+        self._insert = pg_insert if dialect == "postgresql" else sqlite_insert
+
+    @staticmethod
+    def _level(capacity: float, rate: float, now: float):
+        """SQL expression of a bucket's level after refilling up to now"""
+        refilled = llm_rate_buckets.c.tokens + (now - llm_rate_buckets.c.updated_at) * rate
+        return case((refilled > capacity, capacity), else_=refilled)
+
+    def take(self, name: str, cost: float, capacity: float, rate: float) -> float:
+        """Take ``cost`` tokens if available; returns 0, or the seconds until they will be"""
+        now = time.time()
+        level = self._level(capacity, rate, now)
+        with self.engine.begin() as conn:
+            taken = conn.execute(
+                update(llm_rate_buckets)
+                .where(llm_rate_buckets.c.name == name, level >= cost)
+                .values(tokens=level - cost, updated_at=now)
+            ).rowcount
+            if taken:
+                return 0.0
+            current = conn.execute(select(level).where(llm_rate_buckets.c.name == name)).scalar()
+            if current is None:
+                # First use of the bucket: it starts full
+                conn.execute(self._insert(llm_rate_buckets)
+                             .values(name=name, tokens=capacity - cost, updated_at=now)
+                             .on_conflict_do_nothing(index_elements=[llm_rate_buckets.c.name]))
+                return 0.0
+        return (cost - current) / rate
+
+    def debit(self, name: str, amount: float, capacity: float, rate: float) -> None:
+        """Take ``amount`` tokens without waiting (the bucket may go negative)"""
+        now = time.time()
+        with self.engine.begin() as conn:
+            conn.execute(update(llm_rate_buckets).where(llm_rate_buckets.c.name == name)
+                         .values(tokens=self._level(capacity, rate, now) - amount, updated_at=now))
+
+    def drain(self, name: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(update(llm_rate_buckets).where(llm_rate_buckets.c.name == name)
+                         .values(tokens=0.0, updated_at=time.time()))
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrency:
+    """Limit on calls in flight, adjusted by additive increase / multiplicative decrease"""
+
+    def __init__(self, limit: int, min_limit: int = 1, max_limit: Optional[int] = None):
+        self.max_limit = max_limit or limit
+        self.min_limit = min_limit
+        self.limit = float(limit)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        # Futures of async waiters, each woken on its own event loop when a slot is released
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+            try:
+                await waiter[1]
+            finally:
+                with self._condition:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    def release(self, rate_limited: bool = False) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                # +1 after a full window of successful calls
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+        # Every waiter checks again, like the threads woken by notify_all
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+
+class RateGovernor:
+    """Requests/tokens per minute and adaptive concurrency for one model"""
+
+    def __init__(self, name: str, store, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_concurrency: int = 10):
+        self.name = name
+        self.store = store
+        self.rpm = rpm
+        self.tpm = tpm
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+
+    @property
+    def shared(self) -> bool:
+        return isinstance(self.store, SQLBucketStore)
+
+    def _wait(self, tokens: int) -> float:
+        """Seconds to wait before a call of ``tokens`` prompt tokens may be sent (0 once it took them).
+        If the store is unavailable the call is let through."""
+        try:
+            return self._take(tokens)
+        except Exception as e:
+            logger.warning(f"Rate governor store unavailable; not limiting {self.name}: {e}")
+            return 0.0
+
+    def _take(self, tokens: int) -> float:
+        if self.rpm:
+            wait = self.store.take(f"{self.name}:requests", 1, self.rpm, self.rpm / 60)
+            if wait:
+                return wait
+        if self.tpm:
+            # A prompt larger than the whole budget waits for a full bucket
+            cost = min(tokens, self.tpm)
+            wait = self.store.take(f"{self.name}:tokens", cost, self.tpm, self.tpm / 60)
+            if wait and self.rpm:
+                # Give the request back; it is taken again with the tokens
+                self.store.debit(f"{self.name}:requests", -1, self.rpm, self.rpm / 60)
+            return wait
+        return 0.0
+
+    def _record_wait(self, started: float) -> None:
+        metrics.observe("llm.governor.wait", (time.perf_counter() - started) * 1000)
+
+    @contextmanager
+    def acquire(self, tokens: int):
+        """Hold a concurrency slot and the rate budget of one call while it runs"""
+        started = time.perf_counter()
+        self.concurrency.acquire()
+        rate_limited = False
+        try:
+            while (wait := self._wait(tokens)) > 0:
+                time.sleep(wait)
+            self._record_wait(started)
+            yield
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            if rate_limited:
+                self._on_rate_limit()
+            raise
+        finally:
+            self.concurrency.release(rate_limited)
+
+    @asynccontextmanager
+    async def aacquire(self, tokens: int):
+        """Async counterpart of acquire"""
+        started = time.perf_counter()
+        await self.concurrency.aacquire()
+        rate_limited = False
+        try:
+            while True:
+                # Database round trips run off the event loop
+                wait = await asyncio.to_thread(self._wait, tokens) if self.shared else self._wait(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self._record_wait(started)
+            yield
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            if rate_limited:
+                self._on_rate_limit()
+            raise
+        finally:
+            self.concurrency.release(rate_limited)
+
+    def settle(self, estimated_tokens: int, used_tokens: int) -> None:
+        """Charge the tokens a call used beyond its estimate (completion tokens, larger prompts)"""
+        extra = used_tokens - min(estimated_tokens, self.tpm or 0)
+        if self.tpm and extra > 0:
+            try:
+                self.store.debit(f"{self.name}:tokens", extra, self.tpm, self.tpm / 60)
+            except Exception as e:
+                logger.warning(f"Rate governor could not settle {self.name} usage: {e}")
+
+    def _on_rate_limit(self) -> None:
+        metrics.increment("llm.rate_limited")
+        logger.warning(f"{self.name} rate limited by the provider; halving its concurrency")
+        if self.rpm:
+            try:
+                self.store.drain(f"{self.name}:requests")
+            except Exception as e:
+                logger.warning(f"Rate governor could not drain {self.name}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "shared": self.shared,
+        }
+
+
+_store = None
+_governors: Dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def _open_store(url: str):
+    """Shared buckets at ``url``; per-process buckets without one or when it cannot be opened"""
+    if url:
+        try:
+            return SQLBucketStore(url)
+        except Exception as e:
+            # An unreachable or invalid store must not stop clients from being built
+            logger.warning(f"LLM rate limit store unavailable, using per-process buckets: {e}")
+    return MemoryBucketStore()
+
+
+def get_governor(name: str, rate_limit: Optional[Dict[str, Any]], max_concurrency: int) -> Optional[RateGovernor]:
+    """Return the process-wide governor of ``name``, or None when its config sets no rate_limit.
+
+    ``rate_limit`` holds ``rpm`` and/or ``tpm``; buckets are shared across processes when
+    LLM_RATE_LIMIT_URL is set.
+    """
+    global _store
+    if not rate_limit:
+        return None
+    with _governors_lock:
+        governor = _governors.get(name)
+        if governor is None:
+            if _store is None:
+                _store = _open_store(get_settings().llm_rate_limit_url)
+            governor = _governors[name] = RateGovernor(
+                name, _store, rpm=rate_limit.get("rpm"), tpm=rate_limit.get("tpm"), max_concurrency=max_concurrency,
+            )
+            metrics.register_gauge(f"llm_governor.{name}", governor.stats)
+        return governor
@@ -0,0 +1,139 @@
+"""
+Process-wide connection pools for the LangGraph Postgres checkpointer.
+
+Every AgentWorkflow in a worker shares one bounded ``ConnectionPool`` (sync graph)
+and one ``AsyncConnectionPool`` (async graph), so parallel ``write_section``
+fan-out and concurrent requests check out separate connections instead of
+queueing on a single one. Idle connections are health checked before being
+handed out, and the time spent waiting for a connection is recorded in
+``metrics`` under ``checkpoint_pool.wait_ms`` / ``checkpoint_pool_async.wait_ms``.
+"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from src.backend.settings import get_settings
+from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+# Keepalive settings for the checkpointer connections
+CHECKPOINT_CONNECTION_KWARGS = {
+    "autocommit": True,
+    "keepalives": 1,
+    "keepalives_idle": 60,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
+
+SYNC_POOL_NAME = "checkpoint_pool"
+ASYNC_POOL_NAME = "checkpoint_pool_async"
+
+
+class TimedConnectionPool(ConnectionPool):
+    """ConnectionPool that records how long callers wait for a connection"""
+
+    def getconn(self, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            return super().getconn(timeout=timeout)
+        finally:
+            metrics.observe(f"{self.name}.wait_ms", (time.perf_counter() - start) * 1000)
+
+
+class TimedAsyncConnectionPool(AsyncConnectionPool):
+    """AsyncConnectionPool that records how long callers wait for a connection"""
+
+    async def getconn(self, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            return await super().getconn(timeout=timeout)
+        finally:
+            metrics.observe(f"{self.name}.wait_ms", (time.perf_counter() - start) * 1000)
+
+
+def _pool_kwargs():
+    settings = get_settings()
+    return {
+        "conninfo": settings.database_url,
+        "min_size": settings.checkpoint_pool_min_size,
+        "max_size": settings.checkpoint_pool_max_size,
+        "timeout": settings.checkpoint_pool_timeout,
+        "max_idle": settings.checkpoint_pool_max_idle,
+        "max_lifetime": settings.checkpoint_pool_max_lifetime,
+        "kwargs": dict(CHECKPOINT_CONNECTION_KWARGS),
+    }
+
+
+_pool: Optional[TimedConnectionPool] = None
+_pool_lock = threading.Lock()
+_async_pool: Optional[TimedAsyncConnectionPool] = None
+_async_pool_lock: Optional[asyncio.Lock] = None
+
+
+def get_checkpoint_pool() -> ConnectionPool:
+    """Return the shared sync checkpointer pool, opening it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = TimedConnectionPool(
+                    name=SYNC_POOL_NAME,
+                    check=ConnectionPool.check_connection,
+                    open=False,
+                    **_pool_kwargs(),
+                )
+                # Don't block startup on the database; connections are created in the background
+                pool.open(wait=False)
+                metrics.register_gauge(SYNC_POOL_NAME, pool.get_stats)
+                logger.info(f"Opened checkpointer pool (max_size={pool.max_size})")
+                _pool = pool
+    return _pool
+
+
+async def aget_checkpoint_pool() -> AsyncConnectionPool:
+    """Return the shared async checkpointer pool, opening it on first use.
+
+    The pool is bound to the event loop it is opened on (the application loop).
+    """
+    global _async_pool, _async_pool_lock
+    if _async_pool is None:
+        if _async_pool_lock is None:
+            _async_pool_lock = asyncio.Lock()
+        async with _async_pool_lock:
+            if _async_pool is None:
+                pool = TimedAsyncConnectionPool(
+                    name=ASYNC_POOL_NAME,
+                    check=AsyncConnectionPool.check_connection,
+                    open=False,
+                    **_pool_kwargs(),
+                )
+                await pool.open(wait=False)
+                metrics.register_gauge(ASYNC_POOL_NAME, pool.get_stats)
+                logger.info(f"Opened async checkpointer pool (max_size={pool.max_size})")
+                _async_pool = pool
+    return _async_pool
+
+
+def close_checkpoint_pool() -> None:
+    """Close the shared sync pool (application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            metrics.unregister_gauge(SYNC_POOL_NAME)
+            _pool.close()
+            _pool = None
+
+
+async def aclose_checkpoint_pools() -> None:
+    """Close both shared pools (application shutdown)"""
+    global _async_pool
+    pool, _async_pool = _async_pool, None
+    if pool is not None:
+        metrics.unregister_gauge(ASYNC_POOL_NAME)
+        await pool.close()
+    close_checkpoint_pool()
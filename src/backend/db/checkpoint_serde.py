@@ -0,0 +1,194 @@
+"""
+Compact checkpoint serialization for the LangGraph Postgres checkpointer.
+
+``CompactSerializer`` encodes values with msgpack (LangGraph's own encoding, with the
+state dataclasses from ``agents/state.py`` registered) and compresses anything larger
+than a few hundred bytes with zstd. It never pickles. Rows written by the previous
+``JsonPlusSerializer(pickle_fallback=True)`` ("msgpack", "json" and "pickle" types)
+are still readable, and ``migrate_checkpoints`` re-encodes them in place.
+
+``CompactPostgresSaver``/``CompactAsyncPostgresSaver`` additionally move large string
+channels (``input_content`` holds whole pages and PDFs) out of the ``checkpoints`` row,
+where PostgresSaver stores primitive values inline on *every* step, into
+``checkpoint_blobs``, which is written once per channel version.
+"""
+import threading
+from typing import Any, Tuple
+
+import zstandard
+from cachetools import LRUCache
+from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.backend.agents.state import (
+    BlogState,
+    BlogStateInput,
+    BlogStateOutput,
+    Section,
+    Sections,
+    SectionState,
+)
+
+COMPRESSED_TYPE = "msgpack+zstd"
+
+# Dataclasses allowed to be rebuilt from msgpack
+STATE_TYPES = [Section, Sections, SectionState, BlogState, BlogStateInput, BlogStateOutput]
+
+
+class CompactSerializer(SerializerProtocol):
+    """msgpack + zstd serializer for checkpoint blobs and writes"""
+
+    def __init__(self, level: int = 3, min_compress_size: int = 256):
+        self.level = level
+        self.min_compress_size = min_compress_size
+        self._msgpack = JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES)
+        # Only used to read rows written before this serializer existed
+        self._legacy = JsonPlusSerializer(pickle_fallback=True, allowed_msgpack_modules=STATE_TYPES)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        if isinstance(obj, _BlobText):
+            obj = obj.value
+        type_, data = self._msgpack.dumps_typed(obj)
+        if type_ == "msgpack" and len(data) >= self.min_compress_size:
+            return COMPRESSED_TYPE, zstandard.compress(data, self.level)
+        return type_, data
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, data_ = data
+        if type_ == COMPRESSED_TYPE:
+            return self._msgpack.loads_typed(("msgpack", zstandard.decompress(data_)))
+        return self._legacy.loads_typed(data)
+
+
+class _BlobText:
+    """Marks a string channel value that should be stored as a blob instead of inline"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+class _LargeTextMixin:
+    """Routes large string channel values to checkpoint_blobs.
+
+    PostgresSaver keeps str/int/float/bool values inline in the checkpoint JSONB,
+    rewriting them with every checkpoint. Wrapping large strings makes the saver
+    treat them like any other blob: stored (compressed) once per channel version.
+    The (channel, version) pairs already written are remembered so unchanged text
+    isn't re-sent; the blob upsert is a no-op if it exists anyway. Pairs are only
+    remembered once the put has succeeded, so a failed put sends them again.
+    """
+
+    inline_text_limit = 4096
+
+    def _init_large_text(self):
+        self._written_blobs = LRUCache(maxsize=10_000)
+        self._written_lock = threading.Lock()
+
+    def _externalize_large_text(self, config, checkpoint, new_versions):
+        """Return the checkpoint with large text wrapped, its new_versions and the blob keys to remember"""
+        configurable = config["configurable"]
+        key_prefix = (configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+        channel_values = dict(checkpoint["channel_values"])
+        new_versions = dict(new_versions)
+        pending = []
+        with self._written_lock:
+            for channel, value in checkpoint["channel_values"].items():
+                if not isinstance(value, str) or len(value) < self.inline_text_limit:
+                    continue
+                version = checkpoint["channel_versions"][channel]
+                channel_values[channel] = _BlobText(value)
+                key = (*key_prefix, channel, version)
+                if key not in self._written_blobs:
+                    new_versions[channel] = version
+                    pending.append(key)
+        return {**checkpoint, "channel_values": channel_values}, new_versions, pending
+
+    def _mark_written(self, keys):
+        """Remember blob keys whose checkpoint was stored"""
+        with self._written_lock:
+            for key in keys:
+                self._written_blobs[key] = True
+
+
+class CompactPostgresSaver(_LargeTextMixin, PostgresSaver):
+    """PostgresSaver using CompactSerializer and blob storage for large text"""
+
+    def __init__(self, conn, serde: SerializerProtocol = None, **kwargs):
+        super().__init__(conn, serde=serde or CompactSerializer(), **kwargs)
+        self._init_large_text()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        checkpoint, new_versions, pending = self._externalize_large_text(config, checkpoint, new_versions)
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self._mark_written(pending)
+        return next_config
+
+
+class CompactAsyncPostgresSaver(_LargeTextMixin, AsyncPostgresSaver):
+    """AsyncPostgresSaver using CompactSerializer and blob storage for large text"""
+
+    def __init__(self, conn, serde: SerializerProtocol = None, **kwargs):
+        super().__init__(conn, serde=serde or CompactSerializer(), **kwargs)
+        self._init_large_text()
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        checkpoint, new_versions, pending = self._externalize_large_text(config, checkpoint, new_versions)
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        self._mark_written(pending)
+        return next_config
+
+
+def migrate_checkpoints(conn, batch_size: int = 500) -> dict:
+    """Re-encode existing checkpoint_blobs/checkpoint_writes rows with CompactSerializer.
+
+    Rows already in the compact format are skipped, so the migration can be re-run
+    and can run while the application is serving traffic. Inline values in existing
+    ``checkpoints`` rows are left as they are; they still load normally. Returns the number of rows
+    rewritten and the stored bytes before/after per table.
+    """
+    serde = CompactSerializer()
+    tables = {
+        "checkpoint_blobs": ("thread_id", "checkpoint_ns", "channel", "version"),
+        "checkpoint_writes": ("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"),
+    }
+    report = {}
+    for table, keys in tables.items():
+        key_list = ", ".join(keys)
+        where = " AND ".join(f"{k} = %s" for k in keys)
+        stats = {"rows": 0, "bytes_before": 0, "bytes_after": 0}
+        with conn.cursor(name=f"migrate_{table}") as read_cur:
+            read_cur.itersize = batch_size
+            read_cur.execute(
+                f"SELECT {key_list}, type, blob FROM {table} "
+                f"WHERE type IS NOT NULL AND type NOT IN ('{COMPRESSED_TYPE}', 'null', 'empty', 'bytes', 'bytearray')"
+            )
+            with conn.cursor() as write_cur:
+                for row in read_cur:
+                    key, type_, blob = row[:len(keys)], row[-2], row[-1]
+                    new_type, new_blob = serde.dumps_typed(serde.loads_typed((type_, blob)))
+                    if (new_type, new_blob) == (type_, blob):
+                        continue
+                    write_cur.execute(
+                        f"UPDATE {table} SET type = %s, blob = %s WHERE {where}",
+                        (new_type, new_blob, *key),
+                    )
+                    stats["rows"] += 1
+                    stats["bytes_before"] += len(blob or b"")
+                    stats["bytes_after"] += len(new_blob or b"")
+        conn.commit()
+        report[table] = stats
+    return report
+
+
+if __name__ == "__main__":
+    import json
+    import os
+
+    import psycopg
+
+    with psycopg.connect(os.environ["DATABASE_URL"]) as connection:
+        print(json.dumps(migrate_checkpoints(connection), indent=2))
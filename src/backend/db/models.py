@@ -1,6 +1,6 @@
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy import CheckConstraint, Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Table, Enum as SQLEnum, Numeric
+from sqlalchemy import BigInteger, CheckConstraint, Column, Float, Identity, Index, Integer, REAL, String, DateTime, Boolean, ForeignKey, Text, Table, Enum as SQLEnum, Numeric
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -364,6 +364,54 @@ class UserGeneration(Base):
     # Relationship
     profile = relationship("Profile")
 
+class GenerationJob(Base):
+    __tablename__ = 'generation_jobs'
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'succeeded', 'failed')", name='generation_jobs_status_check'),
+        Index('idx_generation_jobs_claim', 'status', 'created_at'),
+        Index('idx_generation_jobs_profile_id', 'profile_id'),
+    )
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    profile_id = Column(UUID(as_uuid=True), ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
+    thread_id = Column(UUID(as_uuid=True), nullable=False)
+    status = Column(Text, nullable=False, default='queued')
+    payload = Column(JSONB, nullable=False)
+    user_context = Column(JSONB, nullable=False)
+    result = Column(JSONB)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    worker_id = Column(Text)
+    lease_expires_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    profile = relationship("Profile")
+
+class GenerationLedgerEntry(Base):
+    """Duration, tokens and estimated cost of a generation, one of its node runs or one LLM call"""
+    __tablename__ = 'generation_ledger'
+    __table_args__ = (
+        CheckConstraint("kind IN ('generation', 'node', 'llm')", name='generation_ledger_kind_check'),
+        Index('idx_generation_ledger_profile_kind', 'profile_id', 'kind', 'created_at'),
+        Index('idx_generation_ledger_thread_id', 'thread_id'),
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    profile_id = Column(UUID(as_uuid=True), ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
+    thread_id = Column(UUID(as_uuid=True), nullable=False)
+    kind = Column(Text, nullable=False)
+    node = Column(Text)  # node name; the operation (generate, social_posts, feedback) for a generation
+    model = Column(Text)
+    duration_ms = Column(REAL, nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    cached_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
 class CheckpointMigrations(Base):
     __tablename__ = 'checkpoint_migrations'
     
@@ -13,6 +13,8 @@ from .media import MediaRepository
 from .source_metadata import SourceMetadataRepository
 from .subscription import SubscriptionRepository
 from .url_references import URLReferencesRepository
+from .job import JobRepository
+from .ledger import LedgerRepository
 
 
 __all__ = [
@@ -29,5 +31,7 @@ __all__ = [
     'MediaRepository',
     'SourceMetadataRepository',
     'SubscriptionRepository',
-    'URLReferencesRepository'
+    'URLReferencesRepository',
+    'JobRepository',
+    'LedgerRepository'
 ]
\ No newline at end of file
@@ -1,10 +1,14 @@
 from typing import Dict, List, Optional, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 from sqlalchemy.orm import joinedload, contains_eager
-from sqlalchemy import and_, or_, desc, insert
+from sqlalchemy import and_, or_, desc, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from ..models import Content, ContentType, Profile, Source, Tag, URLReference, Media, content_tags, content_sources
 from ..sqlalchemy_repository import SQLAlchemyRepository
 from ...api.formatters import format_content_list_item, format_content_list_response
+from src.backend.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
 
 class ContentRepository(SQLAlchemyRepository[Content]):
     def __init__(self):
@@ -325,6 +329,71 @@ class ContentRepository(SQLAlchemyRepository[Content]):
             session.rollback()
             raise e
 
+    def create_with_associations(
+        self,
+        rows: List[Dict[str, Any]],
+        source_id: Optional[UUID] = None,
+        tag_names: Optional[List[str]] = None,
+    ) -> List[UUID]:
+        """
+        Insert generated content rows together with their source and tag associations
+        in one transaction, using a fixed number of statements regardless of the number
+        of rows and tags: content types lookup, content insert, tag upsert, and one
+        insert per association table.
+
+        Args:
+            rows: Content column values, with a "content_type" name instead of content_type_id.
+                Rows whose content type doesn't exist are skipped.
+            source_id: Source linked to every inserted row
+            tag_names: Tags (created if missing) linked to every inserted row
+        Returns the ids of the inserted content rows.
+        """
+        session = self.db.get_session()
+        try:
+            type_names = {row["content_type"] for row in rows}
+            type_ids = dict(session.execute(
+                select(ContentType.name, ContentType.content_type_id).where(ContentType.name.in_(type_names))
+            ).all())
+
+            records = []
+            for row in rows:
+                values = {k: v for k, v in row.items() if k != "content_type"}
+                content_type_id = type_ids.get(row["content_type"])
+                if content_type_id is None:
+                    logger.error(f"Content type {row['content_type']} not found")
+                    continue
+                records.append({**values, "content_id": uuid4(), "content_type_id": content_type_id})
+            if not records:
+                session.commit()
+                return []
+            content_ids = [record["content_id"] for record in records]
+            session.execute(insert(Content), records)
+
+            if source_id:
+                session.execute(insert(content_sources), [
+                    {"content_source_id": uuid4(), "content_id": content_id, "source_id": source_id}
+                    for content_id in content_ids
+                ])
+
+            names = list(dict.fromkeys(name for name in (tag_names or []) if name))
+            if names:
+                # Existing tags (including soft-deleted ones, which are restored) return their id
+                stmt = pg_insert(Tag).values([{"tag_id": uuid4(), "name": name} for name in names])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Tag.name], set_={"is_deleted": False, "deleted_at": None}
+                ).returning(Tag.tag_id)
+                tag_ids = session.execute(stmt).scalars().all()
+                session.execute(insert(content_tags), [
+                    {"content_tag_id": uuid4(), "content_id": content_id, "tag_id": tag_id}
+                    for content_id in content_ids for tag_id in tag_ids
+                ])
+
+            session.commit()
+            return content_ids
+        except Exception as e:
+            session.rollback()
+            raise e
+
     def add_content_sources(self, content_id: UUID, source_ids: List[UUID]) -> bool:
         """
         Add multiple sources to content by inserting into the content_sources association table
@@ -0,0 +1,163 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import and_, func, or_, select, update
+from ..models import GenerationJob
+from ..sqlalchemy_repository import SQLAlchemyRepository
+from src.backend.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class JobRepository(SQLAlchemyRepository[GenerationJob]):
+    """Postgres-backed queue of content generation jobs.
+
+    Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` and hold a lease
+    that they extend while the job runs. A job whose lease expires (the worker
+    crashed or was killed) becomes claimable again until ``max_attempts`` is used up.
+    """
+
+    def __init__(self):
+        super().__init__(GenerationJob)
+
+    def enqueue(self, profile_id: UUID, thread_id: UUID, payload: Dict[str, Any],
+                user_context: Dict[str, Any], max_attempts: int = 3) -> GenerationJob:
+        """Add a queued job"""
+        return self.create({
+            "profile_id": profile_id,
+            "thread_id": thread_id,
+            "status": QUEUED,
+            "payload": payload,
+            "user_context": user_context,
+            "max_attempts": max_attempts,
+        })
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[GenerationJob]:
+        """Lease the oldest runnable job to ``worker_id``, or return None when the queue is empty"""
+        now = func.now()
+        candidate = (
+            select(GenerationJob.job_id)
+            .where(or_(
+                GenerationJob.status == QUEUED,
+                and_(GenerationJob.status == RUNNING,
+                     GenerationJob.lease_expires_at < now,
+                     GenerationJob.attempts < GenerationJob.max_attempts),
+            ))
+            .order_by(GenerationJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(GenerationJob)
+            .where(GenerationJob.job_id == candidate)
+            .values(status=RUNNING, attempts=GenerationJob.attempts + 1, worker_id=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    started_at=func.coalesce(GenerationJob.started_at, now))
+            .returning(GenerationJob)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        session = self.db.get_session()
+        try:
+            job = session.execute(stmt).scalar_one_or_none()
+            session.commit()
+            return job
+        except Exception as e:
+            session.rollback()
+            raise e
+
+    def heartbeat(self, job_ids: List[UUID], worker_id: str, lease_seconds: float) -> List[UUID]:
+        """Extend the leases ``worker_id`` holds on ``job_ids``; returns the ids still held"""
+        if not job_ids:
+            return []
+        session = self.db.get_session()
+        try:
+            held = session.execute(
+                update(GenerationJob)
+                .where(GenerationJob.job_id.in_(job_ids), GenerationJob.worker_id == worker_id,
+                       GenerationJob.status == RUNNING)
+                .values(lease_expires_at=func.now() + timedelta(seconds=lease_seconds))
+                .returning(GenerationJob.job_id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            session.commit()
+            return list(held)
+        except Exception as e:
+            session.rollback()
+            raise e
+
+    def complete(self, job_id: UUID, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result of a job; False when the lease was lost to another worker"""
+        return self._update(
+            self._held(job_id, worker_id),
+            status=SUCCEEDED, result=result, error=None, lease_expires_at=None, finished_at=func.now(),
+        ) > 0
+
+    def fail(self, job_id: UUID, worker_id: str, error: str) -> bool:
+        """Mark a job as failed; False when the lease was lost to another worker"""
+        return self._update(
+            self._held(job_id, worker_id),
+            status=FAILED, error=error, lease_expires_at=None, finished_at=func.now(),
+        ) > 0
+
+    def expire_abandoned(self) -> int:
+        """Fail running jobs whose lease expired after their last allowed attempt"""
+        count = self._update(
+            and_(GenerationJob.status == RUNNING, GenerationJob.lease_expires_at < func.now(),
+                 GenerationJob.attempts >= GenerationJob.max_attempts),
+            status=FAILED, error="Worker stopped before the job finished", lease_expires_at=None,
+            finished_at=func.now(),
+        )
+        if count:
+            logger.warning(f"Failed {count} abandoned generation job(s) with no attempts left")
+        return count
+
+    def count_pending(self, profile_id: UUID) -> int:
+        """Number of queued or running jobs for a profile"""
+        session = self.db.get_session()
+        try:
+            count = session.execute(
+                select(func.count())
+                .select_from(GenerationJob)
+                .where(GenerationJob.profile_id == profile_id, GenerationJob.status.in_((QUEUED, RUNNING)))
+            ).scalar_one()
+            session.commit()
+            return count
+        except Exception as e:
+            session.rollback()
+            raise e
+
+    def get_for_profile(self, job_id: UUID, profile_id: UUID) -> Optional[GenerationJob]:
+        """Get a job owned by a profile"""
+        session = self.db.get_session()
+        try:
+            job = session.execute(
+                select(GenerationJob)
+                .where(GenerationJob.job_id == job_id, GenerationJob.profile_id == profile_id)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+            session.commit()
+            return job
+        except Exception as e:
+            session.rollback()
+            raise e
+
+    @staticmethod
+    def _held(job_id: UUID, worker_id: str):
+        return and_(GenerationJob.job_id == job_id, GenerationJob.worker_id == worker_id,
+                    GenerationJob.status == RUNNING)
+
+    def _update(self, condition, **values) -> int:
+        session = self.db.get_session()
+        try:
+            result = session.execute(
+                update(GenerationJob).where(condition).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            raise e
@@ -0,0 +1,64 @@
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Any, Dict, List
+from uuid import UUID
+from sqlalchemy import func, insert, select
+from ..models import GenerationLedgerEntry
+from ..sqlalchemy_repository import SQLAlchemyRepository
+from src.backend.utils.ledger import GenerationLedger
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class LedgerRepository(SQLAlchemyRepository[GenerationLedgerEntry]):
+    """Per-generation records of node runs and LLM calls, and percentiles over them"""
+
+    def __init__(self):
+        super().__init__(GenerationLedgerEntry)
+
+    def record(self, ledger: GenerationLedger) -> int:
+        """Store every entry of a finished generation in one insert"""
+        profile_id, thread_id = UUID(str(ledger.profile_id)), UUID(str(ledger.thread_id))
+        rows = [{**asdict(entry), "profile_id": profile_id, "thread_id": thread_id} for entry in ledger.rows()]
+        session = self.db.get_session()
+        try:
+            session.execute(insert(GenerationLedgerEntry), rows)
+            session.commit()
+            return len(rows)
+        except Exception as e:
+            session.rollback()
+            raise e
+
+    def percentiles(self, profile_id: UUID, kind: str, days: int = 30) -> List[Dict[str, Any]]:
+        """Duration and cost percentiles per node (and model, for LLM calls) of a profile's recent entries,
+        the nodes with the most total time first"""
+        entry = GenerationLedgerEntry
+
+        def percentile(fraction, column):
+            return func.percentile_cont(fraction).within_group(column)
+
+        stmt = (
+            select(
+                entry.node, entry.model,
+                func.count().label("count"),
+                func.sum(entry.duration_ms).label("total_ms"),
+                *[percentile(p, entry.duration_ms).label(f"p{int(p * 100)}_ms") for p in PERCENTILES],
+                func.sum(entry.prompt_tokens).label("prompt_tokens"),
+                func.sum(entry.cached_tokens).label("cached_tokens"),
+                func.sum(entry.completion_tokens).label("completion_tokens"),
+                func.sum(entry.cost_usd).label("total_cost_usd"),
+                *[percentile(p, entry.cost_usd).label(f"p{int(p * 100)}_cost_usd") for p in PERCENTILES],
+            )
+            .where(entry.profile_id == profile_id, entry.kind == kind,
+                   entry.created_at >= func.now() - timedelta(days=days))
+            .group_by(entry.node, entry.model)
+            .order_by(func.sum(entry.duration_ms).desc())
+        )
+        session = self.db.get_session()
+        try:
+            rows = session.execute(stmt).mappings().all()
+            session.commit()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            session.rollback()
+            raise e
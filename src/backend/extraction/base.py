@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any, List
@@ -23,6 +24,13 @@ class BaseExtractor(ABC):
         """Extract data from the source"""
         pass
 
+    async def aextract(self, source: str, **method_params) -> dict:
+        """Extract data from the source without blocking the event loop.
+
+        Runs ``extract`` in a worker thread; network-bound extractors override it natively.
+        """
+        return await asyncio.to_thread(self.extract, source, **method_params)
+
     @abstractmethod
     def create_summary(self, summary_obj: List[dict], **method_params) -> str:
         """Create a summary from the extracted data"""
@@ -54,4 +62,12 @@ class BaseConverter(ABC):
     @abstractmethod
     def convert(self, input_file: str, **custom_params) -> str:
         """Convert input file to markdown"""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    async def aconvert(self, input_file: str, **custom_params) -> str:
+        """Convert input file to markdown without blocking the event loop.
+
+        Runs ``convert`` in a worker thread (conversion is CPU-bound); converters that
+        fetch their input override it to fetch natively.
+        """
+        return await asyncio.to_thread(self.convert, input_file, **custom_params)
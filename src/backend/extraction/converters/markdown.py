@@ -1,10 +1,12 @@
+import asyncio
 from markitdown import MarkItDown
 from pathlib import Path
 import markdownify
 from typing import Dict, Any
 
+from src.backend.clients.http import get_async_http, get_http
 from src.backend.extraction.base import BaseConverter
-import requests
+from src.backend.utils.singleflight import flight_key, get_flight
 
 class HTMLConverter(BaseConverter):
     def __init__(self, config_name: str = "default"):
@@ -19,7 +21,7 @@ class HTMLConverter(BaseConverter):
 
         # Check if input is URL
         if input.startswith(('http://', 'https://')):
-            response = requests.get(input)
+            response = get_http().get(input)
             html = response.text
         # Check if input is a file path
         elif os.path.isfile(input):
@@ -32,13 +34,21 @@ class HTMLConverter(BaseConverter):
         params = self.merge_method_params(custom_params)
         return markdownify.markdownify(html, **params)
 
+    async def aconvert(self, input: str, **custom_params) -> str:
+        if not input.startswith(('http://', 'https://')):
+            return await super().aconvert(input, **custom_params)
+        # Fetch natively, then convert off the event loop
+        response = await get_async_http().get(input)
+        params = self.merge_method_params(custom_params)
+        return await asyncio.to_thread(markdownify.markdownify, response.text, **params)
+
 class PDFConverter(BaseConverter):
     def __init__(self, config_name: str = "default"):
         super().__init__(f"converters.pdf.{config_name}")
     
     def _setup_converter(self):
-        """Initialize MarkItDown with class params"""
-        self.converter = MarkItDown(**self.config.class_params)
+        """Initialize MarkItDown with class params; URLs are fetched with the shared HTTP session"""
+        self.converter = MarkItDown(requests_session=get_http(), **self.config.class_params)
         
     def convert(self, input_file: str, **custom_params) -> str:
         params = self.merge_method_params(custom_params)
@@ -50,10 +60,14 @@ class GenericConverter(BaseConverter):
         super().__init__(f"converters.generic.{config_name}")
     
     def _setup_converter(self):
-        """Initialize MarkItDown with class params"""
-        self.converter = MarkItDown(**self.config.class_params)
+        """Initialize MarkItDown with class params; URLs are fetched with the shared HTTP session"""
+        self.converter = MarkItDown(requests_session=get_http(), **self.config.class_params)
         
     def convert(self, input_file: str, **custom_params) -> str:
         params = self.merge_method_params(custom_params)
+        # Concurrent conversions of the same URL or file share one download and conversion
+        return get_flight("convert").do(flight_key(str(input_file), params), self._convert, input_file, params)
+
+    def _convert(self, input_file: str, params: Dict[str, Any]) -> str:
         result = self.converter.convert(str(input_file), **params)
-        return result.text_content
\ No newline at end of file
+        return result.text_content
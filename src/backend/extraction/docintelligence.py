@@ -7,6 +7,8 @@ import html2text
 import markdownify
 import requests
 
+from src.backend.clients.http import get_http
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,7 +43,7 @@ class DocumentExtractor:
             # 'docx': self.extract_docx,
             # 'txt': self.extract_txt,
         }
-        self.converter= MarkItDown()
+        self.converter= MarkItDown(requests_session=get_http())
     
     def extract_pdf(self, input_file, output_file=None):
         """
@@ -173,8 +175,8 @@ class DocumentExtractor:
             else:
                 pdf_url = url
             
-            # Download the PDF content
-            pdf_response = requests.get(pdf_url, timeout=10)
+            # Check the PDF exists; the converter downloads it
+            pdf_response = get_http().head(pdf_url, allow_redirects=True, timeout=10)
             pdf_response.raise_for_status()  # Raise an exception for HTTP errors
             
             
@@ -217,14 +219,14 @@ class DocumentExtractor:
             api_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
 
             # Make a request to the GitHub API
-            response = requests.get(api_url, headers={"Accept": "application/vnd.github.v3+json"})
+            response = get_http().get(api_url, headers={"Accept": "application/vnd.github.v3+json"})
             response.raise_for_status()
 
             # Get the download URL for the README
             download_url = response.json()['download_url']
 
             # Fetch the README content
-            readme_response = requests.get(download_url)
+            readme_response = get_http().get(download_url)
             readme_response.raise_for_status()
 
             # Initialize HTML to Markdown converter
@@ -34,5 +34,9 @@ class ArxivExtractor(BaseExtractor):
         except Exception as e:
             raise Exception(f"Failed to extract PDF from arXiv: {str(e)}")
 
+    async def aextract(self, source: str, **method_params) -> dict:
+        # The PDF URL is derived from the paper ID: nothing to fetch or offload
+        return self.extract(source, **method_params)
+
     def create_summary(self, summary_obj: List[dict], **method_params) -> str:
         pass
\ No newline at end of file
@@ -1,9 +1,11 @@
 
 from typing import List
-import requests
 from src.backend.clients.github import GithubClient
+from src.backend.clients.http import get_async_http, get_http
 from src.backend.extraction.base import BaseExtractor
 
+README_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+
 
 class GithubExtractor(BaseExtractor):
     def __init__(self, config_name: str = "default"):
@@ -14,32 +16,45 @@ class GithubExtractor(BaseExtractor):
         pass
         
     
-    def extract(self, source: str, **method_params) -> dict:
-        params = self.merge_method_params(method_params)
-        
-        # Extract owner and repo from URL
+    def _repo(self, source: str):
+        """Owner, repo and README API URL of a repository URL"""
         parts = source.strip('/').split('/')
         owner = parts[-2]
         repo = parts[-1]
+        return owner, repo, f"https://api.github.com/repos/{owner}/{repo}/readme"
+
+    def extract(self, source: str, **method_params) -> dict:
+        params = self.merge_method_params(method_params)
         
-        # Initialize GitHub client
+        # Extract owner and repo from URL
+        owner, repo, readme_url = self._repo(source)
         
         # Get README content
-        readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-        response = requests.get(readme_url, headers={"Accept": "application/vnd.github.v3+json"})
+        response = get_http().get(readme_url, headers=README_HEADERS)
         response.raise_for_status()
         
         if not response:
             raise ValueError(f"Could not fetch README for {source}")
             
-        download_url = response.json()['download_url']
-        
+        return self._result(source, owner, repo, response.json())
+
+    async def aextract(self, source: str, **method_params) -> dict:
+        params = self.merge_method_params(method_params)
+        owner, repo, readme_url = self._repo(source)
+
+        response = await get_async_http().get(readme_url, headers=README_HEADERS)
+        response.raise_for_status()
+
+        return self._result(source, owner, repo, response.json())
+
+    @staticmethod
+    def _result(source: str, owner: str, repo: str, readme: dict) -> dict:
         return {
             "type": "github",
             "path": source,
             "owner": owner,
             "repo": repo,
-            "readme_url": download_url
+            "readme_url": readme['download_url']
         }
     
     def create_summary(self, summary_obj: List[dict], **method_params) -> str:
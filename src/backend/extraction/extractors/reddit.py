@@ -1,3 +1,4 @@
+import asyncio
 import re
 import logging
 from src.backend.extraction.base import BaseExtractor
@@ -26,13 +27,38 @@ class RedditExtractor(BaseExtractor):
 
     def extract(self, source: str, **method_params) -> Dict[str, Any]:
         params = self.merge_method_params(method_params)
+        content, subreddit = self._fetch(source)
+
+        if method_params.get("skip_llm", False):
+            return self._result(content, subreddit, "Summary generation skipped.")
+        
+        # Generate summary using LLM
+        summary = self.llm.invoke([HumanMessage(content=self._summary_prompt(content))])
+
+        return self._result(content, subreddit, summary)
+
+    async def aextract(self, source: str, **method_params) -> Dict[str, Any]:
+        params = self.merge_method_params(method_params)
+        # praw is synchronous: the post and its comments are fetched in a worker thread
+        content, subreddit = await asyncio.to_thread(self._fetch, source)
+
+        if method_params.get("skip_llm", False):
+            return self._result(content, subreddit, "Summary generation skipped.")
+
+        summary = await self.llm.ainvoke([HumanMessage(content=self._summary_prompt(content))])
+
+        return self._result(content, subreddit, summary)
+
+    def _fetch(self, source: str):
+        """Content of a submission and the name of its subreddit"""
         submission = self.reddit.submission(url=source)
         
         # Extract full content
         content = self._extract_submission(submission)
-        
-        # Create summary prompt
-        summary_prompt = f"""
+        return content, submission.subreddit.display_name
+
+    def _summary_prompt(self, content: Dict[str, Any]) -> str:
+        return f"""
         Summarize the following Reddit post and its top comments into a detailed, well-structured summary:
 
         **Post Title:** {content['title']}
@@ -51,27 +77,14 @@ class RedditExtractor(BaseExtractor):
         Ensure the summary is clear, concise, and captures the essence of the post and the discussion. Avoid unnecessary details but include enough depth for a comprehensive understanding.
         """
 
-        if method_params.get("skip_llm", False):
-            return {
-                "type": "reddit",
-                "content": content['selftext'],
-                "title": content['title'],
-                "author": content['author'],
-                "subreddit": submission.subreddit.display_name,
-                "score": content['score'],
-                "top_comments": content['comments'][:10],
-                "summary": "Summary generation skipped."
-            }
-        
-        # Generate summary using LLM
-        summary = self.llm.invoke([HumanMessage(content=summary_prompt)])
-
+    @staticmethod
+    def _result(content: Dict[str, Any], subreddit: str, summary: str) -> Dict[str, Any]:
         return {
             "type": "reddit",
             "content": content['selftext'],
             "title": content['title'],
             "author": content['author'],
-            "subreddit": submission.subreddit.display_name,
+            "subreddit": subreddit,
             "score": content['score'],
             "top_comments": content['comments'][:10],
             "summary": summary
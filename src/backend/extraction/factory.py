@@ -1,10 +1,13 @@
-from typing import Type, Dict, Any
+import threading
+from typing import Type, Dict, Any, Tuple
 from pathlib import Path
 from .base import BaseConverter, BaseExtractor
 
 class Registry:
     """Base registry class"""
     _registry: Dict[str, Type[Any]] = {}
+    _instances: Dict[Tuple[str, str], Any] = {}
+    _instances_lock = threading.Lock()
 
     @classmethod
     def register(cls, name: str, component_class: Type[Any]):
@@ -16,6 +19,9 @@ class Registry:
     def unregister(cls, name: str):
         """Unregister a component"""
         cls._registry.pop(name, None)
+        with cls._instances_lock:
+            for key in [key for key in cls._instances if key[0] == name]:
+                del cls._instances[key]
         
     @classmethod
     def get(cls, name: str, config_name: str = "default") -> Any:
@@ -25,22 +31,54 @@ class Registry:
         component_class = cls._registry[name]
         return component_class(config_name)
 
+    @classmethod
+    def shared(cls, name: str, config_name: str = "default") -> Any:
+        """A component instance reused across calls (built on first use)"""
+        with cls._instances_lock:
+            if (name, config_name) not in cls._instances:
+                cls._instances[(name, config_name)] = cls.get(name, config_name)
+            return cls._instances[(name, config_name)]
+
 class ExtracterRegistry(Registry):
     """Registry for extractors"""
     _registry: Dict[str, Type[BaseExtractor]] = {}
 
+    _instances: Dict[Tuple[str, str], BaseExtractor] = {}
+
     @classmethod
     def get_extractor(cls, extractor_type: str, config_name: str = "default") -> BaseExtractor:
         return cls.get(extractor_type, config_name)
 
+    @classmethod
+    def extract(cls, extractor_type: str, source: str, config_name: str = "default", **method_params) -> dict:
+        """Extract ``source`` with the shared extractor of that type"""
+        return cls.shared(extractor_type, config_name).extract(source, **method_params)
+
+    @classmethod
+    async def aextract(cls, extractor_type: str, source: str, config_name: str = "default", **method_params) -> dict:
+        """Async ``extract``; gather several to run them concurrently"""
+        return await cls.shared(extractor_type, config_name).aextract(source, **method_params)
+
 class ConverterRegistry(Registry):
     """Registry for converters"""
     _registry: Dict[str, Type[BaseConverter]] = {}
 
+    _instances: Dict[Tuple[str, str], BaseConverter] = {}
+
     @classmethod
     def get_converter(cls, converter_type: str, config_name: str = "default") -> BaseConverter:
         return cls.get(converter_type, config_name)
 
+    @classmethod
+    def convert(cls, converter_type: str, input_file: str, config_name: str = "default", **custom_params) -> str:
+        """Convert ``input_file`` with the shared converter of that type"""
+        return cls.shared(converter_type, config_name).convert(input_file, **custom_params)
+
+    @classmethod
+    async def aconvert(cls, converter_type: str, input_file: str, config_name: str = "default", **custom_params) -> str:
+        """Async ``convert``; gather several to run them concurrently"""
+        return await cls.shared(converter_type, config_name).aconvert(input_file, **custom_params)
+
 # Remove the factory classes entirely and use registry classes directly
 
 # Usage examples:
@@ -49,6 +87,9 @@ class ConverterRegistry(Registry):
 #
 # pdf_converter = ConverterRegistry.get_converter('pdf', 'fast')
 # html_converter = ConverterRegistry.get_converter('html', 'minimal')
+#
+# readmes = await asyncio.gather(*(ExtracterRegistry.aextract('github', url) for url in repo_urls))
+# pages = await asyncio.gather(*(ConverterRegistry.aconvert('generic', url) for url in urls))
 
 # Usage examples:
 # factory = ExtractorFactory()
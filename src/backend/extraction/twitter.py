@@ -14,6 +14,7 @@ import ast
 import magic
 import time
 from bs4 import BeautifulSoup 
+from src.backend.clients.http import get_http
 from src.backend.db.connection import DatabaseConnectionManager
 from src.backend.utils.logger import setup_logger
 
@@ -62,10 +63,8 @@ class TweetMetadataCollector:
         for dir_path in self.dirs.values():
             dir_path.mkdir(parents=True, exist_ok=True)
         
-        # Request headers
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        # Request headers (the User-Agent is set by the shared HTTP session)
+        self.headers = {}
         
         # Ensure magic library is available for MIME type detection
         try:
@@ -204,7 +203,7 @@ class TweetMetadataCollector:
             if processed_url:
                 try:
                     # More robust URL expansion with timeout and error handling
-                    response = requests.head(
+                    response = get_http().head(
                         processed_url, 
                         headers=self.headers, 
                         allow_redirects=True, 
@@ -298,12 +297,11 @@ class TweetMetadataCollector:
             
             # Download content with enhanced error handling
             try:
-                response = requests.get(
+                response = get_http().get(
                     url, 
                     headers=headers, 
                     timeout=15, 
-                    allow_redirects=True,
-                    stream=True
+                    allow_redirects=True
                 )
                 
                 # Raise exception for bad status codes
@@ -312,7 +310,7 @@ class TweetMetadataCollector:
                 # Detect content type
                 content_type = response.headers.get('Content-Type', '').lower()
 
-                # Read content for type detection
+                # Read content for type detection (capped by the HTTP session)
                 content = response.content
                 # Check if content is a redirect HTML response
                 if 'html' in content_type:
@@ -333,12 +331,11 @@ class TweetMetadataCollector:
                     tweet_metadata = {}
 
                 url = redirect_url
-                response = requests.get(
+                response = get_http().get(
                     url, 
                     headers=headers, 
                     timeout=15, 
-                    allow_redirects=True,
-                    stream=True
+                    allow_redirects=True
                 )
 
                 response.raise_for_status()
@@ -473,19 +470,15 @@ class TweetMetadataCollector:
                 
                 # Download media with redirect handling
                 try:
-                    # Initial request
-                    response = requests.get(media_url, headers=self.headers, timeout=15, allow_redirects=True)
-                    response.raise_for_status()
+                    # Stream to the file, following redirects, under the HTTP session's size cap
+                    response = get_http().download(media_url, file_path, headers=self.headers, timeout=15)
                     
                     # Check for redirects or content type
                     final_url = response.url
                     content_type = response.headers.get('Content-Type', '').lower()
                     
-                    # Validate and save media
+                    # Validate saved media
                     if response.status_code == 200 and ('image' in content_type or 'video' in content_type):
-                        with open(file_path, 'wb') as f:
-                            f.write(response.content)
-                        
                         # Collect media metadata
                         processed_media.append({
                             'tweet_id':tweet_id,
@@ -500,6 +493,7 @@ class TweetMetadataCollector:
                         
                         logger.info(f"Successfully downloaded media: {file_path}")
                     else:
+                        file_path.unlink(missing_ok=True)
                         logger.warning(f"Invalid media content from {media_url}")
                 
                 except requests.RequestException as e:
@@ -620,12 +614,11 @@ class TweetMetadataCollector:
             
             # Download content with enhanced error handling
             try:
-                response = requests.get(
+                response = get_http().get(
                     url, 
                     headers=headers, 
                     timeout=15, 
-                    allow_redirects=True,
-                    stream=True
+                    allow_redirects=True
                 )
                 
                 # Raise exception for bad status codes
@@ -634,7 +627,7 @@ class TweetMetadataCollector:
                 # Detect content type
                 content_type = response.headers.get('Content-Type', '').lower()
 
-                # Read content for type detection
+                # Read content for type detection (capped by the HTTP session)
                 content = response.content
                 # Check if content is a redirect HTML response
                 if 'html' in content_type:
@@ -651,13 +644,15 @@ class TweetMetadataCollector:
                         return None
 
                 url = redirect_url
-                response = requests.get(
+                response = get_http().get(
                     url, 
                     headers=headers, 
                     timeout=15, 
                     allow_redirects=True,
                     stream=True
                 )
+                # Only the headers are needed: the body is not downloaded
+                response.close()
 
                 response.raise_for_status()
 
@@ -0,0 +1,182 @@
+"""
+Background workers for content generation jobs.
+
+``POST /content/jobs`` stores the request in the ``generation_jobs`` table and returns
+a job id at once. ``GenerationWorkerPool`` runs worker threads that claim queued jobs
+with ``SELECT ... FOR UPDATE SKIP LOCKED`` (so any number of processes can share the
+queue without a broker) and execute ``AgentWorkflow.run_generic_workflow``.
+
+While a job runs, a heartbeat thread keeps extending its lease. If the process dies,
+the lease expires and another worker picks the job up again, up to ``max_attempts``.
+Errors raised by the workflow itself fail the job without a retry.
+
+Workers start with the API (``JOB_WORKERS`` threads per process) or on their own:
+
+    python -m src.backend.jobs
+"""
+import dataclasses
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional, Set
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from src.backend.api.datamodel import UserProfileResponse
+from src.backend.db.connection import DatabaseConnectionManager
+from src.backend.db.repositories import JobRepository, ProfileRepository, TemplateRepository
+from src.backend.settings import get_settings
+from src.backend.utils.logger import setup_logger
+from src.backend.utils.metrics import metrics
+
+logger = setup_logger(__name__)
+
+
+class GenerationWorkerPool:
+    """Worker threads that claim and run generation jobs from the Postgres queue"""
+
+    def __init__(self, workflow_factory: Callable, concurrency: int = 2, lease_seconds: float = 120.0,
+                 poll_interval: float = 1.0, job_repo: Optional[JobRepository] = None,
+                 profile_repo: Optional[ProfileRepository] = None,
+                 template_repo: Optional[TemplateRepository] = None):
+        self.workflow_factory = workflow_factory
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.job_repo = job_repo or JobRepository()
+        self.profile_repo = profile_repo or ProfileRepository()
+        self.template_repo = template_repo or TemplateRepository()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._active: Set[UUID] = set()
+        self._active_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stop_heartbeat = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls, workflow_factory: Callable) -> "GenerationWorkerPool":
+        settings = get_settings()
+        return cls(workflow_factory, concurrency=settings.job_workers,
+                   lease_seconds=settings.job_lease_seconds, poll_interval=settings.job_poll_interval)
+
+    @property
+    def active_jobs(self) -> int:
+        with self._active_lock:
+            return len(self._active)
+
+    def start(self) -> None:
+        """Start the worker and heartbeat threads"""
+        self._stop.clear()
+        self._stop_heartbeat.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"generation-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="generation-heartbeat", daemon=True)
+        for thread in self._threads:
+            thread.start()
+        self._heartbeat_thread.start()
+        metrics.register_gauge("jobs.active", lambda: self.active_jobs)
+        logger.info(f"Started {self.concurrency} generation worker(s) as {self.worker_id}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming jobs and wait up to ``timeout`` seconds for running ones.
+
+        Jobs still running afterwards keep their lease until the process exits,
+        then they are retried by another worker.
+        """
+        self._stop.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if not any(thread.is_alive() for thread in self._threads):
+            self._stop_heartbeat.set()
+            if self._heartbeat_thread:
+                self._heartbeat_thread.join()
+        metrics.unregister_gauge("jobs.active")
+        if self.active_jobs:
+            logger.warning(f"Stopped with {self.active_jobs} generation job(s) still running; they will be retried")
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False when the queue is empty"""
+        job = self.job_repo.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        self._execute(job)
+        return True
+
+    def _execute(self, job) -> None:
+        with self._active_lock:
+            self._active.add(job.job_id)
+        logger.info(f"Running generation job {job.job_id} (attempt {job.attempts}/{job.max_attempts})")
+        start = time.perf_counter()
+        try:
+            user = UserProfileResponse(**job.user_context)
+            payload = dict(job.payload)
+            if payload.get("template_id"):
+                # Templates are resolved when the job runs; only the id is stored with the job
+                payload["template"] = self.template_repo.get_template_with_parameters(UUID(payload["template_id"]))
+            result = self.workflow_factory().run_generic_workflow(payload, str(job.thread_id), user)
+            self.profile_repo.increment_generation_count(job.profile_id)
+            if not self.job_repo.complete(job.job_id, self.worker_id, dataclasses.asdict(result)):
+                logger.warning(f"Lease on generation job {job.job_id} was lost before it completed")
+            metrics.increment("jobs.succeeded")
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"Generation job {job.job_id} failed: {error}", exc_info=True)
+            self.job_repo.fail(job.job_id, self.worker_id, error)
+            metrics.increment("jobs.failed")
+        finally:
+            metrics.observe("jobs.run_ms", (time.perf_counter() - start) * 1000)
+            with self._active_lock:
+                self._active.discard(job.job_id)
+
+    def _work(self) -> None:
+        db = DatabaseConnectionManager()
+        while not self._stop.is_set():
+            try:
+                with db.session():
+                    ran = self.run_once()
+            except Exception as e:
+                logger.error(f"Generation worker error: {e}", exc_info=True)
+                ran = False
+            if not ran:
+                self._stop.wait(self.poll_interval)
+
+    def _heartbeat(self) -> None:
+        db = DatabaseConnectionManager()
+        while not self._stop_heartbeat.wait(self.lease_seconds / 3):
+            try:
+                with self._active_lock:
+                    job_ids = list(self._active)
+                with db.session():
+                    held = set(self.job_repo.heartbeat(job_ids, self.worker_id, self.lease_seconds))
+                    self.job_repo.expire_abandoned()
+                with self._active_lock:
+                    lost = [job_id for job_id in job_ids if job_id not in held and job_id in self._active]
+                if lost:
+                    logger.warning(f"Lost the lease on running generation job(s): {lost}")
+            except Exception as e:
+                logger.warning(f"Generation job heartbeat failed: {e}")
+
+
+def main():
+    from src.backend.api.dependencies import get_workflow
+
+    pool = GenerationWorkerPool.from_settings(get_workflow)
+    pool.concurrency = max(1, pool.concurrency)
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    pool.start()
+    stopped.wait()
+    pool.stop(timeout=pool.lease_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,40 @@ class Settings:
         
         # Database
         self.database_url: str = os.getenv("DATABASE_URL", "")
-        
+
+        # LangGraph checkpointer connection pool (one sync and one async pool per process)
+        self.checkpoint_pool_min_size: int = int(os.getenv("CHECKPOINT_POOL_MIN_SIZE", "1"))
+        self.checkpoint_pool_max_size: int = int(os.getenv("CHECKPOINT_POOL_MAX_SIZE", "10"))
+        self.checkpoint_pool_timeout: float = float(os.getenv("CHECKPOINT_POOL_TIMEOUT", "30"))  # seconds to wait for a connection
+        self.checkpoint_pool_max_idle: float = float(os.getenv("CHECKPOINT_POOL_MAX_IDLE", "300"))
+        self.checkpoint_pool_max_lifetime: float = float(os.getenv("CHECKPOINT_POOL_MAX_LIFETIME", "3600"))
+
+        # Memoized generation stages (plan, sections, social posts), per worker process
+        self.stage_cache_enabled: bool = os.getenv("STAGE_CACHE_ENABLED", "true").lower() == "true"
+        self.stage_cache_size: int = int(os.getenv("STAGE_CACHE_SIZE", "1024"))
+        self.stage_cache_ttl: int = int(os.getenv("STAGE_CACHE_TTL", "86400"))  # 24 hours
+
+        # llm config used by the agents (e.g. llm.routed for multi-deployment routing)
+        self.llm_config: str = os.getenv("LLM_CONFIG", "llm.default")
+
+        # Exact-match LLM response cache (opt-in); LLM_CACHE_URL adds a persistent SQLite/Postgres tier
+        self.llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+        self.llm_cache_size: int = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+        self.llm_cache_ttl: int = int(os.getenv("LLM_CACHE_TTL", "86400"))  # 24 hours
+        self.llm_cache_url: str = os.getenv("LLM_CACHE_URL", "")
+
+        # Shared RPM/TPM buckets of rate-limited llm configs (SQLite/Postgres URL; empty = per process)
+        self.llm_rate_limit_url: str = os.getenv("LLM_RATE_LIMIT_URL", "")
+
+        # Background generation jobs (Postgres queue, worker threads per process)
+        self.job_workers: int = int(os.getenv("JOB_WORKERS", "2"))  # 0 disables workers in the API process
+        self.job_lease_seconds: float = float(os.getenv("JOB_LEASE_SECONDS", "120"))  # reclaimed after this without a heartbeat
+        self.job_poll_interval: float = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # seconds between polls of an empty queue
+        self.job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+        # Per-generation ledger of node runs and LLM calls (duration, tokens, estimated cost)
+        self.ledger_enabled: bool = os.getenv("LEDGER_ENABLED", "true").lower() == "true"
+
         # Authentication Provider Configuration
         self.auth_provider: str = os.getenv("AUTH_PROVIDER", "supabase").lower()
 
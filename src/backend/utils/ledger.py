@@ -0,0 +1,165 @@
+"""
+Per-generation ledger of graph node runs and LLM calls.
+
+``GenerationLedger.recording`` opens the ledger of one generation (a thread of a
+profile). While it is open:
+
+* every LLM call reported through ``record_usage`` adds an "llm" entry with its model,
+  duration, prompt/cached/completion tokens and estimated cost
+* every ``node_span`` adds a "node" entry with the node's duration and the tokens and
+  cost of the LLM calls made inside it
+* closing the ledger adds a "generation" entry for the whole run
+
+The ledger and the running node are context variables, so graph tasks and worker
+threads started with a copy of the context record into the same generation. The
+entries are stored in the ``generation_ledger`` table when the generation ends.
+"""
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Set
+
+import litellm
+
+from src.backend.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+GENERATION, NODE, LLM = "generation", "node", "llm"
+
+
+@dataclass
+class LedgerEntry:
+    """One generation, node run or LLM call"""
+
+    kind: str
+    node: Optional[str]
+    duration_ms: float = 0.0
+    model: Optional[str] = None
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add_usage(self, call: "LedgerEntry") -> None:
+        self.prompt_tokens += call.prompt_tokens
+        self.cached_tokens += call.cached_tokens
+        self.completion_tokens += call.completion_tokens
+        self.cost_usd += call.cost_usd
+
+
+class GenerationLedger:
+    """Entries recorded for one generation"""
+
+    def __init__(self, thread_id: str, profile_id: Optional[str], operation: str):
+        self.thread_id = thread_id
+        self.profile_id = profile_id
+        self.total = LedgerEntry(GENERATION, operation)
+        self.entries: List[LedgerEntry] = []
+        self._lock = threading.Lock()
+
+    @property
+    def operation(self) -> str:
+        return self.total.node
+
+    @operation.setter
+    def operation(self, operation: str) -> None:
+        self.total.node = operation
+
+    @contextmanager
+    def recording(self) -> Iterator["GenerationLedger"]:
+        """Record the node runs and LLM calls made in this context into the ledger"""
+        token = _current_ledger.set(self)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total.duration_ms = (time.perf_counter() - start) * 1000
+            _current_ledger.reset(token)
+
+    def add(self, entry: LedgerEntry, node: Optional[LedgerEntry] = None) -> None:
+        with self._lock:
+            self.entries.append(entry)
+            if entry.kind == LLM:
+                self.total.add_usage(entry)
+                if node is not None:
+                    node.add_usage(entry)
+
+    def rows(self) -> List[LedgerEntry]:
+        """Every entry, ending with the generation total"""
+        with self._lock:
+            return [*self.entries, self.total]
+
+
+_current_ledger: ContextVar[Optional[GenerationLedger]] = ContextVar("generation_ledger", default=None)
+_current_node: ContextVar[Optional[LedgerEntry]] = ContextVar("ledger_node", default=None)
+
+# Models litellm has no price for; looked up once
+_unpriced: Set[str] = set()
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call from litellm's price map (0 for unknown models)"""
+    if not model or model in _unpriced:
+        return 0.0
+    try:
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+            cache_read_input_tokens=cached_tokens,
+        )
+        return prompt_cost + completion_cost
+    except Exception as e:
+        _unpriced.add(model)
+        logger.warning(f"No price for model {model}; its calls are recorded with zero cost: {e}")
+        return 0.0
+
+
+def record_llm_call(model: Optional[str], duration_ms: float, prompt_tokens: int, cached_tokens: int,
+                    completion_tokens: int) -> None:
+    """Add an LLM call to the generation being recorded, if any"""
+    ledger = _current_ledger.get()
+    if ledger is None:
+        return
+    node = _current_node.get()
+    ledger.add(LedgerEntry(
+        LLM, node.node if node else None, duration_ms, model, prompt_tokens, cached_tokens, completion_tokens,
+        estimate_cost(model, prompt_tokens, cached_tokens, completion_tokens),
+    ), node)
+
+
+@contextmanager
+def node_span(node: str) -> Iterator[None]:
+    """Record a run of ``node`` (and attribute the LLM calls made inside it)"""
+    ledger = _current_ledger.get()
+    if ledger is None:
+        yield
+        return
+    entry = LedgerEntry(NODE, node)
+    token = _current_node.set(entry)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry.duration_ms = (time.perf_counter() - start) * 1000
+        _current_node.reset(token)
+        ledger.add(entry)
+
+
+def in_node_span(node: str, fn: Callable) -> Callable:
+    """Wrap a graph node function (sync or async) in ``node_span``"""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def arun(*args, **kwargs):
+            with node_span(node):
+                return await fn(*args, **kwargs)
+        return arun
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        with node_span(node):
+            return fn(*args, **kwargs)
+    return run
@@ -0,0 +1,108 @@
+"""
+Lightweight in-process metrics: counters, gauges and timing summaries.
+
+Values live in memory per worker process and are exposed through the
+``/metrics`` endpoint. Components register a gauge callback for numbers they
+already track themselves (e.g. connection pool stats).
+"""
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and timings"""
+
+    def __init__(self, max_samples: int = 1024):
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._timings: Dict[str, Deque[float]] = {}
+        self._timing_totals: Dict[str, list] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add ``value`` to a counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value_ms: float) -> None:
+        """Record a duration in milliseconds (a bounded window of recent samples is kept)"""
+        with self._lock:
+            samples = self._timings.get(name)
+            if samples is None:
+                samples = self._timings[name] = deque(maxlen=self._max_samples)
+                self._timing_totals[name] = [0, 0.0]
+            samples.append(value_ms)
+            totals = self._timing_totals[name]
+            totals[0] += 1
+            totals[1] += value_ms
+
+    def register_gauge(self, name: str, callback: Callable[[], Any]) -> None:
+        """Register a callback evaluated on every snapshot"""
+        with self._lock:
+            self._gauges[name] = callback
+
+    def unregister_gauge(self, name: str) -> None:
+        with self._lock:
+            self._gauges.pop(name, None)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def timing(self, name: str) -> Dict[str, Any]:
+        """Summary of one timing (without evaluating gauges, so gauges can use it)"""
+        with self._lock:
+            samples = list(self._timings.get(name, ()))
+            count, total = self._timing_totals.get(name, (0, 0.0))
+        return _summarize(samples, count, total)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current values of every metric"""
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {name: (list(samples), list(self._timing_totals[name]))
+                       for name, samples in self._timings.items()}
+            gauges = dict(self._gauges)
+
+        timing_summary = {name: _summarize(samples, count, total)
+                          for name, (samples, (count, total)) in timings.items()}
+
+        gauge_values = {}
+        for name, callback in gauges.items():
+            try:
+                gauge_values[name] = callback()
+            except Exception as e:
+                gauge_values[name] = {"error": str(e)}
+
+        return {"counters": counters, "timings": timing_summary, "gauges": gauge_values}
+
+    def reset(self) -> None:
+        """Clear counters and timings (gauges stay registered)"""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+            self._timing_totals.clear()
+
+
+def _summarize(samples, count, total) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "count": count,
+        "mean_ms": total / count if count else 0.0,
+        "p50_ms": _percentile(ordered, 0.50),
+        "p95_ms": _percentile(ordered, 0.95),
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = max(0, int(round(fraction * len(ordered))) - 1)
+    return ordered[index]
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,124 @@
+"""
+Single-flight coalescing of identical in-flight operations.
+
+Several users (or a retrying client) starting the same work at the same moment,
+e.g. generating from the same trending Reddit topic, repeat identical LLM calls, URL
+conversions and searches. ``SingleFlight.do`` runs one execution per key; calls with
+the same key that arrive while it runs wait for it and share its result or error.
+Results are shared, not copied, so callers must not mutate them.
+
+Only calls that overlap are coalesced; nothing is kept once the execution finishes
+(see ``clients.llm_cache`` for reuse over time). Each named flight counts executions
+and coalesced calls on ``/metrics``.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from src.backend.utils.metrics import metrics
+
+
+def flight_key(*parts: Any) -> str:
+    """Hash of an operation's arguments"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one execution per key at a time and shares it with concurrent callers"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def _count(self, leader: bool) -> None:
+        with self._lock:
+            if leader:
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        metrics.increment(f"singleflight.{self.name}.{'executed' if leader else 'coalesced'}")
+
+    def do(self, key: str, fn: Callable, *args, **kwargs) -> Any:
+        """Return ``fn(*args, **kwargs)``, or the result of the identical call already running"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self._count(leader)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """Async counterpart of do; the execution runs as a task, so a cancelled caller does not
+        cancel it for the others"""
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            leader = task is None
+            if leader:
+                task = self._tasks[task_key] = asyncio.ensure_future(fn(*args, **kwargs))
+                task.add_done_callback(lambda _: self._forget(task_key))
+        self._count(leader)
+        return await asyncio.shield(task)
+
+    def _forget(self, task_key: Tuple[int, str]) -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.executed + self.coalesced
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "coalesced_ratio": round(self.coalesced / calls, 3) if calls else 0.0,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_flight(name: str) -> SingleFlight:
+    """Return the process-wide flight of an operation (e.g. "llm", "convert", "search")"""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+            if len(_flights) == 1:
+                metrics.register_gauge("singleflight", _stats)
+        return flight
+
+
+def _stats() -> Dict[str, Any]:
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
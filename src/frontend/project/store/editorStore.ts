@@ -728,7 +728,10 @@ ${content}`;
             
             // Parse the JSON from the cleaned line
             const eventData = JSON.parse(jsonStr);
-            
+
+            // Token events carry generated text ({type: 'token', node, section, content}), not progress
+            if (eventData.type === 'token') continue;
+
             // Update progress for this specific generation
             if (eventData.message) {
               set((state: CombinedState) => ({
@@ -0,0 +1,8 @@
+"""
+Offline benchmarks for the PostBot backend.
+
+Benchmarks are plain scripts (``bench_*.py``), not collected by pytest. Run them from
+the repository root, e.g.::
+
+    python -m tests.benchmarks.bench_workflow_setup
+"""
@@ -0,0 +1,113 @@
+"""
+Checkpoint size and serialization cost: ``JsonPlusSerializer(pickle_fallback=True)``
+with the stock ``PostgresSaver`` (before) vs ``CompactSerializer`` with
+``CompactPostgresSaver`` (after).
+
+Serialization time is measured on a representative ``BlogState`` (planned sections,
+written sections, final blog and a large ``input_content``). With ``--database-url``
+a full blog generation (``FakeLLM``, no latency) is also run against each saver and
+the bytes stored per generation in ``checkpoints``, ``checkpoint_blobs`` and
+``checkpoint_writes`` are reported. The checkpoint tables are created if missing.
+
+    python -m tests.benchmarks.bench_checkpoint_serde --iterations 200
+    python -m tests.benchmarks.bench_checkpoint_serde --database-url postgresql://localhost/postbot_bench
+"""
+import argparse
+import random
+import uuid
+
+from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from tests.benchmarks.common import CHECKPOINT_SIZES_SQL, print_table, setup_bench_env, summarize, time_calls
+from tests.benchmarks.fakes import FAKE_PLAN, FakeLLM
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.state import BlogState, BlogStateInput, Section  # noqa: E402
+from src.backend.db.checkpoint_serde import CompactPostgresSaver, CompactSerializer  # noqa: E402
+
+# Seeded pseudo-prose, so compression ratios are closer to a scraped article than a repeated sentence
+_WORDS = random.Random(7).choices(
+    "the a of to and model data query latency index cache graph node state section token "
+    "request response server client stream batch table row column worker queue retry".split(),
+    k=8000,
+)
+INPUT_CONTENT = " ".join(_WORDS)
+
+def sample_state():
+    sections = [
+        Section(name=s["name"], description=s["description"], main_body=s["main_body"],
+                content="Generated paragraph for this section. " * 60)
+        for s in FAKE_PLAN["sections"]
+    ]
+    return BlogState(
+        input_topic="benchmark", input_content=INPUT_CONTENT, sections=sections,
+        completed_sections=sections, final_blog="\n\n".join(s.content for s in sections),
+        post_types=["blog"], thread_id="bench",
+    )
+
+
+def serde_rows(state, iterations):
+    rows = {}
+    for label, serde in (("pickle_fallback (before)", JsonPlusSerializer(pickle_fallback=True)),
+                         ("msgpack+zstd (after)", CompactSerializer())):
+        typed = serde.dumps_typed(state)
+        dumps = summarize(time_calls(lambda: serde.dumps_typed(state), iterations))
+        loads = summarize(time_calls(lambda: serde.loads_typed(typed), iterations))
+        rows[f"{label} dumps"] = dumps
+        rows[f"{label} loads"] = loads
+        print(f"{label:<26} {typed[0]:<13} {len(typed[1]):>8} bytes")
+    return rows
+
+
+def bytes_per_generation(saver, pool):
+    saver.setup()
+    workflow = AgentWorkflow(checkpointer=saver)
+    workflow.llm = FakeLLM(latency_ms=0)
+    workflow.content_repo.exists = lambda *args, **kwargs: False
+    workflow._store_new_content = lambda *args, **kwargs: None
+    workflow._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic="benchmark", input_content=INPUT_CONTENT,
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    thread_id = f"serde-bench-{uuid.uuid4()}"
+    workflow.run_generic_workflow({"post_types": ["blog"]}, thread_id, None)
+    with pool.connection() as conn:
+        return {table: conn.execute(sql, (thread_id,)).fetchone() for table, sql in CHECKPOINT_SIZES_SQL.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    state = sample_state()
+    print_table(f"Serializing a BlogState ({args.iterations} iterations)", serde_rows(state, args.iterations))
+
+    if not args.database_url:
+        return
+
+    from psycopg_pool import ConnectionPool
+
+    from src.backend.db.checkpoint import CHECKPOINT_CONNECTION_KWARGS
+
+    with ConnectionPool(args.database_url, kwargs=CHECKPOINT_CONNECTION_KWARGS) as pool:
+        savers = (
+            ("before", PostgresSaver(pool, serde=JsonPlusSerializer(pickle_fallback=True))),
+            ("after", CompactPostgresSaver(pool)),
+        )
+        print(f"\nBytes stored per blog generation ({len(INPUT_CONTENT)} chars of input content)")
+        print(f"{'':<8}" + "".join(f"{table:>26}" for table in CHECKPOINT_SIZES_SQL) + f"{'total':>12}")
+        for label, saver in savers:
+            sizes = bytes_per_generation(saver, pool)
+            cells = "".join(f"{f'{size:,} B ({rows} rows)':>26}" for rows, size in sizes.values())
+            total = sum(size for _, size in sizes.values())
+            print(f"{label:<8}{cells}{total:>10,} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Section prompt size and generation time for a long source, with the raw document
+in every section prompt (before) vs the map-reduce brief (after).
+
+The source is seeded pseudo-prose the size of a long arXiv paper (``--source-tokens``).
+``FakeLLM`` waits ``--llm-latency-ms`` per call; chunk summaries run with the
+configured ``condense.max_concurrency``. Prompt sizes are counted with the
+configured model's tokenizer.
+
+    python -m tests.benchmarks.bench_condense --source-tokens 60000 --llm-latency-ms 200
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import setup_bench_env
+from tests.benchmarks.fakes import FakeLLM
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.state import BlogStateInput  # noqa: E402
+
+_VOCABULARY = (
+    "the a of to and model attention layer token training loss dataset benchmark result "
+    "table figure method baseline accuracy parameter gradient sequence encoder decoder head"
+).split()
+
+
+def long_source(tokens):
+    rng = random.Random(11)
+    paragraphs = [" ".join(rng.choices(_VOCABULARY, k=90)) + "." for _ in range(max(1, tokens // 110))]
+    return "\n\n".join(paragraphs)
+
+
+def build_workflow(content, condense, llm_latency_ms):
+    workflow = AgentWorkflow(checkpointer=InMemorySaver())
+    workflow.llm = FakeLLM(latency_ms=llm_latency_ms)
+    workflow._store_new_content = lambda *args, **kwargs: None
+    workflow.content_repo.exists = lambda *args, **kwargs: False
+    workflow._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic="benchmark", input_content=content,
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    if not condense:
+        workflow.condense_params = {}
+    # Measure the raw document vs the brief, not the per-section token budget
+    workflow.budgeter.budgets.pop("write_section", None)
+    return workflow
+
+
+def run(workflow):
+    prompts = []
+    respond = workflow.llm._respond
+    workflow.llm._respond = lambda messages: prompts.append(messages[0].content) or respond(messages)
+    start = time.perf_counter()
+    asyncio.run(workflow.arun_generic_workflow({"post_types": ["blog"]}, "condense-bench", None))
+    elapsed = (time.perf_counter() - start) * 1000
+    section_tokens = [workflow.budgeter.count(p) for p in prompts if "crafting a section" in p]
+    return elapsed, section_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source-tokens", type=int, default=60000)
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    content = long_source(args.source_tokens)
+    print(f"\nSource: {len(content):,} chars, LLM latency {args.llm_latency_ms:.0f} ms")
+    print(f"{'':<22}{'section prompt tokens':>24}{'LLM calls':>12}{'total ms':>12}")
+    for label, condense in (("raw source (before)", False), ("brief (after)", True)):
+        workflow = build_workflow(content, condense, args.llm_latency_ms)
+        elapsed, section_tokens = run(workflow)
+        print(f"{label:<22}{statistics.fmean(section_tokens):>24,.0f}{workflow.llm.calls:>12}{elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
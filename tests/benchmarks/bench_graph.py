@@ -0,0 +1,318 @@
+"""
+End-to-end generation: runs ``AgentWorkflow.run_generic_workflow`` (source collection
+and the full graph) for URL, topic, tweet and Reddit payloads with every external
+service stubbed, and reports per-node latency, total wall time, LLM calls and tokens,
+and checkpoint bytes per generation.
+
+The LLM is a ``ReplayLLM``: responses recorded with ``--record`` (which calls the real
+model configured in the environment) are replayed with ``--replay``, and any other
+prompt gets a canned response. Each call takes ``--llm-latency-ms`` plus
+``--ms-per-token`` per response token. Web, image and Reddit search and URL conversion
+are fakes with fixed latencies, and database writes are skipped. Checkpoints are
+serialized as in production and kept in memory, or written to Postgres with
+``--database-url``.
+
+Save a run with ``--output`` and pass it to a later run as ``--baseline`` to print what
+changed; the exit status is 1 when a metric got worse by more than ``--threshold``.
+
+    python -m tests.benchmarks.bench_graph --output baseline.json
+    python -m tests.benchmarks.bench_graph --baseline baseline.json
+    python -m tests.benchmarks.bench_graph --record recording.json --iterations 1
+    python -m tests.benchmarks.bench_graph --replay recording.json --database-url postgresql://localhost/postbot_bench
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import CHECKPOINT_SIZES_SQL, print_table, setup_bench_env, summarize
+from tests.benchmarks.fakes import (
+    FakeConverter, FakeImageSearch, FakeRedditSearch, FakeWebSearch, RecordingLLM, ReplayLLM,
+)
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.utils import get_url_metadata  # noqa: E402
+from src.backend.db.checkpoint_serde import CompactPostgresSaver, CompactSerializer  # noqa: E402
+from src.backend.utils.metrics import metrics  # noqa: E402
+
+PAYLOADS = {
+    "url": {"url": "https://example.com/vector-databases"},
+    "topic": {"topic": "Vector databases"},
+    "tweet": {"tweet_id": "1"},
+    "reddit": {"reddit_query": "Vector databases"},
+}
+
+# Timing changes smaller than this are noise, however large relative to a fast node
+NOISE_FLOOR_MS = 5.0
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Wall time spent in each graph node per generation, summed over the node's tasks"""
+
+    def __init__(self):
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.tasks: Dict[str, int] = defaultdict(int)
+        self._started: Dict[uuid.UUID, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.totals.clear()
+            self.tasks.clear()
+
+    def add(self, node: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.totals[node] += elapsed_ms
+            self.tasks[node] += 1
+
+    def on_chain_start(self, serialized, inputs, *, run_id, tags=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Node tasks are tagged with their superstep; routers and runs nested in a node are not
+        if node and kwargs.get("name") == node and any(tag.startswith("graph:step:") for tag in tags or ()):
+            with self._lock:
+                self._started[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started:
+            node, start = started
+            self.add(node, (time.perf_counter() - start) * 1000)
+
+
+def memory_checkpoint_bytes(saver: InMemorySaver, thread_id: str) -> int:
+    """Serialized bytes an InMemorySaver holds for a thread: checkpoints, channel values and writes"""
+    total = 0
+    for checkpoints in saver.storage[thread_id].values():
+        for (_, checkpoint), (_, metadata), _parent in checkpoints.values():
+            total += len(checkpoint) + len(metadata)
+    total += sum(len(blob) for key, (_, blob) in saver.blobs.items() if key[0] == thread_id)
+    total += sum(len(write[2][1]) for key, writes in saver.writes.items() if key[0] == thread_id
+                 for write in writes.values())
+    return total
+
+
+def instrument(workflow: AgentWorkflow, timer: NodeTimer) -> None:
+    """Time source collection and every graph node of the workflow's runs"""
+    run_config = workflow._run_config
+    workflow._run_config = lambda thread_id, payload, **configurable: {
+        **run_config(thread_id, payload, **configurable), "callbacks": [timer],
+    }
+    prepare_input = workflow._prepare_input
+
+    def timed_prepare_input(payload, thread_id, user):
+        start = time.perf_counter()
+        try:
+            return prepare_input(payload, thread_id, user)
+        finally:
+            timer.add("(prepare_input)", (time.perf_counter() - start) * 1000)
+
+    workflow._prepare_input = timed_prepare_input
+
+
+def build_workflow(name: str, args, llm, checkpointer) -> AgentWorkflow:
+    workflow = AgentWorkflow(checkpointer=checkpointer)
+    workflow.llm = llm
+    # Fake search results share one domain, so the per-domain limit is lifted
+    workflow.relevance.max_results = workflow.relevance.max_per_domain = args.urls
+    search = dict(latency_ms=args.search_latency_ms)
+    url = dict(latency_ms=args.url_latency_ms, jitter_ms=args.url_jitter_ms)
+    workflow.websearcher = FakeWebSearch(**search)
+    workflow.imagesearch = FakeImageSearch(nested=name == "reddit", **search)
+    workflow.generic_converter = FakeConverter(content_tokens=args.source_tokens, **url)
+    workflow.reddit_searcher = FakeRedditSearch(**url)
+    # Source, media and content rows are written to the database, which is out of scope here
+    workflow._setup_web_url_source = lambda payload, thread_id, user: (None, get_url_metadata(payload["url"]), [])
+    workflow._setup_topic_source = lambda payload, urls, thread_id, user: (None, [get_url_metadata(u) for u in urls])
+    workflow._setup_tweet_source = lambda payload, thread_id, user: (None, [], [], "New vector database release")
+    workflow._setup_reddit_source = lambda payload, thread_id, user: None
+    workflow._handle_media_storage = lambda source_id, media_meta: None
+    workflow._store_new_content = lambda *args, **kwargs: None
+    workflow.content_repo.exists = lambda *args, **kwargs: False
+    return workflow
+
+
+def bench_payload(name: str, args, llm, checkpointer, checkpoint_bytes: Callable[[str], int]) -> Dict[str, Any]:
+    """Run ``args.iterations`` generations of one payload and average their measurements"""
+    workflow = build_workflow(name, args, llm, checkpointer)
+    timer = NodeTimer()
+    instrument(workflow, timer)
+    payload = {**PAYLOADS[name], "post_types": args.post_types}
+    runs: List[Dict[str, Any]] = []
+    for _ in range(args.iterations):
+        thread_id = f"bench-graph-{name}-{uuid.uuid4()}"
+        timer.reset()
+        metrics.reset()
+        start = time.perf_counter()
+        workflow.run_generic_workflow(payload, thread_id, None)
+        wall_ms = (time.perf_counter() - start) * 1000
+        counters = metrics.snapshot()["counters"]
+        runs.append({
+            "wall_ms": wall_ms,
+            "nodes_ms": dict(timer.totals),
+            "node_tasks": dict(timer.tasks),
+            "llm_calls": counters.get("llm.calls", 0),
+            "prompt_tokens": counters.get("llm.prompt_tokens", 0),
+            "completion_tokens": counters.get("llm.completion_tokens", 0),
+            "checkpoint_bytes": checkpoint_bytes(thread_id),
+        })
+    return {
+        "wall_ms": summarize([run["wall_ms"] for run in runs]),
+        "nodes_ms": {node: statistics.fmean(run["nodes_ms"].get(node, 0.0) for run in runs)
+                     for node in runs[-1]["nodes_ms"]},
+        "node_tasks": runs[-1]["node_tasks"],
+        **{key: statistics.fmean(run[key] for run in runs)
+           for key in ("llm_calls", "prompt_tokens", "completion_tokens", "checkpoint_bytes")},
+    }
+
+
+def flatten(results: Dict[str, Any], payloads) -> Dict[str, float]:
+    """One comparable number per payload metric and per payload node"""
+    flat = {}
+    for name in payloads:
+        result = results["payloads"][name]
+        flat[f"{name} wall p50_ms"] = result["wall_ms"]["p50_ms"]
+        for node, elapsed in result["nodes_ms"].items():
+            flat[f"{name} {node} ms"] = elapsed
+        for key in ("llm_calls", "prompt_tokens", "completion_tokens", "checkpoint_bytes"):
+            flat[f"{name} {key}"] = result[key]
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> Tuple[List[Tuple], List[str]]:
+    """Rows of (metric, before, after, change) and the metrics that got worse by more than ``threshold``"""
+    payloads = [name for name in current["payloads"] if name in baseline["payloads"]]
+    before, after = flatten(baseline, payloads), flatten(current, payloads)
+    rows, regressions = [], []
+    for metric in sorted(before.keys() | after.keys()):
+        old, new = before.get(metric), after.get(metric)
+        if old is None or new is None:
+            rows.append((metric, old, new, None))
+            continue
+        change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+        rows.append((metric, old, new, change))
+        if change > threshold and not (metric.endswith("ms") and new - old < NOISE_FLOOR_MS):
+            regressions.append(metric)
+    return rows, regressions
+
+
+def print_comparison(rows: List[Tuple], regressions: List[str]) -> None:
+    print(f"\nChange from baseline ({len(regressions)} regression(s))")
+    print(f"{'':<44}{'before':>14}{'after':>14}{'change':>10}")
+    for metric, old, new, change in rows:
+        cells = "".join(f"{'-' if value is None else f'{value:,.2f}':>14}" for value in (old, new))
+        delta = "new" if old is None else "removed" if new is None else f"{change:+.1%}"
+        flag = "  REGRESSION" if metric in regressions else ""
+        print(f"{metric:<44}{cells}{delta:>10}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", default=",".join(PAYLOADS))
+    parser.add_argument("--post-types", default="blog,twitter,linkedin")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--ms-per-token", type=float, default=2.0)
+    parser.add_argument("--section-tokens", type=int, default=400)
+    parser.add_argument("--urls", type=int, default=4)
+    parser.add_argument("--source-tokens", type=int, default=1500)
+    parser.add_argument("--search-latency-ms", type=float, default=400.0)
+    parser.add_argument("--url-latency-ms", type=float, default=800.0)
+    parser.add_argument("--url-jitter-ms", type=float, default=400.0)
+    parser.add_argument("--database-url", default=None)
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument("--replay", default=None, help="recorded LLM responses to replay")
+    recording.add_argument("--record", default=None, help="call the real LLM and save its responses here")
+    parser.add_argument("--output", default=None, help="save the results as JSON")
+    parser.add_argument("--baseline", default=None, help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+    args.post_types = args.post_types.split(",")
+
+    if args.record:
+        from src.backend.clients.llm import LLMClient
+
+        llm = RecordingLLM(LLMClient())
+    else:
+        replay_params = dict(latency_ms=args.llm_latency_ms, ms_per_token=args.ms_per_token,
+                             section_tokens=args.section_tokens)
+        llm = ReplayLLM.load(args.replay, **replay_params) if args.replay else ReplayLLM(**replay_params)
+        llm.relevant_urls = args.urls
+
+    pool = None
+    if args.database_url:
+        from psycopg_pool import ConnectionPool
+
+        from src.backend.db.checkpoint import CHECKPOINT_CONNECTION_KWARGS
+
+        pool = ConnectionPool(args.database_url, kwargs=CHECKPOINT_CONNECTION_KWARGS)
+        checkpointer = CompactPostgresSaver(pool)
+        checkpointer.setup()
+
+        def checkpoint_bytes(thread_id):
+            with pool.connection() as conn:
+                return sum(conn.execute(sql, (thread_id,)).fetchone()[1] for sql in CHECKPOINT_SIZES_SQL.values())
+    else:
+        checkpointer = InMemorySaver(serde=CompactSerializer())
+
+        def checkpoint_bytes(thread_id):
+            return memory_checkpoint_bytes(checkpointer, thread_id)
+
+    settings = {key: value for key, value in vars(args).items()
+                if key not in ("record", "output", "baseline", "threshold")}
+    results = {"settings": settings, "payloads": {}}
+    try:
+        for name in args.payloads.split(","):
+            result = bench_payload(name, args, llm, checkpointer, checkpoint_bytes)
+            results["payloads"][name] = result
+            rows = {node: {"mean_ms": elapsed, "tasks": result["node_tasks"][node]}
+                    for node, elapsed in result["nodes_ms"].items()}
+            print_table(f"{name}: time per node ({args.iterations} generations)", rows)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    print_table("Per generation", {
+        name: {"wall_p50_ms": result["wall_ms"]["p50_ms"], "wall_max_ms": result["wall_ms"]["max_ms"],
+               "llm_calls": result["llm_calls"], "prompt_tok": result["prompt_tokens"],
+               "output_tok": result["completion_tokens"], "ckpt_kb": result["checkpoint_bytes"] / 1024}
+        for name, result in results["payloads"].items()
+    })
+    if not args.record and llm.recording:
+        print(f"\n{llm.replayed} of {llm.calls} LLM calls replayed from {args.replay}")
+
+    if args.record:
+        llm.save(args.record)
+        print(f"\nRecorded {len(llm.recording)} LLM responses to {args.record}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("settings") != settings:
+            print("\nNote: the baseline was run with different settings")
+        rows, regressions = compare(baseline, results, args.threshold)
+        print_comparison(rows, regressions)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Research phase time for the topic, tweet and Reddit workflows, with web search,
+image search and URL conversion run one after another (before) vs image search in
+the background and URLs converted concurrently (after).
+
+Network calls are stubbed with fixed latencies: ``--search-latency-ms`` for web and
+image search, ``--url-latency-ms`` plus up to ``--url-jitter-ms`` per URL conversion
+or Reddit lookup, and ``--llm-latency-ms`` for the query rewrite and relevance
+selection prompts. Results are selected by ``--relevance``: ``bm25`` ranks them
+locally, ``llm`` sends them to the relevance prompt. Both keep ``--urls`` results.
+
+    python -m tests.benchmarks.bench_research --urls 8 --url-latency-ms 800
+    python -m tests.benchmarks.bench_research --relevance llm
+"""
+import argparse
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import print_table, setup_bench_env, summarize, time_calls
+from tests.benchmarks.fakes import FakeConverter, FakeImageSearch, FakeLLM, FakeRedditSearch, FakeWebSearch
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.ranking import RelevanceRanker  # noqa: E402
+from src.backend.agents.research import ResearchPool  # noqa: E402
+from src.backend.agents.utils import get_url_metadata  # noqa: E402
+from src.backend.config import ConfigLoader  # noqa: E402
+
+PAYLOADS = {
+    "topic": {"topic": "Vector databases", "post_types": ["blog"]},
+    "tweet": {"tweet_id": "1", "post_types": ["blog"]},
+    "reddit": {"reddit_query": "Vector databases", "post_types": ["blog"]},
+}
+
+
+def build_workflow(name, args, research):
+    workflow = AgentWorkflow(checkpointer=InMemorySaver())
+    workflow.llm = FakeLLM(latency_ms=args.llm_latency_ms)
+    workflow.llm.relevant_urls = args.urls
+    # Fake results share one domain, so the per-domain limit is lifted
+    workflow.relevance = RelevanceRanker(method=args.relevance, max_results=args.urls, max_per_domain=args.urls)
+    search = dict(latency_ms=args.search_latency_ms)
+    url = dict(latency_ms=args.url_latency_ms, jitter_ms=args.url_jitter_ms)
+    workflow.websearcher = FakeWebSearch(**search)
+    workflow.imagesearch = FakeImageSearch(nested=name == "reddit", **search)
+    workflow.generic_converter = FakeConverter(**url)
+    workflow.reddit_searcher = FakeRedditSearch(**url)
+    workflow.research = research
+    # Source records and media rows are written to the database, which is out of scope here
+    workflow._setup_topic_source = lambda payload, urls, thread_id, user: (None, [get_url_metadata(u) for u in urls])
+    workflow._setup_tweet_source = lambda payload, thread_id, user: (None, [], [], "New vector database release")
+    workflow._setup_reddit_source = lambda payload, thread_id, user: None
+    workflow._handle_media_storage = lambda source_id, media_meta: None
+    return workflow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=8)
+    parser.add_argument("--relevance", choices=["bm25", "llm"], default="bm25")
+    parser.add_argument("--search-latency-ms", type=float, default=400.0)
+    parser.add_argument("--url-latency-ms", type=float, default=800.0)
+    parser.add_argument("--url-jitter-ms", type=float, default=400.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    configured = ResearchPool.from_config(ConfigLoader().get_config("research.default"))
+    modes = {
+        "sequential (before)": ResearchPool(max_concurrency=1),
+        f"concurrent x{configured.max_concurrency} (after)": configured,
+    }
+    for name, payload in PAYLOADS.items():
+        rows = {}
+        for label, research in modes.items():
+            workflow = build_workflow(name, args, research)
+            durations = time_calls(lambda: workflow._collect_input(payload, "research-bench", None), args.iterations)
+            rows[label] = summarize(durations)
+        print_table(f"{name} research phase ({args.urls} URLs)", rows)
+
+
+if __name__ == "__main__":
+    main()
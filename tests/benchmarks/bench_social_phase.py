@@ -0,0 +1,86 @@
+"""
+Wall-clock time of the social phase (LinkedIn + Twitter + tags after the blog).
+
+``sequential`` reproduces the previous chained routing, where each derivative ran
+after the other; ``parallel`` is the current fan-out from ``route_derivatives``.
+The LLM is ``FakeLLM`` with a fixed latency, so the result isolates graph scheduling.
+
+    python -m tests.benchmarks.bench_social_phase --iterations 5 --llm-latency-ms 200
+"""
+import argparse
+import asyncio
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import print_table, setup_bench_env, summarize
+from tests.benchmarks.fakes import FakeLLM
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.state import BlogStateInput  # noqa: E402
+
+
+class SequentialDerivativesWorkflow(AgentWorkflow):
+    """Runs one derivative at a time, like the old linkedin -> twitter chain"""
+
+    def route_derivatives(self, state):
+        branches = super().route_derivatives(state)
+        return branches[:1] if isinstance(branches, list) else branches
+
+
+def build_workflow(cls):
+    workflow = cls(checkpointer=InMemorySaver())
+    workflow.llm = FakeLLM(latency_ms=0)
+    # Threads whose blog has been "stored", so the social phase finds its content
+    stored = set()
+    workflow.content_repo.exists = lambda field, value: value in stored
+    workflow._store_new_content = lambda result, thread_id, *args, **kwargs: stored.add(thread_id)
+    workflow._store_social_content = lambda *args, **kwargs: None
+    workflow._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic="benchmark", input_content="Reference material.",
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    return workflow
+
+
+async def time_social_phase(workflow, iterations, llm_latency_ms):
+    durations = []
+    for i in range(iterations):
+        thread_id = f"social-{i}"
+        # The blog itself (and its tags) are produced without latency; only the social phase is timed
+        workflow.llm.latency = 0
+        await workflow.arun_generic_workflow({"post_types": ["blog"]}, thread_id, None)
+        workflow.llm.latency = llm_latency_ms / 1000
+
+        start = time.perf_counter()
+        await workflow.arun_generic_workflow(
+            {"thread_id": thread_id, "post_types": ["linkedin", "twitter"]}, None, None
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    rows = {}
+    for label, cls in (("sequential (before)", SequentialDerivativesWorkflow),
+                       ("parallel (after)", AgentWorkflow)):
+        workflow = build_workflow(cls)
+        rows[label] = summarize(asyncio.run(time_social_phase(workflow, args.iterations, args.llm_latency_ms)))
+
+    print_table(
+        f"Social phase, LinkedIn + Twitter ({args.iterations} iterations, "
+        f"LLM latency {args.llm_latency_ms:.0f} ms)",
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Repeated generations of the same input with and without the stage cache.
+
+Each iteration generates a blog and a Twitter post for the same topic and source
+content on a new thread, like a retry after a disconnect or a second team member
+picking the same URL. ``FakeLLM`` waits ``--llm-latency-ms`` per call.
+
+    python -m tests.benchmarks.bench_stage_cache --iterations 5 --llm-latency-ms 200
+"""
+import argparse
+import asyncio
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import print_table, setup_bench_env, summarize
+from tests.benchmarks.fakes import FakeLLM
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.memo import StageCache  # noqa: E402
+from src.backend.agents.state import BlogStateInput  # noqa: E402
+
+
+def build_workflow(stage_cache, llm_latency_ms):
+    workflow = AgentWorkflow(checkpointer=InMemorySaver())
+    workflow.llm = FakeLLM(latency_ms=llm_latency_ms)
+    workflow.stage_cache = stage_cache
+    workflow._store_new_content = lambda *args, **kwargs: None
+    workflow.content_repo.exists = lambda *args, **kwargs: False
+    workflow._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic="benchmark", input_content="Reference material. " * 200,
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    return workflow
+
+
+async def run(workflow, iterations):
+    durations = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await workflow.arun_generic_workflow({"post_types": ["blog", "twitter"]}, f"memo-{i}", None)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    rows, calls, stats = {}, {}, None
+    for label, cache in (("no cache (before)", None), ("stage cache (after)", StageCache())):
+        workflow = build_workflow(cache, args.llm_latency_ms)
+        rows[label] = summarize(asyncio.run(run(workflow, args.iterations)))
+        calls[label] = workflow.llm.calls
+        stats = cache.stats() if cache else stats
+
+    print_table(
+        f"Generation of the same input ({args.iterations} iterations, "
+        f"LLM latency {args.llm_latency_ms:.0f} ms)",
+        rows,
+    )
+    for label, count in calls.items():
+        print(f"{label:<20} {count} LLM calls")
+    print(f"hit rate per stage: {stats['hit_rate']}")
+
+
+if __name__ == "__main__":
+    main()
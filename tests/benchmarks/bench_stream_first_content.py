@@ -0,0 +1,77 @@
+"""
+Time to first content on the generation stream.
+
+Before token streaming, the first text a client could show arrived with the first
+finished ``write_section`` update; now section tokens are streamed as they are
+generated. Both moments are measured on the same run of ``stream_generic_workflow``
+with ``FakeLLM`` spreading ``--llm-latency-ms`` over each response.
+
+    python -m tests.benchmarks.bench_stream_first_content --iterations 3 --llm-latency-ms 3000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import print_table, setup_bench_env, summarize
+from tests.benchmarks.fakes import FakeLLM
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.state import BlogStateInput  # noqa: E402
+
+
+def build_workflow(llm_latency_ms):
+    workflow = AgentWorkflow(checkpointer=InMemorySaver())
+    workflow.llm = FakeLLM(latency_ms=llm_latency_ms)
+    workflow.content_repo.exists = lambda *args, **kwargs: False
+    workflow._store_new_content = lambda *args, **kwargs: None
+    workflow._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic="benchmark", input_content="Reference material.",
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    return workflow
+
+
+async def measure(workflow, thread_id):
+    start = time.perf_counter()
+    first_token = first_section = None
+    async for line in workflow.stream_generic_workflow({"post_types": ["blog"]}, thread_id, None):
+        event = json.loads(line)
+        elapsed = (time.perf_counter() - start) * 1000
+        if first_token is None and event["type"] == "token" and event["node"] == "write_section":
+            first_token = elapsed
+        if first_section is None and event["type"] == "progress" and event["node"] == "write_section":
+            first_section = elapsed
+    return first_token, first_section
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=3000.0)
+    args = parser.parse_args()
+
+    workflow = build_workflow(args.llm_latency_ms)
+    tokens, sections = [], []
+    for i in range(args.iterations):
+        first_token, first_section = asyncio.run(measure(workflow, f"first-content-{i}"))
+        tokens.append(first_token)
+        sections.append(first_section)
+
+    print_table(
+        f"Time to first section content ({args.iterations} iterations, "
+        f"LLM latency {args.llm_latency_ms:.0f} ms per call)",
+        {
+            "finished section (before)": summarize(sections),
+            "first token (after)": summarize(tokens),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Per-request workflow setup overhead: building an AgentWorkflow for every request
+(the old ``get_workflow`` behaviour) versus reusing the process-wide instance.
+
+The checkpointer connection is replaced by a stub so the benchmark runs offline; use
+``--connect-latency-ms`` to model the round trips of a real connection handshake
+(as paid by the old per-request workflow, which opened its own connection).
+
+    python -m tests.benchmarks.bench_workflow_setup --iterations 20 --connect-latency-ms 40
+"""
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from tests.benchmarks.common import print_table, setup_bench_env, summarize, time_calls
+
+setup_bench_env()
+
+from src.backend.agents import blogs  # noqa: E402
+from src.backend.api import dependencies  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0,
+                        help="Simulated latency of opening a Postgres connection")
+    args = parser.parse_args()
+
+    def fake_connect(*_args, **_kwargs):
+        time.sleep(args.connect_latency_ms / 1000)
+        conn = MagicMock()
+        conn.closed = False
+        return conn
+
+    with patch.object(blogs, "get_checkpoint_pool", side_effect=fake_connect):
+        # Warm imports and lazily initialized libraries so both runs are comparable
+        blogs.AgentWorkflow()
+
+        per_request = time_calls(lambda: blogs.AgentWorkflow(), args.iterations)
+
+        asyncio.run(dependencies.aclose_workflow())
+        dependencies.get_workflow()
+        shared = time_calls(dependencies.get_workflow, args.iterations)
+        asyncio.run(dependencies.aclose_workflow())
+
+    print_table(
+        f"Workflow acquisition per request ({args.iterations} iterations, "
+        f"connect latency {args.connect_latency_ms:.0f} ms)",
+        {
+            "new AgentWorkflow (before)": summarize(per_request),
+            "shared AgentWorkflow (after)": summarize(shared),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
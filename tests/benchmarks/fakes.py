@@ -0,0 +1,310 @@
+"""
+Offline stand-ins for external services used by the benchmarks.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+
+FAKE_PLAN = {
+    "sections": [
+        {"name": "Introduction", "description": "Why the topic matters", "content": "", "main_body": False},
+        {"name": "How it works", "description": "Core ideas", "content": "", "main_body": True},
+        {"name": "In practice", "description": "Worked example", "content": "", "main_body": True},
+        {"name": "Conclusion", "description": "Key takeaways", "content": "", "main_body": False},
+    ]
+}
+
+
+class FakeLLM:
+    """
+    Drop-in replacement for ``LLMClient`` that returns canned responses after a
+    fixed latency. ``invoke``/``stream`` block (like ``Router.completion``) and
+    ``ainvoke``/``astream`` await (like ``Router.acompletion``).
+    """
+
+    cache_key_params = {"model": "fake"}
+    prompt_caching = "implicit"
+    # Like Gemini's implicit caching: a repeated system prompt of at least this many tokens is cached
+    min_cached_tokens = 1024
+    # Search results kept by the relevance selection prompt
+    relevant_urls = 8
+
+    def __init__(self, latency_ms: float = 50.0):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        # Peak number of concurrent invoke/ainvoke calls
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._seen_prefixes = set()
+
+    @contextmanager
+    def _track(self):
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _record_usage(self, messages: List[Any], response: str):
+        """Report usage with ~4 characters per token, caching repeated system prompts"""
+        # Imported here so benchmarks can set up the environment before the backend is imported
+        from src.backend.clients.llm import record_usage
+
+        contents = [getattr(m, "content", str(m)) for m in messages]
+        prompt_tokens = sum(len(c) for c in contents) // 4
+        prefix_tokens = len(contents[0]) // 4
+        with self._lock:
+            cached = contents[0] in self._seen_prefixes and prefix_tokens >= self.min_cached_tokens
+            self._seen_prefixes.add(contents[0])
+        record_usage(prompt_tokens, prefix_tokens if cached else 0, len(response) // 4)
+
+    def _respond(self, messages: List[Any]) -> str:
+        response = self._response(messages)
+        self._record_usage(messages, response)
+        return response
+
+    def _response(self, messages: List[Any]) -> str:
+        self.calls += 1
+        prompt = " ".join(getattr(m, "content", str(m)) for m in messages)
+        if "Generate the sections of the blog" in prompt:
+            return f"```json\n{json.dumps(FAKE_PLAN)}\n```"
+        if "Generate tags for the blog" in prompt:
+            return "<tags>['AI', 'LLM', 'Benchmarks']</tags>"
+        if "Twitter post" in prompt:
+            return "A short post about the article #AI"
+        if "LinkedIn post" in prompt:
+            return "A professional summary of the article. #AI #Engineering"
+        if "Identify the sections the feedback applies to" in prompt:
+            return "<sections>[2]</sections>"
+        if "Revise the section based on the feedback" in prompt:
+            return "Revised section content."
+        if "Modify the content based on the feedback" in prompt:
+            return "Rewritten blog."
+        if "formulate an optimized web search query" in prompt or "formulate a effective search query" in prompt:
+            return "<query>fake search query</query>"
+        if "Select the most relevant results to scrape" in prompt:
+            urls = re.findall(r"https?://\S+", prompt)[:self.relevant_urls]
+            return f"<relevant_urls>[{', '.join(urls)}]</relevant_urls>"
+        if "Summarize this part of the source" in prompt:
+            return "Chunk summary: key claims, methods and results of this part. " * 5
+        if "Combine the chunk summaries" in prompt:
+            return "Reference brief covering the whole source. " * 20
+        return self._section_response()
+
+    def _section_response(self) -> str:
+        """Free-form text: sections, rewrites and anything without a canned response"""
+        return "Generated section content. " * 20
+
+    def _delay(self, response: str) -> float:
+        """Seconds a call returning ``response`` takes"""
+        return self.latency
+
+    def variant(self, config_path: str) -> "FakeLLM":
+        """Every llm config (per-node tiers) is served by this fake"""
+        return self
+
+    def invoke(self, messages: List[Any], **kwargs) -> str:
+        with self._track():
+            response = self._respond(messages)
+            time.sleep(self._delay(response))
+            return response
+
+    async def ainvoke(self, messages: List[Any], **kwargs) -> str:
+        with self._track():
+            response = self._respond(messages)
+            await asyncio.sleep(self._delay(response))
+            return response
+
+    # Streaming spreads the same total latency evenly over the response's words
+
+    def _tokens(self, messages: List[Any]) -> Tuple[List[str], float]:
+        response = self._respond(messages)
+        tokens = re.findall(r"\S+\s*", response)
+        return tokens, self._delay(response) / max(1, len(tokens))
+
+    def stream(self, messages: List[Any], **kwargs) -> Iterator[str]:
+        tokens, delay = self._tokens(messages)
+        for token in tokens:
+            time.sleep(delay)
+            yield token
+
+    async def astream(self, messages: List[Any], **kwargs) -> AsyncIterator[str]:
+        tokens, delay = self._tokens(messages)
+        for token in tokens:
+            await asyncio.sleep(delay)
+            yield token
+
+
+def prompt_digest(messages: List[Any]) -> str:
+    """Key of a prompt in a recording: a hash of its message contents"""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(getattr(message, "content", str(message)).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ReplayLLM(FakeLLM):
+    """
+    ``FakeLLM`` that replays recorded responses and models generation speed.
+
+    A recording (saved by ``RecordingLLM``) maps ``prompt_digest`` to the response a
+    real model gave. Prompts that are not in it get FakeLLM's canned responses, with
+    free-form text padded to about ``section_tokens`` tokens. A call takes
+    ``latency_ms`` plus ``ms_per_token`` per response token (~4 characters per token).
+    """
+
+    def __init__(self, recording: Optional[Dict[str, str]] = None, latency_ms: float = 300.0,
+                 ms_per_token: float = 0.0, section_tokens: int = 150):
+        super().__init__(latency_ms=latency_ms)
+        self.recording = recording or {}
+        self.ms_per_token = ms_per_token / 1000
+        self.section_tokens = section_tokens
+        # Calls answered from the recording
+        self.replayed = 0
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "ReplayLLM":
+        with open(path) as f:
+            return cls(json.load(f), **kwargs)
+
+    def _response(self, messages: List[Any]) -> str:
+        recorded = self.recording.get(prompt_digest(messages))
+        if recorded is None:
+            return super()._response(messages)
+        with self._lock:
+            self.calls += 1
+            self.replayed += 1
+        return recorded
+
+    def _section_response(self) -> str:
+        sentence = "Generated section content with a few more words. "
+        return sentence * max(1, self.section_tokens * 4 // len(sentence))
+
+    def _delay(self, response: str) -> float:
+        return self.latency + self.ms_per_token * (len(response) // 4)
+
+
+class RecordingLLM:
+    """Wraps a real ``LLMClient`` and records every response by prompt for ``ReplayLLM``"""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.recording: Dict[str, str] = {}
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def variant(self, config_path: str) -> "RecordingLLM":
+        """Record the calls of other llm configs (per-node tiers) into the same recording"""
+        recorder = RecordingLLM(self.llm.variant(config_path))
+        recorder.recording = self.recording
+        return recorder
+
+    def invoke(self, messages: List[Any], **kwargs) -> str:
+        response = self.llm.invoke(messages, **kwargs)
+        self.recording[prompt_digest(messages)] = response
+        return response
+
+    async def ainvoke(self, messages: List[Any], **kwargs) -> str:
+        response = await self.llm.ainvoke(messages, **kwargs)
+        self.recording[prompt_digest(messages)] = response
+        return response
+
+    def stream(self, messages: List[Any], **kwargs) -> Iterator[str]:
+        tokens = []
+        for token in self.llm.stream(messages, **kwargs):
+            tokens.append(token)
+            yield token
+        self.recording[prompt_digest(messages)] = "".join(tokens)
+
+    async def astream(self, messages: List[Any], **kwargs) -> AsyncIterator[str]:
+        tokens = []
+        async for token in self.llm.astream(messages, **kwargs):
+            tokens.append(token)
+            yield token
+        self.recording[prompt_digest(messages)] = "".join(tokens)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.recording, f, indent=2, sort_keys=True)
+
+
+class _Latency:
+    """Sleeps ``latency_ms`` (plus seeded jitter) per call and counts calls"""
+
+    def __init__(self, latency_ms: float = 300.0, jitter_ms: float = 0.0, seed: int = 7):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+        time.sleep(delay)
+
+
+class FakeWebSearch(_Latency):
+    """Web search returning ``num_results`` example.com URLs"""
+
+    def __init__(self, num_results: int = 15, **kwargs):
+        super().__init__(**kwargs)
+        self.num_results = num_results
+
+    def search(self, query, max_retries=3):
+        self._wait()
+        results = [
+            {"link": f"https://example.com/{query.replace(' ', '-')}/{i}", "title": f"{query} ({i})",
+             "snippet": f"An article about {query}."}
+            for i in range(self.num_results)
+        ]
+        return SimpleNamespace(get_results=lambda: results, get_all_urls=lambda: [r["link"] for r in results])
+
+
+class FakeImageSearch(_Latency):
+    """Image search; ``nested`` returns results under "images" as the Reddit workflow reads them"""
+
+    def __init__(self, nested: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.nested = nested
+
+    def search(self, query, max_retries=3):
+        self._wait()
+        images = [{"imageUrl": f"https://images.example.com/{i}.png"} for i in range(3)]
+        return SimpleNamespace(results={"images": images} if self.nested else images)
+
+
+class FakeConverter(_Latency):
+    """URL to markdown conversion; ``content_tokens`` sets the size of each page (~4 characters per token)"""
+
+    def __init__(self, content_tokens: Optional[int] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.content_tokens = content_tokens
+
+    def convert(self, url, **kwargs):
+        self._wait()
+        sentence = f"Converted content of {url}. "
+        return sentence * (max(1, self.content_tokens * 4 // len(sentence)) if self.content_tokens else 20)
+
+
+class FakeRedditSearch(_Latency):
+    """Reddit post lookup by URL"""
+
+    def search(self, query, max_retries=3, subreddit=None, limit=10):
+        self._wait()
+        return [{"url": query, "title": "Reddit post", "content": f"Post at {query}", "top_comments": []}]
@@ -0,0 +1,127 @@
+"""
+Load test: do concurrent streaming generations block ``/health``?
+
+Runs the real FastAPI app in-process (httpx ``ASGITransport``) with a shared
+``AgentWorkflow`` that uses an in-memory checkpointer and ``FakeLLM``. Source
+collection and persistence are stubbed, so only graph execution is measured.
+While ``--concurrency`` requests to ``/content/generate/stream`` are in flight,
+``/health`` is polled every ``--poll-ms`` and its latency recorded.
+
+Two runs are compared:
+
+* ``blocking`` - the previous implementation, which drove the synchronous
+  ``graph.stream`` (and blocking ``LLMClient.invoke``) inside the async generator
+* ``async``    - the current ``stream_generic_workflow`` built on ``graph.astream``
+
+    python -m tests.benchmarks.load_stream_health --concurrency 8 --llm-latency-ms 50
+"""
+import argparse
+import asyncio
+import dataclasses
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from langgraph.checkpoint.memory import InMemorySaver
+
+from tests.benchmarks.common import print_table, setup_bench_env, summarize
+from tests.benchmarks.fakes import FakeLLM
+
+setup_bench_env()
+
+from src.backend.agents.blogs import AgentWorkflow  # noqa: E402
+from src.backend.agents.state import BlogStateInput  # noqa: E402
+from src.backend.api.api import app  # noqa: E402
+from src.backend.api.datamodel import UserProfileResponse  # noqa: E402
+from src.backend.api.dependencies import get_current_user_profile, get_workflow  # noqa: E402
+from src.backend.api.routers import content as content_router  # noqa: E402
+
+USER = UserProfileResponse(id="bench-user", profile_id="00000000-0000-0000-0000-000000000001")
+
+
+class BlockingStreamWorkflow(AgentWorkflow):
+    """Reproduces the old streaming path: sync graph driven from an async generator"""
+
+    async def stream_generic_workflow(self, payload, thread_id, user):
+        test_input, _ = self._prepare_input(payload, thread_id, user)
+        config = {"configurable": {"thread_id": thread_id}}
+        for event in self.graph.stream(dataclasses.asdict(test_input), config=config):
+            yield self._format_event(event) + "\n"
+
+
+def build_workflow(cls, llm_latency_ms):
+    workflow = cls(checkpointer=InMemorySaver())
+    workflow.llm = FakeLLM(latency_ms=llm_latency_ms)
+    workflow._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic=payload["topic"], input_content="Reference material. " * 50,
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    workflow.content_repo.exists = lambda *args, **kwargs: False
+    workflow._store_new_content = lambda *args, **kwargs: None
+    return workflow
+
+
+async def run_load(workflow, concurrency, poll_ms):
+    app.dependency_overrides[get_workflow] = lambda: workflow
+    app.dependency_overrides[get_current_user_profile] = lambda: USER
+    limits = {"tier": "bench", "max_generations": 10 ** 6, "generations_used": 0}
+
+    health_latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def generate(i):
+            response = await client.post(
+                "/content/generate/stream",
+                json={"topic": f"benchmark topic {i}", "post_types": ["blog"]},
+            )
+            response.raise_for_status()
+
+        async def poll_health():
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/health")
+                response.raise_for_status()
+                health_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(poll_ms / 1000)
+
+        with patch.object(content_router, "check_generation_limit", AsyncMock(return_value=limits)), \
+                patch.object(content_router, "increment_generation_count", AsyncMock()):
+            poller = asyncio.create_task(poll_health())
+            start = time.perf_counter()
+            await asyncio.gather(*(generate(i) for i in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            done.set()
+            await poller
+
+    app.dependency_overrides.clear()
+    return elapsed, health_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--poll-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    rows, totals = {}, {}
+    for label, cls in (("blocking", BlockingStreamWorkflow), ("async", AgentWorkflow)):
+        workflow = build_workflow(cls, args.llm_latency_ms)
+        elapsed, latencies = asyncio.run(run_load(workflow, args.concurrency, args.poll_ms))
+        rows[f"/health during {label}"] = summarize(latencies)
+        totals[label] = (elapsed, len(latencies))
+
+    print_table(
+        f"/health latency with {args.concurrency} concurrent streams "
+        f"(LLM latency {args.llm_latency_ms:.0f} ms)",
+        rows,
+    )
+    for label, (elapsed, polls) in totals.items():
+        print(f"{label:<9} all streams finished in {elapsed:6.2f} s, /health answered {polls} times")
+
+
+if __name__ == "__main__":
+    main()
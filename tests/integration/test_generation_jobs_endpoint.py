@@ -0,0 +1,78 @@
+"""
+Integration tests for the generation job endpoints, with the job repository mocked.
+"""
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.backend.api.datamodel import UserProfileResponse
+from src.backend.api.dependencies import get_current_user_profile
+
+USER = UserProfileResponse(id="user-1", profile_id=str(uuid.uuid4()), role="free")
+
+
+@pytest.fixture
+def client(test_client):
+    test_client.app.dependency_overrides[get_current_user_profile] = lambda: USER
+    yield test_client
+    test_client.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def job_repository():
+    from src.backend.api.routers import content
+    repository = MagicMock()
+    with patch.object(content, "job_repository", repository), \
+            patch.object(content.profile_repository, "get_with_generation_limits",
+                         return_value={"role": "free", "generation_limit": 5, "generations_used": 3}):
+        yield repository
+
+
+def job(**fields):
+    defaults = dict(job_id=uuid.uuid4(), thread_id=uuid.uuid4(), status="queued", attempts=0, max_attempts=3,
+                    error=None, result=None, created_at=datetime.now(timezone.utc), started_at=None, finished_at=None)
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+class TestGenerationJobEndpoints:
+    """Test submitting and polling generation jobs."""
+
+    def test_submit_returns_queued_job(self, client, job_repository):
+        """Test that submitting stores the request and returns the job at once."""
+        job_repository.count_pending.return_value = 0
+        job_repository.enqueue.return_value = job()
+        response = client.post("/content/jobs", json={"post_types": ["blog"], "topic": "Vector databases"})
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        kwargs = job_repository.enqueue.call_args.kwargs
+        assert kwargs["payload"]["topic"] == "Vector databases"
+        assert kwargs["user_context"]["profile_id"] == USER.profile_id
+
+    def test_pending_jobs_count_against_limit(self, client, job_repository):
+        """Test that queued and running jobs count toward the generation limit."""
+        job_repository.count_pending.return_value = 2
+        response = client.post("/content/jobs", json={"post_types": ["blog"], "topic": "Vector databases"})
+
+        assert response.status_code == 403
+        job_repository.enqueue.assert_not_called()
+
+    def test_status_includes_result(self, client, job_repository):
+        """Test that a finished job returns the generated content."""
+        result = {"final_blog": "# Blog", "reviewed_blog": None, "blog_title": "Title", "twitter_post": None,
+                  "linkedin_post": None, "tags": ["ai"], "feedback_applied": False,
+                  "linkedin_post_generated": False, "twitter_post_generated": False}
+        finished = job(status="succeeded", result=result)
+        job_repository.get_for_profile.return_value = finished
+
+        response = client.get(f"/content/jobs/{finished.job_id}")
+        assert response.status_code == 200
+        assert response.json()["result"]["final_blog"] == "# Blog"
+
+    def test_unknown_job(self, client, job_repository):
+        """Test that jobs of other profiles are not found."""
+        job_repository.get_for_profile.return_value = None
+        assert client.get(f"/content/jobs/{uuid.uuid4()}").status_code == 404
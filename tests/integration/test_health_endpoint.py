@@ -1,8 +1,15 @@
 """
 Integration tests for health check endpoints.
 """
+import uuid
+
 import pytest
 
+from src.backend.api.datamodel import UserProfileResponse
+from src.backend.api.dependencies import get_current_user_profile
+
+USER = UserProfileResponse(id="user-1", profile_id=str(uuid.uuid4()), role="free")
+
 
 class TestHealthEndpoints:
     """Test health check and readiness endpoints."""
@@ -45,3 +52,19 @@ class TestHealthEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data.get("status") == "started"
+    
+    def test_metrics_endpoint(self, test_client):
+        """Test /metrics endpoint returns the metrics snapshot to an authenticated caller."""
+        test_client.app.dependency_overrides[get_current_user_profile] = lambda: USER
+        try:
+            response = test_client.get("/metrics")
+        finally:
+            test_client.app.dependency_overrides.clear()
+        assert response.status_code == 200
+        data = response.json()
+        assert {"counters", "timings", "gauges"} <= set(data)
+
+    def test_metrics_endpoint_requires_auth(self, test_client):
+        """Test /metrics endpoint rejects unauthenticated requests."""
+        response = test_client.get("/metrics")
+        assert response.status_code in [401, 403]
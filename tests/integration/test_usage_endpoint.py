@@ -0,0 +1,52 @@
+"""
+Integration tests for the generation usage endpoint, with the ledger repository mocked.
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.backend.api.datamodel import UserProfileResponse
+from src.backend.api.dependencies import get_current_user_profile
+
+USER = UserProfileResponse(id="user-1", profile_id=str(uuid.uuid4()), role="free")
+
+
+@pytest.fixture
+def client(test_client):
+    test_client.app.dependency_overrides[get_current_user_profile] = lambda: USER
+    yield test_client
+    test_client.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def ledger_repository():
+    from src.backend.api.routers import content
+    repository = MagicMock()
+    with patch.object(content, "ledger_repository", repository):
+        yield repository
+
+
+class TestUsageEndpoint:
+    """Test reading latency and cost percentiles."""
+
+    def test_node_percentiles_for_caller(self, client, ledger_repository):
+        """Test that percentiles are read for the caller's profile."""
+        ledger_repository.percentiles.return_value = [dict(
+            node="write_section", model=None, count=8, total_ms=9600.0, p50_ms=1100.0, p95_ms=2000.0,
+            p99_ms=2300.0, prompt_tokens=16000, cached_tokens=8000, completion_tokens=4000,
+            total_cost_usd=0.02, p50_cost_usd=0.002, p95_cost_usd=0.004, p99_cost_usd=0.005,
+        )]
+        response = client.get("/content/usage", params={"days": 7})
+
+        assert response.status_code == 200
+        assert response.json()[0]["node"] == "write_section"
+        assert response.json()[0]["p95_ms"] == 2000.0
+        ledger_repository.percentiles.assert_called_once_with(uuid.UUID(USER.profile_id), "node", 7)
+
+    def test_unknown_kind_rejected(self, client, ledger_repository):
+        """Test that only generation, node and llm entries can be queried."""
+        response = client.get("/content/usage", params={"kind": "section"})
+
+        assert response.status_code == 422
+        ledger_repository.percentiles.assert_not_called()
@@ -0,0 +1,27 @@
+"""
+Shared fixtures for unit tests.
+"""
+import litellm
+import pytest
+
+from src.backend.clients import llm as llm_module
+
+# litellm's process-wide callback lists; every Router adds to them, up to MAX_CALLBACKS
+CALLBACK_LISTS = ("success_callback", "_async_success_callback", "callbacks",
+                  "failure_callback", "_async_failure_callback")
+
+
+@pytest.fixture(autouse=True)
+def isolated_litellm_callbacks():
+    """Restore litellm's callback lists after each test and drop the Routers built during it.
+
+    Without this, Routers built by earlier tests fill the capped lists and a later
+    Router's latency tracking is never registered. Cached Routers are dropped too,
+    since their callbacks are gone once the lists are restored.
+    """
+    saved = {name: list(getattr(litellm, name)) for name in CALLBACK_LISTS}
+    yield
+    for name, callbacks in saved.items():
+        getattr(litellm, name)[:] = callbacks
+    with llm_module._routers_lock:
+        llm_module._routers.clear()
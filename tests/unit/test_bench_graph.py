@@ -0,0 +1,83 @@
+"""
+Unit tests for the replaying LLM stand-in and the end-to-end generation benchmark.
+"""
+from types import SimpleNamespace
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.backend.db.checkpoint_serde import CompactSerializer
+from tests.benchmarks.bench_graph import bench_payload, build_workflow, compare, memory_checkpoint_bytes
+from tests.benchmarks.fakes import FakeLLM, RecordingLLM, ReplayLLM, prompt_digest
+
+BENCH_ARGS = dict(
+    iterations=1, post_types=["blog", "twitter"], source_tokens=200, search_latency_ms=0,
+    url_latency_ms=0, url_jitter_ms=0, urls=4,
+)
+
+
+def make_results(wall_ms=100.0, calls=10, checkpoint_bytes=5000, node_ms=50.0):
+    return {"payloads": {"topic": {
+        "wall_ms": {"p50_ms": wall_ms}, "nodes_ms": {"write_section": node_ms, "compile_final_blog": 0.5},
+        "llm_calls": calls, "prompt_tokens": 1000, "completion_tokens": 200, "checkpoint_bytes": checkpoint_bytes,
+    }}}
+
+
+class TestReplayLLM:
+    """Test replaying recorded responses."""
+
+    def test_recorded_responses_replayed(self):
+        """Test that a recorded prompt gets its response and other prompts get canned ones."""
+        prompt = [HumanMessage(content="Write about vector databases")]
+        llm = ReplayLLM({prompt_digest(prompt): "Recorded answer"}, latency_ms=0)
+
+        assert llm.invoke(prompt) == "Recorded answer"
+        assert llm.invoke([HumanMessage(content="Generate tags for the blog")]).startswith("<tags>")
+        assert (llm.calls, llm.replayed) == (2, 1)
+
+    def test_latency_scales_with_response_tokens(self):
+        """Test that a call takes the base latency plus the per-token time of its response."""
+        llm = ReplayLLM(latency_ms=100, ms_per_token=2, section_tokens=500)
+        section = llm._section_response()
+        assert abs(len(section) // 4 - 500) < 15
+        assert llm._delay(section) == 0.1 + 0.002 * (len(section) // 4)
+
+    def test_recorded_generation_replays_completely(self):
+        """Test that every prompt of a recorded generation is replayed by a later run on another thread."""
+        recorder = RecordingLLM(FakeLLM(latency_ms=0))
+        workflow = build_workflow("topic", SimpleNamespace(**BENCH_ARGS), recorder, InMemorySaver())
+        workflow.run_generic_workflow({"topic": "Vector databases", "post_types": ["blog"]}, "record", None)
+
+        replay = ReplayLLM(recorder.recording, latency_ms=0)
+        workflow = build_workflow("topic", SimpleNamespace(**BENCH_ARGS), replay, InMemorySaver())
+        workflow.run_generic_workflow({"topic": "Vector databases", "post_types": ["blog"]}, "replay", None)
+        assert replay.calls > 0 and replay.replayed == replay.calls
+
+
+class TestGraphBenchmark:
+    """Test the per-node, LLM and checkpoint measurements and the baseline comparison."""
+
+    def test_payload_measurements(self):
+        """Test that a generation reports its nodes, LLM calls and checkpoint bytes."""
+        saver = InMemorySaver(serde=CompactSerializer())
+        result = bench_payload("topic", SimpleNamespace(**BENCH_ARGS), ReplayLLM(latency_ms=0), saver,
+                               lambda thread_id: memory_checkpoint_bytes(saver, thread_id))
+
+        assert {"(prepare_input)", "generate_blog_plan", "compile_final_blog", "write_twitter_post"} <= \
+            set(result["nodes_ms"])
+        assert result["node_tasks"]["write_section"] == 2
+        # Query rewrite, plan, 4 sections and the Twitter post (results are ranked and tags extracted locally)
+        assert result["llm_calls"] == 7
+        assert result["checkpoint_bytes"] > 0
+
+    def test_compare_flags_regressions(self):
+        """Test that slower timings and higher counts beyond the threshold are regressions, noise is not."""
+        baseline = make_results()
+        _, regressions = compare(baseline, make_results(wall_ms=105.0), 0.10)
+        assert regressions == []
+
+        current = make_results(wall_ms=130.0, calls=12, checkpoint_bytes=4000)
+        current["payloads"]["topic"]["nodes_ms"]["compile_final_blog"] = 2.0
+        rows, regressions = compare(baseline, current, 0.10)
+        assert regressions == ["topic llm_calls", "topic wall p50_ms"]
+        assert dict((row[0], row[3]) for row in rows)["topic checkpoint_bytes"] == -0.2
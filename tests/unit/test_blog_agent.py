@@ -0,0 +1,419 @@
+"""
+Unit tests for the AgentWorkflow graph, run offline with an in-memory checkpointer.
+"""
+import json
+import time
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END
+
+from src.backend.agents.blogs import AgentWorkflow
+from src.backend.agents.memo import StageCache
+from src.backend.agents.state import BlogState, BlogStateInput, Section
+from tests.benchmarks.fakes import FakeLLM
+
+
+@pytest.fixture
+def workflow():
+    """AgentWorkflow with a fake LLM and stubbed source collection/persistence."""
+    agent = AgentWorkflow(checkpointer=InMemorySaver())
+    agent.llm = FakeLLM(latency_ms=0)
+    agent.stage_cache = StageCache()
+    agent._prepare_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic=payload["topic"], input_content="Reference material.",
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    agent._store_new_content = lambda *args, **kwargs: None
+    agent.content_repo.exists = lambda *args, **kwargs: False
+    return agent
+
+
+class TestAsyncWorkflow:
+    """Test the async execution path of the blog graph."""
+
+    def test_sync_and_async_graphs_share_checkpointer(self, workflow):
+        """Test that an injected checkpointer is used for both execution paths."""
+        assert workflow.async_graph.checkpointer is workflow.graph.checkpointer
+
+    @pytest.mark.asyncio
+    async def test_arun_generic_workflow_generates_blog(self, workflow):
+        """Test that a new generation completes through the async nodes."""
+        called = []
+        original = workflow.llm.invoke
+        workflow.llm.invoke = lambda *args, **kwargs: called.append(args) or original(*args, **kwargs)
+
+        result = await workflow.arun_generic_workflow(
+            {"topic": "async graphs", "post_types": ["blog"]}, "thread-async", None
+        )
+
+        assert result.final_blog
+        assert "Generated section content" in result.final_blog
+        assert workflow.llm.calls > 0
+        assert called == []
+
+    @pytest.mark.asyncio
+    async def test_stream_generic_workflow_yields_events(self, workflow):
+        """Test that streaming emits one JSON object per line for node updates."""
+        workflow.content_repo.exists = lambda *args, **kwargs: False
+
+        lines = [
+            line async for line in workflow.stream_generic_workflow(
+                {"topic": "async graphs", "post_types": ["blog"]}, "thread-stream", None
+            )
+        ]
+
+        assert all(line.endswith("\n") for line in lines)
+        events = [json.loads(line) for line in lines]
+        progress = [e for e in events if e["type"] == "progress"]
+        assert [e["node"] for e in progress][0] == "generate_blog_plan"
+        assert "compile_final_blog" in {e["node"] for e in progress}
+        assert progress[-1]["progress"] == 100
+
+    @pytest.mark.asyncio
+    async def test_stream_generic_workflow_streams_section_tokens(self, workflow):
+        """Test that section text arrives as tokens tagged with the section name."""
+        workflow.content_repo.exists = lambda *args, **kwargs: False
+
+        events = [
+            json.loads(line) async for line in workflow.stream_generic_workflow(
+                {"topic": "async graphs", "post_types": ["blog", "twitter"]}, "thread-tokens", None
+            )
+        ]
+
+        tokens = [e for e in events if e["type"] == "token"]
+        sections = {e["section"] for e in tokens if e["node"] == "write_section"}
+        assert sections == {"How it works", "In practice"}
+        assert {e["section"] for e in tokens if e["node"] == "write_final_sections"} == {
+            "Introduction", "Conclusion"
+        }
+        twitter = "".join(e["content"] for e in tokens if e["node"] == "write_twitter_post")
+        assert twitter == "A short post about the article #AI"
+        # The first tokens arrive before the first section has finished
+        first_section_done = next(
+            i for i, e in enumerate(events) if e["type"] == "progress" and e["node"] == "write_section"
+        )
+        assert events.index(tokens[0]) < first_section_done
+
+    def test_invoke_does_not_stream_tokens(self, workflow):
+        """Test that the non-streaming path uses a single blocking LLM call per node."""
+        workflow.llm.stream = lambda *args, **kwargs: pytest.fail("unexpected streaming call")
+        workflow.llm.ainvoke = lambda *args, **kwargs: pytest.fail("unexpected async call")
+        result = workflow.run_generic_workflow(
+            {"topic": "sync graphs", "post_types": ["blog"]}, "thread-sync", None
+        )
+        assert result.final_blog
+
+
+class TestRetriedGeneration:
+    """Test retrying a generation whose first attempt already stored its content."""
+
+    def stored(self, workflow):
+        """Content is stored for the thread; generating again must not happen."""
+        workflow.content_repo.exists = lambda field, value: field == "thread_id"
+        workflow._prepare_input = lambda *args: pytest.fail("source collected again")
+        workflow._store_new_content = lambda *args, **kwargs: pytest.fail("content stored again")
+        workflow.llm.calls = 0
+
+    def test_retry_returns_stored_generation(self, workflow):
+        """Test that a retry after the content was written completes with that content."""
+        payload = {"topic": "retries", "post_types": ["blog", "twitter"]}
+        first = workflow.run_generic_workflow(payload, "thread-retry", None)
+        self.stored(workflow)
+
+        retried = workflow.run_generic_workflow(payload, "thread-retry", None)
+
+        assert retried == first
+        assert workflow.llm.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_async_retry_returns_stored_generation(self, workflow):
+        """Test the same on the async path."""
+        payload = {"topic": "retries", "post_types": ["blog", "linkedin"]}
+        first = await workflow.arun_generic_workflow(payload, "thread-aretry", None)
+        self.stored(workflow)
+
+        retried = await workflow.arun_generic_workflow(payload, "thread-aretry", None)
+
+        assert retried == first
+        assert workflow.llm.calls == 0
+
+
+class TestDerivativeBranches:
+    """Test the parallel LinkedIn/Twitter/tags branches after the final blog."""
+
+    def test_route_fans_out_missing_derivatives(self, workflow):
+        """Test that every requested, missing derivative becomes a branch."""
+        state = BlogState(final_blog="blog", post_types=["blog", "twitter", "linkedin"])
+        assert set(workflow.route_derivatives(state)) == {
+            "write_linkedin_post", "write_twitter_post", "generate_tags"
+        }
+
+    def test_route_prefers_feedback_and_ends_when_complete(self, workflow):
+        """Test that feedback wins and a complete state ends the graph."""
+        assert workflow.route_derivatives(BlogState(feedback="shorter")) == "handle_feedback"
+        done = BlogState(post_types=["twitter"], twitter_post="post", tags=["AI"])
+        assert workflow.route_derivatives(done) == END
+
+    @pytest.mark.asyncio
+    async def test_new_generation_produces_tags_and_posts(self, workflow):
+        """Test that tags and requested posts are generated with the blog."""
+        result = await workflow.arun_generic_workflow(
+            {"topic": "parallel branches", "post_types": ["blog", "twitter", "linkedin"]},
+            "thread-branches", None
+        )
+        # Extracted from the blog by the default keyphrase method
+        assert result.tags == ["Generated Section Content"]
+        assert result.twitter_post and result.linkedin_post
+        assert result.twitter_post_generated and result.linkedin_post_generated
+
+    @pytest.mark.asyncio
+    async def test_social_posts_run_in_parallel(self, workflow):
+        """Test that requesting both posts later runs them concurrently."""
+        await workflow.arun_generic_workflow(
+            {"topic": "parallel branches", "post_types": ["blog"]}, "thread-social", None
+        )
+        workflow.llm.latency = 0.2
+        workflow.content_repo.exists = lambda *args, **kwargs: True
+        workflow._store_social_content = lambda *args, **kwargs: None
+
+        start = time.perf_counter()
+        result = await workflow.arun_generic_workflow(
+            {"thread_id": "thread-social", "post_types": ["twitter", "linkedin"]}, None, None
+        )
+        elapsed = time.perf_counter() - start
+
+        assert result.twitter_post and result.linkedin_post
+        assert elapsed < 0.35
+
+
+class TestSectionFeedback:
+    """Test feedback that revises only the affected sections."""
+
+    async def apply_feedback(self, workflow, thread_id, payload):
+        await workflow.arun_generic_workflow(
+            {"topic": "feedback", "post_types": ["blog"]}, thread_id, None
+        )
+        workflow.llm.calls = 0
+        config = {"configurable": {"thread_id": thread_id}}
+        await workflow.async_graph.aupdate_state(config, values=workflow._feedback_values(payload))
+        return await workflow.async_graph.ainvoke(None, config)
+
+    @pytest.mark.asyncio
+    async def test_only_affected_section_is_rewritten(self, workflow):
+        """Test that one mapping call and one section call replace the targeted section."""
+        result = await self.apply_feedback(
+            workflow, "thread-feedback", {"feedback": "Expand the explanation", "post_types": ["blog"]}
+        )
+
+        assert workflow.llm.calls == 2
+        sections = result["final_blog"].split("\n\n")
+        assert sections[1] == "Revised section content."
+        assert sections[0] == sections[2] == sections[3] == "Generated section content. " * 20
+        assert result["feedback_applied"]
+        state = await workflow.async_graph.aget_state({"configurable": {"thread_id": "thread-feedback"}})
+        assert state.values["feedback"] is None and state.values["feedback_sections"] is None
+        assert state.next == ()
+
+    @pytest.mark.asyncio
+    async def test_full_scope_rewrites_blog(self, workflow):
+        """Test that the full feedback mode keeps the single rewrite call."""
+        result = await self.apply_feedback(
+            workflow, "thread-feedback-full",
+            {"feedback": "Make it shorter", "post_types": ["blog"], "feedback_scope": "full"},
+        )
+        assert workflow.llm.calls == 1
+        assert result["final_blog"] == "Rewritten blog."
+
+    def test_mapping_falls_back_to_full_rewrite(self, workflow):
+        """Test that whole-post or unparseable mappings fall back to a full rewrite."""
+        sections = workflow._latest_sections(BlogState(sections=[
+            Section(name=name, description="", content="text") for name in ("A", "B", "C")
+        ]))
+        assert workflow._parse_feedback_sections("<sections>[3, 9]</sections>", sections) == ["C"]
+        assert workflow._parse_feedback_sections("<sections>all</sections>", sections) is None
+        assert workflow._parse_feedback_sections("<sections>1, 2, 3</sections>", sections) is None
+        assert workflow._parse_feedback_sections("section two", sections) is None
+
+    def test_out_of_sync_blog_is_not_split(self, workflow):
+        """Test that a blog rewritten as a whole is no longer revised per section."""
+        sections = [Section(name=name, description="", content="text") for name in ("A", "B")]
+        state = BlogState(sections=sections, final_blog="text\n\ntext", post_types=["blog"])
+        assert workflow._feedback_candidate_sections(state)
+        state.final_blog = "Rewritten blog."
+        assert workflow._feedback_candidate_sections(state) is None
+
+
+class TestStageMemoization:
+    """Test that repeated generations reuse plan, section and post outputs."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_generation_skips_cached_stages(self, workflow):
+        """Test that no LLM call runs for an identical input."""
+        payload = {"topic": "memo", "post_types": ["blog", "twitter"]}
+        first = await workflow.arun_generic_workflow(payload, "thread-memo-1", None)
+        workflow.llm.calls = 0
+
+        second = await workflow.arun_generic_workflow(payload, "thread-memo-2", None)
+
+        assert workflow.llm.calls == 0
+        assert second.final_blog == first.final_blog
+        assert second.twitter_post == first.twitter_post
+        assert workflow.stage_cache.stats()["hit_rate"]["write_section"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_cache(self, workflow):
+        """Test that a request can opt out of memoized outputs."""
+        await workflow.arun_generic_workflow({"topic": "memo", "post_types": ["blog"]}, "thread-memo-3", None)
+        workflow.llm.calls = 0
+
+        await workflow.arun_generic_workflow(
+            {"topic": "memo", "post_types": ["blog"], "use_cache": False}, "thread-memo-4", None
+        )
+
+        assert workflow.llm.calls == 5
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_reaches_response_cache(self, workflow):
+        """Test that use_cache=False makes fresh LLM calls for the plan and the feedback rewrite."""
+        responses, fresh = {}, []
+        ainvoke = workflow.llm.ainvoke
+
+        async def cached_ainvoke(messages, cache=True, **kwargs):
+            # Stands in for the response cache of LLMClient
+            key = tuple(m.content for m in messages)
+            if not cache or key not in responses:
+                fresh.append(key)
+                responses[key] = await ainvoke(messages, **kwargs)
+            return responses[key]
+
+        workflow.llm.ainvoke = cached_ainvoke
+        feedback = {"feedback": "Make it shorter", "post_types": ["blog"], "feedback_scope": "full"}
+        for thread_id, use_cache in (("thread-memo-7", True), ("thread-memo-8", False)):
+            await workflow.arun_generic_workflow(
+                {"topic": "memo", "post_types": ["blog"], "use_cache": use_cache}, thread_id, None
+            )
+            config = {"configurable": {"thread_id": thread_id, "use_cache": use_cache}}
+            await workflow.async_graph.aupdate_state(config, values=workflow._feedback_values(feedback))
+            await workflow.async_graph.ainvoke(None, config)
+
+        plans = [key for key in fresh if "Generate the sections of the blog" in " ".join(key)]
+        rewrites = [key for key in fresh if "Modify the content based on the feedback" in " ".join(key)]
+        assert len(plans) == 2 and plans[0] == plans[1]
+        assert len(rewrites) == 2 and rewrites[0] == rewrites[1]
+
+    @pytest.mark.asyncio
+    async def test_cached_sections_are_streamed(self, workflow):
+        """Test that a cache hit still sends the section text to streaming clients."""
+        workflow.content_repo.exists = lambda *args, **kwargs: False
+        payload = {"topic": "memo", "post_types": ["blog"]}
+        await workflow.arun_generic_workflow(payload, "thread-memo-5", None)
+
+        events = [
+            json.loads(line) async for line in workflow.stream_generic_workflow(payload, "thread-memo-6", None)
+        ]
+
+        tokens = [e for e in events if e["type"] == "token" and e["node"] == "write_section"]
+        assert {e["section"] for e in tokens} == {"How it works", "In practice"}
+        assert all(e["content"] == "Generated section content. " * 20 for e in tokens)
+
+
+class TestContentBudget:
+    """Test that reference content is fitted to the per-node token budgets."""
+
+    @pytest.mark.asyncio
+    async def test_budget_decisions_recorded(self, workflow):
+        """Test that plan and section prompts are trimmed and the decisions kept in state."""
+        workflow.budgeter.budgets.update(generate_blog_plan=60, write_section=60)
+        workflow._prepare_input = lambda payload, thread_id, user: (
+            BlogStateInput(input_topic=payload["topic"], input_content=". ".join(["Long reference text"] * 400),
+                           post_types=payload["post_types"], thread_id=thread_id),
+            None,
+        )
+        prompts = []
+        respond = workflow.llm._respond
+        workflow.llm._respond = lambda messages: prompts.append(messages[0].content) or respond(messages)
+
+        await workflow.arun_generic_workflow({"topic": "budgets", "post_types": ["blog"]}, "thread-budget", None)
+
+        state = await workflow.async_graph.aget_state({"configurable": {"thread_id": "thread-budget"}})
+        decisions = state.values["content_budget"]
+        assert [d["node"] for d in decisions].count("write_section") == 2
+        assert {d["section"] for d in decisions if d["node"] == "write_section"} == {"How it works", "In practice"}
+        assert all(d["kept_tokens"] <= 60 < d["input_tokens"] for d in decisions)
+        assert all(prompt.count("Long reference text") < 100 for prompt in prompts)
+
+
+class TestReferenceCondensing:
+    """Test the map-reduce brief for oversized reference content."""
+
+    @pytest.fixture
+    def long_source(self, workflow):
+        workflow.condense_params = {"min_tokens": 2000, "chunk_tokens": 500, "max_concurrency": 3}
+        content = "\n\n".join(f"Paragraph {i} of a long paper on attention. " * 8 for i in range(150))
+        workflow._prepare_input = lambda payload, thread_id, user: (
+            BlogStateInput(input_topic=payload["topic"], input_content=content,
+                           post_types=payload["post_types"], thread_id=thread_id),
+            None,
+        )
+        return content
+
+    @pytest.mark.asyncio
+    async def test_sections_use_brief(self, workflow, long_source):
+        """Test that chunks are summarized with bounded concurrency and sections get the brief."""
+        workflow.llm.latency = 0.01
+        prompts = []
+        respond = workflow.llm._respond
+        workflow.llm._respond = lambda messages: prompts.append(messages[0].content) or respond(messages)
+
+        await workflow.arun_generic_workflow({"topic": "attention", "post_types": ["blog"]}, "thread-condense", None)
+
+        state = await workflow.async_graph.aget_state({"configurable": {"thread_id": "thread-condense"}})
+        chunks = workflow._condense_chunks(long_source)
+        assert len(chunks) > 3
+        assert sum("Summarize this part of the source" in p for p in prompts) == len(chunks)
+        assert 1 < workflow.llm.max_in_flight <= 3
+        assert state.values["reference_brief"].startswith("Reference brief")
+        section_prompts = [p for p in prompts if "crafting a section" in p]
+        assert section_prompts and all("Reference brief" in p and "Paragraph 0 of" not in p for p in section_prompts)
+        decision = next(d for d in state.values["content_budget"] if d["node"] == "condense_reference")
+        assert decision["kept_tokens"] * 10 < decision["input_tokens"]
+
+    def test_sync_path_condenses(self, workflow, long_source):
+        """Test that the sync graph summarizes through the thread pool."""
+        workflow.llm.latency = 0.01
+        workflow.run_generic_workflow({"topic": "attention", "post_types": ["blog"]}, "thread-condense-sync", None)
+        state = workflow.graph.get_state({"configurable": {"thread_id": "thread-condense-sync"}})
+        assert state.values["reference_brief"]
+        assert 1 < workflow.llm.max_in_flight <= 3
+
+    def test_small_source_goes_straight_to_plan(self, workflow):
+        """Test that content under the threshold is used as is."""
+        assert workflow.route_input(BlogState(input_content="Short reference.")) == "generate_blog_plan"
+
+
+class TestPromptPrefix:
+    """Test that section prompts share a cacheable prefix."""
+
+    @pytest.mark.asyncio
+    async def test_sections_share_system_prompt(self, workflow):
+        """Test that section calls differ only after the shared instructions and usage is reported."""
+        workflow._prepare_input = lambda payload, thread_id, user: (
+            BlogStateInput(input_topic=payload["topic"], input_content="Reference material. " * 400,
+                           post_types=payload["post_types"], thread_id=thread_id),
+            None,
+        )
+        prompts, reports = [], []
+        respond = workflow.llm._respond
+        workflow.llm._respond = lambda messages: prompts.append(messages) or respond(messages)
+        workflow._report_usage = lambda thread_id, usage: reports.append(usage)
+
+        await workflow.arun_generic_workflow({"topic": "prefix", "post_types": ["blog"]}, "thread-prefix", None)
+
+        sections = [m for m in prompts if "crafting a section" in m[0].content]
+        assert len(sections) == 2
+        assert sections[0][0].content == sections[1][0].content
+        assert sections[0][0].cache and sections[0][1].content != sections[1][1].content
+        assert reports[0].calls == 5
+        assert reports[0].cached_tokens > 0
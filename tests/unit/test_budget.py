@@ -0,0 +1,66 @@
+"""
+Unit tests for token budgeting of reference content.
+"""
+from src.backend.agents.budget import GAP_MARKER, ContentBudgeter
+from src.backend.agents.utils import format_reference_source
+
+
+def word_count(text):
+    return len(text.split())
+
+
+def make_budgeter(**budgets):
+    return ContentBudgeter("fake", budgets, chunk_tokens=20, counter=word_count)
+
+
+def paragraphs(topic, count):
+    return "\n\n".join(f"Paragraph {i} about {topic} " + "filler " * 14 for i in range(count))
+
+
+def sources():
+    return "".join(format_reference_source(i, f"https://example.com/{i}", paragraphs(topic, 5))
+                   for i, topic in enumerate(("databases", "caching", "networking"), 1))
+
+
+class TestContentBudgeter:
+    """Test fitting, trimming and prioritizing reference content."""
+
+    def test_content_within_budget_unchanged(self):
+        """Test that content under the budget is passed through and recorded as fit."""
+        content = sources()
+        fitted, decision = make_budgeter(plan=10_000).fit("plan", content)
+        assert fitted == content
+        assert decision["strategy"] == "fit"
+        assert decision["kept_tokens"] == decision["input_tokens"]
+        assert decision["sources_total"] == 3
+
+    def test_unbudgeted_node_skipped(self):
+        """Test that nodes without a budget get no decision."""
+        content = sources()
+        assert make_budgeter().fit("plan", content) == (content, None)
+
+    def test_trim_keeps_every_source(self):
+        """Test that trimming keeps the leading chunks of every source within budget."""
+        fitted, decision = make_budgeter(plan=120).fit("plan", sources())
+        assert decision["strategy"] == "trim"
+        assert decision["kept_tokens"] <= 120
+        assert decision["sources_kept"] == 3
+        for topic in ("databases", "caching", "networking"):
+            assert f"Paragraph 0 about {topic}" in fitted
+            assert f"Paragraph 4 about {topic}" not in fitted
+        assert fitted.count("# Source ") == 3
+
+    def test_prioritize_prefers_focus(self):
+        """Test that chunks matching the section focus are kept first."""
+        fitted, decision = make_budgeter(section=60).fit("section", sources(), focus="Caching strategies")
+        assert decision["strategy"] == "prioritize"
+        assert "about caching" in fitted
+        assert "about networking" not in fitted
+        assert decision["sources_kept"] == 1
+
+    def test_gap_marked_within_source(self):
+        """Test that skipped chunks inside a source are marked."""
+        content = "\n\n".join(f"Chunk {i} " + ("widgets " if i in (0, 3) else "filler ") * 18 for i in range(4))
+        fitted, _ = make_budgeter(section=45).fit("section", content, focus="widgets")
+        assert "Chunk 0" in fitted and "Chunk 3" in fitted
+        assert GAP_MARKER.strip() in fitted
@@ -0,0 +1,117 @@
+"""
+Unit tests for the compact checkpoint serializer and large-text handling.
+"""
+import pickle
+
+import pytest
+from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.backend.agents.state import BlogState, Section
+from src.backend.db.checkpoint_serde import (
+    COMPRESSED_TYPE,
+    CompactPostgresSaver,
+    CompactSerializer,
+    _BlobText,
+)
+
+
+def make_state():
+    sections = [Section(name=f"Section {i}", description="About it", main_body=True,
+                        content="Paragraph text. " * 50) for i in range(3)]
+    return BlogState(input_topic="topic", input_content="Source text. " * 500,
+                     sections=sections, completed_sections=sections, post_types=["blog"])
+
+
+class TestCompactSerializer:
+    """Test encoding, compression and backward compatibility."""
+
+    def test_state_round_trip(self):
+        """Test that blog state dataclasses survive a round trip."""
+        serde = CompactSerializer()
+        state = make_state()
+        typed = serde.dumps_typed(state)
+        assert typed[0] == COMPRESSED_TYPE
+        assert serde.loads_typed(typed) == state
+
+    def test_compressed_smaller_than_legacy(self):
+        """Test that large values are stored smaller than with the previous serializer."""
+        state = make_state()
+        _, legacy = JsonPlusSerializer(pickle_fallback=True).dumps_typed(state)
+        _, compact = CompactSerializer().dumps_typed(state)
+        assert len(compact) < len(legacy) / 4
+
+    def test_small_values_not_compressed(self):
+        """Test that values under the threshold stay plain msgpack."""
+        serde = CompactSerializer()
+        typed = serde.dumps_typed(["AI", "LLM"])
+        assert typed[0] == "msgpack"
+        assert serde.loads_typed(typed) == ["AI", "LLM"]
+
+    def test_reads_legacy_rows(self):
+        """Test that msgpack and pickle rows from the previous serializer still load."""
+        legacy = JsonPlusSerializer(pickle_fallback=True)
+        serde = CompactSerializer()
+        state = make_state()
+        assert serde.loads_typed(legacy.dumps_typed(state)) == state
+        assert serde.loads_typed(("pickle", pickle.dumps({"a": 1}))) == {"a": 1}
+
+    def test_blob_text_unwrapped(self):
+        """Test that externalized text is stored and loaded as a plain string."""
+        serde = CompactSerializer()
+        text = "Source text. " * 500
+        assert serde.loads_typed(serde.dumps_typed(_BlobText(text))) == text
+
+
+class TestLargeTextChannels:
+    """Test that large strings are moved out of the inline checkpoint."""
+
+    def make_saver(self):
+        saver = CompactPostgresSaver.__new__(CompactPostgresSaver)
+        saver._init_large_text()
+        return saver
+
+    def checkpoint(self, version):
+        return {
+            "channel_values": {"input_content": "x" * 5000, "input_topic": "topic"},
+            "channel_versions": {"input_content": version, "input_topic": version},
+        }
+
+    def test_large_text_routed_to_blob(self):
+        """Test that only large strings are wrapped and versioned for the blob table."""
+        saver = self.make_saver()
+        config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+        checkpoint, new_versions, _ = saver._externalize_large_text(config, self.checkpoint("1"), {})
+        assert isinstance(checkpoint["channel_values"]["input_content"], _BlobText)
+        assert checkpoint["channel_values"]["input_topic"] == "topic"
+        assert new_versions == {"input_content": "1"}
+
+    def test_unchanged_text_written_once(self):
+        """Test that the same channel version isn't re-sent on later checkpoints."""
+        saver = self.make_saver()
+        config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+        saver._mark_written(saver._externalize_large_text(config, self.checkpoint("1"), {})[2])
+        _, new_versions, _ = saver._externalize_large_text(config, self.checkpoint("1"), {})
+        assert new_versions == {}
+        _, new_versions, _ = saver._externalize_large_text(config, self.checkpoint("2"), {})
+        assert new_versions == {"input_content": "2"}
+
+    def test_failed_put_resends_text(self, monkeypatch):
+        """Test that text is only remembered as written once its checkpoint was stored."""
+        saver = self.make_saver()
+        config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+        sent = []
+
+        def put(self, config, checkpoint, metadata, new_versions):
+            sent.append(new_versions)
+            if len(sent) == 1:
+                raise ConnectionError("connection dropped")
+            return config
+
+        monkeypatch.setattr(PostgresSaver, "put", put)
+        with pytest.raises(ConnectionError):
+            saver.put(config, self.checkpoint("1"), {}, {})
+        saver.put(config, self.checkpoint("1"), {}, {})
+        saver.put(config, self.checkpoint("1"), {}, {})
+
+        assert sent == [{"input_content": "1"}, {"input_content": "1"}, {}]
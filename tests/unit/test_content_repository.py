@@ -0,0 +1,98 @@
+"""
+Unit tests for the batched content persistence path, with a recording session.
+"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.backend.db.repositories.content import ContentRepository
+
+BLOG_TYPE, TWITTER_TYPE = uuid.uuid4(), uuid.uuid4()
+
+
+class RecordingSession:
+    """Records executed statements and answers the type lookup and tag upsert."""
+
+    def __init__(self, tag_ids):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.tag_ids = tag_ids
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.statements.append((sql, params))
+        if sql.startswith("SELECT"):
+            return SimpleNamespace(all=lambda: [("blog", BLOG_TYPE), ("twitter", TWITTER_TYPE)])
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.tag_ids))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def repo():
+    repository = ContentRepository()
+    repository.session = RecordingSession([uuid.uuid4(), uuid.uuid4()])
+    repository.db = SimpleNamespace(get_session=lambda: repository.session)
+    return repository
+
+
+def rows(*types):
+    return [{"content_type": t, "profile_id": uuid.uuid4(), "title": None, "body": "text",
+             "status": "Draft", "thread_id": uuid.uuid4()} for t in types]
+
+
+class TestCreateWithAssociations:
+    """Test that generated content is stored with a fixed number of statements."""
+
+    def test_single_transaction_fixed_statements(self, repo):
+        """Test that rows, tags and associations take five statements and one commit."""
+        source_id = uuid.uuid4()
+        content_ids = repo.create_with_associations(
+            rows("blog", "twitter"), source_id=source_id, tag_names=["AI", "LLM", "AI"]
+        )
+
+        session = repo.session
+        assert len(content_ids) == 2
+        assert session.commits == 1 and session.rollbacks == 0
+        kinds = [sql.split("\n")[0] for sql, _ in session.statements]
+        assert len(kinds) == 5
+        assert kinds[0].startswith("SELECT")
+        assert all(kind.startswith("INSERT") for kind in kinds[1:])
+
+        _, content_params = session.statements[1]
+        assert [p["content_type_id"] for p in content_params] == [BLOG_TYPE, TWITTER_TYPE]
+        assert [p["content_id"] for p in content_params] == content_ids
+
+        _, source_params = session.statements[2]
+        assert {p["source_id"] for p in source_params} == {source_id}
+
+        tag_sql, _ = session.statements[3]
+        assert "ON CONFLICT (name) DO UPDATE" in tag_sql and "RETURNING" in tag_sql
+        assert tag_sql.count("%(name_m") == 2
+
+        _, tag_links = session.statements[4]
+        assert len(tag_links) == 4
+        assert {p["tag_id"] for p in tag_links} == set(session.tag_ids)
+
+    def test_unknown_content_type_skipped(self, repo):
+        """Test that rows with a missing content type are not inserted."""
+        content_ids = repo.create_with_associations(rows("blog", "reddit"))
+        _, content_params = repo.session.statements[1]
+        assert len(content_ids) == len(content_params) == 1
+        assert len(repo.session.statements) == 2
+
+    def test_rollback_on_error(self, repo):
+        """Test that a failing statement rolls the whole write back."""
+        def fail(stmt, params=None):
+            raise RuntimeError("insert failed")
+        repo.session.execute = fail
+        with pytest.raises(RuntimeError):
+            repo.create_with_associations(rows("blog"))
+        assert repo.session.rollbacks == 1 and repo.session.commits == 0
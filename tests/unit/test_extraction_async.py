@@ -0,0 +1,121 @@
+"""
+Unit tests for the async extractor and converter interfaces.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+
+from src.backend.clients.http import AsyncHttpSession
+from src.backend.extraction.converters import markdown
+from src.backend.extraction.extractors import github
+from src.backend.extraction.extractors.reddit import RedditExtractor
+from src.backend.extraction.factory import ConverterRegistry, ExtracterRegistry
+from tests.benchmarks.fakes import FakeLLM
+
+
+def mock_http(monkeypatch, module, handler):
+    """Point ``module.get_async_http`` at a session served by ``handler``"""
+    session = AsyncHttpSession(backoff=0, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(module, "get_async_http", lambda: session)
+
+
+class Comments(list):
+    def replace_more(self, limit=None):
+        pass
+
+
+def submission(url):
+    author = SimpleNamespace(name="alice")
+    comment = SimpleNamespace(author=author, score=3, body="Use HNSW.", replies=Comments())
+    return SimpleNamespace(title="Vector databases?", author=author, created_utc=0, num_comments=1, score=10,
+                           upvote_ratio=0.9, selftext="Which one?", comments=Comments([comment]),
+                           subreddit=SimpleNamespace(display_name="MachineLearning"))
+
+
+class TestAsyncExtractors:
+    """Test the native and thread-offloaded aextract implementations."""
+
+    @pytest.mark.asyncio
+    async def test_github_readmes_fetched_concurrently(self, monkeypatch):
+        """Test that gathered GitHub extractions overlap their README lookups."""
+        in_flight = []
+        overlap = 0
+
+        async def readme(request):
+            nonlocal overlap
+            in_flight.append(request)
+            overlap = max(overlap, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            repo = request.url.path.split("/")[3]
+            return httpx.Response(200, json={"download_url": f"https://raw.example.com/{repo}/README.md"})
+
+        mock_http(monkeypatch, github, readme)
+        repos = [f"https://github.com/owner/repo{i}" for i in range(5)]
+        results = await asyncio.gather(*(ExtracterRegistry.aextract("github", url) for url in repos))
+
+        assert overlap > 1
+        assert results[2] == {"type": "github", "path": repos[2], "owner": "owner", "repo": "repo2",
+                              "readme_url": "https://raw.example.com/repo2/README.md"}
+
+    @pytest.mark.asyncio
+    async def test_github_errors_raised(self, monkeypatch):
+        """Test that a missing repository raises like the sync path."""
+        mock_http(monkeypatch, github, lambda request: httpx.Response(404, json={}))
+        with pytest.raises(requests.HTTPError):
+            await ExtracterRegistry.aextract("github", "https://github.com/owner/missing")
+
+    @pytest.mark.asyncio
+    async def test_reddit_matches_sync(self):
+        """Test that the async Reddit extraction returns what the sync one does, summary included."""
+        extractor = RedditExtractor()
+        extractor.reddit = SimpleNamespace(submission=submission)
+        extractor.llm = FakeLLM(latency_ms=0)
+        url = "https://reddit.com/r/MachineLearning/comments/1"
+
+        assert await extractor.aextract(url) == extractor.extract(url)
+        assert extractor.llm.calls == 2
+        skipped = await extractor.aextract(url, skip_llm=True)
+        assert skipped["summary"] == "Summary generation skipped." and skipped["subreddit"] == "MachineLearning"
+        assert extractor.llm.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_offloaded_extractors(self):
+        """Test that extract is offloaded for the text extractor and arXiv resolves its PDF URL inline."""
+        assert await ExtracterRegistry.aextract("text", "hello") == ExtracterRegistry.extract("text", "hello")
+        assert await ExtracterRegistry.aextract("arxiv", "https://arxiv.org/abs/2312.01700") == \
+            {"type": "arxiv", "url": "https://arxiv.org/pdf/2312.01700.pdf"}
+
+
+class TestAsyncConverters:
+    """Test aconvert on the HTML converter and through the registry."""
+
+    @pytest.mark.asyncio
+    async def test_html_url_fetched_natively(self, monkeypatch):
+        """Test that a URL is fetched with the async session and converted to markdown."""
+        mock_http(monkeypatch, markdown, lambda request: httpx.Response(200, html="<h1>Title</h1><p>Body</p>"))
+        assert (await ConverterRegistry.aconvert("html", "https://example.com/post")).strip() == "Title\n=====\n\nBody"
+
+    @pytest.mark.asyncio
+    async def test_html_string_matches_sync(self):
+        """Test that inline HTML converts the same way on both paths."""
+        html = "<ul><li>one</li><li>two</li></ul>"
+        assert await ConverterRegistry.aconvert("html", html) == ConverterRegistry.convert("html", html)
+
+
+class TestRegistry:
+    """Test the shared component instances of the registries."""
+
+    def test_shared_instances(self):
+        """Test that shared components are built once per type and config, and dropped on unregister."""
+        converter = ConverterRegistry.shared("html")
+        assert ConverterRegistry.shared("html") is converter
+        assert ConverterRegistry.get_converter("html") is not converter
+
+        component = ConverterRegistry._registry["html"]
+        ConverterRegistry.unregister("html")
+        ConverterRegistry.register("html", component)
+        assert ConverterRegistry.shared("html") is not converter
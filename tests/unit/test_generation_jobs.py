@@ -0,0 +1,113 @@
+"""
+Unit tests for the generation job queue and worker pool.
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from src.backend.agents.state import BlogStateOutput
+from src.backend.db.repositories.job import JobRepository
+from src.backend.jobs import GenerationWorkerPool
+
+PROFILE_ID = str(uuid.uuid4())
+
+
+def make_job(**payload):
+    return SimpleNamespace(
+        job_id=uuid.uuid4(), thread_id=uuid.uuid4(), profile_id=uuid.UUID(PROFILE_ID),
+        payload={"post_types": ["blog"], "thread_id": None, **payload},
+        user_context={"id": "user-1", "profile_id": PROFILE_ID, "role": "free"},
+        attempts=1, max_attempts=3,
+    )
+
+
+class FakeWorkflow:
+    """Returns a fixed result or raises the configured error."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def run_generic_workflow(self, payload, thread_id, user):
+        self.calls.append((payload, thread_id, user))
+        if self.error:
+            raise self.error
+        return BlogStateOutput(final_blog="# Blog", blog_title="Title", tags=["ai"])
+
+
+def make_pool(jobs, workflow):
+    job_repo = MagicMock()
+    job_repo.claim.side_effect = lambda worker_id, lease: jobs.pop(0) if jobs else None
+    return GenerationWorkerPool(lambda: workflow, concurrency=1, lease_seconds=30, job_repo=job_repo,
+                                profile_repo=MagicMock(), template_repo=MagicMock())
+
+
+class TestJobClaim:
+    """Test the statement workers use to claim jobs."""
+
+    def test_claim_skips_locked_rows(self):
+        """Test that a claim takes one queued or expired job with SKIP LOCKED and leases it."""
+        session = MagicMock()
+        repo = JobRepository()
+        repo.db = SimpleNamespace(get_session=lambda: session)
+        repo.claim("worker-1", 60)
+
+        stmt = session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE generation_jobs")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "LIMIT" in sql and "ORDER BY generation_jobs.created_at" in sql
+        assert "generation_jobs.lease_expires_at < now()" in sql
+        assert "generation_jobs.attempts < generation_jobs.max_attempts" in sql
+        assert "RETURNING" in sql
+        session.commit.assert_called_once()
+
+
+class TestGenerationWorkerPool:
+    """Test running claimed jobs."""
+
+    def test_successful_job_completed(self):
+        """Test that a job runs the workflow and stores its output."""
+        workflow = FakeWorkflow()
+        job = make_job(topic="Vector databases")
+        pool = make_pool([job], workflow)
+
+        assert pool.run_once() is True
+        payload, thread_id, user = workflow.calls[0]
+        assert payload["topic"] == "Vector databases"
+        assert thread_id == str(job.thread_id)
+        assert user.profile_id == PROFILE_ID
+        job_id, worker_id, result = pool.job_repo.complete.call_args.args
+        assert (job_id, worker_id) == (job.job_id, pool.worker_id)
+        assert result["final_blog"] == "# Blog" and result["tags"] == ["ai"]
+        pool.profile_repo.increment_generation_count.assert_called_once_with(job.profile_id)
+        assert pool.active_jobs == 0
+
+    def test_workflow_error_fails_job(self):
+        """Test that a workflow error fails the job with its message and no generation is counted."""
+        pool = make_pool([make_job()], FakeWorkflow(HTTPException(status_code=500, detail="No content found")))
+
+        assert pool.run_once() is True
+        assert pool.job_repo.fail.call_args.args[2] == "No content found"
+        pool.job_repo.complete.assert_not_called()
+        pool.profile_repo.increment_generation_count.assert_not_called()
+
+    def test_template_resolved_when_job_runs(self):
+        """Test that a stored template id is loaded before the workflow runs."""
+        workflow = FakeWorkflow()
+        template_id = str(uuid.uuid4())
+        pool = make_pool([make_job(template_id=template_id)], workflow)
+        pool.template_repo.get_template_with_parameters.return_value = "template"
+
+        pool.run_once()
+        pool.template_repo.get_template_with_parameters.assert_called_once_with(uuid.UUID(template_id))
+        assert workflow.calls[0][0]["template"] == "template"
+
+    def test_empty_queue(self):
+        """Test that run_once reports an empty queue."""
+        workflow = FakeWorkflow()
+        assert make_pool([], workflow).run_once() is False
+        assert workflow.calls == []
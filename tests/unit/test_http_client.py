@@ -0,0 +1,214 @@
+"""
+Unit tests for the shared outbound HTTP session against a local server.
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from src.backend.clients import http
+from src.backend.clients.http import AsyncHttpSession, HttpSession, ResponseTooLarge, get_async_http, get_http
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves ``/bytes/<n>``, ``/flaky`` (503 twice, then 200) and anything else (the User-Agent)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, length=True):
+        self.send_response(status)
+        if length:
+            self.send_header("Content-Length", str(len(body)))
+        else:
+            self.send_header("Connection", "close")
+        self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.hits.append((self.path, self.client_address[1]))
+        if self.path.startswith("/bytes/"):
+            self._send(200, b"x" * int(self.path.split("/")[2]), length="nolength" not in self.path)
+        elif self.path == "/flaky":
+            failures = sum(1 for path, _ in self.server.hits if path == "/flaky")
+            self._send(503 if failures <= 2 else 200, b"ok")
+        else:
+            self._send(200, self.headers["User-Agent"].encode())
+
+    def do_POST(self):
+        self.server.hits.append((self.path, self.client_address[1]))
+        self._send(503, b"")
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.hits = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def session():
+    return HttpSession(max_bytes=1000, retries=2, backoff=0, user_agent="postbot-test")
+
+
+class TestHttpSession:
+    """Test pooling, timeouts, size caps, retries and the User-Agent."""
+
+    def test_user_agent_timeout_and_keep_alive(self, server, session, monkeypatch):
+        """Test that requests carry the User-Agent and default timeouts and reuse one connection."""
+        httpd, base = server
+        timeouts = []
+        send = requests.adapters.HTTPAdapter.send
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, "send",
+                            lambda self, request, **kw: timeouts.append(kw["timeout"]) or send(self, request, **kw))
+
+        assert session.get(f"{base}/echo").text == "postbot-test"
+        session.get(f"{base}/echo", timeout=3)
+
+        assert timeouts == [session.timeout, 3]
+        assert len({port for _, port in httpd.hits}) == 1
+
+    def test_body_over_cap_rejected(self, server, session):
+        """Test that bodies over max_bytes raise, with or without a Content-Length."""
+        _, base = server
+        assert len(session.get(f"{base}/bytes/1000").content) == 1000
+        with pytest.raises(ResponseTooLarge):
+            session.get(f"{base}/bytes/1001")
+        with pytest.raises(ResponseTooLarge):
+            session.get(f"{base}/bytes/200000/nolength")
+        assert len(session.get(f"{base}/bytes/5000", max_bytes=0).content) == 5000
+
+    def test_streamed_body_over_cap_rejected(self, server, session):
+        """Test that streamed bodies raise once read past the cap, while headers stay available."""
+        _, base = server
+        response = session.get(f"{base}/bytes/1001", stream=True)
+        assert response.headers["Content-Length"] == "1001"
+        with pytest.raises(ResponseTooLarge):
+            response.content
+        with pytest.raises(ResponseTooLarge):
+            # How MarkItDown reads URL conversions
+            for _ in session.get(f"{base}/bytes/200000/nolength", stream=True).iter_content(chunk_size=512):
+                pass
+        assert len(session.get(f"{base}/bytes/1000", stream=True).content) == 1000
+
+    def test_download_streams_under_cap(self, server, session, tmp_path):
+        """Test that downloads are written to a file and removed when they exceed the cap."""
+        _, base = server
+        session.download(f"{base}/bytes/800", tmp_path / "small.bin")
+        assert (tmp_path / "small.bin").stat().st_size == 800
+
+        with pytest.raises(ResponseTooLarge):
+            session.download(f"{base}/bytes/200000/nolength", tmp_path / "large.bin")
+        assert not (tmp_path / "large.bin").exists()
+
+    def test_retries(self, server, session):
+        """Test that GETs are retried on 503 and POSTs are not."""
+        httpd, base = server
+        assert session.get(f"{base}/flaky").status_code == 200
+        assert session.post(f"{base}/flaky").status_code == 503
+        assert [path for path, _ in httpd.hits] == ["/flaky"] * 4
+
+    def test_connection_errors_retried_with_jitter(self, session, monkeypatch):
+        """Test that connection errors are retried after jittered waits, then raised."""
+        waits = []
+        monkeypatch.setattr(http.time, "sleep", waits.append)
+        session.backoff = 1.0
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://127.0.0.1:9/unreachable")
+        assert len(waits) == 2
+        assert 0 <= waits[0] <= 1.0 and 0 <= waits[1] <= 2.0
+
+    def test_shared_session_from_config(self):
+        """Test that the process-wide session is built once from the http config."""
+        assert get_http() is get_http()
+        assert get_http().timeout == (5, 30)
+        assert "postbot" in get_http().headers["User-Agent"]
+
+
+@pytest.fixture
+def async_session():
+    return AsyncHttpSession(max_bytes=1000, retries=2, backoff=0, user_agent="postbot-test")
+
+
+class TestAsyncHttpSession:
+    """Test the httpx session used by async extractors."""
+
+    @pytest.mark.asyncio
+    async def test_user_agent_and_keep_alive(self, server, async_session):
+        """Test that async requests carry the User-Agent and reuse kept-alive connections."""
+        httpd, base = server
+        responses = await asyncio.gather(async_session.get(f"{base}/echo"), async_session.get(f"{base}/bytes/10"))
+        await async_session.get(f"{base}/echo")
+
+        assert responses[0].text == "postbot-test" and responses[1].content == b"x" * 10
+        assert len({port for _, port in httpd.hits}) <= 2
+        assert async_session.client() is async_session.client()
+
+    @pytest.mark.asyncio
+    async def test_body_over_cap_rejected(self, server, async_session):
+        """Test that async bodies over max_bytes raise, with or without a Content-Length."""
+        _, base = server
+        with pytest.raises(ResponseTooLarge):
+            await async_session.get(f"{base}/bytes/1001")
+        with pytest.raises(ResponseTooLarge):
+            await async_session.get(f"{base}/bytes/200000/nolength")
+        assert len((await async_session.get(f"{base}/bytes/5000", max_bytes=0)).content) == 5000
+
+    @pytest.mark.asyncio
+    async def test_retries(self, server, async_session):
+        """Test that async GETs are retried on 503 and POSTs are not."""
+        httpd, base = server
+        assert (await async_session.get(f"{base}/flaky")).status_code == 200
+        assert (await async_session.request("POST", f"{base}/flaky")).status_code == 503
+        assert [path for path, _ in httpd.hits] == ["/flaky"] * 4
+
+    @pytest.mark.asyncio
+    async def test_transport_errors_retried(self):
+        """Test that transport errors are retried, then raised as requests.ConnectionError."""
+        attempts = []
+
+        def fail(request):
+            attempts.append(request.url)
+            raise httpx.ConnectError("refused", request=request)
+
+        session = AsyncHttpSession(retries=2, backoff=0, transport=httpx.MockTransport(fail))
+        with pytest.raises(requests.ConnectionError):
+            await session.get("https://example.com/")
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_errors_match_sync_session(self):
+        """Test that timeouts and error statuses raise the requests exceptions of HttpSession."""
+        def answer(request):
+            if request.url.path == "/slow":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(404)
+
+        session = AsyncHttpSession(retries=0, transport=httpx.MockTransport(answer))
+        with pytest.raises(requests.Timeout):
+            await session.get("https://example.com/slow")
+        response = await session.get("https://example.com/missing")
+        with pytest.raises(requests.HTTPError) as error:
+            response.raise_for_status()
+        assert error.value.response.status_code == 404
+
+    def test_client_per_event_loop(self):
+        """Test that each event loop gets its own httpx client."""
+        session = get_async_http()
+
+        async def client():
+            return session.client()
+
+        assert asyncio.run(client()) is not asyncio.run(client())
+        assert session is get_async_http()
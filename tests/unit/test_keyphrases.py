@@ -0,0 +1,88 @@
+"""
+Unit tests for local keyphrase extraction of blog tags.
+"""
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.backend.agents.blogs import AgentWorkflow
+from src.backend.agents.keyphrases import KeyphraseExtractor
+from src.backend.agents.state import BlogState
+from tests.benchmarks.fakes import FakeLLM
+
+BLOG = """# Choosing a Vector Database for RAG
+
+Vector databases store embeddings and answer similarity search queries. In retrieval
+augmented generation pipelines, the vector database decides latency.
+
+## Indexing embeddings
+
+Most vector databases build HNSW indexes over embeddings. [Pinecone](https://pinecone.io)
+supports HNSW indexes, and similarity search stays fast.
+
+```python
+index = hnsw.Index(space="cosine")
+```
+"""
+
+
+class TestKeyphraseExtractor:
+    """Test candidate phrases, scoring and convergence on existing tags."""
+
+    def test_recurring_phrases_first(self):
+        """Test that recurring multi-word terms rank above the words they contain."""
+        tags = KeyphraseExtractor().extract(BLOG)
+
+        assert tags[0] == "Vector Database"
+        assert {"Similarity Search", "HNSW indexes"} <= set(tags)
+        assert "Vector" not in tags and "cosine" not in " ".join(tags).lower()
+        assert len(tags) <= 5
+
+    def test_known_tags_preferred(self):
+        """Test that tags in use are boosted and keep their stored spelling."""
+        extractor = KeyphraseExtractor(vocabulary=lambda limit: ["Vector Databases", "Retrieval Augmented Generation"])
+        tags = extractor.extract(BLOG)
+
+        assert tags[0] == "Vector Databases"
+        assert "Retrieval Augmented Generation" in tags
+
+    def test_vocabulary_cached_and_failures_tolerated(self):
+        """Test that tags in use are loaded once per TTL and a failing load leaves extraction working."""
+        loads = []
+
+        def vocabulary(limit):
+            loads.append(limit)
+            raise ConnectionError("database unavailable")
+
+        extractor = KeyphraseExtractor(vocabulary=vocabulary, vocabulary_size=50)
+        assert extractor.extract(BLOG) == extractor.extract(BLOG) != []
+        assert loads == [50]
+
+    def test_empty_text(self):
+        """Test that an empty post has no tags."""
+        assert KeyphraseExtractor().extract("") == []
+        with pytest.raises(ValueError):
+            KeyphraseExtractor(method="yake")
+
+
+class TestTagGeneration:
+    """Test the generate_tags node in both modes."""
+
+    @pytest.fixture
+    def workflow(self):
+        workflow = AgentWorkflow(checkpointer=InMemorySaver())
+        workflow.llm = FakeLLM(latency_ms=0)
+        workflow.tagger.vocabulary = None
+        return workflow
+
+    @pytest.mark.asyncio
+    async def test_keyphrase_mode_skips_llm(self, workflow):
+        """Test that keyphrase tags are extracted on both paths without an LLM call."""
+        state = BlogState(final_blog=BLOG)
+        assert workflow.generate_tags(state) == await workflow.agenerate_tags(state)
+        assert workflow.llm.calls == 0
+
+    def test_llm_mode(self, workflow):
+        """Test that the llm method still asks the model for tags."""
+        workflow.tagger.method = "llm"
+        assert workflow.generate_tags(BlogState(final_blog=BLOG)) == {"tags": ["AI", "LLM", "Benchmarks"]}
+        assert workflow.llm.calls == 1
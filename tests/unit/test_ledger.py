@@ -0,0 +1,129 @@
+"""
+Unit tests for the per-generation ledger of node runs and LLM calls.
+"""
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from litellm.types.utils import Usage
+from sqlalchemy.dialects import postgresql
+
+from src.backend.agents.blogs import AgentWorkflow
+from src.backend.agents.memo import StageCache
+from src.backend.agents.state import BlogStateInput
+from src.backend.clients.llm import HumanMessage, LLMClient
+from src.backend.db.repositories.ledger import LedgerRepository
+from src.backend.utils.ledger import GenerationLedger, estimate_cost, node_span
+from tests.benchmarks.fakes import FakeLLM
+
+USER = SimpleNamespace(profile_id=str(uuid.uuid4()))
+
+
+class SlowRouter:
+    """Answers after 20 ms with fixed usage."""
+
+    def completion(self, model, messages, **kwargs):
+        time.sleep(0.02)
+        usage = Usage(prompt_tokens=1000, completion_tokens=100, total_tokens=1100)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))], usage=usage)
+
+
+@pytest.fixture
+def workflow():
+    """AgentWorkflow with a fake LLM, stubbed source collection and a mocked ledger repository."""
+    agent = AgentWorkflow(checkpointer=InMemorySaver())
+    agent.llm = FakeLLM(latency_ms=0)
+    agent.stage_cache = StageCache()
+    agent._collect_input = lambda payload, thread_id, user: (
+        BlogStateInput(input_topic=payload["topic"], input_content="Reference material.",
+                       post_types=payload["post_types"], thread_id=thread_id),
+        None,
+    )
+    agent._store_new_content = lambda *args, **kwargs: None
+    agent.content_repo.exists = lambda *args, **kwargs: False
+    agent.ledger_repo = MagicMock()
+    return agent
+
+
+class TestGenerationLedger:
+    """Test recording LLM calls and node runs."""
+
+    def test_llm_call_attributed_to_node(self):
+        """Test that an LLM call is recorded with model, duration and cost and added to its node."""
+        client = LLMClient()
+        client.router = SlowRouter()
+        ledger = GenerationLedger(str(uuid.uuid4()), USER.profile_id, "generate")
+        with ledger.recording():
+            with node_span("write_section"):
+                client.invoke([HumanMessage(content="Write a section")])
+
+        call, node, total = ledger.rows()
+        assert (call.kind, call.node, call.model) == ("llm", "write_section", client.model_name)
+        assert call.duration_ms >= 20 and call.prompt_tokens == 1000 and call.completion_tokens == 100
+        assert call.cost_usd == estimate_cost(client.model_name, 1000, 0, 100) > 0
+        assert (node.kind, node.node, node.prompt_tokens, node.cost_usd) == ("node", "write_section", 1000, call.cost_usd)
+        assert node.duration_ms >= call.duration_ms
+        assert (total.kind, total.node, total.completion_tokens) == ("generation", "generate", 100)
+
+    def test_nothing_recorded_outside_a_generation(self):
+        """Test that calls and spans outside a ledger are ignored."""
+        client = LLMClient()
+        client.router = SlowRouter()
+        with node_span("write_section"):
+            assert client.invoke([HumanMessage(content="Write a section")]) == "ok"
+
+    def test_unknown_model_costs_nothing(self):
+        """Test that a model without a price is recorded with zero cost."""
+        assert estimate_cost("fake-model-without-price", 1000, 0, 100) == 0.0
+
+
+class TestWorkflowLedger:
+    """Test the ledger of workflow runs."""
+
+    @pytest.mark.asyncio
+    async def test_generation_ledger_stored(self, workflow):
+        """Test that a generation stores its nodes and LLM calls against the thread and profile."""
+        await workflow.arun_generic_workflow({"topic": "ledger", "post_types": ["blog"]}, "thread-ledger", USER)
+
+        ledger = workflow.ledger_repo.record.call_args.args[0]
+        assert (ledger.thread_id, ledger.profile_id) == ("thread-ledger", USER.profile_id)
+        rows = ledger.rows()
+        nodes = [row.node for row in rows if row.kind == "node"]
+        assert {"prepare_input", "generate_blog_plan", "compile_final_blog", "generate_tags"} <= set(nodes)
+        assert nodes.count("write_section") == 2
+        calls = [row for row in rows if row.kind == "llm"]
+        assert len(calls) == workflow.llm.calls
+        assert {row.node for row in calls} >= {"generate_blog_plan", "write_section"}
+        assert rows[-1].kind == "generation" and rows[-1].node == "generate"
+        assert rows[-1].prompt_tokens == sum(row.prompt_tokens for row in calls)
+
+    def test_run_without_profile_not_stored(self, workflow):
+        """Test that runs without a profile (scripts, benchmarks) keep the ledger out of the database."""
+        workflow.run_generic_workflow({"topic": "ledger", "post_types": ["blog"]}, "thread-ledger-sync", None)
+        workflow.ledger_repo.record.assert_not_called()
+
+    def test_store_failure_does_not_fail_generation(self, workflow):
+        """Test that a failed ledger write is logged and the generation still succeeds."""
+        workflow.ledger_repo.record.side_effect = RuntimeError("database unavailable")
+        result = workflow.run_generic_workflow({"topic": "ledger", "post_types": ["blog"]}, "thread-ledger-err", USER)
+        assert result.final_blog
+
+
+class TestLedgerRepository:
+    """Test the percentile query."""
+
+    def test_percentiles_grouped_by_node(self):
+        """Test that percentiles are computed per node and model over the profile's recent entries."""
+        session = MagicMock()
+        repo = LedgerRepository()
+        repo.db = SimpleNamespace(get_session=lambda: session)
+        repo.percentiles(uuid.UUID(USER.profile_id), "node", days=7)
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "percentile_cont(%(percentile_cont_1)s) WITHIN GROUP (ORDER BY generation_ledger.duration_ms)" in sql
+        assert "WITHIN GROUP (ORDER BY generation_ledger.cost_usd)" in sql
+        assert "GROUP BY generation_ledger.node, generation_ledger.model" in sql
+        assert "generation_ledger.kind = " in sql and "generation_ledger.created_at >= now() - " in sql
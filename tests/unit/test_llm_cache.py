@@ -0,0 +1,163 @@
+"""
+Unit tests for the exact-match LLM response cache, with a stubbed router.
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.clients import llm_cache
+from src.backend.clients.llm import HumanMessage, LLMClient, SystemMessage
+from src.backend.clients.llm_cache import ResponseCache, SQLResponseStore, get_response_cache
+from src.backend.utils.metrics import metrics
+from tests.unit.test_llm_client import StubRouter
+
+
+def chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class StreamingRouter(StubRouter):
+    """Streams "Hello world" in two chunks."""
+
+    def completion(self, model, messages, stream=False, **kwargs):
+        if not stream:
+            return super().completion(model, messages, **kwargs)
+        self.requests.append((messages, time.perf_counter(), time.perf_counter()))
+        return iter([chunk("Hello "), chunk("world")])
+
+    async def acompletion(self, model, messages, stream=False, **kwargs):
+        if not stream:
+            return await super().acompletion(model, messages, **kwargs)
+        self.requests.append((messages, time.perf_counter(), time.perf_counter()))
+
+        async def chunks():
+            for part in ("Hello ", "world"):
+                yield chunk(part)
+        return chunks()
+
+
+class FailingStore:
+    """Store whose database is unavailable."""
+
+    def get(self, key):
+        raise RuntimeError("database unavailable")
+
+    def set(self, key, value, ttl, model=None):
+        raise RuntimeError("database unavailable")
+
+
+def make_client(response_cache):
+    client = LLMClient()
+    client.router = StreamingRouter()
+    client.response_cache = response_cache
+    return client
+
+
+def prompt(text="Rewrite the query: vector databases"):
+    return [SystemMessage(content="You rewrite search queries."), HumanMessage(content=text)]
+
+
+class TestResponseCache:
+    """Test cache hits, misses and bypass on LLMClient calls."""
+
+    def test_identical_prompt_served_from_cache(self):
+        """Test that a repeated prompt is answered without a provider call and counted as a hit."""
+        metrics.reset()
+        client = make_client(ResponseCache())
+
+        assert client.invoke(prompt()) == client.invoke(prompt()) == "ok"
+        assert len(client.router.requests) == 1
+        counters = metrics.snapshot()["counters"]
+        assert (counters["llm_cache.miss"], counters["llm_cache.hit.memory"]) == (1, 1)
+        assert counters["llm.calls"] == 1
+
+    def test_key_covers_messages_params_and_model(self):
+        """Test that a different prompt, call parameter or model setting is a miss."""
+        client = make_client(ResponseCache())
+        client.invoke(prompt())
+        client.invoke(prompt("Rewrite the query: graph databases"))
+        client.invoke(prompt(), max_tokens=50)
+        client.config = SimpleNamespace(class_params={**client.config.class_params, "temperature": 0.0})
+        client.invoke(prompt())
+        assert len(client.router.requests) == 4
+
+    def test_bypass(self):
+        """Test that cache=False neither reads nor writes the cache."""
+        client = make_client(ResponseCache())
+        client.invoke(prompt(), cache=False)
+        client.invoke(prompt())
+        client.invoke(prompt(), cache=False)
+        assert len(client.router.requests) == 3
+
+    def test_disabled_by_default(self):
+        """Test that the cache is opt-in."""
+        assert get_response_cache() is None
+        assert LLMClient().response_cache is None
+
+    @pytest.mark.asyncio
+    async def test_async_and_streamed_calls(self):
+        """Test that async calls and completed streams are cached; a hit streams as one chunk."""
+        client = make_client(ResponseCache())
+        assert await client.ainvoke(prompt()) == await client.ainvoke(prompt()) == "ok"
+
+        assert [t async for t in client.astream(prompt("Stream"))] == ["Hello ", "world"]
+        assert [t async for t in client.astream(prompt("Stream"))] == ["Hello world"]
+        assert list(client.stream(prompt("Stream"))) == ["Hello world"]
+        assert len(client.router.requests) == 2
+
+
+class TestSQLResponseStore:
+    """Test the persistent tier."""
+
+    def test_store_shared_across_caches(self, tmp_path):
+        """Test that a response stored by one process is a store hit for another and then a memory hit."""
+        url = f"sqlite:///{tmp_path / 'llm_cache.db'}"
+        first = make_client(ResponseCache(store=SQLResponseStore(url)))
+        first.invoke(prompt())
+
+        second = make_client(ResponseCache(store=SQLResponseStore(url)))
+        assert second.invoke(prompt()) == "ok"
+        second.invoke(prompt())
+        assert second.router.requests == []
+        assert second.response_cache.stats()["hits"] == {"memory": 1, "store": 1}
+
+    def test_expired_rows_ignored_and_purged(self, tmp_path):
+        """Test that expired responses are misses and are deleted by purge."""
+        store = SQLResponseStore(f"sqlite:///{tmp_path / 'llm_cache.db'}")
+        store.set("expired", "old", ttl=-1)
+        store.set("fresh", "new", ttl=60)
+        store.set("fresh", "newer", ttl=60)
+
+        assert store.get("expired") is None
+        assert store.get("fresh") == "newer"
+        assert store.purge() == 1
+
+    def test_store_failure_is_a_miss(self):
+        """Test that a failing store never fails the call."""
+        client = make_client(ResponseCache(store=FailingStore()))
+
+        assert client.invoke(prompt()) == client.invoke(prompt()) == "ok"
+        assert len(client.router.requests) == 1
+
+    def test_unsupported_dialect_rejected_before_ddl(self, monkeypatch):
+        """Test that an unsupported database is rejected before the table is created."""
+        created = []
+        monkeypatch.setattr(llm_cache, "create_engine",
+                            lambda url, **kwargs: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+        monkeypatch.setattr(llm_cache.llm_response_cache, "create", lambda *args, **kwargs: created.append(args))
+
+        with pytest.raises(ValueError):
+            SQLResponseStore("mysql://cache")
+        assert created == []
+
+    def test_unavailable_store_falls_back_to_memory(self, monkeypatch):
+        """Test that a store that cannot be opened leaves a memory-only cache instead of failing."""
+        settings = SimpleNamespace(llm_cache_enabled=True, llm_cache_url="postgresql://nobody@127.0.0.1:1/cache",
+                                   llm_cache_size=16, llm_cache_ttl=60)
+        monkeypatch.setattr(llm_cache, "get_settings", lambda: settings)
+        monkeypatch.setattr(llm_cache, "_response_cache", None)
+
+        cache = get_response_cache()
+        assert cache is not None and cache.store is None
@@ -0,0 +1,116 @@
+"""
+Unit tests for LLMClient prompt caching and usage accounting, with a stubbed router.
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from litellm.types.utils import Usage
+
+from src.backend.clients.llm import HumanMessage, LLMClient, SystemMessage, track_usage
+
+
+def response(text="ok", prompt_tokens=2000, cached_tokens=0):
+    usage = Usage(prompt_tokens=prompt_tokens, completion_tokens=10, total_tokens=prompt_tokens + 10,
+                  prompt_tokens_details={"cached_tokens": cached_tokens})
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=usage)
+
+
+class StubRouter:
+    """Records requests and their start/end times."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = []
+
+    def completion(self, model, messages, **kwargs):
+        start = time.perf_counter()
+        time.sleep(self.latency)
+        self.requests.append((messages, start, time.perf_counter()))
+        return response(cached_tokens=1500 if len(self.requests) > 1 else 0)
+
+    async def acompletion(self, model, messages, **kwargs):
+        start = time.perf_counter()
+        await asyncio.sleep(self.latency)
+        self.requests.append((messages, start, time.perf_counter()))
+        return response(cached_tokens=1500 if len(self.requests) > 1 else 0)
+
+
+def make_client(mode, latency=0.0):
+    client = LLMClient()
+    client.prompt_caching = mode
+    client.router = StubRouter(latency)
+    return client
+
+
+def section_prompt(name):
+    return [SystemMessage(content="Shared reference material", cache=True), HumanMessage(content=name)]
+
+
+class TestPromptCaching:
+    """Test cache markers and first-call warming for shared prefixes."""
+
+    def test_explicit_marks_cached_messages(self):
+        """Test that only messages flagged as cacheable get cache_control."""
+        client = make_client("explicit")
+        system, human = client._convert_messages(section_prompt("Section 1"))
+        assert system["content"][0]["cache_control"]["type"] == "ephemeral"
+        assert system["content"][0]["text"] == "Shared reference material"
+        assert human == {"role": "user", "content": "Section 1"}
+
+    def test_implicit_sends_plain_messages(self):
+        """Test that implicit caching relies on the shared prefix only."""
+        client = make_client("implicit")
+        system, _ = client._convert_messages(section_prompt("Section 1"))
+        assert system == {"role": "system", "content": "Shared reference material"}
+        assert client._cache_prefix_key(section_prompt("Section 1")) is None
+
+    @pytest.mark.asyncio
+    async def test_first_call_warms_prefix(self):
+        """Test that concurrent calls wait for the first one and then run in parallel."""
+        client = make_client("explicit", latency=0.05)
+        await asyncio.gather(*(client.ainvoke(section_prompt(f"Section {i}")) for i in range(4)))
+        requests = sorted(client.router.requests, key=lambda r: r[1])
+        first_end = requests[0][2]
+        assert all(start >= first_end for _, start, _ in requests[1:])
+        assert max(start for _, start, _ in requests[1:]) < min(end for _, _, end in requests[1:])
+
+    @pytest.mark.asyncio
+    async def test_warmup_wait_bounded(self):
+        """Test that calls sharing a prefix wait at most prompt_cache_warmup, not the whole first call."""
+        client = make_client("explicit", latency=0.3)
+        client.prompt_cache_warmup = 0.05
+        await asyncio.gather(*(client.ainvoke(section_prompt(f"Section {i}")) for i in range(4)))
+        requests = sorted(client.router.requests, key=lambda r: r[1])
+        first_start, first_end = requests[0][1], requests[0][2]
+        assert all(first_start + 0.04 <= start < first_end for _, start, _ in requests[1:])
+
+    def test_warmup_sync_path(self):
+        """Test that threads sharing a prefix are held back the same way, and later calls not at all."""
+        client = make_client("explicit", latency=0.3)
+        client.prompt_cache_warmup = 0.05
+        threads = [threading.Thread(target=client.invoke, args=(section_prompt(f"Section {i}"),)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        requests = sorted(client.router.requests, key=lambda r: r[1])
+        assert all(requests[0][1] + 0.04 <= start < requests[0][2] for _, start, _ in requests[1:])
+        assert client._cache_prefix_key(section_prompt("Section 4")) in client._warm_prefixes
+
+
+class TestUsageTracking:
+    """Test per-generation token usage."""
+
+    def test_usage_collected_in_context(self):
+        """Test that input, cached and output tokens are summed for calls in the context."""
+        client = make_client("implicit")
+        client.invoke(section_prompt("outside"))
+        with track_usage() as usage:
+            client.invoke(section_prompt("Section 1"))
+            client.invoke(section_prompt("Section 2"))
+        assert (usage.calls, usage.prompt_tokens, usage.cached_tokens) == (2, 4000, 3000)
+        assert usage.cached_ratio == 0.75
@@ -0,0 +1,109 @@
+"""
+Unit tests for multi-deployment LLM routing, with litellm mock deployments.
+"""
+from collections import Counter
+
+import pytest
+import yaml
+
+from src.backend.clients import llm as llm_module
+from src.backend.clients import rate_limit
+from src.backend.clients.llm import HumanMessage, LLMClient, track_usage
+from src.backend.config import ConfigLoader
+from src.backend.utils.metrics import metrics
+
+CONFIG = {"llm": {
+    "slow": {"class_params": {"model": "gemini/gemini-2.5-flash", "mock_response": "slow", "mock_delay": 0.05,
+                              "rate_limit": {"rpm": 1000, "tpm": 100000}, "max_parallel_requests": 4}},
+    "fast": {"class_params": {"model": "gemini/gemini-2.5-flash-lite", "mock_response": "fast",
+                              "rate_limit": {"rpm": 15}, "max_parallel_requests": 2}},
+    "second-key": {"class_params": {"model": "gemini/gemini-2.5-flash", "api_key": "os.environ/GEMINI_API_KEY_2",
+                                    "rate_limit": {"rpm": 1000}}},
+    "limited": {"class_params": {"model": "gemini/gemini-2.5-flash", "mock_response": "litellm.RateLimitError"}},
+    "backup": {"class_params": {"model": "gemini/gemini-3-flash-preview", "mock_response": "backup"}},
+    "balanced": {"class_params": {
+        "deployments": ["slow", "fast"], "routing_strategy": "latency-based-routing", "num_retries": 0,
+        "temperature": 0.5,
+    }},
+    "failover": {"class_params": {"deployments": ["limited"], "fallbacks": ["backup"], "num_retries": 0}},
+}}
+
+
+@pytest.fixture(autouse=True)
+def config(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(CONFIG))
+    monkeypatch.setattr(llm_module, "ConfigLoader", lambda: ConfigLoader(str(path)))
+    metrics.reset()
+
+
+class TestLLMRouting:
+    """Test deployment groups, latency-based selection and fallbacks."""
+
+    def test_group_built_from_configs(self):
+        """Test that each listed config becomes a deployment of the group and fallbacks a separate group."""
+        client = LLMClient("llm.failover")
+
+        assert client.model_name == "failover"
+        assert {d["model_name"] for d in client.router.model_list} == {"failover", "failover-fallback"}
+        assert client.router.fallbacks == [{"failover": ["failover-fallback"]}]
+        assert "deployments" not in client.router.model_list[0]["litellm_params"]
+
+    def test_router_shared_per_config(self):
+        """Test that clients of one llm config share a Router and other configs get their own."""
+        assert LLMClient("llm.balanced").router is LLMClient("llm.balanced").router
+        assert LLMClient("llm.failover").router is not LLMClient("llm.balanced").router
+
+    def test_group_governed_by_combined_quota(self, monkeypatch):
+        """Test that a group without its own rate_limit is governed by its deployments' combined quota."""
+        monkeypatch.setattr(rate_limit, "_governors", {})
+        governor = LLMClient("llm.balanced").governor
+
+        assert (governor.rpm, governor.tpm) == (1015, None)
+        assert governor.concurrency.max_limit == 6
+        assert LLMClient("llm.failover").governor is None
+
+    def test_governor_per_model_and_key(self, monkeypatch):
+        """Test that configs of one model share a governor unless they name another API key."""
+        monkeypatch.setattr(rate_limit, "_governors", {})
+        assert LLMClient("llm.slow").governor.name == "gemini/gemini-2.5-flash"
+        assert LLMClient("llm.second-key").governor.name == "gemini/gemini-2.5-flash@GEMINI_API_KEY_2"
+
+    def test_lowest_latency_deployment_preferred(self):
+        """Test that latency-based routing sends most calls to the faster deployment."""
+        client = LLMClient("llm.balanced")
+        served = Counter(client.invoke([HumanMessage(content=f"Query {i}")]) for i in range(12))
+
+        assert served["fast"] > served["slow"]
+        deployments = client.routing_stats()["deployments"]
+        assert deployments["fast"]["count"] == served["fast"]
+        assert deployments["slow"]["p50_ms"] > deployments["fast"]["p50_ms"]
+
+    def test_fallback_on_rate_limit(self):
+        """Test that a rate-limited group falls back and the call is attributed to the fallback model."""
+        client = LLMClient("llm.failover")
+        with track_usage() as usage:
+            assert client.invoke([HumanMessage(content="Query")]) == "backup"
+
+        assert usage.calls == 1
+        stats = client.routing_stats()
+        assert stats["fallbacks"] == 1
+        assert stats["deployments"]["fallback/backup"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_fallback(self):
+        """Test that async calls fall back the same way."""
+        client = LLMClient("llm.failover")
+        assert await client.ainvoke([HumanMessage(content="Query")]) == "backup"
+        assert metrics.snapshot()["counters"]["llm.fallbacks"] == 1
+
+    def test_cache_key_covers_deployments(self):
+        """Test that a group's cache key includes the settings of every deployment."""
+        params = LLMClient("llm.balanced").cache_key_params
+        assert params["temperature"] == 0.5
+        assert len(params["deployments"]) == 2 and "gemini/gemini-2.5-flash-lite" in params["deployments"][1]
+
+    def test_routing_stats_registered(self):
+        """Test that routing stats of a group are reported on /metrics."""
+        LLMClient("llm.balanced")
+        assert metrics.snapshot()["gauges"]["llm_routing.balanced"]["strategy"] == "latency-based-routing"
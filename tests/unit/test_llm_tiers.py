@@ -0,0 +1,141 @@
+"""
+Unit tests for per-node model tiers: the llm config, output cap and temperature of each LLM call.
+"""
+from types import SimpleNamespace
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.backend.agents.blogs import AgentWorkflow
+from src.backend.agents.memo import StageCache
+from src.backend.agents.state import BlogStateInput
+from src.backend.agents.tiers import ModelTiers
+from src.backend.clients.llm import HumanMessage, LLMClient
+from tests.benchmarks.fakes import FakeLLM
+
+TIERS = {
+    "length_tokens": {"short": 1000, "medium": 2000, "long": 4000},
+    "nodes": {
+        "generate_tags": {"llm": "gemini-lite", "max_tokens": 256, "temperature": 0.2},
+        "write_section": {"max_tokens": "length"},
+    },
+}
+
+
+class TieredLLM(FakeLLM):
+    """FakeLLM whose variants log the llm config and parameters of every call"""
+
+    def __init__(self, config_path="llm.default", log=None):
+        super().__init__(latency_ms=0)
+        self.config_path = config_path
+        self.log = [] if log is None else log
+        self._variants = {}
+
+    def variant(self, config_path):
+        return self._variants.setdefault(config_path, TieredLLM(config_path, self.log))
+
+    def _log(self, messages, kwargs):
+        prompt = " ".join(m.content for m in messages)
+        params = {k: v for k, v in kwargs.items() if k != "cache"}
+        self.log.append((prompt, self.config_path, params))
+
+    def invoke(self, messages, **kwargs):
+        self._log(messages, kwargs)
+        return super().invoke(messages, **kwargs)
+
+    async def ainvoke(self, messages, **kwargs):
+        self._log(messages, kwargs)
+        return await super().ainvoke(messages, **kwargs)
+
+    def calls_with(self, text):
+        return [(config_path, params) for prompt, config_path, params in self.log if text in prompt]
+
+
+@pytest.fixture
+def workflow():
+    """AgentWorkflow with a logging fake LLM and the test tiers."""
+    agent = AgentWorkflow(checkpointer=InMemorySaver())
+    agent.llm = TieredLLM()
+    agent.tiers = ModelTiers.from_config(SimpleNamespace(class_params=TIERS))
+    agent.tagger.method = "llm"
+    agent.stage_cache = StageCache()
+    agent._store_new_content = lambda *args, **kwargs: None
+    agent.content_repo.exists = lambda *args, **kwargs: False
+    return agent
+
+
+def prepare_input(length):
+    return lambda payload, thread_id, user: (
+        BlogStateInput(input_topic=payload["topic"], input_content="Reference material.",
+                       post_types=payload["post_types"], thread_id=thread_id,
+                       template={"parameters": {"length": length}}),
+        None,
+    )
+
+
+class TestModelTiers:
+    """Test the mapping of nodes to llm configs and call parameters."""
+
+    def test_node_params(self):
+        """Test that a listed node gets its config path, cap and temperature, and others nothing."""
+        tiers = ModelTiers.from_config(SimpleNamespace(class_params=TIERS))
+        assert tiers.llm("generate_tags") == "llm.gemini-lite"
+        assert tiers.params("generate_tags") == {"max_tokens": 256, "temperature": 0.2}
+        assert tiers.llm("review_blog") is None and tiers.params("review_blog") == {}
+
+    def test_cap_from_length(self):
+        """Test that length-capped nodes follow the template length, defaulting to medium."""
+        tiers = ModelTiers.from_config(SimpleNamespace(class_params=TIERS))
+        assert tiers.params("write_section", "Long") == {"max_tokens": 4000}
+        assert tiers.params("write_section", "a few paragraphs") == {"max_tokens": 2000}
+        assert tiers.params("write_section") == {"max_tokens": 2000}
+
+
+class TestLLMVariant:
+    """Test clients of other llm configs reached through the main client."""
+
+    def test_variant_created_once(self):
+        """Test that a variant is built once per config and the client's own config returns itself."""
+        client = LLMClient("llm.default")
+        lite = client.variant("llm.gemini-lite")
+
+        assert client.variant("llm.default") is client
+        assert client.variant("llm.gemini-lite") is lite
+        assert lite.model_name == "gemini/gemini-2.5-flash-lite"
+
+    def test_variant_call_parameters(self):
+        """Test that tier parameters reach the provider and key the response cache."""
+        client = LLMClient("llm.default")
+        prompt = [HumanMessage(content="Generate tags")]
+        assert client._request_key(prompt, {"max_tokens": 256}) != client._request_key(prompt, {})
+
+
+class TestWorkflowTiers:
+    """Test that graph nodes call the llm config and parameters of their tier."""
+
+    @pytest.mark.asyncio
+    async def test_nodes_use_their_tier(self, workflow):
+        """Test that tags go to the cheaper config and sections to the main client with a length cap."""
+        workflow._prepare_input = prepare_input("short")
+        await workflow.arun_generic_workflow({"topic": "tiers", "post_types": ["blog"]}, "thread-tiers", None)
+
+        assert workflow.llm.calls_with("Generate tags for the blog") == [
+            ("llm.gemini-lite", {"max_tokens": 256, "temperature": 0.2})
+        ]
+        sections = workflow.llm.calls_with("crafting a section")
+        assert len(sections) == 2
+        assert all(call == ("llm.default", {"max_tokens": 1000}) for call in sections)
+        assert workflow.llm.calls_with("Generate the sections of the blog") == [("llm.default", {})]
+
+    def test_sync_helpers_use_their_tier(self, workflow):
+        """Test that the sync path and helper calls resolve tiers the same way."""
+        workflow.tiers.nodes["query_rewriter"] = {"llm": "gemini-lite", "max_tokens": 64}
+        assert workflow._query_rewriter("vector databases") == "fake search query"
+        assert workflow.llm.log[-1][1:] == ("llm.gemini-lite", {"max_tokens": 64})
+
+    def test_memo_key_depends_on_length(self, workflow):
+        """Test that sections written under different length caps are memoized separately."""
+        messages = [HumanMessage(content="Write the section")]
+        short, _ = workflow._memo_lookup("write_section", messages, None, "short")
+        long, _ = workflow._memo_lookup("write_section", messages, None, "long")
+        assert short != long
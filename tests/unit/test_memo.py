@@ -0,0 +1,51 @@
+"""
+Unit tests for the content-addressed stage cache.
+"""
+import time
+
+from src.backend.agents.memo import StageCache
+from src.backend.clients.llm import HumanMessage, SystemMessage
+from src.backend.utils.metrics import metrics
+
+
+def prompt(content):
+    return [SystemMessage(content=content), HumanMessage(content="Write the section")]
+
+
+class TestStageCache:
+    """Test keys, eviction and hit-rate accounting."""
+
+    def test_key_ignores_whitespace_only_differences(self):
+        """Test that reformatted input content maps to the same entry."""
+        model = {"model": "m", "temperature": 0.5}
+        assert StageCache.key("write_section", prompt("Some  text\n\nhere"), model) == \
+            StageCache.key("write_section", prompt("Some text here "), model)
+
+    def test_key_depends_on_stage_model_and_prompt(self):
+        """Test that the stage, model settings and prompt all change the key."""
+        base = StageCache.key("write_section", prompt("text"), {"model": "m"})
+        assert base != StageCache.key("write_final_sections", prompt("text"), {"model": "m"})
+        assert base != StageCache.key("write_section", prompt("text"), {"model": "m", "temperature": 1})
+        assert base != StageCache.key("write_section", prompt("other text"), {"model": "m"})
+
+    def test_hit_rate_per_stage(self):
+        """Test that hits and misses are tallied per stage and exported as counters."""
+        metrics.reset()
+        cache = StageCache()
+        assert cache.get("write_section", "k") is None
+        cache.set("k", "content")
+        assert cache.get("write_section", "k") == "content"
+        assert cache.stats()["hit_rate"] == {"write_section": 0.5}
+        counters = metrics.snapshot()["counters"]
+        assert counters["stage_cache.hit.write_section"] == 1
+        assert counters["stage_cache.miss.write_section"] == 1
+
+    def test_entries_expire_and_are_bounded(self):
+        """Test TTL expiry and LRU eviction."""
+        cache = StageCache(maxsize=2, ttl=0.05)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        assert cache.stats()["size"] == 2
+        assert cache.get("plan", "a") is None
+        time.sleep(0.06)
+        assert cache.get("plan", "c") is None
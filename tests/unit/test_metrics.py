@@ -0,0 +1,64 @@
+"""
+Unit tests for the in-process metrics registry and checkpointer pool instrumentation.
+"""
+from unittest.mock import patch
+
+from psycopg_pool import ConnectionPool
+
+from src.backend.db import checkpoint
+from src.backend.utils.metrics import MetricsRegistry, metrics
+
+
+class TestMetricsRegistry:
+    """Test counters, timings and gauges."""
+
+    def test_counters_accumulate(self):
+        """Test that increments are summed per name."""
+        registry = MetricsRegistry()
+        registry.increment("hits")
+        registry.increment("hits", 2)
+        assert registry.snapshot()["counters"] == {"hits": 3}
+
+    def test_timing_summary(self):
+        """Test that timings report count, mean and percentiles."""
+        registry = MetricsRegistry()
+        for value in range(1, 101):
+            registry.observe("latency", value)
+        summary = registry.snapshot()["timings"]["latency"]
+        assert summary["count"] == 100
+        assert summary["mean_ms"] == 50.5
+        assert summary["p50_ms"] == 50
+        assert summary["p95_ms"] == 95
+        assert summary["max_ms"] == 100
+
+    def test_timing_window_is_bounded(self):
+        """Test that only recent samples are kept while the count stays exact."""
+        registry = MetricsRegistry(max_samples=10)
+        for value in range(100):
+            registry.observe("latency", value)
+        summary = registry.snapshot()["timings"]["latency"]
+        assert summary["count"] == 100
+        assert summary["max_ms"] == 99
+
+    def test_failing_gauge_is_reported(self):
+        """Test that a gauge raising an error doesn't break the snapshot."""
+        registry = MetricsRegistry()
+        registry.register_gauge("ok", lambda: 1)
+        registry.register_gauge("broken", lambda: 1 / 0)
+        gauges = registry.snapshot()["gauges"]
+        assert gauges["ok"] == 1
+        assert "error" in gauges["broken"]
+
+
+class TestCheckpointPool:
+    """Test the checkpointer connection pool instrumentation."""
+
+    def test_getconn_records_wait_time(self):
+        """Test that checking out a connection records the wait."""
+        pool = checkpoint.TimedConnectionPool(
+            "postgresql://localhost/test", name="test_pool", open=False
+        )
+        metrics.reset()
+        with patch.object(ConnectionPool, "getconn", return_value="conn"):
+            assert pool.getconn() == "conn"
+        assert metrics.snapshot()["timings"]["test_pool.wait_ms"]["count"] == 1
@@ -0,0 +1,84 @@
+"""
+Unit tests for local relevance ranking of web search results.
+"""
+from types import SimpleNamespace
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.backend.agents.blogs import AgentWorkflow
+from src.backend.agents.ranking import RelevanceRanker
+from tests.benchmarks.fakes import FakeLLM
+
+RESULTS = [
+    {"link": "https://shop.example.com/deals", "title": "Best deals this week", "snippet": "Discounts on laptops."},
+    {"link": "https://docs.example.org/vector-db", "title": "Vector databases explained",
+     "snippet": "How vector databases index embeddings for similarity search."},
+    {"link": "https://www.youtube.com/watch?v=1", "title": "Vector databases explained (video)",
+     "snippet": "How vector databases index embeddings for similarity search."},
+    {"link": "https://blog.example.net/embeddings", "title": "Choosing an embeddings store",
+     "snippet": "Comparing vector search engines."},
+]
+
+
+def search_results(results):
+    return SimpleNamespace(get_results=lambda: results, get_all_urls=lambda: [r["link"] for r in results])
+
+
+class TestRelevanceRanker:
+    """Test BM25 scoring, domain priors and selection limits."""
+
+    def test_matching_results_ranked_first(self):
+        """Test that results sharing the query's terms are kept, best first, and unrelated ones dropped."""
+        ranker = RelevanceRanker(min_results=1, domain_priors={"youtube.com": 0.3})
+        urls = ranker.rank("vector databases embeddings", RESULTS)
+
+        assert urls[0] == "https://docs.example.org/vector-db"
+        assert "https://shop.example.com/deals" not in urls
+
+    def test_domain_prior_demotes_results(self):
+        """Test that a domain prior below 1 moves a result behind an equally relevant one."""
+        neutral = RelevanceRanker(position_decay=0).scores("vector databases", RESULTS[1:3])
+        weighted = RelevanceRanker(position_decay=0, domain_priors={"youtube.com": 0.3}).scores(
+            "vector databases", RESULTS[1:3])
+        assert weighted[1] == pytest.approx(neutral[1] * 0.3)
+        assert RelevanceRanker(domain_priors={"example.org": 2}).prior("https://docs.example.org/a") == 2
+
+    def test_limits(self):
+        """Test that results are capped overall and per domain."""
+        results = [{"link": f"https://example.com/{i}", "title": "vector databases", "snippet": ""} for i in range(5)]
+        assert RelevanceRanker(max_per_domain=2).rank("vector databases", results) == \
+            ["https://example.com/0", "https://example.com/1"]
+        assert len(RelevanceRanker(max_results=3, max_per_domain=5).rank("vector databases", results)) == 3
+
+    def test_no_match_returns_nothing(self):
+        """Test that a query sharing no term with the results yields an empty ranking."""
+        assert RelevanceRanker().rank("kubernetes operators", RESULTS) == []
+
+    def test_unknown_method_rejected(self):
+        """Test that only the bm25 and llm methods can be configured."""
+        with pytest.raises(ValueError):
+            RelevanceRanker(method="embeddings")
+
+
+class TestSearchResultSelection:
+    """Test how the workflow selects search results to convert."""
+
+    @pytest.fixture
+    def workflow(self):
+        workflow = AgentWorkflow(checkpointer=InMemorySaver())
+        workflow.llm = FakeLLM(latency_ms=0)
+        return workflow
+
+    def test_ranked_without_llm(self, workflow):
+        """Test that the bm25 method selects results without an LLM call."""
+        urls = workflow._select_search_results(search_results(RESULTS), "vector databases")
+        assert urls and workflow.llm.calls == 0
+
+    def test_llm_fallback(self, workflow):
+        """Test that the LLM selects results when nothing matches or the llm method is configured."""
+        assert workflow._select_search_results(search_results(RESULTS), "kubernetes operators") == \
+            [r["link"] for r in RESULTS]
+        workflow.relevance = RelevanceRanker(method="llm")
+        workflow._select_search_results(search_results(RESULTS), "vector databases")
+        assert workflow.llm.calls == 2
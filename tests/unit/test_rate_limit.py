@@ -0,0 +1,214 @@
+"""
+Unit tests for the LLM rate governor: token buckets, adaptive concurrency and LLMClient integration.
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.clients import rate_limit
+from src.backend.clients.llm import HumanMessage, LLMClient
+from src.backend.clients.rate_limit import AdaptiveConcurrency, MemoryBucketStore, RateGovernor, SQLBucketStore, get_governor
+from src.backend.utils.metrics import metrics
+from tests.unit.test_llm_client import StubRouter, response
+
+
+class RateLimitError(Exception):
+    """Stands in for litellm's RateLimitError."""
+
+
+class LimitedRouter(StubRouter):
+    """Answers 429 to the first ``failures`` calls and tracks the peak number of calls in flight."""
+
+    def __init__(self, latency=0.0, failures=0):
+        super().__init__(latency)
+        self.failures = failures
+        self.in_flight = self.peak = 0
+
+    async def acompletion(self, model, messages, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.failures:
+                self.failures -= 1
+                raise RateLimitError("429 Resource exhausted")
+            await asyncio.sleep(self.latency)
+            if kwargs.get("stream"):
+                return chunks("ok")
+            return response(prompt_tokens=100)
+        finally:
+            self.in_flight -= 1
+
+
+async def chunks(text):
+    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+
+def make_client(governor, router):
+    client = LLMClient()
+    client.router = router
+    client.governor = governor
+    return client
+
+
+class TestTokenBuckets:
+    """Test the per-process and shared token buckets."""
+
+    def test_memory_bucket_waits_for_refill(self):
+        """Test that an empty bucket reports the time until the cost has refilled."""
+        store = MemoryBucketStore()
+        assert store.take("m:requests", 2, capacity=2, rate=10) == 0
+        assert store.take("m:requests", 1, capacity=2, rate=10) == pytest.approx(0.1, abs=0.01)
+        time.sleep(0.11)
+        assert store.take("m:requests", 1, capacity=2, rate=10) == 0
+
+    def test_sql_bucket_shared_and_never_overdrawn(self, tmp_path):
+        """Test that workers on separate stores share one bucket and concurrent takes never overdraw it."""
+        url = f"sqlite:///{tmp_path / 'rate_limit.db'}"
+        stores = [SQLBucketStore(url) for _ in range(4)]
+        taken = []
+
+        def worker(store):
+            for _ in range(10):
+                if store.take("m:requests", 1, capacity=20, rate=0.001) == 0:
+                    taken.append(1)
+
+        threads = [threading.Thread(target=worker, args=(store,)) for store in stores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(taken) == 20
+
+    def test_sql_bucket_debit_and_drain(self, tmp_path):
+        """Test that debits can overdraw a bucket and draining empties it."""
+        store = SQLBucketStore(f"sqlite:///{tmp_path / 'rate_limit.db'}")
+        store.take("m:tokens", 100, capacity=1000, rate=1)
+        store.debit("m:tokens", 950, capacity=1000, rate=1)
+        assert store.take("m:tokens", 10, capacity=1000, rate=1) > 50
+        store.drain("m:tokens")
+        assert store.take("m:tokens", 1, capacity=1000, rate=1) == pytest.approx(1, abs=0.1)
+
+    def test_unsupported_dialect_rejected_before_ddl(self, monkeypatch):
+        """Test that an unsupported database is rejected before the table is created."""
+        created = []
+        monkeypatch.setattr(rate_limit, "create_engine",
+                            lambda url, **kwargs: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+        monkeypatch.setattr(rate_limit.llm_rate_buckets, "create", lambda *args, **kwargs: created.append(args))
+
+        with pytest.raises(ValueError):
+            SQLBucketStore("mysql://buckets")
+        assert created == []
+
+    def test_unavailable_store_falls_back_to_memory(self, monkeypatch):
+        """Test that a shared store that cannot be opened leaves per-process buckets instead of failing."""
+        settings = SimpleNamespace(llm_rate_limit_url="postgresql://nobody@127.0.0.1:1/buckets")
+        monkeypatch.setattr(rate_limit, "get_settings", lambda: settings)
+        monkeypatch.setattr(rate_limit, "_store", None)
+        monkeypatch.setattr(rate_limit, "_governors", {})
+
+        governor = get_governor("unreachable", {"rpm": 60}, max_concurrency=2)
+        assert isinstance(governor.store, MemoryBucketStore)
+
+
+class TestAdaptiveConcurrency:
+    """Test additive increase and multiplicative decrease."""
+
+    def test_halved_on_rate_limit_and_regrown(self):
+        """Test that a 429 halves the limit and a window of successes adds one slot."""
+        concurrency = AdaptiveConcurrency(8)
+        concurrency.acquire()
+        concurrency.release(rate_limited=True)
+        assert int(concurrency.limit) == 4
+        for _ in range(5):
+            concurrency.acquire()
+            concurrency.release()
+        assert int(concurrency.limit) == 5
+
+    def test_acquire_blocks_at_limit(self):
+        """Test that a call waits for a slot when the limit is reached."""
+        concurrency = AdaptiveConcurrency(1)
+        concurrency.acquire()
+        threading.Timer(0.05, concurrency.release).start()
+        started = time.perf_counter()
+        concurrency.acquire()
+        assert time.perf_counter() - started >= 0.04
+
+
+    @pytest.mark.asyncio
+    async def test_async_waiter_woken_by_release(self, monkeypatch):
+        """Test that an async caller waits without polling and takes the slot as soon as it is released."""
+        concurrency = AdaptiveConcurrency(1)
+        await concurrency.aacquire()
+        sleeps = []
+        sleep = asyncio.sleep
+        monkeypatch.setattr(rate_limit.asyncio, "sleep", lambda delay, *args: sleeps.append(delay) or sleep(delay, *args))
+        waiter = asyncio.create_task(concurrency.aacquire())
+        await sleep(0.05)
+        assert not waiter.done() and sleeps == []
+
+        threading.Thread(target=concurrency.release).start()
+        await asyncio.wait_for(waiter, 1)
+        assert concurrency.in_flight == 1 and concurrency._waiters == []
+
+    @pytest.mark.asyncio
+    async def test_cancelled_async_waiter_removed(self):
+        """Test that a cancelled async caller leaves no waiter behind."""
+        concurrency = AdaptiveConcurrency(1)
+        await concurrency.aacquire()
+        waiter = asyncio.create_task(concurrency.aacquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert concurrency._waiters == []
+
+
+class TestGovernedClient:
+    """Test that LLMClient calls go through the governor."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limited(self):
+        """Test that no more calls than the concurrency limit are in flight."""
+        router = LimitedRouter(latency=0.02)
+        client = make_client(RateGovernor("test", MemoryBucketStore(), max_concurrency=2), router)
+        await asyncio.gather(*(client.ainvoke([HumanMessage(content=f"Section {i}")]) for i in range(6)))
+        assert router.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_concurrency_and_drains_requests(self):
+        """Test that a 429 shrinks concurrency and pauses the shared request bucket."""
+        metrics.reset()
+        governor = RateGovernor("test", MemoryBucketStore(), rpm=600, max_concurrency=4)
+        client = make_client(governor, LimitedRouter(failures=1))
+
+        started = time.perf_counter()
+        assert await client.ainvoke([HumanMessage(content="Query")]) == "ok"
+        assert int(governor.concurrency.limit) == 2
+        assert metrics.snapshot()["counters"]["llm.rate_limited"] == 1
+        # The drained bucket refills one request in 0.1 s
+        assert time.perf_counter() - started >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_stream_open_reaches_governor(self):
+        """Test that a 429 when opening a stream halves concurrency before the open is retried."""
+        metrics.reset()
+        governor = RateGovernor("test", MemoryBucketStore(), max_concurrency=4)
+        client = make_client(governor, LimitedRouter(failures=1))
+
+        assert [token async for token in client.astream([HumanMessage(content="Query")], cache=False)] == ["ok"]
+        assert int(governor.concurrency.limit) == 2
+        assert metrics.snapshot()["counters"]["llm.rate_limited"] == 1
+        assert governor.concurrency.in_flight == 0
+
+    def test_tokens_settled_with_usage(self):
+        """Test that the tokens a call used beyond its estimate are charged to the bucket."""
+        store = MemoryBucketStore()
+        client = make_client(RateGovernor("test", store, tpm=60000), StubRouter())
+        client.invoke([HumanMessage(content="x" * 400)])
+
+        # 100 estimated prompt tokens taken before the call, 2010 used
+        assert store.take("test:tokens", 57990, capacity=60000, rate=1) == 0
+        assert store.take("test:tokens", 10, capacity=60000, rate=1) > 0
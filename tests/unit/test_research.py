@@ -0,0 +1,130 @@
+"""
+Unit tests for the concurrent research pool and the topic research phase.
+"""
+import threading
+import time
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.backend.agents.blogs import AgentWorkflow
+from src.backend.agents.ranking import RelevanceRanker
+from src.backend.agents.research import ResearchPool
+from src.backend.agents.utils import get_tweet_reference_content, get_url_metadata
+from tests.benchmarks.fakes import FakeConverter, FakeImageSearch, FakeLLM, FakeWebSearch
+
+
+def sleepy(seconds):
+    def run(item):
+        time.sleep(seconds)
+        return item * 2
+    return run
+
+
+class TestResearchPool:
+    """Test bounded concurrency, ordering and per-call timeouts."""
+
+    def test_map_runs_concurrently_in_order(self):
+        """Test that items run in parallel and results keep the input order."""
+        start = time.perf_counter()
+        results = ResearchPool(max_concurrency=4).map(sleepy(0.1), [1, 2, 3, 4])
+        assert results == [2, 4, 6, 8]
+        assert time.perf_counter() - start < 0.3
+
+    def test_map_bounded_by_max_concurrency(self):
+        """Test that no more than max_concurrency calls run at once."""
+        lock, active, peak = threading.Lock(), [0], [0]
+
+        def run(item):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        ResearchPool(max_concurrency=3).map(run, range(10))
+        assert peak[0] == 3
+
+    def test_failures_and_timeouts_yield_none(self):
+        """Test that a failing or slow item is skipped without delaying the others."""
+        def run(item):
+            if item == "fail":
+                raise RuntimeError("boom")
+            if item == "slow":
+                time.sleep(1)
+            return item
+
+        start = time.perf_counter()
+        results = ResearchPool(max_concurrency=4, url_timeout=0.1).map(run, ["a", "fail", "slow", "b"])
+        assert results == ["a", None, None, "b"]
+        assert time.perf_counter() - start < 0.5
+
+    def test_sequential_when_concurrency_is_one(self):
+        """Test that max_concurrency 1 runs calls inline, one after another."""
+        threads = set()
+        pool = ResearchPool(max_concurrency=1)
+        pool.map(lambda item: threads.add(threading.get_ident()), range(3))
+        future = pool.start(lambda: threads.add(threading.get_ident()))
+        assert future.done()
+        assert threads == {threading.get_ident()}
+
+    def test_background_result_timeout(self):
+        """Test that a background call that takes too long is abandoned."""
+        pool = ResearchPool(search_timeout=0.05)
+        assert pool.result(pool.start(time.sleep, 1), "slow search") is None
+        assert pool.result(pool.start(lambda: "images"), "image search") == "images"
+
+
+class TestResearchPhase:
+    """Test the topic and tweet workflows with stubbed network calls."""
+
+    def make_workflow(self, url_latency_ms=100):
+        workflow = AgentWorkflow(checkpointer=InMemorySaver())
+        workflow.llm = FakeLLM(latency_ms=0)
+        workflow.relevance = RelevanceRanker(max_results=4, max_per_domain=4)
+        workflow.websearcher = FakeWebSearch(latency_ms=50)
+        workflow.imagesearch = FakeImageSearch(latency_ms=150)
+        workflow.generic_converter = FakeConverter(latency_ms=url_latency_ms)
+        workflow.research = ResearchPool(max_concurrency=4)
+        workflow._setup_topic_source = lambda payload, urls, thread_id, user: (None, [get_url_metadata(u) for u in urls])
+        workflow.stored_media = []
+        workflow._handle_media_storage = lambda source_id, media_meta: workflow.stored_media.extend(media_meta)
+        return workflow
+
+    def test_topic_overlaps_searches_and_conversions(self):
+        """Test that image search and URL conversions overlap and every source is kept in order."""
+        workflow = self.make_workflow()
+        start = time.perf_counter()
+        state, _ = workflow._collect_input({"topic": "Vector databases", "post_types": ["blog"]}, "thread", None)
+        elapsed = time.perf_counter() - start
+
+        # Sequentially: 50 ms web search + 4 x 100 ms conversions + 150 ms image search
+        assert elapsed < 0.4
+        assert [line.split(": ", 1)[1] for line in state.input_content.splitlines() if line.startswith("# Source")] == \
+            [f"https://example.com/fake-search-query/{i}" for i in range(4)]
+        assert len(workflow.stored_media) == 3
+
+    def test_failed_conversion_skipped(self):
+        """Test that a URL that fails to convert is left out and sources are renumbered."""
+        workflow = self.make_workflow()
+        convert = workflow.generic_converter.convert
+
+        def flaky_convert(url):
+            if url.endswith("/1"):
+                raise IOError("404 Not Found")
+            return convert(url)
+
+        workflow.generic_converter.convert = flaky_convert
+
+        state, _ = workflow._collect_input({"topic": "Vector databases", "post_types": ["blog"]}, "thread", None)
+        assert state.input_content.count("# Source ") == 3
+        assert "/1\n" not in state.input_content and "# Source 3:" in state.input_content
+
+    def test_tweet_links_fetched_with_map(self):
+        """Test that tweet links go through the provided map and keep their order."""
+        urls = [{"url": f"https://example.com/{i}", "type": "unknown"} for i in range(3)]
+        calls = []
+        content, links = get_tweet_reference_content(urls, map_urls=lambda fn, items: calls.append(items) or [fn(u) for u in items])
+        assert calls == [urls]
+        assert links == "".join(f"URL:https://example.com/{i}\n" for i in range(3))
+        assert content.count("# Source ") == 3
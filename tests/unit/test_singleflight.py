@@ -0,0 +1,124 @@
+"""
+Unit tests for single-flight coalescing and its use by LLM calls, URL conversions and searches.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.agents.tools import WebSearch
+from src.backend.clients.llm import HumanMessage
+from src.backend.extraction.converters.markdown import GenericConverter
+from src.backend.utils.singleflight import SingleFlight, get_flight
+from tests.unit.test_llm_client import make_client
+
+
+def run_concurrently(fn, count=5):
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(lambda _: fn(), range(count)))
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent calls with the same key."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that overlapping calls wait for one execution and get its result."""
+        flight, calls = SingleFlight("test"), []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"value": 42}
+
+        results = run_concurrently(lambda: flight.do("key", work))
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"executed": 1, "coalesced": 4, "coalesced_ratio": 0.8, "in_flight": 0}
+
+    def test_error_shared_and_not_kept(self):
+        """Test that waiters get the execution's error and a later call runs again."""
+        flight = SingleFlight("test")
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError("provider down")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", fail)
+            started.wait()
+            follower = executor.submit(flight.do, "key", lambda: "never runs")
+            for future in (leader, follower):
+                with pytest.raises(RuntimeError, match="provider down"):
+                    future.result()
+        assert flight.do("key", lambda: "ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_async_calls_coalesced_and_cancellation_isolated(self):
+        """Test that async callers share one task and a cancelled caller does not cancel it."""
+        flight, calls = SingleFlight("test"), []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.ado("key", work))
+        others = [asyncio.ensure_future(flight.ado("key", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await asyncio.gather(*others) == ["done"] * 3
+        assert len(calls) == 1
+
+
+class TestCoalescedOperations:
+    """Test that LLM calls, conversions and searches are coalesced."""
+
+    @pytest.mark.asyncio
+    async def test_identical_llm_calls_coalesced(self):
+        """Test that identical concurrent prompts make one provider call unless the cache is bypassed."""
+        client = make_client("implicit", latency=0.05)
+        prompt = [HumanMessage(content="Suggest trending titles")]
+        await asyncio.gather(*(client.ainvoke(prompt) for _ in range(4)))
+        assert len(client.router.requests) == 1
+
+        await asyncio.gather(*(client.ainvoke(prompt, cache=False) for _ in range(2)))
+        assert len(client.router.requests) == 3
+
+    def test_sync_llm_calls_coalesced(self):
+        """Test that identical prompts from concurrent threads make one provider call."""
+        client = make_client("implicit", latency=0.05)
+        run_concurrently(lambda: client.invoke([HumanMessage(content="Rewrite the query")]), count=3)
+        assert len(client.router.requests) == 1
+
+    def test_same_url_converted_once(self):
+        """Test that concurrent conversions of a URL share one download."""
+        converter, calls = GenericConverter(), []
+
+        def convert(source, **params):
+            calls.append(source)
+            time.sleep(0.05)
+            return SimpleNamespace(text_content=f"# {source}")
+
+        converter.converter = SimpleNamespace(convert=convert)
+        results = run_concurrently(lambda: converter.convert("https://example.com/post"), count=3)
+        assert results == ["# https://example.com/post"] * 3 and len(calls) == 1
+        assert get_flight("convert").stats()["coalesced"] >= 2
+
+    def test_same_query_searched_once(self):
+        """Test that concurrent identical searches share one provider request."""
+        searcher, calls = WebSearch.__new__(WebSearch), []
+        searcher.provider, searcher.num_results, searcher.results = "google", 15, []
+
+        def results(query):
+            calls.append(query)
+            time.sleep(0.05)
+            return {"organic": [{"link": "https://example.com", "title": "Example"}]}
+
+        searcher.search_tool = SimpleNamespace(results=results)
+        urls = run_concurrently(lambda: searcher.search("vector databases").get_all_urls(), count=3)
+        assert urls == [["https://example.com"]] * 3 and len(calls) == 1
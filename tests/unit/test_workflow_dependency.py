@@ -0,0 +1,57 @@
+"""
+Unit tests for the shared AgentWorkflow dependency.
+"""
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.backend.api import dependencies
+
+
+class TestWorkflowDependency:
+    """Test the process-wide workflow returned by get_workflow."""
+
+    def setup_method(self):
+        dependencies._workflow = None
+
+    def teardown_method(self):
+        dependencies._workflow = None
+
+    def test_get_workflow_reuses_instance(self):
+        """Test that the workflow is built once and reused."""
+        with patch.object(dependencies, "AgentWorkflow") as workflow_cls:
+            first = dependencies.get_workflow()
+            second = dependencies.get_workflow()
+            assert first is second
+            workflow_cls.assert_called_once()
+
+    def test_get_workflow_is_thread_safe(self):
+        """Test that concurrent first calls build a single workflow."""
+        def slow_build():
+            threading.Event().wait(0.05)
+            return MagicMock()
+
+        with patch.object(dependencies, "AgentWorkflow", side_effect=slow_build) as workflow_cls:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(dependencies.get_workflow()))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert workflow_cls.call_count == 1
+            assert all(result is results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_aclose_workflow_releases_instance(self):
+        """Test that closing releases the workflow and its pools, and the next call rebuilds it."""
+        with patch.object(dependencies, "AgentWorkflow") as workflow_cls, \
+                patch.object(dependencies, "aclose_checkpoint_pools", new_callable=AsyncMock) as close_pools:
+            dependencies.get_workflow()
+            await dependencies.aclose_workflow()
+            close_pools.assert_awaited_once()
+            dependencies.get_workflow()
+            assert workflow_cls.call_count == 2